@@ -0,0 +1,169 @@
+# src/recsys/api/batching.py
+"""
+Async micro-batching of inference calls.
+
+FAISS and the ALS scorer are vectorized: one call with 32 queries costs far
+less than 32 calls with one query each. `MicroBatcher` sits between the async
+request handlers and such a batch function:
+
+- each request `await`s `submit(item)`, which queues the item with a future;
+- a collector task takes the first queued item, then keeps gathering for at
+  most `max_wait_ms` or until `max_batch_size` items are queued;
+- the batch runs in a thread pool (so the event loop keeps accepting
+  requests), and each result is fanned back to its request's future.
+
+While one batch runs, the collector already gathers the next one, so at most
+`max_workers` batches are in flight. `max_batch_size=1` disables batching.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from recsys.logging.app_logger import logger
+
+
+def _fail(batch: list[tuple[Any, asyncio.Future]], error: BaseException) -> None:
+    """(Internal) Sets `error` on every unresolved future of `batch`."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+@dataclass
+class BatchStats:
+    """Counters of the batches run so far."""
+
+    batches: int = 0
+    items: int = 0
+    max_batch: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def mean_batch(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent `submit` calls into batches for a synchronous batch function.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[Any]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_workers: int = 4,
+    ):
+        """
+        Args:
+            handler (Callable): Runs a batch; returns one result per item, in order.
+            max_batch_size (int): Most items per batch.
+            max_wait_ms (float): Longest time the first item of a batch waits for company.
+            max_workers (int): Batches run concurrently in the thread pool.
+        """
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.max_workers = max_workers
+        self.stats = BatchStats()
+        self._queue: asyncio.Queue[tuple[Any, asyncio.Future]] | None = None
+        self._collector: asyncio.Task | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._running: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Starts the collector on the running event loop."""
+        if self._collector is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batcher")
+        self._collector = asyncio.create_task(self._collect(self._queue, asyncio.Semaphore(self.max_workers)))
+
+    async def stop(self) -> None:
+        """Finishes the batches in flight, fails queued items and stops the thread pool."""
+        collector, queue, executor = self._collector, self._queue, self._executor
+        if collector is None or queue is None or executor is None:
+            return
+        collector.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await collector
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        queued = []
+        while not queue.empty():
+            queued.append(queue.get_nowait())
+        _fail(queued, RuntimeError("The batcher was stopped."))
+        executor.shutdown(wait=True)
+        self._collector = self._executor = self._queue = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queues `item` and returns its result once its batch has run."""
+        if self._queue is None:
+            raise RuntimeError("The batcher is not running. Call `start` first.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue[tuple[Any, asyncio.Future]], slots: asyncio.Semaphore) -> None:
+        """(Internal) Forms batches and hands each to a dispatch task."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: list[tuple[Any, asyncio.Future]] = []
+            try:
+                batch.append(await queue.get())
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    if not queue.empty():
+                        batch.append(queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except TimeoutError:
+                        break
+                # Wait for a free worker, then keep collecting while this batch runs.
+                await slots.acquire()
+            except asyncio.CancelledError:
+                # Stopped mid-collection: these items are off the queue, so `stop` cannot fail them.
+                _fail(batch, RuntimeError("The batcher was stopped."))
+                raise
+            task = asyncio.create_task(self._dispatch(batch, slots))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    def _handle(self, items: list[Any]) -> Sequence[Any]:
+        """(Internal) Runs the handler on a worker thread and checks it returned one result per item."""
+        results = self.handler(items)
+        if len(results) != len(items):
+            raise RuntimeError(f"Batch handler returned {len(results)} results for {len(items)} items.")
+        return results
+
+    async def _dispatch(self, batch: list[tuple[Any, asyncio.Future]], slots: asyncio.Semaphore) -> None:
+        """(Internal) Runs one batch in the thread pool and resolves its futures."""
+        items = [item for item, _ in batch]
+        start = time.perf_counter()
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self._executor, self._handle, items)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(f"Batch of {len(items)} failed: {e}")
+            _fail(batch, e)
+            return
+        finally:
+            slots.release()
+            self.stats.batches += 1
+            self.stats.items += len(items)
+            self.stats.max_batch = max(self.stats.max_batch, len(items))
+            self.stats.busy_seconds += time.perf_counter() - start
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
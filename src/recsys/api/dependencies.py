@@ -1 +1,316 @@
-# Dependency injection
+# src/recsys/api/dependencies.py
+"""
+Model registry and FastAPI dependencies.
+
+HLD §3.4 loads the artifacts of `models/vN` into memory at startup, so shipping
+a new model meant restarting every worker. `ModelRegistry` instead watches
+`models_dir` from a background thread:
+
+1. When a newer version directory is marked ready (`MODEL_READY_MARKER`), it
+   is loaded and warmed (a few queries page in the memory-mapped arrays) while
+   the current version keeps serving.
+2. The registry's `current` reference is swapped under a lock, so every
+   request sees either the old or the new version, never a mix.
+3. Requests hold a lease on the version they started with (`acquire`). The
+   old version is closed, and its memory released, when its last lease ends.
+
+A version that fails to load is logged and skipped (until a newer version
+appears); the current version keeps serving.
+"""
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi import HTTPException, Request
+
+from recsys.logging.app_logger import logger
+from recsys.models.collaborative_filter import MODEL_FILENAME as CF_MODEL_FILENAME
+from recsys.models.collaborative_filter import CollaborativeFilter, UserVectorStore
+from recsys.models.hybrid import HybridRecommender
+from recsys.models.neighbor_table import METADATA_FILENAME as NEIGHBORS_FILENAME
+from recsys.models.neighbor_table import NeighborTable
+from recsys.models.rag_recommender import INDEX_FILENAME as RAG_INDEX_FILENAME
+from recsys.models.rag_recommender import RAGRecommender
+from recsys.utils.clustering import INDEX_FILENAME as CLUSTERS_FILENAME
+from recsys.utils.clustering import ClusterIndex
+from recsys.utils.distance_metrics import ENGINE_FILENAME, NeighborEngine
+from recsys.utils.paths import model_versions
+
+
+@dataclass
+class ModelBundle:
+    """The loaded artifacts of one model version, plus its lease count."""
+
+    version: str
+    path: Path
+    cf: CollaborativeFilter | None = None
+    rag: RAGRecommender | None = None
+    neighbors: NeighborTable | None = None
+    clusters: ClusterIndex | None = None
+    engine: NeighborEngine | None = None
+    recommender: HybridRecommender | None = None
+    # Users whose factors were folded in online since this version was loaded.
+    user_vectors: UserVectorStore | None = None
+    leases: int = 0
+    retired: bool = False
+    closed: bool = field(default=False, repr=False)
+
+    def warm(self, n_queries: int = 8) -> None:
+        """Runs a few representative queries so the first real requests do not pay page-in costs."""
+        if self.rag is not None and len(self.rag.game_ids):
+            sample = self.rag.game_ids[:n_queries].tolist()
+            self.rag.similar_games(sample, k=10)
+            if self.recommender is not None:
+                self.recommender.recommend(sample[:1], n=10)
+        if self.neighbors is not None:
+            for game_id in self.neighbors.ids[:n_queries].tolist():
+                self.neighbors.similar_games(game_id)
+
+    def close(self) -> None:
+        """Stops the recommender's threads and drops the artifact references."""
+        if self.recommender is not None:
+            self.recommender.close()
+        self.cf = self.rag = self.neighbors = self.clusters = self.engine = None
+        self.recommender = self.user_vectors = None
+        self.closed = True
+
+
+def load_bundle(path: Path, max_online_users: int = 100_000) -> ModelBundle:
+    """
+    Loads every artifact present in a model version directory.
+
+    Args:
+        path (Path): Model version directory, e.g. `models/v2`.
+        max_online_users (int): Users whose folded-in factors are kept (see `UserVectorStore`).
+    """
+    bundle = ModelBundle(version=path.name, path=path)
+    if (path / CF_MODEL_FILENAME).is_file():
+        bundle.cf = CollaborativeFilter.load(path)
+    if (path / RAG_INDEX_FILENAME).is_file():
+        bundle.rag = RAGRecommender.load(path)
+    if (path / NEIGHBORS_FILENAME).is_file():
+        bundle.neighbors = NeighborTable.load(path)
+    if (path / CLUSTERS_FILENAME).is_file():
+        bundle.clusters = ClusterIndex.load(path)
+    if (path / ENGINE_FILENAME).is_file():
+        bundle.engine = NeighborEngine.load(path)
+    if bundle.cf is not None:
+        bundle.user_vectors = UserVectorStore(bundle.cf, maxsize=max_online_users)
+    if bundle.cf is not None or bundle.rag is not None or bundle.engine is not None:
+        # The store answers like the filter, with fresh factors for users who rated since the load.
+        bundle.recommender = HybridRecommender(rag=bundle.rag, cf=bundle.user_vectors, engine=bundle.engine)
+    return bundle
+
+
+class ModelRegistry:
+    """
+    Serves the newest ready model version and hot-swaps in newer ones without downtime.
+    """
+
+    def __init__(
+        self,
+        models_dir: Path,
+        loader: Callable[[Path], ModelBundle] = load_bundle,
+        poll_interval: float = 10.0,
+        warm: bool = True,
+    ):
+        """
+        Args:
+            models_dir (Path): Directory holding the `vN` version directories.
+            loader (Callable[[Path], ModelBundle]): Loads one version directory.
+            poll_interval (float): Seconds between checks for a new version.
+            warm (bool): Warm a version before it starts serving.
+        """
+        self.models_dir = models_dir
+        self.loader = loader
+        self.poll_interval = poll_interval
+        self.warm = warm
+        self.current: ModelBundle | None = None
+        self._failed: set[str] = set()
+        self._swap_listeners: list[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+        # Held by fold-ins and by the final replay in `swap`, so no fold-in lands on a version being replaced.
+        self._fold_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    def apply_event(self, event: dict) -> bool:
+        """Folds a tracked `rate_game` event into the current version (an `InteractionTracker` listener)."""
+        with self._fold_lock:
+            current = self.current
+            if current is None or current.user_vectors is None:
+                return False
+            return current.user_vectors.apply_event(event)
+
+    @property
+    def version(self) -> str | None:
+        current = self.current
+        return current.version if current is not None else None
+
+    def on_swap(self, listener: Callable[[str], None]) -> None:
+        """Registers a callback run with the new version after each swap (e.g. `TieredCache.set_model_version`)."""
+        self._swap_listeners.append(listener)
+
+    # --- Leases ---
+
+    def lease(self) -> ModelBundle:
+        """
+        Leases the current version; every lease must be returned with `unlease`.
+
+        Raises:
+            RuntimeError: If no version has been loaded yet.
+        """
+        with self._lock:
+            bundle = self.current
+            if bundle is None:
+                raise RuntimeError(f"No ready model version under '{self.models_dir}'.")
+            bundle.leases += 1
+            return bundle
+
+    def unlease(self, bundle: ModelBundle) -> None:
+        """Returns a lease, releasing a retired version once its last lease ends."""
+        with self._lock:
+            bundle.leases -= 1
+            release = bundle.retired and bundle.leases == 0
+        if release:
+            self._release(bundle)
+
+    @contextmanager
+    def acquire(self) -> Iterator[ModelBundle]:
+        """Leases the current version for the duration of a `with` block."""
+        bundle = self.lease()
+        try:
+            yield bundle
+        finally:
+            self.unlease(bundle)
+
+    def _release(self, bundle: ModelBundle) -> None:
+        bundle.close()
+        logger.info(f"Released model {bundle.version}.")
+
+    # --- Loading and swapping ---
+
+    def swap(self, bundle: ModelBundle) -> ModelBundle | None:
+        """
+        Makes `bundle` the current version. The previous one is released once its leases end.
+
+        Users folded in online under the previous version are refolded against the new one first,
+        from a snapshot and without blocking fold-ins, which keep landing on the previous version.
+        Only the users those fold-ins changed are then refolded under the fold lock, just before
+        the switch; fold-ins arriving during that short step wait and go to the new version.
+
+        Returns:
+            ModelBundle | None: The previous version.
+        """
+        replayed = self._replay(self.current, bundle)
+        with self._fold_lock:
+            previous = self.current
+            self._replay(previous, bundle, skip=replayed)
+            with self._lock:
+                self.current = bundle
+                release = False
+                if previous is not None:
+                    previous.retired = True
+                    release = previous.leases == 0
+        if release and previous is not None:
+            self._release(previous)
+        logger.info(f"Serving model {bundle.version} (previously {previous.version if previous else 'none'}).")
+        for listener in self._swap_listeners:
+            try:
+                listener(bundle.version)
+            except Exception as e:
+                # A listener must not undo the swap.
+                logger.warning(f"Model swap listener failed: {e}")
+        return previous
+
+    @staticmethod
+    def _replay(previous: ModelBundle | None, bundle: ModelBundle, skip: dict | None = None) -> dict:
+        """(Internal) Refolds the online users of `previous` into `bundle`; see `UserVectorStore.replay`."""
+        if previous is None or previous.user_vectors is None or bundle.user_vectors is None:
+            return {}
+        return bundle.user_vectors.replay(previous.user_vectors, skip=skip)
+
+    def poll(self) -> bool:
+        """
+        Loads, warms and swaps in the newest ready version if it is newer than the current one.
+
+        Returns:
+            bool: Whether a new version started serving.
+        """
+        candidates = [v for v in model_versions(self.models_dir) if v not in self._failed]
+        if not candidates:
+            return False
+        latest = candidates[-1]
+        current = self.version
+        if current is not None and int(latest[1:]) <= int(current[1:]):
+            return False
+
+        logger.info(f"Loading model {latest} in the background.")
+        try:
+            bundle = self.loader(self.models_dir / latest)
+            if self.warm:
+                bundle.warm()
+        except Exception as e:
+            # Keep serving the current version.
+            self._failed.add(latest)
+            logger.error(f"Could not load model {latest}; still serving {current}: {e}")
+            return False
+        self.swap(bundle)
+        return True
+
+    # --- Watching ---
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Model registry poll failed: {e}")
+
+    def start(self) -> "ModelRegistry":
+        """Loads the newest ready version synchronously, then watches for newer ones in the background."""
+        self.poll()
+        if self._watcher is None:
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+            self._watcher.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops watching and releases the current version."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+        with self._lock:
+            current, self.current = self.current, None
+            release = current is not None and current.leases == 0
+            if current is not None:
+                current.retired = True
+        if release and current is not None:
+            self._release(current)
+
+
+# --- FastAPI dependencies ---
+
+
+def get_registry(request: Request) -> ModelRegistry:
+    """The registry created at application startup (`app.state.registry`)."""
+    registry: ModelRegistry = request.app.state.registry
+    return registry
+
+
+def get_models(request: Request) -> Iterator[ModelBundle]:
+    """Leases the current model version for one request."""
+    registry = get_registry(request)
+    try:
+        bundle = registry.lease()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    try:
+        yield bundle
+    finally:
+        registry.unlease(bundle)
@@ -1 +1,101 @@
-# FastAPI app
+# src/recsys/api/main.py
+"""
+FastAPI application.
+
+Serve with:
+    uvicorn recsys.api.main:app --workers 4
+
+At startup the app loads the newest ready model version (`ModelRegistry`),
+opens the game catalogue if it has been built, creates the recommendation
+cache and starts the `/recommend` micro-batcher, all configured by the `api`
+and `cache` sections of the project settings (`get_settings`). The served
+`app` folds ratings tracked by the application tracker (`get_tracker`) into
+the model as they arrive.
+"""
+
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from recsys.api.batching import MicroBatcher
+from recsys.api.dependencies import ModelRegistry, load_bundle
+from recsys.api.routes import games, health, recommendations
+from recsys.config_management.settings import get_settings
+from recsys.data.catalogue_store import CatalogueStore
+from recsys.logging.app_logger import logger
+from recsys.tracking.interaction_tracker import InteractionTracker, get_tracker
+from recsys.utils.cache import TieredCache
+from recsys.utils.paths import get_project_root
+
+
+def create_app(
+    config: dict | None = None,
+    registry: ModelRegistry | None = None,
+    project_root: Path | None = None,
+    tracker: InteractionTracker | Callable[[], InteractionTracker] | None = None,
+) -> FastAPI:
+    """
+    Builds the application; components are created when it starts.
+
+    Args:
+        config (dict | None): Project configuration. Defaults to the process-wide `get_settings()`.
+        registry (ModelRegistry | None): Model registry. Defaults to one watching `paths.models_dir`.
+        project_root (Path | None): Base of the relative paths in `config`. Defaults to the project root.
+        tracker (InteractionTracker | Callable | None): If given, its `rate_game` events are folded into
+            the serving collaborative filter as they are tracked. A function (e.g. `get_tracker`) is
+            called when the app starts, so the tracker is created in the serving process.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        root = project_root or get_project_root()
+        settings = config if config is not None else get_settings().as_dict()
+        api_settings = settings.get("api", {})
+
+        app.state.registry = registry or ModelRegistry(
+            root / settings["paths"]["models_dir"],
+            loader=partial(load_bundle, max_online_users=api_settings.get("max_online_users", 100_000)),
+            poll_interval=api_settings.get("model_poll_seconds", 10),
+        )
+        await run_in_threadpool(app.state.registry.start)
+        app_tracker = tracker() if callable(tracker) else tracker
+        if app_tracker is not None:
+            app_tracker.subscribe(app.state.registry.apply_event)
+
+        app.state.cache = None
+        if settings.get("cache", {}).get("enabled", True):
+            app.state.cache = TieredCache.from_config(settings, app.state.registry.version or "none")
+            app.state.registry.on_swap(app.state.cache.set_model_version)
+
+        catalogue_path = root / settings["paths"]["bgg_api"]["sqlite_db_file"]
+        app.state.catalogue = CatalogueStore(catalogue_path) if catalogue_path.is_file() else None
+
+        batching = api_settings.get("batching", {})
+        app.state.batcher = MicroBatcher(
+            recommendations.batch_recommend,
+            max_batch_size=batching.get("max_batch_size", 32) if batching.get("enabled", True) else 1,
+            max_wait_ms=batching.get("max_wait_ms", 5),
+            max_workers=batching.get("max_workers", 4),
+        )
+        await app.state.batcher.start()
+        logger.info(f"API ready, serving model {app.state.registry.version}.")
+        try:
+            yield
+        finally:
+            await app.state.batcher.stop()
+            if app.state.catalogue is not None:
+                app.state.catalogue.close()
+            await run_in_threadpool(app.state.registry.stop)
+
+    app = FastAPI(title="Board Game Recommender", version="0.1.0", lifespan=lifespan)
+    app.include_router(health.router)
+    app.include_router(recommendations.router)
+    app.include_router(games.router)
+    return app
+
+
+app = create_app(tracker=get_tracker)
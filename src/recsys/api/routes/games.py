@@ -0,0 +1,60 @@
+# src/recsys/api/routes/games.py
+"""
+Catalogue endpoints backed by the SQLite `CatalogueStore`, and the
+"because you chose X" list served from the model's precomputed `NeighborTable`.
+
+The store is synchronous, so these handlers are plain functions, which FastAPI
+runs in its thread pool.
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from recsys.api.dependencies import ModelBundle, get_models
+from recsys.api.schemas.game import Game, GameSuggestion
+from recsys.api.schemas.recommendation import RecommendedGame, SimilarGamesResponse
+from recsys.data.catalogue_store import CatalogueStore
+
+router = APIRouter(prefix="/games", tags=["games"])
+
+
+def _catalogue(request: Request) -> CatalogueStore:
+    catalogue: CatalogueStore | None = request.app.state.catalogue
+    if catalogue is None:
+        raise HTTPException(status_code=503, detail="The game catalogue is not available.")
+    return catalogue
+
+
+@router.get("/search", response_model=list[GameSuggestion])
+def search_games(
+    request: Request, q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50)
+) -> list[GameSuggestion]:
+    """Autocompletes game names; tolerates typos."""
+    return [GameSuggestion(bggid=bggid, name=name) for bggid, name in _catalogue(request).autocomplete(q, limit)]
+
+
+@router.get("/{bggid}", response_model=Game)
+def get_game(bggid: int, request: Request) -> dict:
+    """Returns one game's metadata."""
+    game = _catalogue(request).get(bggid)
+    if game is None:
+        raise HTTPException(status_code=404, detail=f"Game {bggid} not found.")
+    return game
+
+
+@router.get("/{bggid}/similar", response_model=SimilarGamesResponse)
+def similar_games(
+    bggid: int, models: Annotated[ModelBundle, Depends(get_models)], n: int = Query(10, ge=1, le=100)
+) -> SimilarGamesResponse:
+    """Returns the games closest to one game, read from the neighbor table built at training time."""
+    if models.neighbors is None:
+        raise HTTPException(status_code=503, detail=f"Model {models.version} has no neighbor table.")
+    similar = models.neighbors.similar_games(bggid, n)
+    if not similar:
+        raise HTTPException(status_code=404, detail=f"Game {bggid} is not in model {models.version}.")
+    return SimilarGamesResponse(
+        model_version=models.version,
+        game_id=bggid,
+        similar=[RecommendedGame(game_id=g, score=s) for g, s in similar],
+    )
@@ -0,0 +1,23 @@
+# src/recsys/api/routes/health.py
+"""
+Liveness and serving statistics.
+"""
+
+from dataclasses import asdict
+
+from fastapi import APIRouter, Request
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/health")
+async def health(request: Request) -> dict:
+    """Reports the serving model version with batching and cache counters."""
+    state = request.app.state
+    batcher, cache = state.batcher, state.cache
+    return {
+        "status": "ok" if state.registry.version is not None else "loading",
+        "model_version": state.registry.version,
+        "batching": {**asdict(batcher.stats), "mean_batch": batcher.stats.mean_batch} if batcher else None,
+        "cache": cache.stats.as_dict() if cache is not None else None,
+    }
@@ -0,0 +1,76 @@
+# src/recsys/api/routes/recommendations.py
+"""
+`/recommend`: hybrid recommendations, micro-batched across concurrent requests.
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from recsys.api.dependencies import ModelBundle, get_models
+from recsys.api.schemas.recommendation import RecommendationRequest, RecommendationResponse, RecommendedGame
+from recsys.models.hybrid import HybridRecommendations
+
+router = APIRouter(tags=["recommendations"])
+
+
+def batch_recommend(items: list[tuple[ModelBundle, RecommendationRequest]]) -> list[HybridRecommendations]:
+    """
+    Runs one micro-batch: a single `recommend_many` call per model version present in the batch.
+
+    A batch can straddle a model swap, so requests are grouped by the version they leased.
+    """
+    groups: dict[int, list[int]] = {}
+    for position, (bundle, _) in enumerate(items):
+        groups.setdefault(id(bundle), []).append(position)
+
+    results: dict[int, HybridRecommendations] = {}
+    for positions in groups.values():
+        bundle = items[positions[0]][0]
+        if bundle.recommender is None:
+            raise RuntimeError(f"Model {bundle.version} has no recommender artifacts.")
+        batch = bundle.recommender.recommend_many([
+            (items[p][1].game_ids, items[p][1].user_id, items[p][1].n) for p in positions
+        ])
+        results.update(zip(positions, batch, strict=True))
+    return [results[p] for p in range(len(items))]
+
+
+@router.post("/recommend", response_model=RecommendationResponse)
+async def recommend(
+    body: RecommendationRequest, request: Request, models: Annotated[ModelBundle, Depends(get_models)]
+) -> RecommendationResponse:
+    """Recommends games similar to the liked ones, personalized when `user_id` is known."""
+    if models.recommender is None:
+        raise HTTPException(status_code=503, detail=f"Model {models.version} has no recommender artifacts.")
+
+    cache = request.app.state.cache
+    key = None
+    if cache is not None:
+        # Ratings folded in online change a user's results before the model version does.
+        vectors = models.user_vectors
+        revision = vectors.revision(body.user_id) if vectors is not None and body.user_id is not None else 0
+        # Keyed by the leased version: during a swap the cache may already be on the next one.
+        key = cache.key(
+            "recommend",
+            body.game_ids,
+            model_version=models.version,
+            user_id=body.user_id,
+            n=body.n,
+            user_revision=revision,
+        )
+        cached: RecommendationResponse | None = await run_in_threadpool(cache.get, key)
+        if cached is not None:
+            return cached.model_copy(update={"cached": True})
+
+    result = await request.app.state.batcher.submit((models, body))
+    response = RecommendationResponse(
+        model_version=models.version,
+        recommendations=[RecommendedGame(game_id=g, score=s) for g, s in result.as_pairs()],
+        degraded=result.degraded,
+        timings_ms=result.timings_ms,
+    )
+    if cache is not None and not result.degraded:
+        await run_in_threadpool(cache.set, key, response)
+    return response
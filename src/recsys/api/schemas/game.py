@@ -0,0 +1,28 @@
+# src/recsys/api/schemas/game.py
+"""
+Response models of the game catalogue endpoints.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class Game(BaseModel):
+    """One catalogue game (see `CatalogueStore`)."""
+
+    bggid: int
+    name: str
+    year_published: int | None = None
+    description: str | None = None
+    avg_rating: float | None = None
+    bayes_avg_rating: float | None = None
+    num_user_ratings: int | None = None
+    game_weight: float | None = None
+    image_path: str | None = None
+    attributes: dict = Field(default_factory=dict)
+
+
+class GameSuggestion(BaseModel):
+    """An autocomplete match."""
+
+    bggid: int
+    name: str
@@ -0,0 +1,37 @@
+# src/recsys/api/schemas/recommendation.py
+"""
+Request and response models of the recommendation endpoints.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class RecommendationRequest(BaseModel):
+    """Games the user liked, and optionally who the user is."""
+
+    game_ids: list[int] = Field(..., min_length=1, max_length=50, description="BGGIds of the liked games.")
+    user_id: str | None = Field(None, description="BGG user known to the collaborative filter.")
+    n: int = Field(10, ge=1, le=100, description="Number of recommendations.")
+
+
+class RecommendedGame(BaseModel):
+    game_id: int
+    score: float
+
+
+class RecommendationResponse(BaseModel):
+    """Ranked recommendations and how they were produced."""
+
+    model_version: str
+    recommendations: list[RecommendedGame]
+    degraded: list[str] = Field(default_factory=list, description="Pipeline stages skipped for this request.")
+    timings_ms: dict[str, float] = Field(default_factory=dict)
+    cached: bool = False
+
+
+class SimilarGamesResponse(BaseModel):
+    """Precomputed neighbors of one game, closest first."""
+
+    model_version: str
+    game_id: int
+    similar: list[RecommendedGame] = Field(..., description="Neighbors with their distance (lower is closer).")
@@ -1,12 +1,15 @@
 # src/recsys/config_management/load_config.py
 """
 This module provides a function to load configuration settings from a YAML file.
-It handles errors gracefully and ensures the application can access necessary configurations.
 
+Prefer `recsys.config_management.settings.get_settings()`, which merges the
+project's configuration files and environment variables and parses them once
+per process.
 """
 
-# This module provides a function to load configuration settings from a YAML file.
-import yaml
+from pathlib import Path
+
+from recsys.config_management.settings import read_yaml
 
 
 def load_config(config_path: str = "config.yml") -> dict:
@@ -21,17 +24,8 @@ def load_config(config_path: str = "config.yml") -> dict:
         dict: A dictionary containing the configuration settings.
 
     Raises:
-        SystemExit: If the file is not found or cannot be parsed.
+        FileNotFoundError: If the file is not found.
+        ValueError: If the file cannot be parsed.
+        TypeError: If the file does not hold a mapping.
     """
-    try:
-        with open(config_path, encoding="utf-8") as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
-        print(f"FATAL: Configuration file not found at '{config_path}'.")
-        exit(1)  # Exits the script if config is missing.
-    except yaml.YAMLError as e:
-        print(f"FATAL: Error parsing YAML configuration file '{config_path}': {e}")
-        exit(1)
-    except Exception as e:
-        print(f"FATAL: An unexpected error occurred while loading config '{config_path}': {e}")
-        exit(1)
+    return read_yaml(Path(config_path))
@@ -0,0 +1,295 @@
+# src/recsys/data/catalogue_store.py
+"""
+SQLite-backed catalogue of game metadata (`bgg_api.sqlite_db_file`).
+
+Replaces DataFrame scans such as `df[df.Name == name]` with index seeks:
+
+- `games` is keyed by `bggid` (the rowid, so id lookups are a B-tree seek)
+  and has a `NOCASE` index on `name` for exact name lookups.
+- `games_fts` (unicode61 tokens, prefix index) answers autocomplete prefix
+  queries; `games_trigram` (trigram tokens) backs typo-tolerant search by
+  matching overlapping 3-character chunks of the query. Both are external
+  content tables kept in sync with `games` by triggers.
+- The database runs in WAL mode, so API workers read from a pool of
+  read-only connections while the loader writes.
+
+Bulk loads upsert every row of the interim CSVs in one transaction; the
+columns the API uses are typed, the remaining CSV columns are kept as JSON.
+"""
+
+import json
+import queue
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from recsys.config_management.settings import get_settings
+from recsys.logging.app_logger import logger
+from recsys.utils.paths import get_project_root
+
+# Kaggle `games.csv` column -> catalogue column.
+GAME_COLUMNS = {
+    "BGGId": "bggid",
+    "Name": "name",
+    "YearPublished": "year_published",
+    "Description": "description",
+    "AvgRating": "avg_rating",
+    "BayesAvgRating": "bayes_avg_rating",
+    "NumUserRatings": "num_user_ratings",
+    "GameWeight": "game_weight",
+    "ImagePath": "image_path",
+}
+CATALOGUE_COLUMNS = (*GAME_COLUMNS.values(), "attributes")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    bggid INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    year_published INTEGER,
+    description TEXT,
+    avg_rating REAL,
+    bayes_avg_rating REAL,
+    num_user_ratings INTEGER,
+    game_weight REAL,
+    image_path TEXT,
+    attributes TEXT
+);
+CREATE INDEX IF NOT EXISTS games_name ON games (name COLLATE NOCASE);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS games_fts USING fts5(
+    name, content='games', content_rowid='bggid', tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS games_trigram USING fts5(
+    name, content='games', content_rowid='bggid', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS games_ai AFTER INSERT ON games BEGIN
+    INSERT INTO games_fts (rowid, name) VALUES (new.bggid, new.name);
+    INSERT INTO games_trigram (rowid, name) VALUES (new.bggid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS games_ad AFTER DELETE ON games BEGIN
+    INSERT INTO games_fts (games_fts, rowid, name) VALUES ('delete', old.bggid, old.name);
+    INSERT INTO games_trigram (games_trigram, rowid, name) VALUES ('delete', old.bggid, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS games_au AFTER UPDATE OF name ON games BEGIN
+    INSERT INTO games_fts (games_fts, rowid, name) VALUES ('delete', old.bggid, old.name);
+    INSERT INTO games_trigram (games_trigram, rowid, name) VALUES ('delete', old.bggid, old.name);
+    INSERT INTO games_fts (rowid, name) VALUES (new.bggid, new.name);
+    INSERT INTO games_trigram (rowid, name) VALUES (new.bggid, new.name);
+END;
+"""
+
+_COLUMN_LIST = ", ".join(CATALOGUE_COLUMNS)
+_PLACEHOLDERS = ", ".join("?" * len(CATALOGUE_COLUMNS))
+_UPDATES = ", ".join(f"{c} = excluded.{c}" for c in CATALOGUE_COLUMNS if c != "bggid")
+# Only the fixed column names above are interpolated; values are bound as parameters.
+_UPSERT = f"INSERT INTO games ({_COLUMN_LIST}) VALUES ({_PLACEHOLDERS}) ON CONFLICT (bggid) DO UPDATE SET {_UPDATES}"  # noqa: S608
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _row_dicts(rows: list[sqlite3.Row]) -> list[dict]:
+    games = []
+    for row in rows:
+        game = dict(row)
+        game["attributes"] = json.loads(game["attributes"]) if game.get("attributes") else {}
+        games.append(game)
+    return games
+
+
+class CatalogueStore:
+    """
+    Game metadata store with a single writer and a pool of read-only connections.
+    """
+
+    def __init__(self, db_path: Path, pool_size: int = 4):
+        """
+        Args:
+            db_path (Path): SQLite database file; created with the schema if missing.
+            pool_size (int): Read-only connections available to concurrent readers.
+        """
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self._pool: queue.Queue[sqlite3.Connection] | None = None
+        self._readers: list[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._writer() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    # --- Connections ---
+
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA mmap_size=268435456")
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a read-only connection from the pool (opened on first use)."""
+        pool = self._pool
+        if pool is None:
+            with self._pool_lock:
+                # Concurrent first readers must not each open (and then orphan) a pool.
+                if self._pool is None:
+                    self._readers = [self._open_reader() for _ in range(self.pool_size)]
+                    self._pool = queue.Queue()
+                    for reader in self._readers:
+                        self._pool.put(reader)
+                pool = self._pool
+        conn = pool.get()
+        try:
+            yield conn
+        finally:
+            pool.put(conn)
+
+    def close(self) -> None:
+        """Closes the pooled read connections."""
+        with self._pool_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers, self._pool = [], None
+
+    # --- Writing ---
+
+    @staticmethod
+    def _records(df: pd.DataFrame) -> Iterator[tuple]:
+        """(Internal) Maps a games frame onto catalogue rows, keeping unmapped columns as JSON."""
+        known = [c for c in GAME_COLUMNS if c in df.columns]
+        extra = [c for c in df.columns if c not in GAME_COLUMNS]
+        df = df.astype(object).where(df.notna(), None)
+        for record in df.to_dict("records"):
+            values = {GAME_COLUMNS[c]: record[c] for c in known}
+            attributes = json.dumps({c: record[c] for c in extra if record[c] is not None}, default=str)
+            yield (*(values.get(c) for c in CATALOGUE_COLUMNS[:-1]), attributes)
+
+    def upsert_games(self, frames: pd.DataFrame | Iterable[pd.DataFrame]) -> int:
+        """
+        Inserts or updates games from one frame or an iterable of chunks, in a single transaction.
+
+        Args:
+            frames: Games in the Kaggle `games.csv` layout (at least `BGGId` and `Name`).
+
+        Returns:
+            int: Number of rows written.
+        """
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        written = 0
+        with self._writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for df in frames:
+                    conn.executemany(_UPSERT, self._records(df))
+                    written += len(df)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("PRAGMA optimize")
+        logger.info(f"Upserted {written} games into '{self.db_path}'.")
+        return written
+
+    def upsert_from_csv(self, csv_path: Path, chunksize: int = 50_000) -> int:
+        """Streams an interim `games.csv` into the store in one transaction."""
+        return self.upsert_games(pd.read_csv(csv_path, chunksize=chunksize))
+
+    # --- Reading ---
+
+    def get(self, bggid: int) -> dict | None:
+        """Returns one game by id."""
+        games = self.get_many([bggid])
+        return games[0] if games else None
+
+    def get_many(self, bggids: Iterable[int]) -> list[dict]:
+        """Returns games by id, in the order requested; unknown ids are skipped."""
+        ids = [int(i) for i in bggids]
+        if not ids:
+            return []
+        with self.reader() as conn:
+            placeholders = ", ".join("?" * len(ids))
+            rows = conn.execute(f"SELECT * FROM games WHERE bggid IN ({placeholders})", ids).fetchall()  # noqa: S608
+        by_id = {game["bggid"]: game for game in _row_dicts(rows)}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def find_by_name(self, name: str) -> list[dict]:
+        """Returns the games whose name equals `name`, ignoring case (an index seek on `games_name`)."""
+        with self.reader() as conn:
+            rows = conn.execute("SELECT * FROM games WHERE name = ? COLLATE NOCASE", (name,)).fetchall()
+        return _row_dicts(rows)
+
+    def autocomplete(self, text: str, limit: int = 10) -> list[tuple[int, str]]:
+        """
+        Suggests game names for a partially typed query.
+
+        Every typed word is matched as a prefix (`catan` -> "Catan: Seafarers"). If that yields
+        fewer than `limit` names, trigram matches fill the rest, which tolerates typos
+        ("glomhaven" -> "Gloomhaven").
+
+        Returns:
+            list[tuple[int, str]]: `(bggid, name)` pairs, best match first.
+        """
+        tokens = _TOKEN.findall(text.lower())
+        if not tokens:
+            return []
+        results: dict[int, str] = {}
+        with self.reader() as conn:
+            prefix_query = " ".join(f'"{t}"*' for t in tokens)
+            rows = conn.execute(
+                "SELECT g.bggid, g.name FROM games_fts JOIN games g ON g.bggid = games_fts.rowid "
+                "WHERE games_fts MATCH ? ORDER BY bm25(games_fts), g.num_user_ratings DESC LIMIT ?",
+                (prefix_query, limit),
+            ).fetchall()
+            results.update((row[0], row[1]) for row in rows)
+
+            joined = " ".join(tokens)
+            trigrams = sorted({joined[i : i + 3] for i in range(len(joined) - 2)} - {""})
+            trigrams = [t for t in trigrams if " " not in t]
+            if len(results) < limit and trigrams:
+                fuzzy_query = " OR ".join(f'"{t}"' for t in trigrams)
+                rows = conn.execute(
+                    "SELECT g.bggid, g.name FROM games_trigram JOIN games g ON g.bggid = games_trigram.rowid "
+                    "WHERE games_trigram MATCH ? ORDER BY bm25(games_trigram), g.num_user_ratings DESC LIMIT ?",
+                    (fuzzy_query, limit * 2),
+                ).fetchall()
+                for bggid, name in rows:
+                    if len(results) >= limit:
+                        break
+                    results.setdefault(bggid, name)
+        return list(results.items())
+
+
+def main() -> None:
+    """
+    Loads the interim `games.csv` into the SQLite catalogue (`bgg_api.sqlite_db_file`).
+    """
+    try:
+        project_root = get_project_root()
+        config = get_settings().as_dict()
+
+        store = CatalogueStore(project_root / config["paths"]["bgg_api"]["sqlite_db_file"])
+        rows = store.upsert_from_csv(project_root / config["paths"]["extract_data_dir"] / "games.csv")
+        print(f"Loaded {rows} games into '{store.db_path}'.")
+
+    except (FileNotFoundError, OSError, ValueError, TypeError, sqlite3.Error) as e:
+        print(f"\nAn error occurred while building the catalogue: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,24 +3,93 @@
 Data extraction utilities for the recsys project.
 Provides functions to extract data from zip files and load specific extracted files.
 """
+
+import json
+import multiprocessing
+import os
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import yaml
+import pandas as pd
+
+from recsys.config_management.settings import get_settings
+from recsys.data.loader import load_extracted_data, read_csv_stream
+from recsys.utils.files import atomic_write
+from recsys.utils.paths import get_project_root
+
+MANIFEST_FILENAME = ".extract_manifest.json"
+
+
+def _read_manifest(manifest_path: Path) -> dict:
+    """(Internal) Returns the stored {member: {"crc", "size"}} manifest, or {} if missing/corrupt."""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            members: dict = json.load(f).get("members", {})
+            return members
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return {}
+
+
+def _write_manifest(manifest_path: Path, archive_name: str, members: dict) -> None:
+    """(Internal) Atomically writes the extraction manifest."""
+    with atomic_write(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"archive": archive_name, "members": members}, f, indent=2, sort_keys=True)
+
+
+def _is_up_to_date(info: zipfile.ZipInfo, stored: dict | None, extract_data_dir: Path) -> bool:
+    """(Internal) True if the member's CRC/size match the manifest and the extracted file is intact."""
+    if stored is None or stored.get("crc") != info.CRC or stored.get("size") != info.file_size:
+        return False
+    extracted = extract_data_dir / info.filename
+    return extracted.is_file() and extracted.stat().st_size == info.file_size
+
+
+def _extract_members(zipfile_path: str, members: list[str], extract_data_dir: str) -> list[str]:
+    """(Internal) Worker: extracts `members` from the archive. Each process opens its own handle."""
+    with zipfile.ZipFile(zipfile_path, "r") as zip_ref:
+        for member in members:
+            zip_ref.extract(member, extract_data_dir)
+    return members
+
 
-from recsys.data.loader import load_extracted_data
-from recsys.utils.paths import check_config_file_exists, get_project_root
+def _partition(infos: list[zipfile.ZipInfo], n_parts: int) -> list[list[str]]:
+    """(Internal) Splits members into `n_parts` groups with balanced compressed sizes."""
+    parts: list[list[str]] = [[] for _ in range(n_parts)]
+    loads = [0] * n_parts
+    for info in sorted(infos, key=lambda i: i.compress_size, reverse=True):
+        lightest = loads.index(min(loads))
+        parts[lightest].append(info.filename)
+        loads[lightest] += info.compress_size
+    return [part for part in parts if part]
 
 
-def extract_data(project_root: Path, config: dict) -> tuple[Path, list[str]]:
+def extract_data(
+    project_root: Path, config: dict, incremental: bool = True, max_workers: int | None = None
+) -> tuple[Path, list[str]]:
     """
-    Extracts all files from a zip archive specified in the config file.
+    Extracts files from the zip archive specified in the config file.
+
+    In incremental mode, the CRC and size of every member are compared against
+    the manifest written by the previous run, and only new or changed members
+    (or members whose extracted file went missing) are decompressed. Members
+    are decompressed in parallel across a process pool.
+
+    Args:
+        project_root (Path): The project root directory.
+        config (dict): The loaded project configuration.
+        incremental (bool): Skip members that are unchanged since the last extraction.
+        max_workers (int | None): Size of the process pool. Defaults to the CPU count; 1 disables it.
+
+    Returns:
+        tuple[Path, list[str]]: The extraction directory and the names of all members in the archive.
     """
     # Use Path objects for cleaner, cross-platform path handling
     raw_data_dir = project_root / config["paths"]["raw_data_dir"]
     raw_data_file = config["paths"]["raw_data_file"]
     extract_data_dir = project_root / config["paths"]["extract_data_dir"]
     zipfile_path = raw_data_dir / raw_data_file
+    manifest_path = extract_data_dir / MANIFEST_FILENAME
 
     print(f"Attempting to extract '{zipfile_path}' to '{extract_data_dir}'...")
 
@@ -29,16 +98,60 @@ def extract_data(project_root: Path, config: dict) -> tuple[Path, list[str]]:
 
     extract_data_dir.mkdir(parents=True, exist_ok=True)
 
-    files = []
-    with zipfile.ZipFile(zipfile_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_data_dir)
+    with zipfile.ZipFile(zipfile_path, "r") as zip_ref:
+        infos = [info for info in zip_ref.infolist() if not info.is_dir()]
         files = zip_ref.namelist()
-        print(f"Successfully extracted all {len(files)} files to: {extract_data_dir}")
+
+    stored = _read_manifest(manifest_path) if incremental else {}
+    pending = [info for info in infos if not _is_up_to_date(info, stored.get(info.filename), extract_data_dir)]
+
+    n_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    if n_workers > 1:
+        groups = _partition(pending, n_workers)
+        # Spawned workers avoid forking a parent that may already run BLAS/Arrow threads.
+        with ProcessPoolExecutor(max_workers=len(groups), mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [
+                pool.submit(_extract_members, str(zipfile_path), group, str(extract_data_dir)) for group in groups
+            ]
+            for future in futures:
+                future.result()
+    elif pending:
+        _extract_members(str(zipfile_path), [info.filename for info in pending], str(extract_data_dir))
+
+    _write_manifest(
+        manifest_path,
+        raw_data_file,
+        {info.filename: {"crc": info.CRC, "size": info.file_size} for info in infos},
+    )
+    print(
+        f"Extracted {len(pending)} new or changed files ({len(infos) - len(pending)} unchanged) to: {extract_data_dir}"
+    )
 
     return extract_data_dir, files
 
 
-def main():
+def load_member(project_root: Path, config: dict, member: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Loads a CSV member straight from the zip archive without writing it to disk.
+
+    Args:
+        project_root (Path): The project root directory.
+        config (dict): The loaded project configuration.
+        member (str): Name of the CSV inside the archive.
+        columns (list[str] | None): Only load these columns.
+    """
+    zipfile_path = project_root / config["paths"]["raw_data_dir"] / config["paths"]["raw_data_file"]
+    if not zipfile_path.is_file():
+        raise FileNotFoundError(f"Zip file not found at: {zipfile_path}")
+
+    with zipfile.ZipFile(zipfile_path, "r") as zip_ref:
+        if member not in zip_ref.namelist():
+            raise FileNotFoundError(f"'{member}' is not a member of '{zipfile_path}'.")
+        with zip_ref.open(member) as stream:
+            return read_csv_stream(stream, columns=columns)
+
+
+def main() -> None:
     """
     Main orchestration function to run the data extraction and loading process.
     """
@@ -46,10 +159,7 @@ def main():
         project_root = get_project_root()
         print(f"Project root determined as: {project_root}")
 
-        config_path = project_root / "config" / "local.yml"
-        check_config_file_exists(config_path)
-        with open(config_path, encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+        config = get_settings().as_dict()
 
         # --- Step 1: Extract the data ---
         _, extracted_files = extract_data(project_root, config)
@@ -60,8 +170,9 @@ def main():
         print("\nSuccessfully loaded games.csv for verification:")
         print(df_games.head())
 
-    except (FileNotFoundError, OSError, ValueError) as e:
+    except (FileNotFoundError, OSError, ValueError, TypeError) as e:
         print(f"\nAn error occurred during the process: {e}")
 
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,199 @@
+# src/recsys/data/feature_engineering.py
+"""
+Bitmap inverted index over game categories, mechanics and themes.
+
+The POC filters games with `transform_categories` -> `index_of_data` ->
+`get_new_dataset`: a Python double loop over every row checking
+`categories[i][j] == 1`, followed by a `df.loc` copy. Here every feature
+(a category, mechanic or theme) instead owns a packed bitmap with one bit
+per catalogue row, stored as uint64 words:
+
+    bitmaps[f, w] bit b  <=>  row 64 * w + b has feature f
+
+An OR filter is `np.bitwise_or.reduce` over the selected features' rows, an
+AND filter is `np.bitwise_and.reduce`, and NOT is `~`; each touches
+`n_rows / 64` words per feature. Results stay packed until the end, so filters
+over different families (e.g. any of these categories AND all of these
+mechanics) are combined with one more bitwise op before `rows` unpacks them
+into row ids. The row ids index the original DataFrame (`df.iloc[rows]` or
+`df.take(rows)`), which is never copied by the filter itself.
+
+Packed bitmaps cost `n_rows / 8` bytes per feature whatever their density, so
+the ~380 long-tail mechanics and themes of the Kaggle dump take about 1 MB for
+20k games; compressed bitmaps would save little at this size.
+"""
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Kaggle `games.csv` one-hot category columns.
+CATEGORY_PREFIX = "Cat:"
+
+
+class FeatureIndex:
+    """
+    Packed-bitmap inverted index of one family of binary features over a fixed row order.
+    """
+
+    def __init__(self, features: Sequence[str], bitmaps: np.ndarray, n_rows: int):
+        """
+        Args:
+            features (Sequence[str]): Feature names, one per bitmap row.
+            bitmaps (np.ndarray): uint64 words, shape (n_features, ceil(n_rows / 64)).
+            n_rows (int): Number of catalogue rows the bits refer to.
+        """
+        self.features = list(features)
+        self.bitmaps = bitmaps
+        self.n_rows = n_rows
+        self._feature_of = {name.lower(): i for i, name in enumerate(self.features)}
+        self._all = self._full_mask(n_rows)
+
+    @staticmethod
+    def _full_mask(n_rows: int) -> np.ndarray:
+        """(Internal) A mask with the first `n_rows` bits set."""
+        bits = np.zeros(-(-n_rows // 64) * 64, dtype=bool)
+        bits[:n_rows] = True
+        return np.packbits(bits, bitorder="little").view("<u8")
+
+    @classmethod
+    def from_matrix(cls, features: Sequence[str], matrix: np.ndarray) -> "FeatureIndex":
+        """
+        Packs a one-hot matrix into per-feature bitmaps.
+
+        Args:
+            features (Sequence[str]): Feature name of each matrix column.
+            matrix (np.ndarray): Membership, shape (n_rows, n_features); non-zero means member.
+        """
+        matrix = np.asarray(matrix) != 0
+        n_rows, n_features = matrix.shape
+        padded = np.zeros((n_features, -(-n_rows // 64) * 64), dtype=bool)
+        padded[:, :n_rows] = matrix.T
+        bitmaps = np.packbits(padded, axis=1, bitorder="little").view("<u8")
+        return cls(features, np.ascontiguousarray(bitmaps), n_rows)
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, columns: Sequence[str] | None = None, strip_prefix: str = ""
+    ) -> "FeatureIndex":
+        """
+        Builds the index from one-hot DataFrame columns, in the frame's row order.
+
+        Args:
+            df (pd.DataFrame): Frame with one 0/1 column per feature.
+            columns (Sequence[str] | None): Feature columns. Defaults to columns starting with `strip_prefix`.
+            strip_prefix (str): Prefix removed from column names to form feature names (e.g. 'Cat:').
+        """
+        if columns is None:
+            columns = [c for c in df.columns if c.startswith(strip_prefix)] if strip_prefix else list(df.columns)
+        names = [c.removeprefix(strip_prefix) for c in columns]
+        matrix = df[list(columns)].fillna(0).to_numpy(dtype=np.uint8)
+        return cls.from_matrix(names, matrix)
+
+    # --- Filtering (packed) ---
+
+    def _positions(self, features: Iterable[str]) -> list[int]:
+        try:
+            return [self._feature_of[f.strip().lower()] for f in features]
+        except KeyError as e:
+            raise KeyError(f"Unknown feature '{e.args[0]}'.") from e
+
+    def any_of(self, features: Iterable[str]) -> np.ndarray:
+        """Packed mask of rows having at least one of `features` (the POC's filter). Empty -> no rows."""
+        positions = self._positions(features)
+        if not positions:
+            return np.zeros_like(self._all)
+        return np.asarray(np.bitwise_or.reduce(self.bitmaps[positions], axis=0))
+
+    def all_of(self, features: Iterable[str]) -> np.ndarray:
+        """Packed mask of rows having every one of `features`. Empty -> all rows."""
+        positions = self._positions(features)
+        if not positions:
+            return self._all.copy()
+        return np.asarray(np.bitwise_and.reduce(self.bitmaps[positions], axis=0))
+
+    def none_of(self, features: Iterable[str]) -> np.ndarray:
+        """Packed mask of rows having none of `features`. Empty -> all rows."""
+        return np.asarray(~self.any_of(features) & self._all)
+
+    def mask(self, any_of: Iterable[str] = (), all_of: Iterable[str] = (), none_of: Iterable[str] = ()) -> np.ndarray:
+        """Packed mask of rows matching every given clause; an empty `any_of` does not restrict."""
+        any_of, all_of, none_of = list(any_of), list(all_of), list(none_of)
+        mask = self.all_of(all_of)
+        if any_of:
+            mask &= self.any_of(any_of)
+        if none_of:
+            mask &= self.none_of(none_of)
+        return mask
+
+    # --- Results ---
+
+    def rows(self, mask: np.ndarray) -> np.ndarray:
+        """Unpacks a mask into sorted row ids."""
+        bits = np.unpackbits(mask.view(np.uint8), bitorder="little", count=self.n_rows)
+        return np.flatnonzero(bits)
+
+    def count(self, mask: np.ndarray) -> int:
+        """Number of rows set in a mask, without unpacking row ids."""
+        return int(np.bitwise_count(mask).sum())
+
+    def features_of(self, row: int) -> list[str]:
+        """Lists the features of one row."""
+        word, bit = divmod(row, 64)
+        has = (self.bitmaps[:, word] >> np.uint64(bit)) & np.uint64(1)
+        return [self.features[i] for i in np.flatnonzero(has)]
+
+
+class CatalogueIndex:
+    """
+    Category, mechanic and theme indexes aligned to one catalogue row order.
+    """
+
+    def __init__(self, game_ids: np.ndarray, families: dict[str, FeatureIndex]):
+        self.game_ids = np.asarray(game_ids, dtype=np.int64)
+        self.families = families
+
+    @classmethod
+    def from_frames(
+        cls,
+        games_df: pd.DataFrame,
+        mechanics_df: pd.DataFrame | None = None,
+        themes_df: pd.DataFrame | None = None,
+        id_column: str = "BGGId",
+    ) -> "CatalogueIndex":
+        """
+        Builds the index from the Kaggle frames; mechanics and themes are aligned to `games_df` by id.
+
+        Args:
+            games_df (pd.DataFrame): Games with `Cat:*` one-hot columns; defines the row order.
+            mechanics_df (pd.DataFrame | None): `mechanics.csv`: an id column plus one column per mechanic.
+            themes_df (pd.DataFrame | None): `themes.csv`: an id column plus one column per theme.
+            id_column (str): The game id column shared by the frames.
+        """
+        game_ids = games_df[id_column].to_numpy(dtype=np.int64)
+        families = {"categories": FeatureIndex.from_frame(games_df, strip_prefix=CATEGORY_PREFIX)}
+        for name, df in (("mechanics", mechanics_df), ("themes", themes_df)):
+            if df is not None:
+                aligned = df.set_index(id_column).reindex(game_ids)
+                families[name] = FeatureIndex.from_frame(aligned)
+        return cls(game_ids, families)
+
+    def filter(self, **clauses: Iterable[str]) -> np.ndarray:
+        """
+        Returns the row ids matching every clause, e.g.
+        `filter(categories_any=["thematic", "war"], mechanics_all=["Dice Rolling"], themes_none=["Horror"])`.
+
+        Each keyword is `<family>_<any|all|none>`; clauses are ANDed together.
+        """
+        mask = None
+        for key, features in clauses.items():
+            family, _, op = key.rpartition("_")
+            if family not in self.families or op not in ("any", "all", "none"):
+                raise ValueError(
+                    f"Unknown filter '{key}'. Expected <family>_<any|all|none> over {list(self.families)}."
+                )
+            clause = getattr(self.families[family], f"{op}_of")(features)
+            mask = clause if mask is None else mask & clause
+        index = next(iter(self.families.values()))
+        return index.rows(index.all_of(()) if mask is None else mask)
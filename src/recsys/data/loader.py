@@ -1,22 +1,212 @@
-import yaml
+# src/recsys/data/loader.py
+"""
+Loading utilities for the extracted (interim) data files.
+
+CSV files are parsed once and cached next to the source as a columnar file in
+a `.cache/` directory. Arrow IPC caches are memory-mapped on load, so warm
+loads are zero-copy; Parquet caches trade a decode step for a smaller file.
+A cache entry is reused while the source CSV's size and mtime are unchanged;
+if either changed, the source is re-hashed and only re-parsed when its
+content hash differs.
+"""
+
+import json
+import os
 from pathlib import Path
+from typing import IO
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from recsys.utils.files import atomic_write, buffer_digest, file_digest
+
+CACHE_DIRNAME = ".cache"
+CACHE_FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+
+Filters = list[tuple] | list[list[tuple]]
+
+# Without `newlines_in_values`, a quoted field crossing a block boundary makes
+# the parallel chunker lose sync with the parser.
+PARSE_OPTIONS = pa_csv.ParseOptions(newlines_in_values=True)
+
+
+def _source_key(stat: os.stat_result) -> dict:
+    """(Internal) Returns the cheap part of the cache key: size and mtime."""
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _cache_paths(csv_path: Path, cache_format: str) -> tuple[Path, Path]:
+    """(Internal) Returns the cache data file and its metadata sidecar for `csv_path`."""
+    cache_dir = csv_path.parent / CACHE_DIRNAME
+    data_path = cache_dir / (csv_path.stem + CACHE_FORMATS[cache_format])
+    return data_path, data_path.with_name(data_path.name + ".json")
 
-def load_extracted_data(filename: str, project_root: Path, config: dict) -> pd.DataFrame:
+
+def _cache_is_fresh(csv_path: Path, data_path: Path, meta_path: Path) -> bool:
+    """
+    (Internal) Checks whether the cache still matches the source CSV.
+
+    Size and mtime are compared first. If they changed, the CSV is hashed and
+    the cache is kept (with a refreshed key) when the content is identical,
+    e.g. after the file was re-extracted from an unchanged archive.
+    """
+    if not data_path.is_file() or not meta_path.is_file():
+        return False
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False
+
+    key = _source_key(csv_path.stat())
+    if meta.get("size") == key["size"] and meta.get("mtime_ns") == key["mtime_ns"]:
+        return True
+    if meta.get("size") != key["size"] or meta.get("hash") != file_digest(csv_path):
+        return False
+
+    _write_json_atomic(meta_path, {**meta, **key})
+    return True
+
+
+def _write_json_atomic(path: Path, payload: dict) -> None:
+    """(Internal) Writes JSON through a temporary file so readers never see a partial file."""
+    with atomic_write(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+
+
+def _build_cache(csv_path: Path, data_path: Path, meta_path: Path, cache_format: str) -> pa.Table:
+    """
+    (Internal) Parses the CSV with the Arrow reader and writes the columnar cache.
+
+    The key, the hash and the parsed table all come from one memory-mapped read
+    of the open file, so a CSV replaced mid-build cannot be recorded under a key
+    or hash that does not match the cached rows.
+    """
+    with pa.memory_map(str(csv_path), "r") as source:
+        key = _source_key(os.fstat(source.fileno()))
+        buffer = source.read_buffer()
+        digest = buffer_digest(memoryview(buffer))
+        table = pa_csv.read_csv(pa.BufferReader(buffer), parse_options=PARSE_OPTIONS)
+
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(data_path) as sink:
+        if cache_format == "arrow":
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            pq.write_table(table, sink)
+    _write_json_atomic(meta_path, {**key, "hash": digest, "format": cache_format})
+    return table
+
+
+def _check_columns(schema: pa.Schema, columns: list[str] | None, filters: Filters | None) -> None:
+    """(Internal) Raises ValueError if `columns` or `filters` reference unknown columns."""
+    requested = set(columns or [])
+    if filters:
+        clauses = filters if isinstance(filters[0], list) else [filters]
+        requested.update(clause[0] for conjunction in clauses for clause in conjunction)
+    missing = sorted(requested - set(schema.names))
+    if missing:
+        raise ValueError(f"Unknown columns {missing}. Available columns: {schema.names}")
+
+
+def _read_cache(data_path: Path, cache_format: str, columns: list[str] | None, filters: Filters | None) -> pa.Table:
+    """(Internal) Reads the cache with column projection and row filters."""
+    if cache_format == "parquet":
+        _check_columns(pq.read_schema(data_path), columns, filters)
+        return pq.read_table(data_path, columns=columns, filters=filters)
+
+    # Memory-mapped IPC: buffers point into the page cache, nothing is copied. They keep
+    # the mapping alive after the file handle is closed.
+    with pa.memory_map(str(data_path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return _project(table, columns, filters)
+
+
+def _project(table: pa.Table, columns: list[str] | None, filters: Filters | None) -> pa.Table:
+    """(Internal) Applies `filters` then `columns` to an in-memory table."""
+    _check_columns(table.schema, columns, filters)
+    if filters:
+        table = table.filter(pq.filters_to_expression(filters))
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def read_csv_stream(source: IO[bytes], columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Parses a CSV from an open binary stream (e.g. a zip member) without touching disk.
+
+    Args:
+        source (IO[bytes]): Readable binary file object positioned at the CSV header.
+        columns (list[str] | None): Only load these columns.
+
+    Returns:
+        pd.DataFrame: The parsed data with pyarrow-backed dtypes.
+    """
+    convert_options = pa_csv.ConvertOptions(include_columns=columns) if columns is not None else None
+    try:
+        table = pa_csv.read_csv(source, parse_options=PARSE_OPTIONS, convert_options=convert_options)
+    except pa.ArrowException as e:
+        raise OSError(f"Error reading the CSV stream: {e}") from e
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def load_extracted_data(
+    filename: str,
+    project_root: Path,
+    config: dict,
+    columns: list[str] | None = None,
+    filters: Filters | None = None,
+    use_cache: bool = True,
+    cache_format: str = "arrow",
+) -> pd.DataFrame:
     """
     Loads a specific file (e.g., a CSV) from the 'interim' data directory.
+
+    Args:
+        filename (str): Name of the file inside `extract_data_dir`.
+        project_root (Path): The project root directory.
+        config (dict): The loaded project configuration.
+        columns (list[str] | None): Only load these columns.
+        filters (Filters | None): Row filters in pyarrow DNF form, e.g. `[("YearPublished", ">=", 2000)]`.
+        use_cache (bool): Build and reuse the columnar cache next to the CSV.
+        cache_format (str): 'arrow' (memory-mapped IPC) or 'parquet'.
+
+    Returns:
+        pd.DataFrame: The loaded data with pyarrow-backed dtypes.
     """
     extract_data_dir = project_root / config["paths"]["extract_data_dir"]
     interim_file_path = extract_data_dir / filename
 
     if not interim_file_path.is_file():
-        raise FileNotFoundError(f"The file '{filename}' was not found at '{interim_file_path}'. Please check the filename.")
+        raise FileNotFoundError(
+            f"The file '{filename}' was not found at '{interim_file_path}'. Please check the filename."
+        )
+    if cache_format not in CACHE_FORMATS:
+        raise ValueError(f"Unsupported cache format '{cache_format}'. Expected one of {list(CACHE_FORMATS)}.")
 
     if filename.endswith(".csv"):
         try:
-            df = pd.read_csv(interim_file_path, dtype_backend="pyarrow")
+            if not use_cache:
+                table = _project(pa_csv.read_csv(interim_file_path, parse_options=PARSE_OPTIONS), columns, filters)
+            else:
+                data_path, meta_path = _cache_paths(interim_file_path, cache_format)
+                if _cache_is_fresh(interim_file_path, data_path, meta_path):
+                    table = _read_cache(data_path, cache_format, columns, filters)
+                else:
+                    table = _project(
+                        _build_cache(interim_file_path, data_path, meta_path, cache_format), columns, filters
+                    )
+            df = table.to_pandas(types_mapper=pd.ArrowDtype)
             print(f"Successfully loaded '{filename}'.")
             return df
+        except pa.ArrowException as e:
+            raise OSError(f"Error reading the CSV file '{filename}': {e}") from e
+        except ValueError:
+            raise
         except Exception as e:
             raise OSError(f"Error reading the CSV file '{filename}': {e}") from e
     else:
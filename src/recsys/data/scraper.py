@@ -0,0 +1,384 @@
+# src/recsys/data/scraper.py
+"""
+Asynchronous client for the BoardGameGeek XML API2 `thing` endpoint.
+
+Game details (names, thumbnails, images, descriptions) are fetched in
+batched multi-id requests (`/thing?id=1,2,3...`) that run concurrently over
+one pooled `aiohttp` session. Three mechanisms keep the client polite and
+fast:
+
+- `TokenBucket`: a request-rate limiter whose state (tokens left, last
+  refill) is persisted in `rate_limit_file`, so back-to-back runs and
+  separate processes do not reset the budget and burst BGG. Every token is
+  taken under an exclusive lock on the file (POSIX only; elsewhere the
+  budget is shared between runs but not between concurrent processes).
+- Retries: 202 (BGG's "request queued"), 429 and 5xx responses and network
+  errors are retried with exponential backoff and full jitter, honoring
+  `Retry-After` when BGG sends it.
+- `ResponseCache`: responses are stored in `cache_dir` by content hash, with
+  one small metadata record per request URL. Fresh entries are served without
+  a request; stale ones are revalidated with `If-None-Match` /
+  `If-Modified-Since`, and a 304 reuses the stored body.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+import aiohttp
+from defusedxml import ElementTree
+
+if sys.platform != "win32":  # Windows has no `fcntl`: no cross-process locking of the rate limit state.
+    import fcntl
+
+from recsys.logging.app_logger import logger
+from recsys.utils.files import atomic_write
+
+BGG_THING_URL = "https://boardgamegeek.com/xmlapi2/thing"
+# BGG rejects `thing` requests with more than 20 ids.
+MAX_IDS_PER_REQUEST = 20
+RETRY_STATUSES = {202, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter with its state persisted to a JSON file.
+    """
+
+    def __init__(self, rate: float, capacity: float, state_file: Path | None = None):
+        """
+        Args:
+            rate (float): Tokens (requests) added per second.
+            capacity (float): Maximum burst size.
+            state_file (Path | None): Where the bucket level is persisted between runs.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.state_file = state_file
+        self._lock = asyncio.Lock()
+        self.tokens, self.updated = capacity, time.time()
+        self._load()
+
+    def _load(self) -> None:
+        if self.state_file is None or not self.state_file.is_file():
+            return
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                state = json.load(f)
+            self.tokens, self.updated = float(state["tokens"]), float(state["updated"])
+        except (ValueError, KeyError, OSError) as e:
+            logger.warning(f"Ignoring unreadable rate limit state '{self.state_file}': {e}")
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+
+    def _save(self) -> None:
+        if self.state_file is None:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.state_file, "w", encoding="utf-8") as f:
+            json.dump({"tokens": self.tokens, "updated": self.updated}, f)
+
+    @contextmanager
+    def _state_lock(self) -> Iterator[None]:
+        """(Internal) Holds an exclusive lock on the state file, so processes sharing it take turns."""
+        if self.state_file is None or sys.platform == "win32":
+            yield
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_file.with_name(self.state_file.name + ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reserve(self) -> float:
+        """(Internal) Takes a token, possibly ahead of its refill; returns the seconds until it is due."""
+        with self._state_lock():
+            # Another process may have taken tokens since this one last looked.
+            self._load()
+            self._refill(time.time())
+            self.tokens -= 1
+            self._save()
+        return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and takes it."""
+        async with self._lock:
+            # The file lock can wait on another process; keep that off the event loop.
+            delay = await asyncio.to_thread(self._reserve)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class ResponseCache:
+    """
+    Content-addressed response cache with HTTP validators for revalidation.
+
+    Layout under `cache_dir`:
+
+        objects/<sha256 of body>.xml   response bodies, shared by identical responses
+        requests/<sha256 of url>.json  url, body hash, ETag, Last-Modified and fetch time
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float = 7 * 24 * 3600):
+        """
+        Args:
+            cache_dir (Path): Cache root directory.
+            ttl (float): Seconds an entry is served without revalidation.
+        """
+        self.objects_dir = cache_dir / "objects"
+        self.requests_dir = cache_dir / "requests"
+        self.ttl = ttl
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.requests_dir.mkdir(parents=True, exist_ok=True)
+
+    def _record_path(self, url: str) -> Path:
+        return self.requests_dir / (hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> dict | None:
+        """Returns the cache record of `url` (with its `body`), or None on a miss."""
+        try:
+            with open(self._record_path(url), encoding="utf-8") as f:
+                record: dict = json.load(f)
+            record["body"] = (self.objects_dir / f"{record['body_sha256']}.xml").read_bytes()
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+        return record
+
+    def is_fresh(self, record: dict) -> bool:
+        return bool(time.time() - record["fetched_at"] < self.ttl)
+
+    def put(self, url: str, body: bytes, etag: str | None, last_modified: str | None) -> None:
+        """Stores a response body and its validators."""
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self.objects_dir / f"{digest}.xml"
+        if not object_path.exists():
+            with atomic_write(object_path) as f:
+                f.write(body)
+        self._write_record(url, {"url": url, "body_sha256": digest, "etag": etag, "last_modified": last_modified})
+
+    def touch(self, url: str, record: dict) -> None:
+        """Marks a revalidated (304) entry as freshly fetched."""
+        self._write_record(url, {key: value for key, value in record.items() if key != "body"})
+
+    def _write_record(self, url: str, record: dict) -> None:
+        record["fetched_at"] = time.time()
+        with atomic_write(self._record_path(url), "w", encoding="utf-8") as f:
+            json.dump(record, f)
+
+
+def parse_things(xml: bytes) -> list[dict]:
+    """
+    Parses a `thing` response into one dict per item.
+
+    Returns:
+        list[dict]: `id`, `type`, `name`, `year_published`, `thumbnail`, `image` and `description`.
+    """
+    items = []
+    for item in ElementTree.fromstring(xml).iter("item"):
+        primary = item.find("name[@type='primary']")
+        year = item.find("yearpublished")
+        items.append({
+            "id": int(item.get("id")),
+            "type": item.get("type"),
+            "name": primary.get("value") if primary is not None else None,
+            "year_published": int(year.get("value")) if year is not None and year.get("value") else None,
+            "thumbnail": (item.findtext("thumbnail") or "").strip() or None,
+            "image": (item.findtext("image") or "").strip() or None,
+            "description": item.findtext("description"),
+        })
+    return items
+
+
+class BGGScraper:
+    """
+    Batched, rate-limited, cached async fetching of BGG `thing` records.
+
+    Use as an async context manager, which owns the pooled HTTP session:
+
+        async with BGGScraper(cache_dir, rate_limit_file) as scraper:
+            games = await scraper.fetch_things([174430, 224517])
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        rate_limit_file: Path | None = None,
+        base_url: str = BGG_THING_URL,
+        batch_size: int = MAX_IDS_PER_REQUEST,
+        max_connections: int = 4,
+        rate: float = 1.0,
+        burst: float = 4.0,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        timeout: float = 30.0,
+        cache_ttl: float = 7 * 24 * 3600,
+    ):
+        """
+        Args:
+            cache_dir (Path): Response cache directory (`bgg_api.cache_dir`).
+            rate_limit_file (Path | None): Token bucket state file (`bgg_api.rate_limit_file`).
+            base_url (str): The `thing` endpoint URL.
+            batch_size (int): Ids per request (BGG allows at most 20).
+            max_connections (int): Size of the session's connection pool.
+            rate (float): Sustained requests per second.
+            burst (float): Requests allowed back to back after an idle period.
+            max_retries (int): Retries per batch before giving up.
+            backoff_base (float): First retry delay ceiling in seconds, doubled per attempt.
+            backoff_max (float): Upper bound on a single retry delay.
+            timeout (float): Total timeout per request in seconds.
+            cache_ttl (float): Seconds a cached response is served without revalidation.
+        """
+        self.base_url = base_url
+        self.batch_size = min(batch_size, MAX_IDS_PER_REQUEST)
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.cache = ResponseCache(cache_dir, ttl=cache_ttl)
+        self.bucket = TokenBucket(rate, burst, rate_limit_file)
+        self.stats: dict[str, int] = {"requests": 0, "cache_hits": 0, "revalidated": 0, "retries": 0}
+        self._session: aiohttp.ClientSession | None = None
+
+    @classmethod
+    def from_config(cls, project_root: Path, config: dict, **kwargs: Any) -> "BGGScraper":
+        """Builds a scraper using the `paths.bgg_api` locations from the project config."""
+        bgg_paths = config["paths"]["bgg_api"]
+        return cls(
+            cache_dir=project_root / bgg_paths["cache_dir"],
+            rate_limit_file=project_root / bgg_paths["rate_limit_file"],
+            **kwargs,
+        )
+
+    async def __aenter__(self) -> "BGGScraper":
+        connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _batch_url(self, ids: list[int]) -> str:
+        query = urlencode({"id": ",".join(str(i) for i in ids), "type": "boardgame", "stats": 1})
+        return f"{self.base_url}?{query}"
+
+    def _retry_delay(self, attempt: int, retry_after: str | None) -> float:
+        """(Internal) Full-jitter exponential backoff, or the server's Retry-After if larger."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))  # noqa: S311 - jitter, not security
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(self.backoff_max, float(retry_after)))
+        return delay
+
+    async def fetch(self, url: str) -> bytes:
+        """
+        GETs `url` through the cache, rate limiter and retry policy.
+
+        Raises:
+            aiohttp.ClientError: If the request still fails after `max_retries` retries.
+        """
+        if self._session is None:
+            raise RuntimeError("BGGScraper must be used as an async context manager.")
+        record = self.cache.get(url)
+        if record is not None and self.cache.is_fresh(record):
+            self.stats["cache_hits"] += 1
+            cached: bytes = record["body"]
+            return cached
+
+        headers = self._conditional_headers(record)
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            self.stats["requests"] += 1
+            error: Exception
+            retry_after: str | None = None
+            try:
+                async with self._session.get(url, headers=headers) as response:
+                    return await self._read_response(url, response, record)
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUSES:
+                    raise
+                error, retry_after = e, e.headers.get("Retry-After") if e.headers else None
+            except (aiohttp.ClientConnectionError, TimeoutError) as e:
+                error = e
+            if attempt == self.max_retries:
+                raise error
+            self.stats["retries"] += 1
+            delay = self._retry_delay(attempt, retry_after)
+            logger.debug(f"Retrying BGG request in {delay:.2f}s after {error!r}.")
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    def _conditional_headers(record: dict | None) -> dict[str, str]:
+        """(Internal) Revalidation headers for a stale cache record."""
+        headers = {}
+        if record is not None and record.get("etag"):
+            headers["If-None-Match"] = record["etag"]
+        if record is not None and record.get("last_modified"):
+            headers["If-Modified-Since"] = record["last_modified"]
+        return headers
+
+    async def _read_response(self, url: str, response: aiohttp.ClientResponse, record: dict | None) -> bytes:
+        """
+        (Internal) Returns the body of a response, caching it, or the stored body on a 304.
+
+        Raises:
+            aiohttp.ClientResponseError: For error statuses, including the retryable `RETRY_STATUSES`.
+        """
+        if response.status == 304 and record is not None:
+            self.stats["revalidated"] += 1
+            self.cache.touch(url, record)
+            revalidated: bytes = record["body"]
+            return revalidated
+        if response.status in RETRY_STATUSES:
+            # 202 is not an error to aiohttp, but BGG has only queued the request.
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message=response.reason or "",
+                headers=response.headers,
+            )
+        response.raise_for_status()
+        body = await response.read()
+        self.cache.put(url, body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return body
+
+    async def fetch_things(self, game_ids: Iterable[int]) -> dict[int, dict]:
+        """
+        Fetches `thing` records for many games in concurrent, batched requests.
+
+        Args:
+            game_ids (Iterable[int]): BGG ids; duplicates are fetched once.
+
+        Returns:
+            dict[int, dict]: Parsed records by id (see `parse_things`). Ids BGG does not know are absent.
+        """
+        ids = sorted({int(g) for g in game_ids})
+        batches = [ids[i : i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+        bodies = await asyncio.gather(*(self.fetch(self._batch_url(batch)) for batch in batches))
+        return {item["id"]: item for body in bodies for item in parse_things(body)}
+
+
+def fetch_things(game_ids: Iterable[int], project_root: Path, config: dict, **kwargs: Any) -> dict[int, dict]:
+    """Synchronous wrapper around `BGGScraper.fetch_things` for scripts and notebooks."""
+
+    async def run() -> dict[int, dict]:
+        async with BGGScraper.from_config(project_root, config, **kwargs) as scraper:
+            return await scraper.fetch_things(game_ids)
+
+    return asyncio.run(run())
@@ -9,14 +9,82 @@ observability stack like Loki/Grafana).
 Application code should ONLY import and use the `logger` from this module.
 """
 
-# --- Backend Selection ---
-# We point to our new default logger which handles both console and file logging.
-from src.recsys.logging.logging_backends.default_logger import logger as backend_logger
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-# --- Application-Specific Context ---
-# .bind() creates a new logger with bound data that will be included in all
-# subsequent log messages. This is perfect for adding consistent context.
-logger = backend_logger.bind(app_name="BoardGameRecommender", version="0.1.0")
+from recsys.logging.logging_backends.default_logger import setup_default_logger
+from recsys.logging.logging_backends.pipeline import LogPipeline, LogSampler, LogSink
+
+if TYPE_CHECKING:
+    from loguru import Logger
+
+
+@cache
+def _configure() -> tuple["Logger", LogPipeline]:
+    """(Internal) Sets up the backend from the `logging` settings, on the first log call."""
+    # Imported here: the settings pull in pydantic, which a bare import of the logger should not.
+    from recsys.config_management.settings import LoggingSettings, get_settings
+
+    try:
+        config, config_error = get_settings().logging, None
+    except (FileNotFoundError, ValueError, TypeError) as e:
+        # Logging has to work even when the configuration does not.
+        config, config_error = LoggingSettings(), e
+
+    # --- Backend Selection ---
+    # The default backend handles console and file logging; Loki is added when a URL is configured.
+    extra_sinks: list[LogSink] = []
+    if config.loki.url:
+        from recsys.logging.logging_backends.loki_logger import LokiSink
+
+        extra_sinks.append(
+            LokiSink(
+                config.loki.url,
+                labels=config.loki.labels,
+                level=config.loki.level,
+                batch_size=config.loki.batch_size,
+                flush_interval=config.loki.flush_interval_seconds,
+                max_buffer=config.loki.max_buffer,
+                max_retries=config.loki.max_retries,
+                timeout=config.loki.timeout_seconds,
+            )
+        )
+    sampling = config.sampling
+    sampler = LogSampler(sampling.rate_per_second, sampling.burst, sampling.max_level) if sampling.enabled else None
+    backend_logger, pipeline = setup_default_logger(
+        Path(config.log_dir), config.console_level, config.file_level, sampler, extra_sinks, config.max_queue
+    )
+
+    # --- Application-Specific Context ---
+    # .bind() creates a new logger with bound data that will be included in all
+    # subsequent log messages. This is perfect for adding consistent context.
+    bound = backend_logger.bind(app_name="BoardGameRecommender", version="0.1.0")
+    if config_error is not None:
+        bound.warning(f"Invalid logging configuration, using the defaults: {config_error}")
+    return bound, pipeline
+
+
+def get_pipeline() -> LogPipeline:
+    """The pipeline behind `logger`, e.g. to `flush()` it or read its `stats`."""
+    return _configure()[1]
+
+
+class _LazyLogger:
+    """
+    Stands in for the bound logger and configures the backend on first use.
+
+    `logger.info(...)` resolves to the real logger's method before it is called,
+    so loguru still reports the caller's module, function and line.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_configure()[0], name)
+
+
+logger = _LazyLogger()
 
 # --- How to Observe and Query (Documentation for the developer) ---
 #
@@ -43,5 +111,7 @@ logger = backend_logger.bind(app_name="BoardGameRecommender", version="0.1.0")
 #    cat logs/app_events.log | jq 'select(.record.message | contains("Connection failed"))'
 #
 # This setup provides powerful querying capabilities locally without needing
-# a complex observability stack, but is perfectly positioned to be forwarded
-# to one (like Loki) in the future.
+# a complex observability stack. To also ship logs to Loki, set `logging.loki.url`
+# in the config (or RECSYS_LOGGING__LOKI__URL); the same JSON lines then arrive
+# in streams labeled by `logging.loki.labels` and level, e.g. in Grafana:
+#    {service="recsys", level="error"} | json | record_module="setup_snowflake_db"
@@ -3,4 +3,8 @@ This module contains logging backends for this application.
 Each backend is abstracted behind a common interface so that
 the logging implementation can be swapped out easily and is adaptable for future needs,
 avoiding painful rewrites.
+
+- `pipeline`: the non-blocking `LogPipeline` and `LogSampler` every backend is fed by;
+- `default_logger`: console and rotating JSON-file sinks;
+- `loki_logger`: `LokiSink`, shipping batched, gzipped lines to Grafana Loki.
 """
@@ -6,51 +6,172 @@ This setup provides a two-pronged approach:
 1.  Human-Readable Console Logs: For immediate feedback during development.
 2.  Machine-Readable File Logs: Saves logs in a structured JSON format,
     which is essential for persistence, observation, and querying.
+
+Both are written by the `LogPipeline` thread, not by the code that logs:
+a log call only samples (`LogSampler`) and queues the message. Further
+sinks (e.g. `LokiSink`) can be passed in as `extra_sinks`.
 """
 
 import sys
+import time
+from collections.abc import Sequence
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, TextIO
 
 from loguru import logger
 
+from recsys.logging.logging_backends.pipeline import LEVEL_NUMBERS, LogPipeline, LogSampler, LogSink, serialize_record
+
+if TYPE_CHECKING:
+    from loguru import Logger, Message
+
+_ANSI = {
+    "TRACE": "\033[36m",
+    "DEBUG": "\033[34m",
+    "INFO": "\033[1m",
+    "SUCCESS": "\033[32m",
+    "WARNING": "\033[33m",
+    "ERROR": "\033[31m",
+    "CRITICAL": "\033[1;31m",
+}
+_GREEN, _CYAN, _RESET = "\033[32m", "\033[36m", "\033[0m"
+
+# The pipeline installed by the last `setup_default_logger` call, closed when it is replaced.
+_pipeline: LogPipeline | None = None
+
+
+class ConsoleSink:
+    """Human-readable lines at `level` and above, colored when the stream is a terminal."""
 
-def setup_default_logger():
+    def __init__(self, stream: TextIO | None = None, level: str = "INFO", colorize: bool | None = None):
+        """
+        Args:
+            stream: Text stream written to. Defaults to whatever `sys.stderr` is at write time.
+            level (str): Least severe level printed.
+            colorize (bool | None): Use ANSI colors. Defaults to whether the stream is a terminal.
+        """
+        self.stream = stream
+        self.level_no = LEVEL_NUMBERS[level.upper()]
+        self.colorize = (stream or sys.stderr).isatty() if colorize is None else colorize
+
+    def _format(self, message: "Message") -> str:
+        record = message.record
+        level = record["level"].name
+        when = record["time"].strftime("%Y-%m-%d %H:%M:%S")
+        where = f"{record['name']}:{record['function']}:{record['line']}"
+        text = str(message).rstrip("\n")
+        if not self.colorize:
+            return f"{when} | {level: <8} | {where} - {text}\n"
+        color = _ANSI.get(level, "")
+        return f"{_GREEN}{when}{_RESET} | {color}{level: <8}{_RESET} | {_CYAN}{where}{_RESET} - {color}{text}{_RESET}\n"
+
+    def write_batch(self, messages: Sequence["Message"]) -> None:
+        lines = [self._format(m) for m in messages if m.record["level"].no >= self.level_no]
+        if lines:
+            stream = self.stream or sys.stderr
+            stream.write("".join(lines))
+            stream.flush()
+
+    def close(self) -> None:
+        stream = self.stream or sys.stderr
+        if not stream.closed:
+            stream.flush()
+
+
+class JsonFileSink:
     """
-    Configures a logger that outputs to both the console and a structured JSON file.
+    JSON Lines in loguru's `serialize=True` layout, with size-based rotation and age-based retention.
     """
-    # Ensure the 'logs' directory exists.
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    log_file_path = log_dir / "app_events.log"
 
+    def __init__(self, path: Path, level: str = "DEBUG", rotation_bytes: int = 10 * 2**20, retention_days: float = 7):
+        """
+        Args:
+            path (Path): The active log file; rotated files sit next to it as `<stem>.<timestamp><suffix>`.
+            level (str): Least severe level written.
+            rotation_bytes (int): Rotate once the file would grow past this many bytes (UTF-8 encoded).
+            retention_days (float): Rotated files older than this are deleted at rotation.
+        """
+        self.path = path
+        self.level_no = LEVEL_NUMBERS[level.upper()]
+        self.rotation_bytes = rotation_bytes
+        self.retention_days = retention_days
+        self._file: BinaryIO | None = None
+        self._size = 0
+
+    def _open(self) -> BinaryIO:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Binary, so `_size` counts bytes on disk rather than characters.
+        self._file = open(self.path, "ab")  # noqa: SIM115 - kept open across batches
+        self._size = self._file.tell()
+        return self._file
+
+    def _rotate(self, file: BinaryIO) -> BinaryIO:
+        file.close()
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        self.path.rename(self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}"))
+        cutoff = time.time() - self.retention_days * 86_400
+        for rotated in self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}"):
+            if rotated.stat().st_mtime < cutoff:
+                rotated.unlink(missing_ok=True)
+        return self._open()
+
+    def write_batch(self, messages: Sequence["Message"]) -> None:
+        text = "".join(serialize_record(m) for m in messages if m.record["level"].no >= self.level_no)
+        if not text:
+            return
+        data = text.encode("utf-8")
+        file = self._file if self._file is not None else self._open()
+        if self._size and self._size + len(data) > self.rotation_bytes:
+            file = self._rotate(file)
+        file.write(data)
+        file.flush()
+        self._size += len(data)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def setup_default_logger(
+    log_dir: Path = Path("logs"),
+    console_level: str = "INFO",
+    file_level: str = "DEBUG",
+    sampler: LogSampler | None = None,
+    extra_sinks: Sequence[LogSink] = (),
+    max_queue: int = 100_000,
+) -> tuple["Logger", LogPipeline]:
+    """
+    Configures a logger that outputs to both the console and a structured JSON file.
+
+    A pipeline installed by an earlier call is closed, delivering its queued messages,
+    so reconfiguring does not leave its thread and file handles behind.
+
+    Args:
+        log_dir (Path): Directory of `app_events.log`; created on the first write.
+        console_level (str): Least severe level printed to stderr.
+        file_level (str): Least severe level written to the JSON file.
+        sampler (LogSampler | None): Rate limit for low-severity messages, per call site.
+        extra_sinks (Sequence[LogSink]): Further destinations fed by the same pipeline.
+        max_queue (int): Messages buffered before new ones are dropped.
+
+    Returns:
+        The loguru logger, and the `LogPipeline` behind it (for flushing and stats).
+    """
+    global _pipeline
     logger.remove()  # Start with a clean slate
+    if _pipeline is not None:
+        _pipeline.close()
 
-    # --- Handler 1: Human-Readable Console Output ---
-    logger.add(
-        sys.stderr,
-        level="INFO",  # Keep console output clean (INFO and above).
-        format=(
-            "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-            "<level>{level: <8}</level> | "
-            "<cyan>{name}:{function}:{line}</cyan> - <level>{message}</level>"
-        ),
-        colorize=True,
-    )
-
-    # --- Handler 2: Machine-Readable File Output for Querying ---
-    logger.add(
-        log_file_path,
-        level="DEBUG",  # Log everything to the file for detailed analysis.
-        format="{message}",  # The serializer handles the structure.
-        serialize=True,  # <-- The most important part! This creates JSON logs.
-        rotation="10 MB",  # Start a new file when the log reaches 10 MB.
-        retention="7 days",  # Keep log files for up to 7 days.
-        catch=True,  # Catch and log exceptions from your code automatically.
-    )
-
-    return logger
-
-
-# The logger instance that will be imported by the facade.
-# Renamed to 'logger_' for clarity, as it's the sole export.
-logger_ = setup_default_logger()
+    sinks: list[LogSink] = [
+        # --- Sink 1: Human-Readable Console Output ---
+        ConsoleSink(level=console_level),
+        # --- Sink 2: Machine-Readable File Output for Querying ---
+        JsonFileSink(log_dir / "app_events.log", level=file_level),
+        *extra_sinks,
+    ]
+    pipeline = _pipeline = LogPipeline(sinks, max_queue=max_queue)
+    # Messages no sink wants are discarded by loguru before they are even sampled.
+    pipeline.install(logger, level=min(sink.level_no for sink in sinks), sampler=sampler)
+    return logger, pipeline
@@ -0,0 +1,222 @@
+# src/recsys/logging/logging_backends/loki_logger.py
+"""
+Grafana Loki backend: ships log lines to Loki's push API.
+
+`LokiSink` is a `LogPipeline` sink, so it never runs on the calling thread.
+The pipeline hands it batches of messages, which it serializes (the same
+JSON layout as the file sink, so LogQL's `| json` works) into a bounded
+buffer. Its own thread then pushes them:
+
+- lines are grouped into one stream per label set: the static `labels`
+  (e.g. `service`, `env`) plus the level. Labels stay low-cardinality;
+  everything else goes in the line;
+- a push is sent once `batch_size` lines are buffered or every
+  `flush_interval` seconds, gzip-compressed;
+- 429s, 5xx responses and connection errors are retried with full-jitter
+  exponential backoff, honoring `Retry-After`. A batch that still fails, or is
+  rejected outright (other 4xx), is dropped and counted;
+- when Loki is down for long, the buffer keeps the newest `max_buffer`
+  lines and counts the older ones it drops, so memory stays bounded.
+
+The owning `LogPipeline` closes the sink (pushing what is still buffered)
+when it is closed itself, at the latest at exit; a sink used on its own must
+be closed by its owner.
+"""
+
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import httpx
+
+from recsys.logging.logging_backends.pipeline import LEVEL_NUMBERS, serialize_record
+
+PUSH_PATH = "/loki/api/v1/push"
+
+
+@dataclass
+class LokiStats:
+    """Counters exposed by `LokiSink`."""
+
+    buffered: int = 0
+    sent: int = 0
+    batches: int = 0
+    retries: int = 0
+    failed_batches: int = 0
+    dropped: int = 0
+    push_seconds: float = 0.0
+
+
+class LokiSink:
+    """
+    Batches, compresses and pushes log lines to Loki from a background thread.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        labels: dict[str, str] | None = None,
+        level: str = "INFO",
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10_000,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 5.0,
+        compresslevel: int = 6,
+    ):
+        """
+        Args:
+            url (str): Loki base URL, e.g. `http://localhost:3100`.
+            labels (dict[str, str] | None): Static stream labels added to every line.
+            level (str): Least severe level shipped.
+            batch_size (int): Most lines per push; a full batch is pushed without waiting.
+            flush_interval (float): Longest a line waits in the buffer.
+            max_buffer (int): Lines held while Loki is slow or down; the oldest are dropped beyond it.
+            max_retries (int): Retries of a failed push before its batch is dropped.
+            backoff_base (float): First retry delay ceiling in seconds, doubled per attempt.
+            backoff_max (float): Upper bound on a single retry delay.
+            timeout (float): Seconds per push request.
+            compresslevel (int): gzip level of the request bodies.
+        """
+        self.push_url = url.rstrip("/") + PUSH_PATH
+        self.labels = tuple(sorted((labels or {}).items()))
+        self.level_no = LEVEL_NUMBERS[level.upper()]
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.compresslevel = compresslevel
+        self.stats = LokiStats()
+        self._client = httpx.Client(timeout=timeout)
+        self._buffer: deque[tuple[tuple, str, str]] = deque()
+        self._lock = threading.Lock()
+        self._has_lines = threading.Condition(self._lock)
+        self._flushed = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def write_batch(self, messages: Sequence) -> None:
+        """Buffers a batch from the pipeline thread, dropping the oldest lines beyond `max_buffer`."""
+        entries = []
+        for message in messages:
+            record = message.record
+            if record["level"].no < self.level_no:
+                continue
+            stream = (*self.labels, ("level", record["level"].name.lower()))
+            timestamp_ns = str(int(record["time"].timestamp() * 1_000_000) * 1000)
+            entries.append((stream, timestamp_ns, serialize_record(message).rstrip("\n")))
+        if not entries:
+            return
+        with self._lock:
+            if self._closed:
+                self.stats.dropped += len(entries)
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="loki-sink", daemon=True)
+                self._thread.start()
+            self._buffer.extend(entries)
+            self.stats.buffered += len(entries)
+            while len(self._buffer) > self.max_buffer:
+                self._buffer.popleft()
+                self.stats.dropped += 1
+            if len(self._buffer) >= self.batch_size:
+                self._has_lines.notify()
+
+    def flush(self, timeout: float | None = 10.0) -> bool:
+        """
+        Blocks until every buffered line has been pushed (or dropped).
+
+        Returns:
+            bool: False if `timeout` expired first.
+        """
+        with self._lock:
+            if self._thread is None:
+                return True
+            self._has_lines.notify()
+            return self._flushed.wait_for(lambda: not self._buffer and not self._in_flight, timeout=timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Pushes the buffered lines and stops the thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._has_lines.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._client.close()
+
+    def _run(self) -> None:
+        """(Internal) Sender loop: wait for a batch or the interval, push, repeat."""
+        while True:
+            with self._lock:
+                if not self._closed and len(self._buffer) < self.batch_size:
+                    self._has_lines.wait(timeout=self.flush_interval)
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                self._in_flight = len(batch)
+                closed = self._closed
+            if batch:
+                self._push(batch)
+            with self._lock:
+                self._in_flight = 0
+                if not self._buffer:
+                    self._flushed.notify_all()
+                    if closed:
+                        return
+
+    def encode(self, batch: list[tuple[tuple, str, str]]) -> bytes:
+        """Builds the gzip-compressed push body: one stream per label set."""
+        streams: dict[tuple, list[list[str]]] = {}
+        for stream, timestamp_ns, line in batch:
+            streams.setdefault(stream, []).append([timestamp_ns, line])
+        payload = {"streams": [{"stream": dict(stream), "values": values} for stream, values in streams.items()]}
+        return gzip.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"), self.compresslevel)
+
+    def _retry_delay(self, attempt: int, retry_after: str | None) -> float:
+        """(Internal) Full-jitter exponential backoff, or the server's Retry-After if larger."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))  # noqa: S311 - jitter, not security
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(self.backoff_max, float(retry_after)))
+        return delay
+
+    def _push(self, batch: list[tuple[tuple, str, str]]) -> None:
+        """(Internal) Sends one batch, retrying transient failures."""
+        start = time.perf_counter()
+        body = self.encode(batch)
+        headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        error = "no attempt made"
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = self._client.post(self.push_url, content=body, headers=headers)
+                if response.is_success:
+                    self.stats.sent += len(batch)
+                    self.stats.batches += 1
+                    self.stats.push_seconds += time.perf_counter() - start
+                    return
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code != 429 and response.status_code < 500:
+                    break  # Rejected (e.g. malformed or too old); retrying cannot help.
+                retry_after = response.headers.get("Retry-After")
+            except httpx.HTTPError as e:
+                error = repr(e)
+            if attempt < self.max_retries:
+                self.stats.retries += 1
+                time.sleep(self._retry_delay(attempt, retry_after))
+        self.stats.failed_batches += 1
+        self.stats.dropped += len(batch)
+        self.stats.push_seconds += time.perf_counter() - start
+        # Not logged through the logger: that would feed the failure back into this sink.
+        print(f"Dropped {len(batch)} log lines after failing to push them to Loki: {error}", file=sys.stderr)
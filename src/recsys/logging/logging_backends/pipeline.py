@@ -0,0 +1,283 @@
+# src/recsys/logging/logging_backends/pipeline.py
+"""
+Non-blocking log pipeline shared by the logging backends.
+
+A single loguru handler runs on the calling thread, and it does little:
+
+1. `LogSampler` (the handler's filter) rate-limits DEBUG/INFO messages per
+   call site with a token bucket. A hot loop logging on every iteration
+   keeps a trickle of lines instead of flooding the sinks. WARNING and above
+   always pass.
+2. The message is put on a bounded queue. When the queue is full the
+   message is dropped and counted; the caller never waits.
+
+A background thread drains the queue in batches and hands each batch to the
+sinks (console, JSON file, Loki), so formatting, serialization and I/O
+happen off the request path. A sink that raises is reported on stderr and
+skipped; the other sinks still receive the batch.
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import weakref
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from loguru import Logger, Message, Record
+
+# loguru's level numbers; levels above `max_level` are never sampled.
+LEVEL_NUMBERS = {"TRACE": 5, "DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+# Open pipelines, re-initialized in forked children and closed at exit by one pair of module hooks.
+# Weak, so a pipeline that is closed or no longer referenced is not kept alive.
+_open_pipelines: weakref.WeakSet["LogPipeline"] = weakref.WeakSet()
+
+
+def _reinit_after_fork() -> None:
+    for pipeline in list(_open_pipelines):
+        pipeline._init_state()
+
+
+def _close_all() -> None:
+    for pipeline in list(_open_pipelines):
+        pipeline.close()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+atexit.register(_close_all)
+
+
+class LogSink(Protocol):
+    """A destination fed by the pipeline thread."""
+
+    level_no: int
+
+    def write_batch(self, messages: Sequence["Message"]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def serialize_record(message: "Message") -> str:
+    """
+    Encodes a loguru message as one JSON line, in the layout of loguru's `serialize=True`.
+
+    Queries written against the old file sink (e.g. `jq 'select(.record.level.name == "ERROR")'`) keep working.
+    """
+    record = message.record
+    exception = record["exception"]
+    serializable = {
+        "text": str(message),
+        "record": {
+            "elapsed": {"repr": record["elapsed"], "seconds": record["elapsed"].total_seconds()},
+            "exception": exception
+            and {
+                "type": None if exception.type is None else exception.type.__name__,
+                "value": exception.value,
+                "traceback": bool(exception.traceback),
+            },
+            "extra": record["extra"],
+            "file": {"name": record["file"].name, "path": record["file"].path},
+            "function": record["function"],
+            "level": {"icon": record["level"].icon, "name": record["level"].name, "no": record["level"].no},
+            "line": record["line"],
+            "message": record["message"],
+            "module": record["module"],
+            "name": record["name"],
+            "process": {"id": record["process"].id, "name": record["process"].name},
+            "thread": {"id": record["thread"].id, "name": record["thread"].name},
+            "time": {"repr": record["time"], "timestamp": record["time"].timestamp()},
+        },
+    }
+    return json.dumps(serializable, default=str, ensure_ascii=False) + "\n"
+
+
+class LogSampler:
+    """
+    Per-call-site token bucket for low-severity messages; a loguru `filter`.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 50, max_level: str = "INFO"):
+        """
+        Args:
+            rate (float): Messages per second each call site may emit once its burst is spent.
+            burst (int): Messages a call site may emit back to back.
+            max_level (str): Most severe level that is sampled.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_level_no = LEVEL_NUMBERS[max_level.upper()]
+        self.dropped = 0
+        # (module name, line) -> [tokens, last refill time, messages dropped since the last one kept]
+        self._sites: dict[tuple[str | None, int], list] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record: "Record") -> bool:
+        if record["level"].no > self.max_level_no:
+            return True
+        key = (record["name"], record["line"])
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [float(self.burst), now, 0]
+            site[0] = min(self.burst, site[0] + (now - site[1]) * self.rate)
+            site[1] = now
+            if site[0] < 1:
+                site[2] += 1
+                self.dropped += 1
+                return False
+            site[0] -= 1
+            suppressed, site[2] = site[2], 0
+        if suppressed:
+            # Tells the reader how many lines this one stands for.
+            record["extra"]["sampled_out"] = suppressed
+        return True
+
+
+@dataclass
+class PipelineStats:
+    """Counters exposed by `LogPipeline`."""
+
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    sink_errors: int = 0
+    # Time spent in the handler on the calling thread (queueing only, not loguru's record creation).
+    enqueue_seconds: float = 0.0
+
+    @property
+    def mean_enqueue_us(self) -> float:
+        return 1e6 * self.enqueue_seconds / self.enqueued if self.enqueued else 0.0
+
+
+class LogPipeline:
+    """
+    Feeds loguru messages to sinks from a background thread.
+    """
+
+    def __init__(self, sinks: Sequence[LogSink], max_queue: int = 100_000, batch_size: int = 512):
+        """
+        Args:
+            sinks (Sequence[LogSink]): Destinations, each receiving every batch.
+            max_queue (int): Messages held in memory before new ones are dropped.
+            batch_size (int): Most messages handed to the sinks at once.
+        """
+        self.sinks = list(sinks)
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self._init_state()
+        _open_pipelines.add(self)
+
+    def _init_state(self) -> None:
+        """
+        (Internal) Creates the queue and counters.
+
+        Also runs in forked children, which do not inherit the parent's thread:
+        the child starts with an empty queue and its own thread on first use.
+        """
+        self.stats = PipelineStats()
+        # Messages, plus `threading.Event`s from `flush` and the `None` from `close`.
+        self._queue: queue.Queue[Any] = queue.Queue(self.max_queue)
+        self._start_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def install(self, logger: "Logger", level: str | int = "DEBUG", sampler: LogSampler | None = None) -> int:
+        """
+        Adds the pipeline to `logger` as a single handler.
+
+        Returns:
+            int: The loguru handler id.
+        """
+        return logger.add(self.put, level=level, format="{message}", filter=sampler, catch=True)
+
+    def put(self, message: "Message") -> None:
+        """Queues one message (the loguru sink); drops it if the queue is full or closed."""
+        start = time.perf_counter()
+        if self._thread is None:
+            self._ensure_started()
+        if self._closed:
+            self.stats.dropped += 1
+        else:
+            try:
+                self._queue.put_nowait(message)
+                self.stats.enqueued += 1
+            except queue.Full:
+                self.stats.dropped += 1
+        self.stats.enqueue_seconds += time.perf_counter() - start
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """
+        Blocks until every message queued so far has reached the sinks.
+
+        Returns:
+            bool: False if `timeout` expired first.
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Delivers the queued messages, stops the thread and closes the sinks."""
+        if self._closed:
+            return
+        self._closed = True
+        _open_pipelines.discard(self)
+        thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                # Closing must not raise at exit.
+                print(f"Log sink {sink!r} failed to close: {e}", file=sys.stderr)
+
+    def _ensure_started(self) -> None:
+        """(Internal) Starts the pipeline thread on first use."""
+        with self._start_lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="log-pipeline", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """(Internal) Pipeline loop: take a batch, hand it to every sink, repeat."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            messages = [item for item in batch if item is not None and not isinstance(item, threading.Event)]
+            if messages:
+                self._write(messages)
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if any(item is None for item in batch):
+                return
+
+    def _write(self, messages: list["Message"]) -> None:
+        for sink in self.sinks:
+            try:
+                sink.write_batch(messages)
+            except Exception as e:
+                # One failing sink must not silence the others.
+                self.stats.sink_errors += 1
+                print(f"Log sink {sink!r} failed: {e}", file=sys.stderr)
+        self.stats.written += len(messages)
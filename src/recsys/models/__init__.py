@@ -0,0 +1,5 @@
+"""
+Recommendation models for the Game Recommender Application.
+Each model owns its training (`fit`), serialization (`save`/`load`) and
+inference API, as described in the LLD.
+"""
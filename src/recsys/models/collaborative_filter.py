@@ -0,0 +1,476 @@
+# src/recsys/models/collaborative_filter.py
+"""
+Collaborative filtering model for the recommender (LLD §3.2).
+
+Wraps `implicit`'s Alternating Least Squares over a user x item ratings
+matrix. Besides the in-memory `fit(ratings_df)` path, `fit_from_path` streams
+a ratings CSV in chunks, interns raw user and game ids into compact int32
+codes as it goes, and accumulates COO triplets in growable numpy buffers, so
+the full BGG ratings dump never exists as a DataFrame.
+
+Between retrains, `fold_in` recomputes one user's factors from their current
+ratings against the fixed item factors (the ALS user step for a single user),
+and `UserVectorStore` keeps those fresh vectors for recently active users, so
+a new `rate_game` event changes that user's recommendations immediately.
+"""
+
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from recsys.logging.app_logger import logger
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+MODEL_FILENAME = "cf_model.pkl"
+MAPPINGS_FILENAME = "cf_mappings.json"
+
+# Column names of the Snowflake mart (LLD §3.2) and of the Kaggle BGG `user_ratings.csv`.
+MART_COLUMNS = ("USER_ID", "GAME_ID", "RATING")
+BGG_CSV_COLUMNS = ("Username", "BGGId", "Rating")
+
+
+class IdInterner:
+    """
+    Maps raw ids (usernames, BGGIds) to dense int32 codes in first-seen order.
+
+    Each chunk is factorized first, so the dict is only consulted once per
+    distinct id in the chunk rather than once per row.
+    """
+
+    def __init__(self) -> None:
+        self._code_of: dict = {}
+        self.ids: list = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def intern(self, values: np.ndarray | pd.Series) -> np.ndarray:
+        """Returns the int32 code of every value, assigning new codes to unseen ids."""
+        inverse, uniques = pd.factorize(values, use_na_sentinel=False)
+        unique_codes = np.empty(len(uniques), dtype=np.int32)
+        for i, raw_id in enumerate(uniques.tolist()):
+            code = self._code_of.get(raw_id)
+            if code is None:
+                code = len(self.ids)
+                self._code_of[raw_id] = code
+                self.ids.append(raw_id)
+            unique_codes[i] = code
+        return np.asarray(unique_codes[inverse])
+
+    def get(self, raw_id: object) -> int | None:
+        """Returns the code of `raw_id`, or None if it was never interned."""
+        return self._code_of.get(raw_id)
+
+    @classmethod
+    def from_ids(cls, ids: list) -> "IdInterner":
+        interner = cls()
+        interner.ids = list(ids)
+        interner._code_of = {raw_id: code for code, raw_id in enumerate(interner.ids)}
+        return interner
+
+
+class GrowableArray:
+    """A preallocated numpy buffer that doubles its capacity when full."""
+
+    def __init__(self, dtype: npt.DTypeLike, capacity: int = 1 << 20):
+        self._data = np.empty(max(1, capacity), dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, values: np.ndarray) -> None:
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            new_capacity = len(self._data)
+            while new_capacity < needed:
+                new_capacity *= 2
+            grown = np.empty(new_capacity, dtype=self._data.dtype)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+        self._data[self._size : needed] = values
+        self._size = needed
+
+    def view(self) -> np.ndarray:
+        """Returns the filled part of the buffer without copying."""
+        return self._data[: self._size]
+
+
+def _keep_last_rating(
+    rows: np.ndarray, cols: np.ndarray, ratings: np.ndarray, n_items: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (Internal) Drops all but the last rating of each (user, game) pair.
+
+    The CSR conversion would otherwise sum them, so a game rated 7 and re-rated
+    8 would train as a 15. The last rating wins, as it does in `fold_in`.
+    """
+    keys = rows.astype(np.int64) * n_items + cols
+    # `np.unique` reports first occurrences; in the reversed keys those are the last ratings.
+    _, first_in_reversed = np.unique(keys[::-1], return_index=True)
+    if len(first_in_reversed) == len(keys):
+        return rows, cols, ratings
+    keep = np.sort(len(keys) - 1 - first_in_reversed)
+    logger.info(f"Dropped {len(keys) - len(keep)} superseded duplicate ratings.")
+    return rows[keep], cols[keep], ratings[keep]
+
+
+class CollaborativeFilter:
+    """
+    ALS collaborative filtering over explicit BGG ratings.
+    """
+
+    def __init__(
+        self,
+        factors: int = 64,
+        regularization: float = 0.05,
+        iterations: int = 15,
+        alpha: float = 1.0,
+        random_state: int | None = 42,
+    ):
+        """
+        Args:
+            factors (int): Latent factor count.
+            regularization (float): L2 regularization of the ALS solve.
+            iterations (int): ALS sweeps.
+            alpha (float): Confidence scaling applied to ratings.
+            random_state (int | None): Seed for factor initialization.
+        """
+        # implicit and scipy.sparse are imported on first use (or by unpickling in `load`), not with the module.
+        from implicit.als import AlternatingLeastSquares
+
+        self.als_model = AlternatingLeastSquares(
+            factors=factors,
+            regularization=regularization,
+            iterations=iterations,
+            alpha=alpha,
+            random_state=random_state,
+        )
+        self.users = IdInterner()
+        self.items = IdInterner()
+        self.user_items: csr_matrix | None = None
+
+    # --- Training ---
+
+    def fit(self, ratings_df: pd.DataFrame, columns: tuple[str, str, str] = MART_COLUMNS) -> "CollaborativeFilter":
+        """
+        Trains on an in-memory ratings frame (LLD §3.2).
+
+        Args:
+            ratings_df (pd.DataFrame): User-item-rating triplets.
+            columns (tuple[str, str, str]): Names of the user, game and rating columns.
+        """
+        if ratings_df.empty:
+            raise ValueError("Cannot fit the collaborative filter on an empty ratings DataFrame.")
+        user_col, item_col, rating_col = columns
+        self.users, self.items = IdInterner(), IdInterner()
+        rows = self.users.intern(ratings_df[user_col].to_numpy())
+        cols = self.items.intern(ratings_df[item_col].to_numpy())
+        ratings = ratings_df[rating_col].to_numpy(dtype=np.float32)
+        return self._fit_triplets(rows, cols, ratings)
+
+    def fit_from_path(
+        self,
+        ratings_path: Path,
+        columns: tuple[str, str, str] = BGG_CSV_COLUMNS,
+        chunksize: int = 1_000_000,
+    ) -> "CollaborativeFilter":
+        """
+        Trains from a ratings CSV without loading it as a single DataFrame.
+
+        The file is read `chunksize` rows at a time with only the three needed
+        columns. Ids are interned to int32 codes chunk by chunk and the COO
+        triplets are appended to growable buffers, then converted to CSR once.
+
+        Args:
+            ratings_path (Path): Path to the ratings CSV (e.g. `user_ratings.csv`).
+            columns (tuple[str, str, str]): Names of the user, game and rating columns.
+            chunksize (int): Rows parsed per chunk.
+        """
+        if not ratings_path.is_file():
+            raise FileNotFoundError(f"Ratings file not found at: {ratings_path}")
+
+        self.users, self.items = IdInterner(), IdInterner()
+        rows = GrowableArray(np.int32)
+        cols = GrowableArray(np.int32)
+        data = GrowableArray(np.float32)
+        for chunk_rows, chunk_cols, chunk_data in self._iter_triplets(ratings_path, columns, chunksize):
+            rows.extend(chunk_rows)
+            cols.extend(chunk_cols)
+            data.extend(chunk_data)
+
+        if not len(data):
+            raise ValueError(f"No ratings found in '{ratings_path}'.")
+        logger.info(f"Streamed {len(data)} ratings for {len(self.users)} users and {len(self.items)} games.")
+        return self._fit_triplets(rows.view(), cols.view(), data.view())
+
+    def _iter_triplets(
+        self, ratings_path: Path, columns: tuple[str, str, str], chunksize: int
+    ) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(Internal) Yields interned (user, item, rating) arrays per CSV chunk."""
+        user_col, item_col, rating_col = columns
+        # Fixed dtypes: inferred per chunk, the same username could come back as an int in one
+        # chunk and a str in another and be interned twice.
+        reader = pd.read_csv(
+            ratings_path,
+            usecols=list(columns),
+            dtype={user_col: str, item_col: "int64", rating_col: "float32"},
+            chunksize=chunksize,
+        )
+        with reader:
+            for chunk in reader:
+                chunk = chunk.dropna(subset=list(columns))
+                yield (
+                    self.users.intern(chunk[user_col].to_numpy()),
+                    self.items.intern(chunk[item_col].to_numpy()),
+                    chunk[rating_col].to_numpy(dtype=np.float32),
+                )
+
+    def _fit_triplets(self, rows: np.ndarray, cols: np.ndarray, ratings: np.ndarray) -> "CollaborativeFilter":
+        """(Internal) Builds the user x item CSR matrix and fits ALS on it."""
+        from scipy.sparse import coo_matrix
+
+        shape = (len(self.users), len(self.items))
+        rows, cols, ratings = _keep_last_rating(rows, cols, ratings, n_items=shape[1])
+        self.user_items = coo_matrix((ratings, (rows, cols)), shape=shape).tocsr()
+        self.als_model.fit(self.user_items, show_progress=False)
+        return self
+
+    # --- Inference ---
+
+    def _require_fitted(self) -> "csr_matrix":
+        if self.user_items is None:
+            raise RuntimeError("The collaborative filter is not fitted. Call `fit` or `load` first.")
+        return self.user_items
+
+    def recommend(self, user_id: object, n: int = 10) -> list[tuple[object, float]]:
+        """
+        Recommends unseen games for a known user.
+
+        Returns:
+            list[tuple[object, float]]: `(game_id, score)` pairs, best first. Empty for unknown users.
+        """
+        user_items = self._require_fitted()
+        code = self.users.get(user_id)
+        if code is None:
+            return []
+        item_codes, scores = self.als_model.recommend(code, user_items[code], N=n)
+        return [(self.items.ids[c], float(s)) for c, s in zip(item_codes, scores, strict=True)]
+
+    def similar_games(self, game_id: object, n: int = 10) -> list[tuple[object, float]]:
+        """Returns the `n` games whose item factors are closest to `game_id`, excluding itself."""
+        self._require_fitted()
+        code = self.items.get(game_id)
+        if code is None:
+            return []
+        item_codes, scores = self.als_model.similar_items(code, N=n + 1)
+        return [(self.items.ids[c], float(s)) for c, s in zip(item_codes, scores, strict=True) if c != code][:n]
+
+    # --- Online fold-in ---
+
+    def user_ratings(self, user_id: object) -> dict:
+        """Returns the ratings a user had at training time, as `{game_id: rating}`."""
+        user_items = self._require_fitted()
+        code = self.users.get(user_id)
+        if code is None:
+            return {}
+        row = user_items[code]
+        return {self.items.ids[c]: float(r) for c, r in zip(row.indices, row.data, strict=True)}
+
+    def fold_in(self, ratings: dict) -> np.ndarray:
+        """
+        Solves one user's factors from their ratings, keeping the item factors fixed.
+
+        With item factors Y, the user's rated rows Y_u and confidences c = alpha * rating, this
+        is the ALS user update `(YᵀY + Y_uᵀ diag(c - 1) Y_u + λI) x = Y_uᵀ c`: a factors x factors
+        solve whose cost grows with the user's rating count, not the catalogue.
+
+        Args:
+            ratings (dict): `{game_id: rating}`; games unknown to the model are ignored.
+
+        Returns:
+            np.ndarray: The user's factor vector (zeros if no rated game is known).
+        """
+        self._require_fitted()
+        model = self.als_model
+        codes, confidences = [], []
+        for game_id, rating in ratings.items():
+            code = self.items.get(game_id)
+            if code is not None:
+                codes.append(code)
+                confidences.append(model.alpha * rating)
+        if not codes:
+            return np.zeros(model.factors, dtype=np.float32)
+        rated = model.item_factors[codes]
+        confidence = np.asarray(confidences, dtype=np.float32)
+        lhs = model.YtY + model.regularization * np.eye(model.factors, dtype=np.float32)
+        lhs += (rated.T * (confidence - 1)) @ rated
+        return np.linalg.solve(lhs, rated.T @ confidence).astype(np.float32)
+
+    def recommend_factors(self, user_factors: np.ndarray, n: int = 10, exclude: Iterable = ()) -> list[tuple]:
+        """Recommends for an explicit factor vector (e.g. from `fold_in`), skipping the `exclude` games."""
+        self._require_fitted()
+        scores = self.als_model.item_factors @ user_factors
+        excluded = [code for code in map(self.items.get, exclude) if code is not None]
+        scores[excluded] = -np.inf
+        n = min(n, len(scores) - len(excluded))
+        if n <= 0:
+            return []
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.items.ids[c], float(scores[c])) for c in top]
+
+    # --- Serialization ---
+
+    def save(self, path: Path) -> None:
+        """Writes `cf_model.pkl` and `cf_mappings.json` into the `path` directory."""
+        user_items = self._require_fitted()
+        path.mkdir(parents=True, exist_ok=True)
+        with open(path / MODEL_FILENAME, "wb") as f:
+            pickle.dump({"als_model": self.als_model, "user_items": user_items}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(path / MAPPINGS_FILENAME, "w", encoding="utf-8") as f:
+            json.dump({"user_ids": self.users.ids, "item_ids": self.items.ids}, f, default=int)
+        logger.info(f"Saved collaborative filter artifacts to '{path}'.")
+
+    @classmethod
+    def load(cls, path: Path) -> "CollaborativeFilter":
+        """Loads the artifacts written by `save`."""
+        model_path, mappings_path = path / MODEL_FILENAME, path / MAPPINGS_FILENAME
+        for artifact in (model_path, mappings_path):
+            if not artifact.is_file() or artifact.stat().st_size == 0:
+                raise FileNotFoundError(f"Collaborative filter artifact missing or empty: '{artifact}'")
+
+        with open(model_path, "rb") as f:
+            state = pickle.load(f)  # noqa: S301 - artifacts are produced by our own training pipeline.
+        with open(mappings_path, encoding="utf-8") as f:
+            mappings = json.load(f)
+
+        model = cls.__new__(cls)
+        model.als_model = state["als_model"]
+        model.user_items = state["user_items"]
+        model.users = IdInterner.from_ids(mappings["user_ids"])
+        model.items = IdInterner.from_ids(mappings["item_ids"])
+        return model
+
+
+class UserVectorStore:
+    """
+    Bounded LRU of user factors folded in online, in front of a trained `CollaborativeFilter`.
+
+    It answers `recommend` and `similar_games` like the filter, so it can stand in for it in
+    `HybridRecommender`: users with fresh ratings are scored with their folded-in factors,
+    everyone else by the trained model.
+    """
+
+    def __init__(self, cf: CollaborativeFilter, maxsize: int = 100_000):
+        """
+        Args:
+            cf (CollaborativeFilter): The trained model whose item factors stay fixed.
+            maxsize (int): Users kept; the least recently updated are evicted (they fall back to the model).
+        """
+        self.cf = cf
+        self.maxsize = maxsize
+        self.fold_ins = 0
+        self.fold_in_seconds = 0.0
+        # user_id -> (ratings {game_id: rating}, factors, revision)
+        self._users: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._users
+
+    def rate(self, user_id: object, ratings: dict) -> np.ndarray:
+        """
+        Records new ratings for a user and refolds their factors.
+
+        Args:
+            user_id: The rating user, known to the model or not.
+            ratings (dict): New `{game_id: rating}`; they override earlier ratings of the same games.
+
+        Returns:
+            np.ndarray: The user's updated factors.
+        """
+        # Held throughout, so concurrent ratings of one user cannot overwrite each other.
+        with self._lock:
+            entry = self._users.get(user_id)
+            current = dict(entry[0]) if entry is not None else self.cf.user_ratings(user_id)
+            current.update(ratings)
+
+            start = time.perf_counter()
+            factors = self.cf.fold_in(current)
+            self.fold_ins += 1
+            self.fold_in_seconds += time.perf_counter() - start
+            self._users[user_id] = (current, factors, self.fold_ins)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.maxsize:
+                self._users.popitem(last=False)
+        return factors
+
+    def apply_event(self, event: dict) -> bool:
+        """Folds in a tracked `rate_game` event (`details`: `game_id`, `rating`); returns whether it applied."""
+        details = event.get("details") or {}
+        if event.get("event_type") != "rate_game" or "game_id" not in details or "rating" not in details:
+            return False
+        self.rate(event["user_id"], {details["game_id"]: float(details["rating"])})
+        return True
+
+    def replay(self, other: "UserVectorStore", skip: dict | None = None) -> dict:
+        """
+        Refolds the users of `other` (e.g. the previous model version's store) against this model.
+
+        Args:
+            other (UserVectorStore): The store to copy users from.
+            skip (dict | None): `{user_id: revision}` returned by an earlier replay; users whose
+                revision in `other` is unchanged since then are not refolded.
+
+        Returns:
+            dict: The `{user_id: revision}` of the users refolded, as of `other`'s snapshot.
+        """
+        skip = skip or {}
+        with other._lock:
+            users = [
+                (user_id, ratings, revision)
+                for user_id, (ratings, _, revision) in other._users.items()
+                if skip.get(user_id) != revision
+            ]
+        for user_id, ratings, _ in users:
+            self.rate(user_id, ratings)
+        return {user_id: revision for user_id, _, revision in users}
+
+    def factors(self, user_id: object) -> np.ndarray | None:
+        """The user's folded-in factors, or None if they have no online update."""
+        with self._lock:
+            entry = self._users.get(user_id)
+        return entry[1] if entry is not None else None
+
+    def revision(self, user_id: object) -> int:
+        """Changes with every fold-in of the user; 0 while they are served by the trained model."""
+        with self._lock:
+            entry = self._users.get(user_id)
+        return entry[2] if entry is not None else 0
+
+    def recommend(self, user_id: object, n: int = 10) -> list[tuple[object, float]]:
+        """Recommends unrated games, from folded-in factors when the user has them."""
+        with self._lock:
+            entry = self._users.get(user_id)
+        if entry is None:
+            return self.cf.recommend(user_id, n)
+        ratings, factors, _ = entry
+        return self.cf.recommend_factors(factors, n, exclude=ratings)
+
+    def similar_games(self, game_id: object, n: int = 10) -> list[tuple[object, float]]:
+        return self.cf.similar_games(game_id, n)
@@ -0,0 +1,331 @@
+# src/recsys/models/hybrid.py
+"""
+Two-stage hybrid recommender (PRD FR-3).
+
+Stage 1, candidate generation: the RAG index (content similarity to the games
+the user liked) and the collaborative filter (the user's ALS recommendations,
+or item-item neighbors for anonymous users) run in parallel on a thread pool.
+FAISS and implicit both release the GIL, so the two searches overlap.
+`recommend_many` runs this stage once for a batch of requests, searching the
+liked games of all of them in one FAISS call (see the API's micro-batcher).
+
+Stage 2, merge and re-rank: the candidate sets are merged into one id array
+with a per-source score column (missing = 0), each source min-max scaled to
+[0, 1]. The `NeighborEngine` then scores every candidate against every liked
+game in one matmul, applying the themes/rating/popularity weights of the POC
+distance, and the final score blends the sources with the mean distance.
+
+Each stage has a time budget. A candidate source that misses its budget is
+dropped for the request; if no source answers, the most popular games are
+returned. If re-ranking misses its budget, the merged candidates are ranked by
+their blended source scores. Re-ranking runs on its own pool: a source that
+overran its budget keeps its thread until it returns, and must not delay the
+re-rank of later requests. Every request records per-stage wall time, which
+`recommend` returns and which is kept in a bounded `timing_history`.
+"""
+
+import itertools
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from recsys.logging.app_logger import logger
+from recsys.models.collaborative_filter import CollaborativeFilter, UserVectorStore
+from recsys.models.rag_recommender import RAGRecommender
+from recsys.utils.distance_metrics import NeighborEngine
+
+SOURCES = ("content", "collaborative")
+
+
+@dataclass(frozen=True)
+class StageBudgets:
+    """Per-stage time budgets in milliseconds (the PRD's p95 target is 500 ms end to end)."""
+
+    candidates_ms: float = 200.0
+    rerank_ms: float = 150.0
+
+
+@dataclass(frozen=True)
+class HybridWeights:
+    """How the merged source scores and the re-ranking distance are blended."""
+
+    content: float = 1.0
+    collaborative: float = 1.0
+    distance: float = 1.0
+
+
+@dataclass
+class HybridRecommendations:
+    """The ranked result of one `HybridRecommender.recommend` call."""
+
+    game_ids: np.ndarray
+    scores: np.ndarray
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    degraded: list[str] = field(default_factory=list)
+
+    def as_pairs(self) -> list[tuple[int, float]]:
+        return [(int(g), float(s)) for g, s in zip(self.game_ids, self.scores, strict=True)]
+
+
+def _min_max(scores: np.ndarray) -> np.ndarray:
+    """(Internal) Scales finite scores to [0, 1]; a constant column becomes all ones."""
+    scores = np.where(np.isfinite(scores), scores, np.nan)
+    if np.all(np.isnan(scores)):
+        return np.zeros_like(scores)
+    low, high = np.nanmin(scores), np.nanmax(scores)
+    scaled = np.ones_like(scores) if high == low else (scores - low) / (high - low)
+    return np.asarray(np.nan_to_num(scaled, nan=0.0))
+
+
+def merge_candidates(candidates: dict[str, tuple[np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merges per-source candidate lists into a unique id array and a score matrix.
+
+    Args:
+        candidates (dict): Source name -> (game ids, scores). Ids of -1 are padding and ignored.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Unique candidate ids and a (n_candidates, len(SOURCES))
+        matrix of min-max scaled scores, 0 where a source did not propose the game.
+    """
+    present = {
+        name: (np.asarray(ids, dtype=np.int64), np.asarray(scores, dtype=np.float64))
+        for name, (ids, scores) in candidates.items()
+    }
+    all_ids = [ids[ids >= 0] for ids, _ in present.values()]
+    merged = np.unique(np.concatenate(all_ids)) if all_ids else np.empty(0, dtype=np.int64)
+    matrix = np.zeros((len(merged), len(SOURCES)), dtype=np.float64)
+    for name, (ids, scores) in present.items():
+        keep = ids >= 0
+        ids, scores = ids[keep], _min_max(scores[keep])
+        # Several query games can propose the same candidate; keep its best score.
+        np.maximum.at(matrix[:, SOURCES.index(name)], np.searchsorted(merged, ids), scores)
+    return merged, matrix
+
+
+class HybridRecommender:
+    """
+    Blends RAG and collaborative-filtering candidates and re-ranks them with the POC distance.
+
+    Any of the three components may be missing; the pipeline degrades to what is available.
+    """
+
+    def __init__(
+        self,
+        rag: RAGRecommender | None = None,
+        cf: CollaborativeFilter | UserVectorStore | None = None,
+        engine: NeighborEngine | None = None,
+        weights: HybridWeights | None = None,
+        budgets: StageBudgets | None = None,
+        n_candidates: int = 100,
+        max_workers: int = 4,
+        history_size: int = 1024,
+    ):
+        """
+        Args:
+            rag (RAGRecommender | None): Content candidate source.
+            cf (CollaborativeFilter | UserVectorStore | None): Collaborative candidate source; a store
+                also reflects ratings folded in since training.
+            engine (NeighborEngine | None): Catalogue features used by the re-ranker and popularity fallback.
+            weights (HybridWeights | None): Blend weights.
+            budgets (StageBudgets | None): Per-stage time budgets.
+            n_candidates (int): Candidates requested from each source.
+            max_workers (int): Threads of each stage's pool (candidates and re-rank).
+            history_size (int): Number of recent per-request timings kept in `timing_history`.
+        """
+        self.rag = rag
+        self.cf = cf
+        self.engine = engine
+        self.weights = weights or HybridWeights()
+        self.budgets = budgets or StageBudgets()
+        self.n_candidates = n_candidates
+        self.timing_history: deque[dict[str, float]] = deque(maxlen=history_size)
+        self._candidate_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hybrid-candidates")
+        self._rerank_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hybrid-rerank")
+        self._popular_rows: np.ndarray | None = None
+
+    # --- Stage 1: candidate generation ---
+
+    def _content_candidates(
+        self, rag: RAGRecommender, liked_sets: list[np.ndarray]
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """(Internal) Searches the liked games of every request in one batched FAISS call."""
+        known = [liked[np.isin(liked, rag.game_ids)] for liked in liked_sets]
+        empty = (np.empty(0, dtype=np.int64), np.empty(0))
+        all_known = np.concatenate(known) if known else np.empty(0, dtype=np.int64)
+        if len(all_known) == 0:
+            return [empty] * len(liked_sets)
+        ids, scores = rag.similar_games(all_known.tolist(), k=self.n_candidates)
+        bounds = np.cumsum([0] + [len(k) for k in known])
+        return [
+            (ids[lo:hi].ravel(), scores[lo:hi].ravel()) if hi > lo else empty for lo, hi in itertools.pairwise(bounds)
+        ]
+
+    def _collaborative_candidates(
+        self, cf: CollaborativeFilter | UserVectorStore, liked: np.ndarray, user_id: object
+    ) -> tuple[np.ndarray, np.ndarray]:
+        pairs = cf.recommend(user_id, n=self.n_candidates) if user_id is not None else []
+        if not pairs:
+            # Anonymous or unknown user: item-item neighbors of the liked games.
+            pairs = [pair for game_id in liked.tolist() for pair in cf.similar_games(game_id, n=self.n_candidates)]
+        if not pairs:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        ids, scores = zip(*pairs, strict=True)
+        return np.asarray(ids, dtype=np.int64), np.asarray(scores, dtype=np.float64)
+
+    def _generate_candidates(
+        self, liked_sets: list[np.ndarray], user_ids: list, degraded: list[list[str]]
+    ) -> list[dict[str, tuple[np.ndarray, np.ndarray]]]:
+        """(Internal) Runs every available source in parallel for a batch of requests, keeping those in budget."""
+        futures: dict[str, Future] = {}
+        if self.rag is not None:
+            futures["content"] = self._candidate_executor.submit(self._content_candidates, self.rag, liked_sets)
+        if (cf := self.cf) is not None:
+            futures["collaborative"] = self._candidate_executor.submit(
+                lambda: [
+                    self._collaborative_candidates(cf, liked, user_id)
+                    for liked, user_id in zip(liked_sets, user_ids, strict=True)
+                ]
+            )
+
+        deadline = time.perf_counter() + self.budgets.candidates_ms / 1000
+        candidates: list[dict] = [{} for _ in liked_sets]
+        for name, future in futures.items():
+            try:
+                per_request = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            except FutureTimeoutError:
+                future.cancel()
+                per_request, reason = None, f"{name}:timeout"
+            except Exception as e:
+                logger.warning(f"Hybrid {name} candidate source failed: {e}")
+                per_request, reason = None, f"{name}:error"
+            for i in range(len(liked_sets)):
+                if per_request is None:
+                    degraded[i].append(reason)
+                else:
+                    candidates[i][name] = per_request[i]
+        return candidates
+
+    def _popular(self, liked: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """(Internal) Fallback: the most popular catalogue games the user has not liked."""
+        if self.engine is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        if self._popular_rows is None:
+            self._popular_rows = np.argsort(-self.engine.popularity, kind="stable")
+        ids = self.engine.game_ids[self._popular_rows[: n + len(liked)]]
+        ids = ids[~np.isin(ids, liked)][:n]
+        return ids, self.engine.popularity[self.engine.rows_for(ids)]
+
+    # --- Stage 2: re-ranking ---
+
+    def _blend(self, source_scores: np.ndarray) -> np.ndarray:
+        source_weights = np.array([self.weights.content, self.weights.collaborative])
+        return np.asarray(source_scores @ source_weights)
+
+    def _rerank(self, liked: np.ndarray, candidate_ids: np.ndarray, source_scores: np.ndarray) -> np.ndarray:
+        """(Internal) Scores all candidates against all liked games with one distance computation."""
+        scores = self._blend(source_scores)
+        if self.engine is None:
+            return scores
+        catalogue_ids = self.engine.game_ids
+        query_rows = self.engine.rows_for(liked[np.isin(liked, catalogue_ids)])
+        in_catalogue = np.isin(candidate_ids, catalogue_ids)
+        if len(query_rows) == 0 or not in_catalogue.any():
+            return scores
+        mean_dist = self.engine.distances(query_rows, self.engine.rows_for(candidate_ids[in_catalogue])).mean(axis=0)
+        # Candidates without catalogue features get the worst observed distance.
+        distance = np.full(len(candidate_ids), mean_dist.max())
+        distance[in_catalogue] = mean_dist
+        return scores - self.weights.distance * _min_max(distance)
+
+    # --- Public API ---
+
+    def recommend(self, liked_game_ids: list[int], user_id: object = None, n: int = 10) -> HybridRecommendations:
+        """
+        Recommends `n` games for a user who liked `liked_game_ids`.
+
+        Args:
+            liked_game_ids (list[int]): BGGIds of the games the user selected or rated highly.
+            user_id: Optional user id known to the collaborative filter.
+            n (int): Number of recommendations.
+
+        Returns:
+            HybridRecommendations: Ranked ids and scores, per-stage timings and any degradations.
+        """
+        return self.recommend_many([(liked_game_ids, user_id, n)])[0]
+
+    def recommend_many(self, requests: list[tuple[list[int], object, int]]) -> list[HybridRecommendations]:
+        """
+        Recommends for a batch of requests, sharing one candidate-generation pass.
+
+        The liked games of every request are searched in a single FAISS call; merging and
+        re-ranking then run per request. Results match calling `recommend` for each request.
+
+        Args:
+            requests (list[tuple]): `(liked_game_ids, user_id, n)` per request.
+
+        Returns:
+            list[HybridRecommendations]: One result per request, in order.
+        """
+        liked_sets = [np.asarray(liked, dtype=np.int64) for liked, _, _ in requests]
+        degraded: list[list[str]] = [[] for _ in requests]
+        start = time.perf_counter()
+        candidates = self._generate_candidates(liked_sets, [user_id for _, user_id, _ in requests], degraded)
+        candidates_ms = (time.perf_counter() - start) * 1000
+        return [
+            self._rank(liked, request_candidates, n, request_degraded, start, candidates_ms)
+            for liked, request_candidates, (_, _, n), request_degraded in zip(
+                liked_sets, candidates, requests, degraded, strict=True
+            )
+        ]
+
+    def _rank(
+        self,
+        liked: np.ndarray,
+        candidates: dict[str, tuple[np.ndarray, np.ndarray]],
+        n: int,
+        degraded: list[str],
+        start: float,
+        candidates_ms: float,
+    ) -> HybridRecommendations:
+        """(Internal) Stage 2 for one request: merge, re-rank within budget, and record timings."""
+        timings = {"candidates": candidates_ms}
+        stage_end = time.perf_counter()
+        candidate_ids, source_scores = merge_candidates(candidates)
+        keep = ~np.isin(candidate_ids, liked)
+        candidate_ids, source_scores = candidate_ids[keep], source_scores[keep]
+        timings["merge"] = (time.perf_counter() - stage_end) * 1000
+        stage_end = time.perf_counter()
+
+        if len(candidate_ids) == 0:
+            degraded.append("popularity_fallback")
+            game_ids, scores = self._popular(liked, n)
+        else:
+            future = self._rerank_executor.submit(self._rerank, liked, candidate_ids, source_scores)
+            try:
+                scores = future.result(timeout=self.budgets.rerank_ms / 1000)
+            except FutureTimeoutError:
+                degraded.append("rerank:timeout")
+                scores = self._blend(source_scores)
+            except Exception as e:
+                logger.warning(f"Hybrid re-ranking failed: {e}")
+                degraded.append("rerank:error")
+                scores = self._blend(source_scores)
+            top = np.argsort(-scores, kind="stable")[:n]
+            game_ids, scores = candidate_ids[top], scores[top]
+        timings["rerank"] = (time.perf_counter() - stage_end) * 1000
+        timings["total"] = (time.perf_counter() - start) * 1000
+
+        self.timing_history.append(timings)
+        if degraded:
+            logger.warning(f"Hybrid recommendation degraded: {', '.join(degraded)} ({timings['total']:.1f} ms).")
+        return HybridRecommendations(game_ids, np.asarray(scores, dtype=np.float64), timings, degraded)
+
+    def close(self) -> None:
+        """Shuts down the worker threads of both stages."""
+        self._candidate_executor.shutdown(wait=False, cancel_futures=True)
+        self._rerank_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,164 @@
+# src/recsys/models/neighbor_table.py
+"""
+Precomputed item-to-item neighbor table.
+
+The "Because you chose X" lists only change when the model is retrained, so
+they are computed once at training time with the `NeighborEngine` and stored
+as flat arrays that serving memory-maps:
+
+    neighbor_ids.npy        int32   BGGIds of every game's neighbors, back to back
+    neighbor_scores.npy     float16 the matching POC distances (lower is closer)
+    neighbor_offsets.npy    int64   game row r owns ids[offsets[r]:offsets[r + 1]]
+    neighbor_positions.npy  int32   dense BGGId -> row lookup, -1 for unknown games
+    neighbors.json          k, game count and distance weights
+
+A lookup is two array reads and a slice, with no similarity computation on
+the request path. The build scores the catalogue in blocks of query rows on a
+thread pool (the matmul and top-k selection release the GIL) and writes each
+block straight into the memory-mapped output files, so peak memory stays at
+one (block_size, n_games) distance buffer per worker.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+
+from recsys.logging.app_logger import logger
+from recsys.utils.distance_metrics import NeighborEngine
+
+IDS_FILENAME = "neighbor_ids.npy"
+SCORES_FILENAME = "neighbor_scores.npy"
+OFFSETS_FILENAME = "neighbor_offsets.npy"
+POSITIONS_FILENAME = "neighbor_positions.npy"
+METADATA_FILENAME = "neighbors.json"
+
+
+class NeighborTable:
+    """Read-only, memory-mapped top-K neighbor lists keyed by BGGId."""
+
+    def __init__(self, ids: np.ndarray, scores: np.ndarray, offsets: np.ndarray, positions: np.ndarray, k: int):
+        self.ids = ids
+        self.scores = scores
+        self.offsets = offsets
+        self.positions = positions
+        self.k = k
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def neighbors(self, game_id: int, n: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the precomputed neighbors of one game, closest first.
+
+        Args:
+            game_id (int): The BGGId to look up.
+            n (int | None): Return at most this many neighbors. Defaults to all `k`.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Neighbor BGGIds and distances (views into the
+            memory-mapped arrays). Both are empty for games not in the table.
+        """
+        row = self.positions[game_id] if 0 <= game_id < len(self.positions) else -1
+        if row < 0:
+            return self.ids[:0], self.scores[:0]
+        start, end = self.offsets[row], self.offsets[row + 1]
+        if n is not None:
+            end = min(end, start + n)
+        return self.ids[start:end], self.scores[start:end]
+
+    def similar_games(self, game_id: int, n: int = 10) -> list[tuple[int, float]]:
+        """Returns `(game_id, distance)` pairs for one game, closest first."""
+        ids, scores = self.neighbors(game_id, n)
+        return [(int(g), float(s)) for g, s in zip(ids, scores, strict=True)]
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "NeighborTable":
+        """
+        Loads a table written by `build_neighbor_table`.
+
+        Args:
+            path (Path): Model version directory, e.g. `models/v1`.
+            mmap (bool): Memory-map the arrays instead of reading them into private memory.
+        """
+        with open(path / METADATA_FILENAME, encoding="utf-8") as f:
+            metadata = json.load(f)
+        mode: Literal["r"] | None = "r" if mmap else None
+        table = cls(
+            ids=np.load(path / IDS_FILENAME, mmap_mode=mode),
+            scores=np.load(path / SCORES_FILENAME, mmap_mode=mode),
+            offsets=np.load(path / OFFSETS_FILENAME, mmap_mode=mode),
+            positions=np.load(path / POSITIONS_FILENAME, mmap_mode=mode),
+            k=metadata["k"],
+        )
+        if len(table) != metadata["n_games"]:
+            raise ValueError(f"Neighbor table holds {len(table)} games but metadata lists {metadata['n_games']}.")
+        return table
+
+
+def _write_neighbors(engine: NeighborEngine, path: Path, k: int, block_size: int, max_workers: int | None) -> None:
+    """(Internal) Scores the catalogue block by block into memory-mapped id and score files."""
+    n_games = len(engine)
+    ids = np.lib.format.open_memmap(path / IDS_FILENAME, mode="w+", dtype=np.int32, shape=(n_games * k,))
+    scores = np.lib.format.open_memmap(path / SCORES_FILENAME, mode="w+", dtype=np.float16, shape=(n_games * k,))
+    ids_2d, scores_2d = ids.reshape(n_games, k), scores.reshape(n_games, k)
+
+    def score_block(start: int) -> None:
+        rows = np.arange(start, min(start + block_size, n_games))
+        neighbor_rows, dist = engine.kneighbors_rows(rows, k, batch_size=block_size)
+        ids_2d[rows] = engine.game_ids[neighbor_rows]
+        scores_2d[rows] = dist
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # list() re-raises the first failed block.
+        list(executor.map(score_block, range(0, n_games, block_size)))
+    ids.flush()
+    scores.flush()
+    # The maps are closed when this returns, before the table is re-opened for reading.
+
+
+def build_neighbor_table(
+    engine: NeighborEngine,
+    path: Path,
+    k: int = 50,
+    block_size: int = 1024,
+    max_workers: int | None = None,
+) -> NeighborTable:
+    """
+    Computes the top-`k` neighbors of every catalogue game and writes the table to `path`.
+
+    Args:
+        engine (NeighborEngine): The catalogue and distance weights to score with.
+        path (Path): Model version directory the arrays are written into.
+        k (int): Neighbors kept per game.
+        block_size (int): Query games scored per matrix pass.
+        max_workers (int | None): Threads scoring blocks concurrently. Defaults to the CPU count.
+
+    Returns:
+        NeighborTable: The freshly written table, memory-mapped.
+    """
+    n_games = len(engine)
+    k = max(0, min(k, n_games - 1))
+    if n_games and int(engine.game_ids.max()) > np.iinfo(np.int32).max:
+        raise ValueError("Game ids must fit in int32 to be stored in the neighbor table.")
+    path.mkdir(parents=True, exist_ok=True)
+
+    if n_games * k:
+        _write_neighbors(engine, path, k, block_size, max_workers)
+    else:
+        # Nothing to score, and an empty file cannot be memory-mapped.
+        np.save(path / IDS_FILENAME, np.empty(0, dtype=np.int32))
+        np.save(path / SCORES_FILENAME, np.empty(0, dtype=np.float16))
+
+    np.save(path / OFFSETS_FILENAME, np.arange(n_games + 1, dtype=np.int64) * k)
+    positions = np.full(int(engine.game_ids.max()) + 1 if n_games else 0, -1, dtype=np.int32)
+    positions[engine.game_ids] = np.arange(n_games, dtype=np.int32)
+    np.save(path / POSITIONS_FILENAME, positions)
+    with open(path / METADATA_FILENAME, "w", encoding="utf-8") as f:
+        json.dump({"k": k, "n_games": n_games, "weights": asdict(engine.weights)}, f)
+
+    logger.info(f"Wrote neighbor table for {n_games} games (k={k}) to '{path}'.")
+    return NeighborTable.load(path)
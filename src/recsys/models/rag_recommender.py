@@ -0,0 +1,319 @@
+# src/recsys/models/rag_recommender.py
+"""
+FAISS-backed retrieval for the RAG recommender.
+
+The recommender stores L2-normalized game embeddings in a FAISS index and
+retrieves nearest games by inner product, which ranks identically to the
+`IndexFlatL2` of LLD §3.1 on unit vectors while returning cosine similarities.
+
+Three index types are supported:
+
+- `flat`: exact brute-force search. Best recall, cost grows linearly with the catalogue.
+- `ivf_flat`: inverted file over k-means cells. Sub-linear search tuned by `nprobe`.
+- `hnsw`: hierarchical navigable small-world graph. Fast, high recall, tuned by `ef_search`.
+
+Saved indexes are loaded with FAISS memory-mapping (`IO_FLAG_MMAP`), so every
+forked API worker maps the same page-cache pages instead of holding a private copy.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import faiss
+import numpy as np
+import pandas as pd
+
+from recsys.logging.app_logger import logger
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+INDEX_FILENAME = "rag_index.faiss"
+METADATA_FILENAME = "metadata.json"
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw")
+
+# Flat and HNSW keep their vectors in a flat code array, which FAISS maps with
+# IO_FLAG_MMAP_IFC. IVF keeps vectors in inverted lists, which IO_FLAG_MMAP maps.
+_MMAP_IFC = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+_MMAP_FLAGS = {
+    "flat": _MMAP_IFC | faiss.IO_FLAG_READ_ONLY,
+    "hnsw": _MMAP_IFC | faiss.IO_FLAG_READ_ONLY,
+    "ivf_flat": faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY,
+}
+
+
+def build_embedding_text(games_df: pd.DataFrame) -> pd.Series:
+    """
+    Concatenates the game fields used for embedding (LLD §3.1, step 2).
+
+    Args:
+        games_df (pd.DataFrame): Frame with `NAME`, `DESCRIPTION`, `CATEGORIES` and `MECHANICS` columns.
+
+    Returns:
+        pd.Series: One "Name: ...; Description: ...; ..." string per game.
+    """
+    fields = [
+        ("Name", "NAME"),
+        ("Description", "DESCRIPTION"),
+        ("Categories", "CATEGORIES"),
+        ("Mechanics", "MECHANICS"),
+    ]
+    parts = [prefix + ": " + games_df[column].fillna("").astype(str) for prefix, column in fields]
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + "; " + part
+    return text
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """(Internal) Returns C-contiguous float32 unit-length rows."""
+    vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32).copy()
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+class RAGRecommender:
+    """
+    Content-based retrieval over game embeddings backed by a FAISS index.
+    """
+
+    def __init__(
+        self,
+        index_type: str = "flat",
+        embedding_model_name: str = DEFAULT_EMBEDDING_MODEL,
+        nlist: int | None = None,
+        nprobe: int = 8,
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        ef_construction: int = 80,
+    ):
+        """
+        Args:
+            index_type (str): One of 'flat', 'ivf_flat' or 'hnsw'.
+            embedding_model_name (str): sentence-transformers model used to encode text.
+            nlist (int | None): IVF cell count. Defaults to ~4*sqrt(n_games).
+            nprobe (int): IVF cells visited per query.
+            hnsw_m (int): HNSW graph degree.
+            ef_search (int): HNSW search beam width.
+            ef_construction (int): HNSW construction beam width.
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{index_type}'. Expected one of {INDEX_TYPES}.")
+        self.index_type = index_type
+        self.embedding_model_name = embedding_model_name
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self.ef_construction = ef_construction
+
+        self.faiss_index: faiss.Index | None = None
+        self.game_ids: np.ndarray = np.empty(0, dtype=np.int64)
+        self._row_of: dict[int, int] = {}
+        self._embedding_model: SentenceTransformer | None = None
+
+    # --- Training ---
+
+    def fit(self, games_df: pd.DataFrame, id_column: str = "GAME_ID", batch_size: int = 64) -> "RAGRecommender":
+        """
+        Embeds the games and builds the index (LLD §3.1).
+
+        Args:
+            games_df (pd.DataFrame): Games with an id column plus the `build_embedding_text` fields.
+            id_column (str): Column holding the game id.
+            batch_size (int): Encoding batch size.
+        """
+        if games_df.empty:
+            raise ValueError("Cannot fit the RAG recommender on an empty games DataFrame.")
+        texts = build_embedding_text(games_df).tolist()
+        embeddings = self.encode(texts, batch_size=batch_size)
+        return self.fit_embeddings(games_df[id_column].to_numpy(), embeddings)
+
+    def fit_embeddings(self, game_ids: np.ndarray, embeddings: np.ndarray) -> "RAGRecommender":
+        """
+        Builds the index from precomputed embeddings.
+
+        Args:
+            game_ids (np.ndarray): Game id of each embedding row.
+            embeddings (np.ndarray): Embeddings, shape (n_games, dim).
+        """
+        vectors = _normalize(embeddings)
+        if len(game_ids) != len(vectors):
+            raise ValueError(f"Got {len(game_ids)} game ids for {len(vectors)} embeddings.")
+
+        index = faiss.index_factory(vectors.shape[1], self._factory_string(len(vectors)), faiss.METRIC_INNER_PRODUCT)
+        if self.index_type == "hnsw":
+            self._hnsw(index).efConstruction = self.ef_construction
+        if not index.is_trained:
+            index.train(vectors)
+        index.add(vectors)
+        if self.index_type == "ivf_flat":
+            # Needed for `vectors_for`; serialized with the index.
+            faiss.extract_index_ivf(index).make_direct_map()
+
+        self.faiss_index = index
+        self._set_game_ids(game_ids)
+        self._apply_search_params()
+        logger.info(f"Built {self.index_type} index with {index.ntotal} vectors of dim {index.d}.")
+        return self
+
+    def _factory_string(self, n_vectors: int) -> str:
+        """(Internal) Returns the `faiss.index_factory` spec for the configured index type."""
+        if self.index_type == "ivf_flat":
+            nlist = self.nlist or max(1, int(4 * math.sqrt(n_vectors)))
+            # FAISS wants ~39 training points per cell; shrink nlist for small catalogues.
+            nlist = max(1, min(nlist, n_vectors // 39 or 1))
+            return f"IVF{nlist},Flat"
+        if self.index_type == "hnsw":
+            return f"HNSW{self.hnsw_m}"
+        return "Flat"
+
+    def _apply_search_params(self) -> None:
+        """(Internal) Pushes nprobe / efSearch onto the live index."""
+        if self.faiss_index is None:
+            return
+        if self.index_type == "ivf_flat":
+            faiss.extract_index_ivf(self.faiss_index).nprobe = self.nprobe
+        elif self.index_type == "hnsw":
+            self._hnsw(self.faiss_index).efSearch = self.ef_search
+
+    @staticmethod
+    def _hnsw(index: faiss.Index) -> faiss.HNSW:
+        """(Internal) The graph of an 'hnsw' index, which holds its beam widths."""
+        hnsw_index = faiss.downcast_index(index)
+        if not isinstance(hnsw_index, faiss.IndexHNSW):
+            raise TypeError(f"Expected an HNSW index, got {type(hnsw_index).__name__}.")
+        return hnsw_index.hnsw
+
+    def _set_game_ids(self, game_ids: np.ndarray) -> None:
+        self.game_ids = np.asarray(game_ids, dtype=np.int64)
+        self._row_of = {int(game_id): row for row, game_id in enumerate(self.game_ids)}
+
+    # --- Encoding ---
+
+    def encode(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        """Encodes texts with the sentence-transformers model, loading it on first use."""
+        if self._embedding_model is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._embedding_model = SentenceTransformer(self.embedding_model_name)
+        embeddings = self._embedding_model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+        return np.asarray(embeddings, dtype=np.float32)
+
+    # --- Inference ---
+
+    def _require_index(self) -> faiss.Index:
+        if self.faiss_index is None:
+            raise RuntimeError("The RAG index is not loaded. Call `fit` or `load` first.")
+        return self.faiss_index
+
+    def search_many(self, query_vectors: np.ndarray, k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Searches a batch of query embeddings in one FAISS call.
+
+        Args:
+            query_vectors (np.ndarray): Query embeddings, shape (n_queries, dim).
+            k (int): Number of results per query.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Game ids and cosine similarities, both (n_queries, k).
+            Slots FAISS could not fill hold id -1 and score -inf.
+        """
+        index = self._require_index()
+        scores, rows = index.search(_normalize(query_vectors), k)
+        ids = np.where(rows >= 0, self.game_ids[np.clip(rows, 0, None)], -1)
+        scores = np.where(rows >= 0, scores, -np.inf)
+        return ids, scores
+
+    def search(self, query_vector: np.ndarray, k: int = 10) -> list[tuple[int, float]]:
+        """Searches a single query embedding and returns `(game_id, score)` pairs."""
+        ids, scores = self.search_many(np.atleast_2d(query_vector), k)
+        return [(int(i), float(s)) for i, s in zip(ids[0], scores[0], strict=True) if i >= 0]
+
+    def search_text(self, texts: list[str], k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """Encodes free-text queries and searches them as one batch."""
+        return self.search_many(self.encode(texts), k)
+
+    def vectors_for(self, game_ids: list[int]) -> np.ndarray:
+        """Reconstructs the stored (normalized) embeddings of the given games."""
+        index = self._require_index()
+        try:
+            rows = np.array([self._row_of[int(g)] for g in game_ids], dtype=np.int64)
+        except KeyError as e:
+            raise KeyError(f"Game {e.args[0]} is not in the RAG index.") from e
+        return np.asarray(index.reconstruct_batch(rows))
+
+    def similar_games(self, game_ids: list[int], k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the `k` most similar games for each given game, excluding the game itself."""
+        ids, scores = self.search_many(self.vectors_for(game_ids), k + 1)
+        out_ids = np.full((len(game_ids), k), -1, dtype=np.int64)
+        out_scores = np.full((len(game_ids), k), -np.inf, dtype=np.float32)
+        for row, game_id in enumerate(game_ids):
+            keep = ids[row] != game_id
+            kept_ids, kept_scores = ids[row][keep][:k], scores[row][keep][:k]
+            out_ids[row, : len(kept_ids)] = kept_ids
+            out_scores[row, : len(kept_scores)] = kept_scores
+        return out_ids, out_scores
+
+    # --- Serialization ---
+
+    def save(self, path: Path) -> None:
+        """
+        Writes `rag_index.faiss` and `metadata.json` into the `path` directory.
+
+        Args:
+            path (Path): Model version directory, e.g. `models/v1`.
+        """
+        index = self._require_index()
+        path.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(index, str(path / INDEX_FILENAME))
+        metadata = {
+            "ids": self.game_ids.tolist(),
+            "index_type": self.index_type,
+            "dim": index.d,
+            "embedding_model": self.embedding_model_name,
+            "nprobe": self.nprobe,
+            "ef_search": self.ef_search,
+        }
+        with open(path / METADATA_FILENAME, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        logger.info(f"Saved RAG artifacts to '{path}'.")
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "RAGRecommender":
+        """
+        Loads the artifacts written by `save`.
+
+        Args:
+            path (Path): Model version directory, e.g. `models/v1`.
+            mmap (bool): Memory-map the index instead of reading it into private memory.
+
+        Returns:
+            RAGRecommender: A read-only recommender ready for search.
+        """
+        index_path, metadata_path = path / INDEX_FILENAME, path / METADATA_FILENAME
+        for artifact in (index_path, metadata_path):
+            if not artifact.is_file() or artifact.stat().st_size == 0:
+                raise FileNotFoundError(f"RAG artifact missing or empty: '{artifact}'")
+
+        with open(metadata_path, encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        recommender = cls(
+            index_type=metadata.get("index_type", "flat"),
+            embedding_model_name=metadata.get("embedding_model", DEFAULT_EMBEDDING_MODEL),
+            nprobe=metadata.get("nprobe", 8),
+            ef_search=metadata.get("ef_search", 64),
+        )
+        flags = _MMAP_FLAGS[recommender.index_type] if mmap else 0
+        recommender.faiss_index = faiss.read_index(str(index_path), flags)
+        recommender._set_game_ids(metadata["ids"])
+        recommender._apply_search_params()
+        if recommender.faiss_index.ntotal != len(recommender.game_ids):
+            raise ValueError(
+                f"Index holds {recommender.faiss_index.ntotal} vectors but metadata lists {len(recommender.game_ids)} ids."
+            )
+        return recommender
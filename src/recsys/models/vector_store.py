@@ -0,0 +1,255 @@
+# src/recsys/models/vector_store.py
+"""
+Compact, quantized storage for game embeddings.
+
+The POC keeps every embedding as a Python list inside a dict, and the LLD
+stores raw float32 vectors. `QuantizedVectorStore` instead keeps all vectors
+as one contiguous code array in one of four formats:
+
+- `float32`: 4 bytes per dimension, exact.
+- `float16`: 2 bytes per dimension, ~3 significant digits.
+- `int8`:    1 byte per dimension; each dimension is scaled to [-127, 127]
+             from its own min/max (scalar quantization).
+- `pq`:      `pq_m` bytes per vector; the vector is split into `pq_m`
+             sub-vectors, each replaced by the id of its nearest of 256
+             k-means centroids (product quantization).
+
+Vectors are L2-normalized and scored by inner product (cosine similarity), as
+in `RAGRecommender`. Compressed codes are scored without decoding the whole
+array: float16/int8 blocks are widened on the fly, and int8 folds its scale
+and offset into the query; PQ uses per-query lookup tables (asymmetric
+distance). Because quantization reorders near-ties, `search_many` can pull
+`rescore_factor * k` candidates from the codes and re-score only those rows
+against the full-precision vectors, which are kept memory-mapped on disk and
+never paged in beyond the candidates touched.
+
+The store is not wired into training or serving yet: `RAGRecommender` still
+serves from its FAISS index, and `benchmark_vector_store` measures the formats.
+"""
+
+import json
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from recsys.logging.app_logger import logger
+
+FORMATS = ("float32", "float16", "int8", "pq")
+CODES_FILENAME = "vector_codes.npy"
+FULL_FILENAME = "vector_full.npy"
+IDS_FILENAME = "vector_ids.npy"
+QUANTIZER_FILENAME = "vector_quantizer.npz"
+METADATA_FILENAME = "vector_store.json"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """(Internal) Returns C-contiguous float32 unit-length rows."""
+    vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32).copy()
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """(Internal) Returns the column indices of each row's `k` highest scores, best first."""
+    k = min(k, scores.shape[1])
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+class QuantizedVectorStore:
+    """
+    Game embeddings held as one contiguous array of float16, int8 or PQ codes.
+    """
+
+    def __init__(self, fmt: str = "int8", pq_m: int = 48, block_size: int = 65_536):
+        """
+        Args:
+            fmt (str): One of 'float32', 'float16', 'int8' or 'pq'.
+            pq_m (int): PQ sub-vectors (= bytes per vector); must divide the dimension.
+            block_size (int): Rows widened to float32 at a time while scoring.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported vector format '{fmt}'. Expected one of {list(FORMATS)}.")
+        self.fmt = fmt
+        self.pq_m = pq_m
+        self.block_size = block_size
+
+        self.game_ids: np.ndarray = np.empty(0, dtype=np.int64)
+        self.codes: np.ndarray | None = None
+        self.full: np.ndarray | None = None
+        self.dim = 0
+        # int8: per-dimension x ≈ code * scale + offset. pq: centroids (pq_m, 256, dim / pq_m). Empty otherwise.
+        self.scale: np.ndarray = np.empty(0, dtype=np.float32)
+        self.offset: np.ndarray = np.empty(0, dtype=np.float32)
+        self.centroids: np.ndarray = np.empty(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Resident bytes of the code array and quantizer (excludes the memory-mapped full vectors)."""
+        extra = sum(a.nbytes for a in (self.scale, self.offset, self.centroids))
+        return (self.codes.nbytes if self.codes is not None else 0) + extra
+
+    # --- Building ---
+
+    def fit(self, game_ids: np.ndarray, vectors: np.ndarray) -> "QuantizedVectorStore":
+        """
+        Normalizes and encodes `vectors`, training the quantizer if the format needs one.
+
+        Args:
+            game_ids (np.ndarray): Game id of each vector row.
+            vectors (np.ndarray): Embeddings, shape (n_games, dim).
+        """
+        vectors = _normalize(vectors)
+        if len(game_ids) != len(vectors):
+            raise ValueError(f"Got {len(game_ids)} game ids for {len(vectors)} vectors.")
+        if not len(vectors):
+            raise ValueError("Cannot fit the vector store on zero vectors.")
+        self.game_ids = np.asarray(game_ids, dtype=np.int64)
+        self.dim = vectors.shape[1]
+        self.full = vectors
+
+        if self.fmt == "float32":
+            self.codes = vectors
+        elif self.fmt == "float16":
+            self.codes = vectors.astype(np.float16)
+        elif self.fmt == "int8":
+            low, high = vectors.min(axis=0), vectors.max(axis=0)
+            self.offset = ((high + low) / 2).astype(np.float32)
+            self.scale = np.maximum((high - low) / 254, np.finfo(np.float32).tiny).astype(np.float32)
+            self.codes = np.clip(np.rint((vectors - self.offset) / self.scale), -127, 127).astype(np.int8)
+        else:
+            if self.dim % self.pq_m:
+                raise ValueError(f"pq_m={self.pq_m} must divide the embedding dimension {self.dim}.")
+            pq = faiss.ProductQuantizer(self.dim, self.pq_m, 8)
+            pq.train(vectors)
+            self.centroids = faiss.vector_to_array(pq.centroids).reshape(self.pq_m, pq.ksub, pq.dsub)
+            self.codes = pq.compute_codes(vectors)
+        logger.info(f"Encoded {len(self)} vectors as {self.fmt} ({self.nbytes / len(self):.0f} bytes/vector).")
+        return self
+
+    # --- Scoring ---
+
+    def _codes(self) -> np.ndarray:
+        """(Internal) The code array; raises if the store was never fitted or loaded."""
+        if self.codes is None:
+            raise RuntimeError("The vector store is empty. Call `fit` or `load` first.")
+        return self.codes
+
+    def _score_codes(self, queries: np.ndarray, rows: slice) -> np.ndarray:
+        """(Internal) Approximate inner products between queries and a block of code rows."""
+        codes: np.ndarray = self._codes()[rows]
+        if self.fmt in ("float32", "float16"):
+            return queries @ codes.astype(np.float32, copy=False).T
+        if self.fmt == "int8":
+            # q · (c * s + o) == (q * s) · c + q · o
+            return np.asarray((queries * self.scale) @ codes.astype(np.float32).T + (queries @ self.offset)[:, None])
+        # PQ asymmetric distance: one (pq_m, 256) lookup table per query.
+        sub_queries = queries.reshape(len(queries), self.pq_m, 1, -1)
+        tables = (sub_queries * self.centroids[None]).sum(axis=-1)
+        scores = np.zeros((len(queries), len(codes)), dtype=np.float32)
+        for m in range(self.pq_m):
+            scores += tables[:, m, codes[:, m]]
+        return scores
+
+    def decode(self, rows: np.ndarray) -> np.ndarray:
+        """Reconstructs the (approximate) vectors stored at `rows`."""
+        codes: np.ndarray = self._codes()[rows]
+        if self.fmt in ("float32", "float16"):
+            return codes.astype(np.float32)
+        if self.fmt == "int8":
+            return np.asarray(codes.astype(np.float32) * self.scale + self.offset)
+        return np.asarray(self.centroids[np.arange(self.pq_m), codes]).reshape(len(rows), self.dim)
+
+    def search_many(
+        self, query_vectors: np.ndarray, k: int = 10, rescore: bool = True, rescore_factor: int = 4
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the `k` most similar stored vectors for each query.
+
+        Args:
+            query_vectors (np.ndarray): Query embeddings, shape (n_queries, dim).
+            k (int): Number of results per query.
+            rescore (bool): Re-score the top `rescore_factor * k` candidates at full precision.
+            rescore_factor (int): Candidate over-fetch factor when rescoring.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Game ids and similarities, both (n_queries, k).
+        """
+        if self.codes is None:
+            raise RuntimeError("The vector store is empty. Call `fit` or `load` first.")
+        queries = _normalize(query_vectors)
+        full = self.full if rescore and self.fmt != "float32" else None
+        n_candidates = min(len(self), k * rescore_factor if full is not None else k)
+        if n_candidates <= 0:
+            return np.empty((len(queries), 0), dtype=np.int64), np.empty((len(queries), 0), dtype=np.float32)
+
+        # Keep a running top-n per query across blocks, so only one block is widened at a time.
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self), self.block_size):
+            block = self._score_codes(queries, slice(start, start + self.block_size))
+            block_rows = np.broadcast_to(np.arange(start, start + block.shape[1]), block.shape)
+            rows = np.concatenate([best_rows, block_rows], axis=1)
+            scores = np.concatenate([best_scores, block.astype(np.float32)], axis=1)
+            keep = _top_k(scores, n_candidates)
+            best_rows, best_scores = np.take_along_axis(rows, keep, 1), np.take_along_axis(scores, keep, 1)
+
+        if full is not None:
+            # Each query touches only its own candidate rows of the memory-mapped full vectors.
+            candidates = np.asarray(full[best_rows.ravel()]).reshape(*best_rows.shape, self.dim)
+            best_scores = np.einsum("qd,qcd->qc", queries, candidates)
+            keep = _top_k(best_scores, k)
+            best_rows, best_scores = np.take_along_axis(best_rows, keep, 1), np.take_along_axis(best_scores, keep, 1)
+        return self.game_ids[best_rows[:, :k]], best_scores[:, :k]
+
+    # --- Serialization ---
+
+    def save(self, path: Path, keep_full: bool = True) -> None:
+        """
+        Writes the codes, quantizer and (optionally) the full-precision vectors into `path`.
+
+        Args:
+            path (Path): Model version directory, e.g. `models/v1`.
+            keep_full (bool): Also write float32 vectors for rescoring.
+        """
+        if self.codes is None:
+            raise RuntimeError("The vector store is empty. Call `fit` first.")
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / CODES_FILENAME, self.codes)
+        np.save(path / IDS_FILENAME, self.game_ids)
+        quantizer = {name: getattr(self, name) for name in ("scale", "offset", "centroids")}
+        np.savez(path / QUANTIZER_FILENAME, **{name: a for name, a in quantizer.items() if a.size})
+        if keep_full and self.full is not None:
+            np.save(path / FULL_FILENAME, np.asarray(self.full, dtype=np.float32))
+        with open(path / METADATA_FILENAME, "w", encoding="utf-8") as f:
+            json.dump({"format": self.fmt, "dim": self.dim, "pq_m": self.pq_m, "block_size": self.block_size}, f)
+        logger.info(f"Saved {self.fmt} vector store to '{path}'.")
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "QuantizedVectorStore":
+        """
+        Loads a store written by `save`.
+
+        Args:
+            path (Path): Model version directory, e.g. `models/v1`.
+            mmap (bool): Memory-map the code array too (the full vectors are always memory-mapped).
+        """
+        with open(path / METADATA_FILENAME, encoding="utf-8") as f:
+            metadata = json.load(f)
+        store = cls(fmt=metadata["format"], pq_m=metadata["pq_m"], block_size=metadata["block_size"])
+        store.dim = metadata["dim"]
+        store.codes = np.load(path / CODES_FILENAME, mmap_mode="r" if mmap else None)
+        store.game_ids = np.load(path / IDS_FILENAME)
+        with np.load(path / QUANTIZER_FILENAME) as quantizer:
+            for name in quantizer.files:
+                setattr(store, name, quantizer[name])
+        if (path / FULL_FILENAME).is_file():
+            store.full = np.load(path / FULL_FILENAME, mmap_mode="r")
+        if len(store.codes) != len(store.game_ids):
+            raise ValueError(f"Store holds {len(store.codes)} codes but {len(store.game_ids)} ids.")
+        return store
@@ -0,0 +1,5 @@
+"""
+Benchmark scripts for the Game Recommender Application.
+Each module is runnable with `python -m recsys.scripts.benchmarks.<name>`
+and prints its results as a plain-text table.
+"""
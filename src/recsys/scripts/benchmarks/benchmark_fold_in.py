@@ -0,0 +1,127 @@
+# src/recsys/scripts/benchmarks/benchmark_fold_in.py
+"""
+Latency and quality benchmark for online collaborative-filter fold-in.
+
+Generates low-rank synthetic ratings, then:
+
+- latency: times `CollaborativeFilter.fold_in` per user for several history
+  lengths, against the time of a full ALS retrain;
+- quality: holds out a sample of users, trains once without them and once
+  with them (the full retrain), folds the held-out users into the first
+  model, and compares recall@k on each held-out user's hidden ratings, plus
+  the overlap of the two top-k lists.
+
+Usage:
+    python -m recsys.scripts.benchmarks.benchmark_fold_in --n-users 50000 --n-games 20000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from recsys.models.collaborative_filter import CollaborativeFilter, UserVectorStore
+
+
+def make_ratings(n_users: int, n_games: int, per_user: int, rank: int = 16, seed: int = 0) -> pd.DataFrame:
+    """Each user rates the `per_user` games with the highest noisy low-rank affinity."""
+    rng = np.random.default_rng(seed)
+    user_taste = rng.normal(size=(n_users, rank)).astype(np.float32)
+    game_traits = rng.normal(size=(n_games, rank)).astype(np.float32)
+    popularity = rng.gumbel(size=n_games).astype(np.float32)
+    user_chunks, game_chunks = [], []
+    for start in range(0, n_users, 2048):
+        affinity = user_taste[start : start + 2048] @ game_traits.T + popularity
+        affinity += rng.gumbel(size=affinity.shape).astype(np.float32) * 2
+        top = np.argpartition(-affinity, per_user, axis=1)[:, :per_user]
+        user_chunks.append(np.repeat(np.arange(start, start + len(top)), per_user))
+        game_chunks.append(top.ravel())
+    users, games = np.concatenate(user_chunks), np.concatenate(game_chunks)
+    return pd.DataFrame({"USER_ID": users, "GAME_ID": games, "RATING": rng.integers(6, 11, size=len(users))})
+
+
+def time_fold_in(model: CollaborativeFilter, n_games: int, history: int, repeats: int) -> tuple[float, float]:
+    """p50 and p99 milliseconds of folding in a user with `history` ratings."""
+    rng = np.random.default_rng(history)
+    latencies = []
+    for _ in range(repeats):
+        ratings = {
+            int(g): float(r)
+            for g, r in zip(
+                rng.choice(n_games, size=history, replace=False), rng.integers(1, 11, size=history), strict=True
+            )
+        }
+        start = time.perf_counter()
+        model.fold_in(ratings)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(latencies, 50)), float(np.percentile(latencies, 99))
+
+
+def evaluate_quality(ratings: pd.DataFrame, n_held_out: int, k: int, factors: int, iterations: int) -> dict:
+    """Recall@k of folded-in users vs the same users in a full retrain."""
+    rng = np.random.default_rng(1)
+    held_out = rng.choice(ratings.USER_ID.unique(), size=n_held_out, replace=False)
+    is_held_out = ratings.USER_ID.isin(held_out)
+    # Hide 20% of every held-out user's ratings; both models see the remaining 80%.
+    hidden = ratings[is_held_out].groupby("USER_ID").sample(frac=0.2, random_state=1)
+    visible = ratings.drop(hidden.index)
+
+    base = CollaborativeFilter(factors=factors, iterations=iterations).fit(visible[~visible.USER_ID.isin(held_out)])
+    start = time.perf_counter()
+    full = CollaborativeFilter(factors=factors, iterations=iterations).fit(visible)
+    retrain_s = time.perf_counter() - start
+
+    store = UserVectorStore(base)
+    hidden_by_user = hidden.groupby("USER_ID").GAME_ID.apply(set)
+    visible_by_user = visible[visible.USER_ID.isin(held_out)].groupby("USER_ID")
+    folded_recall, full_recall, overlap = [], [], []
+    for user, rows in visible_by_user:
+        store.rate(user, dict(zip(rows.GAME_ID.tolist(), rows.RATING.astype(float).tolist(), strict=True)))
+        truth = hidden_by_user.get(user, set())
+        folded = {g for g, _ in store.recommend(user, n=k)}
+        retrained = {g for g, _ in full.recommend(user, n=k)}
+        if truth:
+            folded_recall.append(len(folded & truth) / min(k, len(truth)))
+            full_recall.append(len(retrained & truth) / min(k, len(truth)))
+        overlap.append(len(folded & retrained) / k)
+    return {
+        "retrain_s": retrain_s,
+        "folded_recall": float(np.mean(folded_recall)),
+        "full_recall": float(np.mean(full_recall)),
+        "overlap": float(np.mean(overlap)),
+        "fold_in_ms": 1000 * store.fold_in_seconds / max(store.fold_ins, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-users", type=int, default=20_000)
+    parser.add_argument("--n-games", type=int, default=10_000)
+    parser.add_argument("--per-user", type=int, default=50, help="Ratings per synthetic user.")
+    parser.add_argument("--factors", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=15)
+    parser.add_argument("--held-out", type=int, default=500)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    ratings = make_ratings(args.n_users, args.n_games, args.per_user)
+    print(f"{len(ratings):,} ratings: {args.n_users:,} users x {args.n_games:,} games, {args.factors} factors\n")
+
+    quality = evaluate_quality(ratings, args.held_out, args.k, args.factors, args.iterations)
+    model = CollaborativeFilter(factors=args.factors, iterations=args.iterations).fit(ratings)
+    print(f"Full ALS retrain: {quality['retrain_s']:.1f} s")
+    print(f"{'history':>8}{'p50 ms':>9}{'p99 ms':>9}")
+    for history in (10, 100, 1000):
+        p50, p99 = time_fold_in(model, args.n_games, min(history, args.n_games), repeats=200)
+        print(f"{history:>8}{p50:>9.3f}{p99:>9.3f}")
+
+    print(f"\nQuality on {args.held_out} held-out users (recall@{args.k} on hidden 20% of their ratings):")
+    print(f"  fold-in into a model trained without them: {quality['folded_recall']:.3f}")
+    print(f"  full retrain including them:                {quality['full_recall']:.3f}")
+    print(f"  top-k overlap between the two:              {quality['overlap']:.3f}")
+    print(f"  mean fold-in time:                          {quality['fold_in_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
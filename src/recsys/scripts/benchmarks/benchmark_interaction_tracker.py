@@ -0,0 +1,82 @@
+# src/recsys/scripts/benchmarks/benchmark_interaction_tracker.py
+"""
+Throughput and latency benchmark for `InteractionTracker.track_event`.
+
+Compares the synchronous open/append/close path (`buffered=False`) with the
+background `BufferedEventWriter`, optionally with fsync, and reports
+request-path events/sec, p50/p99 `track_event` latency, end-to-end time
+until every event is on disk, and dropped events.
+
+Usage:
+    python -m recsys.scripts.benchmarks.benchmark_interaction_tracker --events 100000 --threads 4
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from recsys.tracking.interaction_tracker import InteractionTracker
+
+
+def run(tracker: InteractionTracker, n_events: int, n_threads: int) -> dict:
+    """Fires `n_events` split across `n_threads` producers and collects per-call latencies."""
+    per_thread = n_events // n_threads
+    latencies = [np.empty(per_thread) for _ in range(n_threads)]
+    details = {"game_id": 174430, "rating": 9, "source": "benchmark"}
+
+    def produce(worker: int) -> None:
+        out = latencies[worker]
+        for i in range(per_thread):
+            start = time.perf_counter_ns()
+            tracker.track_event(f"user{worker}", "rate_game", f"session{worker}", details)
+            out[i] = time.perf_counter_ns() - start
+
+    threads = [threading.Thread(target=produce, args=(w,)) for w in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    request_path_s = time.perf_counter() - start
+    tracker.close()
+    durable_s = time.perf_counter() - start
+
+    all_latencies = np.concatenate(latencies) / 1000
+    return {
+        "events_per_s": per_thread * n_threads / request_path_s,
+        "p50_us": float(np.percentile(all_latencies, 50)),
+        "p99_us": float(np.percentile(all_latencies, 99)),
+        "durable_s": durable_s,
+        "dropped": tracker.writer.stats.dropped if tracker.writer else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    configs = {
+        "unbuffered (current)": {"buffered": False},
+        "buffered": {"buffered": True},
+        "buffered + fsync": {"buffered": True, "fsync": True},
+    }
+    print(f"{args.events} events from {args.threads} threads\n")
+    print(f"{'mode':<22}{'events/s':>12}{'p50 us':>9}{'p99 us':>9}{'on disk s':>11}{'dropped':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, kwargs in configs.items():
+            tracker = InteractionTracker(Path(tmp) / f"{name}.jsonl", **kwargs)
+            row = run(tracker, args.events, args.threads)
+            print(
+                f"{name:<22}{row['events_per_s']:>12.0f}{row['p50_us']:>9.1f}{row['p99_us']:>9.1f}"
+                f"{row['durable_s']:>11.2f}{row['dropped']:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
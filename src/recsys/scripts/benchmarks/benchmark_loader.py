@@ -0,0 +1,105 @@
+# src/recsys/scripts/benchmarks/benchmark_loader.py
+"""
+Cold CSV vs. warm columnar-cache benchmark for `load_extracted_data`.
+
+Measures, for one interim CSV:
+- pandas: `pd.read_csv(dtype_backend="pyarrow")`, the loader's previous behaviour,
+- cold: parsing the CSV with the Arrow reader and the cache disabled,
+- build: first cached load, which parses the CSV and writes the cache,
+- warm: loading every column from the cache,
+- projected: loading two columns with a row filter from the cache.
+
+When the requested file is not present in `extract_data_dir`, a synthetic
+ratings-shaped CSV of `--rows` rows is generated in a temporary directory,
+which is removed afterwards. For a real file, only that file's cache entries
+are dropped between formats; the rest of the project's `.cache/` is untouched.
+
+Usage:
+    python -m recsys.scripts.benchmarks.benchmark_loader --filename user_ratings.csv
+"""
+
+import argparse
+import contextlib
+import functools
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from recsys.config_management.settings import get_settings
+from recsys.data.loader import CACHE_DIRNAME, CACHE_FORMATS, load_extracted_data
+from recsys.utils.paths import get_project_root
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Returns the median wall time of `fn` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _synthetic_project(root: Path, rows: int) -> dict:
+    """Writes a synthetic `user_ratings.csv` into the project at `root` and returns its config."""
+    (root / "interim").mkdir()
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "BGGId": rng.integers(1, 25_000, size=rows),
+        "Rating": rng.uniform(1, 10, size=rows).round(1),
+        "Username": [f"user{u}" for u in rng.integers(0, 400_000, size=rows)],
+    }).to_csv(root / "interim" / "user_ratings.csv", index=False)
+    return {"paths": {"extract_data_dir": "interim"}}
+
+
+def _drop_cache(csv_path: Path) -> None:
+    """Removes the cache files of `csv_path` in every format, leaving other cache entries alone."""
+    for suffix in CACHE_FORMATS.values():
+        data_path = csv_path.parent / CACHE_DIRNAME / (csv_path.stem + suffix)
+        data_path.unlink(missing_ok=True)
+        data_path.with_name(data_path.name + ".json").unlink(missing_ok=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filename", default="user_ratings.csv")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Rows of the synthetic CSV.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    project_root = get_project_root()
+    config = get_settings().as_dict()
+    with contextlib.ExitStack() as stack:
+        if not (project_root / config["paths"]["extract_data_dir"] / args.filename).is_file():
+            print(f"'{args.filename}' not found; generating a synthetic {args.rows}-row ratings CSV.")
+            project_root = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="recsys-bench-")))
+            config = _synthetic_project(project_root, args.rows)
+            args.filename = "user_ratings.csv"
+
+        csv_path = project_root / config["paths"]["extract_data_dir"] / args.filename
+        header = list(pd.read_csv(csv_path, nrows=1).columns)
+        projected = {"columns": header[:2], "filters": [(header[0], ">", 0)]}
+
+        pandas = _time(lambda: pd.read_csv(csv_path, dtype_backend="pyarrow"), args.repeat)
+        print(f"pandas read_csv (previous loader): {pandas:.0f} ms")
+        print(f"{'format':<9}{'cold ms':>10}{'build ms':>10}{'warm ms':>10}{'projected ms':>14}")
+        for cache_format in ("arrow", "parquet"):
+            _drop_cache(csv_path)
+            load = functools.partial(
+                load_extracted_data, args.filename, project_root, config, cache_format=cache_format
+            )
+
+            cold = _time(functools.partial(load, use_cache=False), args.repeat)
+            build = _time(load, 1)
+            warm = _time(load, args.repeat)
+            proj = _time(functools.partial(load, **projected), args.repeat)
+            print(f"{cache_format:<9}{cold:>10.0f}{build:>10.0f}{warm:>10.0f}{proj:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
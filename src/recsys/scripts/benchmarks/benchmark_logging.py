@@ -0,0 +1,143 @@
+# src/recsys/scripts/benchmarks/benchmark_logging.py
+"""
+Per-call overhead of logging under load, with the previous synchronous sinks
+and with the `LogPipeline` backends.
+
+`--threads` producers log `--messages` INFO lines between them, from a few
+call sites, with the app's bound context. Modes:
+
+- sync (previous): loguru's console and `serialize=True` file handlers,
+  formatting and writing on the calling thread;
+- pipeline: sampling off, console + JSON file written by the pipeline thread;
+- pipeline + loki: the same, also shipping to a local Loki stand-in (an HTTP
+  server that accepts pushes);
+- pipeline + sampling: the default per-call-site sampling on top.
+
+Console output goes to /dev/null. Reports calls/s on the producers, p50/p99
+per-call latency, the time until every line has reached its sinks, and
+pipeline drops, sampled-out lines and Loki pushes.
+
+Usage:
+    python -m recsys.scripts.benchmarks.benchmark_logging --messages 100000 --threads 4
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from recsys.logging.logging_backends.default_logger import ConsoleSink, JsonFileSink
+from recsys.logging.logging_backends.loki_logger import LokiSink
+from recsys.logging.logging_backends.pipeline import LogPipeline, LogSampler, LogSink
+
+
+class _AcceptPushes(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def produce(n_messages: int, n_threads: int) -> tuple[np.ndarray, float]:
+    """Logs from `n_threads` threads; returns per-call latencies (us) and the producers' wall time."""
+    per_thread = n_messages // n_threads
+    latencies = [np.empty(per_thread) for _ in range(n_threads)]
+    log = logger.bind(app_name="BoardGameRecommender", version="0.1.0")
+
+    def run(worker: int) -> None:
+        out = latencies[worker]
+        for i in range(per_thread):
+            start = time.perf_counter_ns()
+            if i % 2:
+                log.info("Served {} recommendations for user {}", 10, worker)
+            else:
+                log.info(f"Cache miss for request {i}")
+            out[i] = time.perf_counter_ns() - start
+
+    threads = [threading.Thread(target=run, args=(w,)) for w in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return np.concatenate(latencies) / 1000, time.perf_counter() - start
+
+
+def run_mode(mode: str, log_dir: Path, loki_url: str, n_messages: int, n_threads: int) -> dict:
+    """Configures the global loguru logger for `mode`, drives it and tears it down."""
+    logger.remove()
+    devnull = open(os.devnull, "w")  # noqa: SIM115 - closed below
+    pipeline = loki = sampler = None
+    if mode == "sync (previous)":
+        logger.add(devnull, level="INFO", colorize=True, format="<green>{time}</green> | {level} | {name} - {message}")
+        logger.add(log_dir / f"{mode}.log", level="DEBUG", format="{message}", serialize=True, catch=True)
+    else:
+        sinks: list[LogSink] = [ConsoleSink(devnull, colorize=True), JsonFileSink(log_dir / f"{mode}.log")]
+        if "loki" in mode:
+            loki = LokiSink(loki_url, labels={"service": "benchmark"})
+            sinks.append(loki)
+        sampler = LogSampler() if "sampling" in mode else None
+        pipeline = LogPipeline(sinks)
+        pipeline.install(logger, level="DEBUG", sampler=sampler)
+
+    latencies, producers_s = produce(n_messages, n_threads)
+    start = time.perf_counter()
+    if pipeline is not None:
+        pipeline.flush(timeout=None)
+        if loki is not None:
+            loki.flush(timeout=None)
+        pipeline.close()
+    logger.remove()
+    drain_s = time.perf_counter() - start
+    devnull.close()
+    return {
+        "calls_per_s": len(latencies) / producers_s,
+        "p50_us": float(np.percentile(latencies, 50)),
+        "p99_us": float(np.percentile(latencies, 99)),
+        "drain_s": drain_s,
+        "dropped": pipeline.stats.dropped if pipeline else 0,
+        "sampled_out": sampler.dropped if sampler else 0,
+        "loki_lines": loki.stats.sent if loki else 0,
+        "loki_pushes": loki.stats.batches if loki else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _AcceptPushes)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    loki_url = f"http://127.0.0.1:{server.server_port}"
+
+    modes = ("sync (previous)", "pipeline", "pipeline + loki", "pipeline + sampling")
+    print(f"{args.messages} INFO calls from {args.threads} threads\n")
+    print(
+        f"{'mode':<22}{'calls/s':>10}{'p50 us':>9}{'p99 us':>9}{'drain s':>9}"
+        f"{'dropped':>9}{'sampled':>9}{'loki lines':>12}{'pushes':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in modes:
+            row = run_mode(mode, Path(tmp), loki_url, args.messages, args.threads)
+            print(
+                f"{mode:<22}{row['calls_per_s']:>10.0f}{row['p50_us']:>9.1f}{row['p99_us']:>9.1f}"
+                f"{row['drain_s']:>9.2f}{row['dropped']:>9}{row['sampled_out']:>9}"
+                f"{row['loki_lines']:>12}{row['loki_pushes']:>8}"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
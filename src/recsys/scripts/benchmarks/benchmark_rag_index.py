@@ -0,0 +1,102 @@
+# src/recsys/scripts/benchmarks/benchmark_rag_index.py
+"""
+Recall@k vs. latency benchmark for the RAG index types.
+
+Builds every index type supported by `RAGRecommender` over a synthetic,
+clustered catalogue of the requested size, uses the exact `flat` index as
+ground truth, and reports build time, recall@k, single-query latency
+percentiles and batched (`search_many`) throughput.
+
+Usage:
+    python -m recsys.scripts.benchmarks.benchmark_rag_index --n-games 100000 --dim 384
+"""
+
+import argparse
+import time
+from typing import Any
+
+import numpy as np
+
+from recsys.models.rag_recommender import RAGRecommender
+
+
+def make_catalogue(n_games: int, dim: int, n_clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Generates clustered embeddings, which resemble real text embeddings better than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+    assignments = rng.integers(0, n_clusters, size=n_games)
+    return centers[assignments] + 0.5 * rng.normal(size=(n_games, dim)).astype(np.float32)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    """Fraction of the true top-k ids retrieved, averaged over queries."""
+    hits = sum(len(np.intersect1d(f, t)) for f, t in zip(found, truth, strict=True))
+    return hits / truth.size
+
+
+def run_benchmark(n_games: int, dim: int, n_queries: int, k: int) -> list[dict]:
+    """Benchmarks each index configuration and returns one result row per configuration."""
+    embeddings = make_catalogue(n_games, dim)
+    game_ids = np.arange(n_games, dtype=np.int64)
+    rng = np.random.default_rng(1)
+    queries = embeddings[rng.choice(n_games, size=n_queries, replace=False)]
+    queries = queries + 0.1 * rng.normal(size=queries.shape).astype(np.float32)
+
+    configs: list[tuple[str, dict[str, Any]]] = [
+        ("flat", {}),
+        ("ivf_flat", {"nprobe": 4}),
+        ("ivf_flat", {"nprobe": 16}),
+        ("ivf_flat", {"nprobe": 64}),
+        ("hnsw", {"ef_search": 32}),
+        ("hnsw", {"ef_search": 64}),
+        ("hnsw", {"ef_search": 128}),
+    ]
+    truth = None
+    results = []
+    for index_type, params in configs:
+        start = time.perf_counter()
+        model = RAGRecommender(index_type=index_type, **params).fit_embeddings(game_ids, embeddings)
+        build_s = time.perf_counter() - start
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            model.search(query, k)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        found, _ = model.search_many(queries, k)
+        batch_s = time.perf_counter() - start
+
+        if truth is None:
+            truth = found
+        results.append({
+            "index": index_type + "".join(f" {key}={value}" for key, value in params.items()),
+            "build_s": build_s,
+            "recall": recall_at_k(found, truth),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "batch_qps": n_queries / batch_s,
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-games", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--n-queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"Catalogue: {args.n_games} games x {args.dim} dims, {args.n_queries} queries, k={args.k}\n")
+    print(f"{'index':<24}{'build s':>9}{'recall@k':>10}{'p50 ms':>9}{'p99 ms':>9}{'batch qps':>12}")
+    for row in run_benchmark(args.n_games, args.dim, args.n_queries, args.k):
+        print(
+            f"{row['index']:<24}{row['build_s']:>9.2f}{row['recall']:>10.3f}"
+            f"{row['p50_ms']:>9.3f}{row['p99_ms']:>9.3f}{row['batch_qps']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
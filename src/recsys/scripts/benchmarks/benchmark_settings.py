@@ -0,0 +1,66 @@
+# src/recsys/scripts/benchmarks/benchmark_settings.py
+"""
+Configuration load-time benchmark for `get_settings`.
+
+Measures, for the project's configuration:
+- previous: what every config read used to cost, an uncached walk up to the
+  project root plus a pure-Python `yaml.safe_load` of `config/<env>.yml`,
+- load: one uncached `load_settings` (read, merge and validate every file),
+- cached: a `get_settings()` call after the first one,
+- import: importing `recsys.config_management.settings` (pydantic-settings
+  included) in a fresh interpreter, next to importing `yaml` alone.
+
+Usage:
+    python -m recsys.scripts.benchmarks.benchmark_settings --repeat 200
+"""
+
+import argparse
+import os
+import statistics
+import time
+from collections.abc import Callable
+
+import yaml
+
+from recsys.config_management.settings import DEFAULT_ENV, ENV_VARIABLE, get_settings, load_settings
+from recsys.scripts.benchmarks.profile_imports import profile_import
+from recsys.utils.paths import get_project_root
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Returns the median wall time of `fn` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    env = os.environ.get(ENV_VARIABLE, DEFAULT_ENV)
+    project_root = get_project_root()
+
+    def previous() -> None:
+        root = get_project_root.__wrapped__()
+        with open(root / "config" / f"{env}.yml", encoding="utf-8") as f:
+            yaml.safe_load(f)
+
+    get_settings()
+    timings = {
+        "previous": _time(previous, args.repeat),
+        "load": _time(lambda: load_settings(project_root, env), args.repeat),
+        "cached": _time(get_settings, args.repeat),
+    }
+    for name, ms in timings.items():
+        print(f"{name:<10}{ms:>10.3f} ms")
+    for module in ("yaml", "recsys.config_management.settings"):
+        print(f"import {module}: {profile_import(module).total_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# src/recsys/scripts/benchmarks/benchmark_vector_store.py
+"""
+Memory, latency and recall benchmark for the `QuantizedVectorStore` formats.
+
+Encodes a synthetic, clustered catalogue in every format, uses exact float32
+search as ground truth, and reports resident MiB per million vectors, the
+p50/p99 latency of a single-query search, and recall@k with and without
+full-precision rescoring. The POC's list-of-floats-in-a-dict layout is
+included as a memory reference.
+
+Usage:
+    python -m recsys.scripts.benchmarks.benchmark_vector_store --n-games 100000 --dim 384
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from recsys.models.vector_store import QuantizedVectorStore
+from recsys.scripts.benchmarks.benchmark_rag_index import make_catalogue, recall_at_k
+
+MIB_PER_MILLION = 1_000_000 / (1024 * 1024)
+
+
+def python_list_bytes_per_vector(dim: int) -> float:
+    """Approximate size of one embedding stored as a Python list of floats (the POC layout)."""
+    sample = [float(i) for i in range(dim)]
+    return sys.getsizeof(sample) + sum(sys.getsizeof(x) for x in sample)
+
+
+def run_benchmark(n_games: int, dim: int, n_queries: int, k: int, pq_m: int, rescore_factor: int) -> list[dict]:
+    """Benchmarks each storage format and returns one result row per format."""
+    embeddings = make_catalogue(n_games, dim)
+    game_ids = np.arange(n_games, dtype=np.int64)
+    rng = np.random.default_rng(1)
+    queries = embeddings[rng.choice(n_games, size=n_queries, replace=False)]
+    queries = queries + 0.1 * rng.normal(size=queries.shape).astype(np.float32)
+
+    truth = None
+    results = []
+    for fmt in ("float32", "float16", "int8", "pq"):
+        start = time.perf_counter()
+        store = QuantizedVectorStore(fmt, pq_m=pq_m).fit(game_ids, embeddings)
+        build_s = time.perf_counter() - start
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            store.search_many(query[None], k, rescore=True, rescore_factor=rescore_factor)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        raw, _ = store.search_many(queries, k, rescore=False)
+        rescored, _ = store.search_many(queries, k, rescore=True, rescore_factor=rescore_factor)
+        if truth is None:
+            truth = raw
+        results.append({
+            "format": fmt,
+            "build_s": build_s,
+            "mib_per_million": store.nbytes / len(store) * MIB_PER_MILLION,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "recall": recall_at_k(raw, truth),
+            "recall_rescored": recall_at_k(rescored, truth),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-games", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--n-queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--pq-m", type=int, default=48)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"Catalogue: {args.n_games} games x {args.dim} dims, {args.n_queries} queries, k={args.k}")
+    print(f"POC list-of-floats layout: {python_list_bytes_per_vector(args.dim) * MIB_PER_MILLION:,.0f} MiB/M vectors\n")
+    print(f"{'format':<10}{'build s':>9}{'MiB/M vec':>11}{'p50 ms':>9}{'p99 ms':>9}{'recall':>9}{'rescored':>10}")
+    rows = run_benchmark(args.n_games, args.dim, args.n_queries, args.k, args.pq_m, args.rescore_factor)
+    for row in rows:
+        print(
+            f"{row['format']:<10}{row['build_s']:>9.2f}{row['mib_per_million']:>11,.0f}{row['p50_ms']:>9.2f}"
+            f"{row['p99_ms']:>9.2f}{row['recall']:>9.3f}{row['recall_rescored']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# src/recsys/scripts/benchmarks/load_test_api.py
+"""
+Load test of `/recommend` with and without micro-batching.
+
+By default, builds a synthetic model version (a flat RAG index over random
+embeddings and a small collaborative filter) in a temporary directory, starts
+the app in-process once with batching enabled and once with
+`max_batch_size=1`, and drives each with `--concurrency` closed-loop clients.
+With `--url`, a running server is load-tested instead (a single run, with
+whatever batching it was started with).
+
+Reports throughput, p50/p95/p99 latency, errors, responses that missed a
+stage budget (`degraded`) and, in-process, the mean batch size.
+
+Usage:
+    python -m recsys.scripts.benchmarks.load_test_api --n-games 20000 --concurrency 64 --requests 4000
+    python -m recsys.scripts.benchmarks.load_test_api --url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from recsys.api.main import create_app
+from recsys.models.collaborative_filter import CollaborativeFilter
+from recsys.models.rag_recommender import RAGRecommender
+from recsys.utils.paths import MODEL_READY_MARKER
+
+
+def build_models(root: Path, n_games: int, dim: int, n_users: int) -> None:
+    """Writes a synthetic, ready `models/v1` under `root`."""
+    rng = np.random.default_rng(0)
+    game_ids = np.arange(1, n_games + 1, dtype=np.int64)
+    version = root / "models" / "v1"
+    RAGRecommender().fit_embeddings(game_ids, rng.normal(size=(n_games, dim)).astype(np.float32)).save(version)
+    n_ratings = n_users * 20
+    ratings = pd.DataFrame({
+        "USER_ID": rng.integers(0, n_users, size=n_ratings),
+        "GAME_ID": rng.choice(game_ids, size=n_ratings),
+        "RATING": rng.uniform(1, 10, size=n_ratings),
+    }).drop_duplicates(subset=["USER_ID", "GAME_ID"])
+    CollaborativeFilter(factors=32, iterations=3).fit(ratings).save(version)
+    (version / MODEL_READY_MARKER).touch()
+
+
+def make_bodies(n_requests: int, n_games: int, n_users: int) -> list[dict]:
+    """Random requests: 1-5 liked games, half of them from known users."""
+    rng = np.random.default_rng(1)
+    return [
+        {
+            "game_ids": rng.integers(1, n_games + 1, size=rng.integers(1, 6)).tolist(),
+            "user_id": str(rng.integers(0, n_users)) if rng.random() < 0.5 else None,
+            "n": 10,
+        }
+        for _ in range(n_requests)
+    ]
+
+
+async def drive(client: httpx.AsyncClient, bodies: list[dict], concurrency: int) -> dict:
+    """Sends `bodies` from `concurrency` closed-loop clients and summarizes the latencies."""
+    queue = iter(bodies)
+    latencies: list[float] = []
+    errors = degraded = 0
+
+    async def worker() -> None:
+        nonlocal errors, degraded
+        for body in queue:
+            start = time.perf_counter()
+            response = await client.post("/recommend", json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += response.status_code != 200
+            degraded += response.status_code == 200 and bool(response.json()["degraded"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "errors": errors,
+        "degraded": degraded,
+    }
+
+
+async def run_in_process(args: argparse.Namespace) -> list[tuple[str, dict]]:
+    """Load-tests an in-process app with and without batching."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        print(f"Building synthetic models: {args.n_games} games x {args.dim} dims, {args.n_users} users...")
+        build_models(root, args.n_games, args.dim, args.n_users)
+        bodies = make_bodies(args.requests, args.n_games, args.n_users)
+        for label, batch_size in (("batched", args.max_batch_size), ("unbatched", 1)):
+            config = {
+                "paths": {"models_dir": "models", "bgg_api": {"sqlite_db_file": "missing.sqlite"}},
+                "cache": {"enabled": False},
+                "api": {
+                    "batching": {
+                        "max_batch_size": batch_size,
+                        "max_wait_ms": args.max_wait_ms,
+                        "max_workers": args.workers,
+                    }
+                },
+            }
+            app = create_app(config, project_root=root)
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+                    await drive(client, bodies[: args.concurrency], args.concurrency)  # warm-up
+                    stats = app.state.batcher.stats
+                    before = (stats.batches, stats.items)
+                    result = await drive(client, bodies, args.concurrency)
+                    batches, items = stats.batches - before[0], stats.items - before[1]
+                    result["mean_batch"] = items / batches if batches else 0.0
+            rows.append((label, result))
+    return rows
+
+
+async def run_remote(args: argparse.Namespace) -> list[tuple[str, dict]]:
+    """Load-tests a running server."""
+    bodies = make_bodies(args.requests, args.n_games, args.n_users)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30) as client:
+        result = await drive(client, bodies, args.concurrency)
+    result["mean_batch"] = float("nan")
+    return [(args.url, result)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="Load-test a running server instead of an in-process app.")
+    parser.add_argument("--n-games", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--n-users", type=int, default=5_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=4, help="Batches run concurrently.")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run_remote(args) if args.url else run_in_process(args))
+    print(f"\n{args.requests} requests, {args.concurrency} concurrent clients")
+    print(f"{'mode':<12}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'batch':>7}{'errors':>8}{'degraded':>10}")
+    for label, row in rows:
+        print(
+            f"{label:<12}{row['rps']:>9.0f}{row['p50']:>9.1f}{row['p95']:>9.1f}{row['p99']:>9.1f}"
+            f"{row['mean_batch']:>7.1f}{row['errors']:>8}{row['degraded']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
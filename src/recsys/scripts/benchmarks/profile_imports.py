@@ -0,0 +1,197 @@
+# src/recsys/scripts/benchmarks/profile_imports.py
+"""
+Import-time profiler and startup budget for the CLI scripts and the API.
+
+Each entry point is imported in a fresh interpreter with `python -X importtime`,
+run from an empty temporary directory, and checked for:
+
+- its total import time against the budget in `STARTUP_BUDGETS_MS`;
+- heavy dependencies in `DEFERRED_MODULES`, which must only be imported on
+  first use (inside the function that needs them);
+- import side effects: files or directories created by merely importing it
+  (e.g. a logger creating `logs/` or a singleton creating `data/`).
+
+It prints the slowest third-party packages and modules of each entry point.
+`tests/test_scripts/test_profile_imports.py` runs the same check.
+
+Usage:
+    python -m recsys.scripts.benchmarks.profile_imports
+    python -m recsys.scripts.benchmarks.profile_imports recsys.api.main --top 20 --check
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Entry point -> import budget (ms). Roughly twice what a single core measures, so
+# only a regression (an eager heavy import) trips it, not machine noise.
+STARTUP_BUDGETS_MS = {
+    "recsys.api.main": 2000,
+    "recsys.scripts.train_model": 1000,
+    "recsys.scripts.generate_embeddings": 1000,
+    "recsys.scripts.load_raw_data": 500,
+    "recsys.data.extract": 1000,
+    "recsys.data.catalogue_store": 1000,
+}
+
+# Imported inside the functions that need them; importing an entry point must not load them.
+DEFERRED_MODULES = (
+    "sklearn",
+    "implicit",
+    "scipy.sparse",
+    "sentence_transformers",
+    "torch",
+    "pyspark",
+    "redis",
+    "snowflake.connector",
+)
+
+_SRC_DIR = Path(__file__).resolve().parents[3]
+
+
+@dataclass
+class ImportTime:
+    """One line of `-X importtime` output."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    """What importing one module in a fresh interpreter cost and did."""
+
+    module: str
+    imports: list[ImportTime]
+    created: list[str] = field(default_factory=list)
+
+    @property
+    def subtree(self) -> list[ImportTime]:
+        """The imports triggered by the profiled module, itself last (interpreter startup excluded)."""
+        # `-X importtime` prints each module after its own imports, so the subtree is the run of
+        # nested lines just before the module's top-level line.
+        end = next((n for n in range(len(self.imports) - 1, -1, -1) if self.imports[n].name == self.module), None)
+        if end is None:
+            return []
+        start = end
+        while start > 0 and self.imports[start - 1].depth > 0:
+            start -= 1
+        return self.imports[start : end + 1]
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of the profiled module itself."""
+        subtree = self.subtree
+        return subtree[-1].cumulative_us / 1000 if subtree else 0.0
+
+    @property
+    def loaded(self) -> set[str]:
+        return {i.name for i in self.imports}
+
+    def deferred_loaded(self, deferred: tuple[str, ...] = DEFERRED_MODULES) -> list[str]:
+        """The modules of `deferred` that importing this module loaded."""
+        return [name for name in deferred if name in self.loaded]
+
+    def packages(self, n: int = 10) -> list[ImportTime]:
+        """The `n` top-level packages with the highest cumulative time."""
+        top_level: dict[str, ImportTime] = {}
+        for entry in self.subtree:
+            if "." not in entry.name and entry.name != self.module:
+                previous = top_level.get(entry.name)
+                if previous is None or entry.cumulative_us > previous.cumulative_us:
+                    top_level[entry.name] = entry
+        return sorted(top_level.values(), key=lambda i: -i.cumulative_us)[:n]
+
+    def slowest(self, n: int = 10) -> list[ImportTime]:
+        """The `n` modules with the highest self time."""
+        return sorted(self.subtree, key=lambda i: -i.self_us)[:n]
+
+
+def parse_importtime(stderr: str) -> list[ImportTime]:
+    """Parses the `import time: self | cumulative | name` lines written by `-X importtime`."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # The column header.
+        stripped = name.lstrip()
+        # One leading space, then two per nesting level.
+        depth = (len(name) - len(stripped) - 1) // 2
+        imports.append(ImportTime(stripped.rstrip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def profile_import(module: str, python: str = sys.executable) -> ImportProfile:
+    """
+    Imports `module` in a fresh interpreter under `-X importtime`, from an empty working directory.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(_SRC_DIR), env.get("PYTHONPATH")]))
+    env.pop("PYTHONIMPORTTIME", None)
+    with tempfile.TemporaryDirectory() as cwd:
+        # The interpreter and module names come from this script's own command line.
+        result = subprocess.run(  # noqa: S603
+            [python, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        created = sorted(os.listdir(cwd))
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing '{module}' failed:\n{result.stderr[-2000:]}")
+    return ImportProfile(module, parse_importtime(result.stderr), created)
+
+
+def check_startup(profile: ImportProfile, budget_ms: float | None = None) -> list[str]:
+    """Returns the startup-budget violations of one profile (empty when it passes)."""
+    problems = []
+    budget_ms = budget_ms if budget_ms is not None else STARTUP_BUDGETS_MS.get(profile.module)
+    if budget_ms is not None and profile.total_ms > budget_ms:
+        problems.append(f"imports in {profile.total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    if deferred := profile.deferred_loaded():
+        problems.append(f"eagerly imports {', '.join(deferred)}")
+    if profile.created:
+        problems.append(f"creates {', '.join(profile.created)} on import")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=list(STARTUP_BUDGETS_MS), help="Entry points to profile.")
+    parser.add_argument("--top", type=int, default=8, help="Packages and modules listed per entry point.")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on a budget violation.")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        profile = profile_import(module)
+        budget = STARTUP_BUDGETS_MS.get(module)
+        print(f"\n{module}: {profile.total_ms:.0f} ms" + (f" (budget {budget} ms)" if budget else ""))
+        print(f"  {'package':<32}{'cumulative ms':>14}")
+        for entry in profile.packages(args.top):
+            print(f"  {entry.name:<32}{entry.cumulative_us / 1000:>14.1f}")
+        print(f"  {'module':<48}{'self ms':>9}")
+        for entry in profile.slowest(args.top):
+            print(f"  {entry.name:<48}{entry.self_us / 1000:>9.1f}")
+        for problem in check_startup(profile):
+            failed = True
+            print(f"  !! {problem}")
+    if args.check and failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,18 @@
 """
 This module is responsible for generating a Snowflake SQL schema from CSV files.
 It handles data type inference and SQL syntax generation.
+
+Type inference streams each CSV as strings and folds per-chunk type profiles
+(integer width, decimal scale, float, boolean, date/timestamp, string length)
+into one profile per column, so it runs in constant memory and yields tight
+types such as NUMBER(p,s) and VARCHAR(n) instead of generic NUMBER/VARCHAR.
 """
 
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 import pandas as pd
@@ -20,29 +29,186 @@ def _sanitize_column_name(col_name) -> str:
         return f'"{col_name}"'
 
 
-def _map_pandas_to_snowflake_type(pd_dtype: str) -> str:
-    """(Internal) Maps a pandas data type to a corresponding Snowflake SQL type."""
-    dtype_str = str(pd_dtype).lower()
-    if "int" in dtype_str:
-        return "NUMBER"
-    if "float" in dtype_str:
-        return "FLOAT"
-    if "bool" in dtype_str:
-        return "BOOLEAN"
-    if "datetime" in dtype_str:
-        return "TIMESTAMP_NTZ"
-    if "object" in dtype_str:
-        return "VARCHAR"
-    return "VARCHAR"
+# Mirrors the NULL_IF list of `my_csv_format`, so inference sees the same NULLs as COPY INTO.
+NULL_VALUES = ["NULL", "null", "", "\\N"]
+MAX_NUMBER_PRECISION = 38
+MAX_VARCHAR_LENGTH = 16_777_216
+
+_INT_RE = r"[+-]?\d+"
+_LEADING_ZERO_RE = r"[+-]?0\d"
+_DECIMAL_RE = r"[+-]?(\d*)\.(\d*)"
+_FLOAT_RE = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|[+-]?(?:inf|Infinity|NaN|nan)"
+_DATE_RE = r"\d{4}-\d{2}-\d{2}"
+_TIMESTAMP_RE = r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?"
+_TZ_RE = r"(?:Z|[+-]\d{2}:?\d{2})"
+_BOOL_VALUES = {"true", "false", "t", "f", "yes", "no"}
+
+
+@dataclass
+class ColumnProfile:
+    """
+    (Internal) A point in the per-column type lattice, folded chunk by chunk.
+
+    Each `is_*` flag stays True only while every non-null value seen so far
+    parses as that type; the widths track what the final type has to hold.
+    """
+
+    non_null: int = 0
+    is_bool: bool = True
+    is_int: bool = True
+    is_decimal: bool = True
+    is_float: bool = True
+    is_date: bool = True
+    is_timestamp: bool = True
+    has_tz: bool = False
+    int_digits: int = 0
+    scale: int = 0
+    max_length: int = 0
+
+    @classmethod
+    def from_values(cls, values: pd.Series) -> "ColumnProfile":
+        """Profiles one chunk of a column read as strings (NULLs already dropped)."""
+        values = values.dropna().astype(str).str.strip()
+        profile = cls(non_null=len(values))
+        if values.empty:
+            return profile
+
+        profile.max_length = int(values.str.len().max())
+        profile.is_bool = bool(values.str.lower().isin(_BOOL_VALUES).all())
+        # Leading zeros (e.g. "007") are identifiers, not numbers; keep them as text.
+        if values.str.match(_LEADING_ZERO_RE).any():
+            profile.is_int = profile.is_decimal = profile.is_float = False
+        else:
+            profile.is_int = bool(values.str.fullmatch(_INT_RE).all())
+        if profile.is_int:
+            profile.int_digits = int(values.str.lstrip("+-").str.lstrip("0").str.len().max())
+        elif profile.is_decimal:
+            parts = values.str.extract(f"^{_DECIMAL_RE}$")
+            profile.is_decimal = bool(values.str.fullmatch(f"{_INT_RE}|{_DECIMAL_RE}").all())
+            if profile.is_decimal:
+                int_part = parts[0].fillna(values).str.lstrip("+-").str.lstrip("0")
+                profile.int_digits = int(int_part.str.len().max())
+                profile.scale = int(parts[1].fillna("").str.len().max())
+        profile.is_float = profile.is_float and bool(values.str.fullmatch(_FLOAT_RE).all())
+        profile.is_date = bool(values.str.fullmatch(_DATE_RE).all())
+        profile.is_timestamp = profile.is_date or bool(values.str.fullmatch(f"{_TIMESTAMP_RE}{_TZ_RE}?").all())
+        if profile.is_timestamp and not profile.is_date:
+            profile.has_tz = bool(values.str.contains(f"{_TZ_RE}$").any())
+        return profile
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+        """Joins two profiles in the lattice (the least type that holds both)."""
+        if not self.non_null:
+            return other
+        if not other.non_null:
+            return self
+        return ColumnProfile(
+            non_null=self.non_null + other.non_null,
+            is_bool=self.is_bool and other.is_bool,
+            is_int=self.is_int and other.is_int,
+            is_decimal=self.is_decimal and other.is_decimal,
+            is_float=self.is_float and other.is_float,
+            is_date=self.is_date and other.is_date,
+            is_timestamp=self.is_timestamp and other.is_timestamp,
+            has_tz=self.has_tz or other.has_tz,
+            int_digits=max(self.int_digits, other.int_digits),
+            scale=max(self.scale, other.scale),
+            max_length=max(self.max_length, other.max_length),
+        )
+
+    def to_snowflake_type(self, complete: bool) -> str:
+        """
+        Returns the tightest Snowflake type for the profiled values.
+
+        Args:
+            complete (bool): True if every row was scanned. Sampled profiles get
+                headroom: NUMBER precision is widened to 38 and VARCHAR lengths are
+                doubled and rounded up to a power of two.
+        """
+        if not self.non_null:
+            return "VARCHAR"
+        if self.is_bool:
+            return "BOOLEAN"
+        if self.is_int or self.is_decimal:
+            precision = max(1, self.int_digits + self.scale)
+            if precision <= MAX_NUMBER_PRECISION:
+                if not complete:
+                    precision = MAX_NUMBER_PRECISION
+                return f"NUMBER({precision},{self.scale})"
+        if self.is_float:
+            return "FLOAT"
+        if self.is_date:
+            return "DATE"
+        if self.is_timestamp:
+            return "TIMESTAMP_TZ" if self.has_tz else "TIMESTAMP_NTZ"
+        length = max(1, self.max_length)
+        if not complete:
+            length = 1 << (2 * length - 1).bit_length()
+        return f"VARCHAR({min(length, MAX_VARCHAR_LENGTH)})"
+
 
+def infer_csv_schema(csv_file: Path, sample_rows: int = 0, chunksize: int = 100_000) -> dict[str, str]:
+    """
+    Infers Snowflake column types for one CSV in constant memory.
+
+    The file is read as strings in chunks; each chunk is profiled and folded
+    into a running `ColumnProfile` per column, so memory is bounded by
+    `chunksize` regardless of file size.
+
+    Args:
+        csv_file (Path): The CSV file to scan.
+        sample_rows (int): Rows to scan; 0 scans the whole file and yields exact widths.
+        chunksize (int): Rows profiled per chunk.
+
+    Returns:
+        dict[str, str]: Column name to Snowflake type, in file order.
+    """
+    profiles: dict[str, ColumnProfile] = {}
+    reader = pd.read_csv(
+        csv_file,
+        dtype=str,
+        keep_default_na=False,
+        na_values=NULL_VALUES,
+        nrows=sample_rows if sample_rows > 0 else None,
+        chunksize=chunksize,
+        encoding="utf-8",
+    )
+    rows = 0
+    with reader:
+        for chunk in reader:
+            rows += len(chunk)
+            for col in chunk.columns:
+                chunk_profile = ColumnProfile.from_values(chunk[col])
+                profiles[col] = profiles[col].merge(chunk_profile) if col in profiles else chunk_profile
+    if not profiles:
+        profiles = {col: ColumnProfile() for col in pd.read_csv(csv_file, nrows=0, encoding="utf-8").columns}
 
-def generate_schema_sql_from_csvs(data_dir: Path, sample_rows: int) -> str:
+    complete = sample_rows <= 0 or rows < sample_rows
+    return {col: profile.to_snowflake_type(complete) for col, profile in profiles.items()}
+
+
+def _table_sql(csv_file: Path, sample_rows: int, chunksize: int) -> str:
+    """(Internal) Worker: infers one CSV's schema and renders its CREATE TABLE statement."""
+    schema = infer_csv_schema(csv_file, sample_rows, chunksize)
+    table_name = csv_file.stem.upper().replace("-", "_")
+    cols_sql = ",\n".join([f"    {_sanitize_column_name(col)} {sql_type}" for col, sql_type in schema.items()])
+    return f"-- Schema for: {csv_file.name}\nCREATE OR REPLACE TABLE {table_name} (\n{cols_sql}\n);"
+
+
+def generate_schema_sql_from_csvs(
+    data_dir: Path, sample_rows: int, max_workers: int | None = None, chunksize: int = 100_000
+) -> str:
     """
     Generates a complete Snowflake setup SQL script from all CSVs in a directory.
 
+    Files are scanned in parallel across a process pool, each with the
+    streaming, constant-memory inference of `infer_csv_schema`.
+
     Args:
         data_dir (Path): The directory containing the source CSV files.
-        sample_rows (int): The number of rows to sample for dtype inference.
+        sample_rows (int): The number of rows to sample for dtype inference (0 = whole file).
+        max_workers (int | None): Size of the process pool. Defaults to the CPU count; 1 disables it.
+        chunksize (int): Rows profiled per chunk.
 
     Returns:
         str: A single string containing the complete, executable SQL script.
@@ -74,19 +240,28 @@ CREATE OR REPLACE STAGE my_internal_stage FILE_FORMAT = my_csv_format;
         print(f"Warning: No CSV files found in '{data_dir}'.")
         return sql_header
 
-    for csv_file in csv_files:
-        try:
-            df_sample = pd.read_csv(csv_file, nrows=sample_rows if sample_rows > 0 else None, encoding="utf-8")
-            table_name = csv_file.stem.upper().replace("-", "_")
-
-            cols_sql = ",\n".join([
-                f"    {_sanitize_column_name(col)} {_map_pandas_to_snowflake_type(dtype)}"
-                for col, dtype in df_sample.dtypes.items()
-            ])
-            table_sql = f"-- Schema for: {csv_file.name}\nCREATE OR REPLACE TABLE {table_name} (\n{cols_sql}\n);"
-            table_creation_statements.append(table_sql)
-        except Exception as e:
-            error_sql = f"-- ERROR generating schema for {csv_file.name}: {e}"
+    n_workers = min(max_workers or os.cpu_count() or 1, len(csv_files))
+    outcomes: list[str | Exception] = []
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_table_sql, csv_file, sample_rows, chunksize) for csv_file in csv_files]
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    outcomes.append(e)
+    else:
+        for csv_file in csv_files:
+            try:
+                outcomes.append(_table_sql(csv_file, sample_rows, chunksize))
+            except Exception as e:
+                outcomes.append(e)
+
+    for csv_file, outcome in zip(csv_files, outcomes, strict=True):
+        if isinstance(outcome, Exception):
+            error_sql = f"-- ERROR generating schema for {csv_file.name}: {outcome}"
             table_creation_statements.append(error_sql)
-            print(f"  - ❌ ERROR for {csv_file.name}: {e}")
+            print(f"  - ❌ ERROR for {csv_file.name}: {outcome}")
+        else:
+            table_creation_statements.append(outcome)
     return sql_header + "\n\n".join(table_creation_statements)
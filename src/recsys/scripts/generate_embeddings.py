@@ -0,0 +1,399 @@
+# src/recsys/scripts/generate_embeddings.py
+"""
+Batch embedding generation for the RAG recommender (LLD §3.1, step 3).
+
+Instead of one `model.encode()` call over the whole `embedding_text` column,
+the pipeline:
+
+1. hashes every game's embedding text and keeps only games that are new or
+   whose text changed since the last run (nightly runs embed a handful),
+2. sorts those texts by length, so each batch holds texts of similar length
+   and the tokenizer pads as little as possible; batches are sized to a
+   character budget, so short texts go in large batches and long ones in small,
+3. cuts the sorted work into fixed-size shards and encodes them across CPU
+   worker processes, each loading the model once,
+4. writes every finished shard as a float32 `.npy` file and records it in
+   `manifest.json` before the next one is accepted.
+
+An interrupted run therefore resumes after its last completed shard: those
+games' hashes are already in the manifest and are skipped on restart.
+
+Output layout (under `processed_data_dir/<output_dir>`):
+
+    shard_00000.npy      float32 embeddings, one row per game
+    shard_00000.ids.npy  int64 game ids of those rows
+    manifest.json        model, dim, shard list and the text hash of every embedded game
+
+A game re-embedded after an edit appears in a newer shard; `load_embeddings`
+keeps the newest row per game and drops games no longer in the catalogue,
+reading only those rows from the memory-mapped shards. Once more than
+`compact_ratio` of the stored rows are dead (superseded, or of games that
+left the catalogue), the live rows are rewritten into fresh shards and the
+old ones deleted, so the directory does not grow with every edit.
+
+`train_model` builds the version's RAG index from `load_embeddings`.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from recsys.config_management.settings import get_settings
+from recsys.data.feature_engineering import CATEGORY_PREFIX
+from recsys.data.loader import load_extracted_data
+from recsys.models.rag_recommender import DEFAULT_EMBEDDING_MODEL, build_embedding_text
+from recsys.utils.files import atomic_write
+from recsys.utils.paths import get_project_root
+
+MANIFEST_FILENAME = "manifest.json"
+SHARD_TEMPLATE = "shard_{:05d}"
+DEFAULT_COMPACT_RATIO = 0.25
+
+# Kaggle `games.csv` column -> mart column used by `build_embedding_text`.
+KAGGLE_COLUMNS = {"BGGId": "GAME_ID", "Name": "NAME", "Description": "DESCRIPTION"}
+KAGGLE_ID_COLUMN = "BGGId"
+
+Encoder = Callable[[list[str], int], np.ndarray]
+
+_worker_encoder: Encoder | None = None
+
+
+def text_hash(text: str) -> str:
+    """Returns a short content hash of one embedding text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def sentence_transformer_encoder(model_name: str) -> Encoder:
+    """Loads a sentence-transformers model and returns its `encode(texts, batch_size)` function."""
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(texts: list[str], batch_size: int) -> np.ndarray:
+        return np.asarray(model.encode(texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False))
+
+    return encode
+
+
+def one_hot_labels(df: pd.DataFrame, columns: Sequence[str], strip_prefix: str = "") -> pd.Series:
+    """Joins the names of each row's set one-hot columns, e.g. `Cat:Thematic`, `Cat:War` -> "Thematic, War"."""
+    names = np.array([column.removeprefix(strip_prefix) for column in columns], dtype=object)
+    members = df[list(columns)].to_numpy(dtype=np.float64, na_value=0) != 0
+    return pd.Series([", ".join(names[row]) for row in members], index=df.index, dtype=object)
+
+
+def kaggle_embedding_frame(games: pd.DataFrame, mechanics: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Maps the Kaggle files onto the mart columns `build_embedding_text` reads.
+
+    Args:
+        games (pd.DataFrame): `games.csv`, with its `Cat:*` one-hot category columns.
+        mechanics (pd.DataFrame | None): `mechanics.csv`: an id column plus one column per mechanic.
+
+    Returns:
+        pd.DataFrame: `GAME_ID`, `NAME`, `DESCRIPTION`, `CATEGORIES` and `MECHANICS`, one row per game.
+    """
+    frame = games[list(KAGGLE_COLUMNS)].rename(columns=KAGGLE_COLUMNS)
+    categories = [c for c in games.columns if c.startswith(CATEGORY_PREFIX)]
+    frame["CATEGORIES"] = one_hot_labels(games, categories, strip_prefix=CATEGORY_PREFIX)
+    if mechanics is None:
+        frame["MECHANICS"] = ""
+    else:
+        aligned = mechanics.set_index(KAGGLE_ID_COLUMN).reindex(games[KAGGLE_ID_COLUMN])
+        frame["MECHANICS"] = one_hot_labels(aligned, aligned.columns).to_numpy()
+    return frame
+
+
+def length_batches(lengths: np.ndarray, max_batch_size: int, max_batch_chars: int) -> list[slice]:
+    """
+    Splits length-sorted texts into batches whose padded size stays within a budget.
+
+    Args:
+        lengths (np.ndarray): Text lengths, sorted descending.
+        max_batch_size (int): Upper bound on texts per batch.
+        max_batch_chars (int): Upper bound on `len(batch) * longest text in batch`.
+
+    Returns:
+        list[slice]: Consecutive slices covering every text.
+    """
+    batches, start = [], 0
+    while start < len(lengths):
+        # Sorted descending, so the first text of a batch is its longest.
+        size = max(1, min(max_batch_size, max_batch_chars // max(1, int(lengths[start]))))
+        batches.append(slice(start, min(start + size, len(lengths))))
+        start += size
+    return batches
+
+
+def _init_worker(encoder_factory: Callable, model_name: str, threads: int | None) -> None:
+    """(Internal) Loads the model once per worker process."""
+    global _worker_encoder
+    if threads:
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    _worker_encoder = encoder_factory(model_name)
+
+
+def _encode_shard(texts: list[str], max_batch_size: int, max_batch_chars: int) -> np.ndarray:
+    """(Internal) Encodes one shard of length-sorted texts batch by batch."""
+    if _worker_encoder is None:
+        raise RuntimeError("The worker's encoder is not loaded; `_init_worker` must run first.")
+    encode = _worker_encoder
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    parts = [
+        np.asarray(encode(texts[batch], batch.stop - batch.start), dtype=np.float32)
+        for batch in length_batches(lengths, max_batch_size, max_batch_chars)
+    ]
+    return np.concatenate(parts) if parts else np.empty((0, 0), dtype=np.float32)
+
+
+class EmbeddingStore:
+    """The shard directory and its manifest."""
+
+    def __init__(self, path: Path, model_name: str = DEFAULT_EMBEDDING_MODEL):
+        self.path = path
+        self.manifest_path = path / MANIFEST_FILENAME
+        self.manifest: dict[str, Any] = {"model": model_name, "dim": None, "shards": [], "hashes": {}}
+        if self.manifest_path.is_file():
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+            if self.manifest["model"] != model_name:
+                raise ValueError(
+                    f"'{path}' holds embeddings from '{self.manifest['model']}', not '{model_name}'. "
+                    "Use a different output directory or delete it to re-embed."
+                )
+
+    def stale(self, game_ids: np.ndarray, hashes: list[str]) -> np.ndarray:
+        """Returns the positions of games that are new or whose text hash changed."""
+        known = self.manifest["hashes"]
+        stale = [i for i, (g, h) in enumerate(zip(game_ids.tolist(), hashes, strict=True)) if known.get(str(g)) != h]
+        return np.array(stale, dtype=np.int64)
+
+    def _write_shard(self, game_ids: np.ndarray, embeddings: np.ndarray) -> dict:
+        """(Internal) Writes the arrays of a new shard under a fresh name; returns its manifest entry."""
+        # Never reuses a name, so a compaction's new shards cannot overwrite the ones it replaces.
+        number = self.manifest.get("next_shard", len(self.manifest["shards"]))
+        self.manifest["next_shard"] = number + 1
+        name = SHARD_TEMPLATE.format(number)
+        self.path.mkdir(parents=True, exist_ok=True)
+        for suffix, array in ((".npy", embeddings.astype(np.float32)), (".ids.npy", game_ids.astype(np.int64))):
+            with atomic_write(self.path / (name + suffix)) as f:
+                np.save(f, array)
+        return {"name": name, "rows": len(game_ids)}
+
+    def _save_manifest(self) -> None:
+        """(Internal) Replaces the manifest atomically."""
+        with atomic_write(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+
+    def add_shard(self, game_ids: np.ndarray, hashes: list[str], embeddings: np.ndarray) -> str:
+        """Writes one shard and commits it to the manifest (both atomically)."""
+        entry = self._write_shard(game_ids, embeddings)
+        self.manifest["dim"] = int(embeddings.shape[1])
+        self.manifest["shards"].append(entry)
+        self.manifest["hashes"].update({str(g): h for g, h in zip(game_ids.tolist(), hashes, strict=True)})
+        self._save_manifest()
+        name: str = entry["name"]
+        return name
+
+    def compact(
+        self, game_ids: np.ndarray, shard_size: int = 4096, compact_ratio: float = DEFAULT_COMPACT_RATIO
+    ) -> bool:
+        """
+        Rewrites the live rows into new shards once dead rows pass `compact_ratio` of all rows.
+
+        A row is live if it is the newest embedding of a game in `game_ids`. The new shards are
+        committed by a single manifest replace and the old files deleted afterwards, so a crash
+        at any point leaves a loadable directory.
+
+        Returns:
+            bool: Whether the shards were rewritten.
+        """
+        shards = self.manifest["shards"]
+        total = sum(shard["rows"] for shard in shards)
+        if not total:
+            return False
+        ids, vectors = load_embeddings(self.path, game_ids)
+        if total - len(ids) <= compact_ratio * total:
+            return False
+
+        self.manifest["shards"] = [
+            self._write_shard(ids[start : start + shard_size], vectors[start : start + shard_size])
+            for start in range(0, len(ids), shard_size)
+        ]
+        live = {str(g) for g in ids.tolist()}
+        self.manifest["hashes"] = {g: h for g, h in self.manifest["hashes"].items() if g in live}
+        self._save_manifest()
+        for shard in shards:
+            for suffix in (".npy", ".ids.npy"):
+                (self.path / (shard["name"] + suffix)).unlink(missing_ok=True)
+        return True
+
+
+def generate_embeddings(
+    game_ids: np.ndarray,
+    texts: list[str],
+    output_dir: Path,
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    shard_size: int = 4096,
+    max_batch_size: int = 128,
+    max_batch_chars: int = 64_000,
+    max_workers: int | None = None,
+    encoder_factory: Callable = sentence_transformer_encoder,
+    compact_ratio: float = DEFAULT_COMPACT_RATIO,
+) -> dict:
+    """
+    Embeds every game whose text is new or changed and appends the results as shards.
+
+    Args:
+        game_ids (np.ndarray): Game id of each text.
+        texts (list[str]): Embedding texts (see `build_embedding_text`).
+        output_dir (Path): Shard directory; created if missing, resumed if present.
+        model_name (str): Sentence-transformers model name.
+        shard_size (int): Games per shard, i.e. per checkpoint.
+        max_batch_size (int): Upper bound on texts per `encode` call.
+        max_batch_chars (int): Upper bound on padded characters per `encode` call.
+        max_workers (int | None): Encoding processes. Defaults to the CPU count; 1 encodes in-process.
+        encoder_factory (Callable): `factory(model_name) -> encode(texts, batch_size)`; must be picklable.
+        compact_ratio (float): Rewrite the shards once this share of their rows is dead (see `EmbeddingStore.compact`).
+
+    Returns:
+        dict: `embedded`, `skipped` and `shards` counts for this run, and whether the shards were `compacted`.
+    """
+    game_ids = np.asarray(game_ids, dtype=np.int64)
+    hashes = [text_hash(t) for t in texts]
+    store = EmbeddingStore(output_dir, model_name)
+    todo = store.stale(game_ids, hashes)
+    summary = {"embedded": 0, "skipped": len(game_ids) - len(todo), "shards": 0, "compacted": False}
+    if len(todo) == 0:
+        summary["compacted"] = store.compact(game_ids, shard_size, compact_ratio)
+        return summary
+
+    # Longest first: the slowest shards start while the pool is fullest.
+    lengths = np.fromiter((len(texts[i]) for i in todo), dtype=np.int64, count=len(todo))
+    todo = todo[np.argsort(-lengths, kind="stable")]
+    shards = [todo[start : start + shard_size] for start in range(0, len(todo), shard_size)]
+    jobs = [([texts[i] for i in shard], max_batch_size, max_batch_chars) for shard in shards]
+
+    n_workers = min(max_workers or os.cpu_count() or 1, len(shards))
+    if n_workers == 1:
+        _init_worker(encoder_factory, model_name, None)
+        results: Iterator[np.ndarray] = (_encode_shard(*job) for job in jobs)
+        executor = None
+    else:
+        threads = max(1, (os.cpu_count() or 1) // n_workers)
+        executor = ProcessPoolExecutor(
+            n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(encoder_factory, model_name, threads),
+        )
+        results = executor.map(_encode_shard, *zip(*jobs, strict=True))
+    try:
+        # Shards are committed in order, so a crash loses at most the shards still in flight.
+        for shard, embeddings in zip(shards, results, strict=True):
+            store.add_shard(game_ids[shard], [hashes[i] for i in shard], embeddings)
+            summary["embedded"] += len(shard)
+            summary["shards"] += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    summary["compacted"] = store.compact(game_ids, shard_size, compact_ratio)
+    return summary
+
+
+def load_embeddings(path: Path, game_ids: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Loads the newest embedding of every game from a shard directory.
+
+    Args:
+        path (Path): Shard directory written by `generate_embeddings`.
+        game_ids (np.ndarray | None): Only return these games (e.g. the current catalogue).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Game ids and their float32 embeddings, row-aligned.
+    """
+    with open(path / MANIFEST_FILENAME, encoding="utf-8") as f:
+        manifest = json.load(f)
+    shard_names = [shard["name"] for shard in manifest["shards"]]
+    shard_ids = [np.load(path / f"{name}.ids.npy") for name in shard_names]
+    ids = np.concatenate(shard_ids) if shard_ids else np.empty(0, dtype=np.int64)
+
+    # Newest shard wins: take the last occurrence of each id.
+    unique_ids, first_in_reversed = np.unique(ids[::-1], return_index=True)
+    rows = len(ids) - 1 - first_in_reversed
+    if game_ids is not None:
+        keep = np.isin(unique_ids, game_ids)
+        unique_ids, rows = unique_ids[keep], rows[keep]
+
+    # Only the live rows are read, shard by shard, from the memory-mapped files.
+    vectors = np.empty((len(rows), manifest["dim"] or 0), dtype=np.float32)
+    offsets = np.cumsum([0] + [len(shard) for shard in shard_ids])
+    shard_of_row = np.searchsorted(offsets, rows, side="right") - 1
+    for shard, name in enumerate(shard_names):
+        selected = np.flatnonzero(shard_of_row == shard)
+        if len(selected):
+            vectors[selected] = np.load(path / f"{name}.npy", mmap_mode="r")[rows[selected] - offsets[shard]]
+    return unique_ids, vectors
+
+
+def main() -> None:
+    """
+    Embeds the interim games file into sharded `.npy` files under `processed_data_dir`.
+    """
+    parser = argparse.ArgumentParser(description="Generate game embeddings for the RAG recommender.")
+    parser.add_argument("--workers", type=int, default=None, help="Encoding processes (default: CPU count).")
+    args = parser.parse_args()
+
+    try:
+        project_root = get_project_root()
+        config = get_settings().as_dict()
+        emb_config = config.get("training", {}).get("embeddings", {})
+
+        # All columns: the categories are the `Cat:*` one-hot columns.
+        games = load_extracted_data(emb_config.get("games_file", "games.csv"), project_root, config)
+        mechanics_file = emb_config.get("mechanics_file", "mechanics.csv")
+        mechanics = load_extracted_data(mechanics_file, project_root, config) if mechanics_file else None
+        games = kaggle_embedding_frame(games, mechanics)
+        texts = build_embedding_text(games).tolist()
+
+        start = time.perf_counter()
+        summary = generate_embeddings(
+            games["GAME_ID"].to_numpy(dtype=np.int64),
+            texts,
+            project_root / config["paths"]["processed_data_dir"] / emb_config.get("output_dir", "embeddings"),
+            model_name=emb_config.get("model", DEFAULT_EMBEDDING_MODEL),
+            shard_size=emb_config.get("shard_size", 4096),
+            max_batch_size=emb_config.get("max_batch_size", 128),
+            max_batch_chars=emb_config.get("max_batch_chars", 64_000),
+            max_workers=args.workers or emb_config.get("max_workers"),
+            compact_ratio=emb_config.get("compact_ratio", DEFAULT_COMPACT_RATIO),
+        )
+        print(
+            f"Embedded {summary['embedded']} games in {summary['shards']} shards "
+            f"({summary['skipped']} unchanged{', shards compacted' if summary['compacted'] else ''}) "
+            f"in {time.perf_counter() - start:.1f}s."
+        )
+
+    except (FileNotFoundError, OSError, ValueError, TypeError) as e:
+        print(f"\nAn error occurred while generating embeddings: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+# src/recsys/scripts/load_raw_data.py
+"""
+Bulk loader for the interim CSV files into the RAW_DATA schema (HLD §3, step 1).
+
+For every CSV the loader:
+1. hashes the file and skips it if its checksum matches the file's latest
+   load recorded in the LOAD_HISTORY ledger table,
+2. splits it into gzip-compressed chunks (each with the header row), with
+   files processed in parallel across a process pool,
+3. clears the table's stage prefix, then uploads the chunks to it in
+   parallel (PUT),
+4. per table, in one transaction: empties the table, runs COPY INTO on
+   exactly the chunks staged by this run and records the file's checksum
+   and row count in LOAD_HISTORY; tables are loaded concurrently.
+
+A failed COPY rolls back, leaving the table's previous contents and no
+ledger entry, so the file is retried on the next run. Its chunks stay
+staged until that run clears the prefix, so they are never loaded twice.
+
+The warehouse is reached through a `LoaderBackend`, which owns connecting,
+staging and copying. `SnowflakeBackend` talks to Snowflake; `SQLiteBackend`
+is a local stand-in with the same semantics, used by tests and for dry runs
+without network access. Connections come from a small pool shared by the
+upload and copy threads.
+"""
+
+import csv
+import gzip
+import itertools
+import multiprocessing
+import os
+import queue
+import shutil
+import sqlite3
+import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+from recsys.config_management.settings import get_settings
+from recsys.utils.files import file_digest
+from recsys.utils.paths import get_project_root
+
+LEDGER_TABLE = "LOAD_HISTORY"
+DEFAULT_ROWS_PER_CHUNK = 250_000
+
+
+def table_name_for(csv_file: Path) -> str:
+    """Returns the RAW_DATA table a CSV loads into (same rule as `generate_db_schema`)."""
+    return csv_file.stem.upper().replace("-", "_")
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes a table or column name for SQL, escaping embedded double quotes."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+@contextmanager
+def _sql_transaction(conn: Any, begin: str = "BEGIN") -> Iterator[None]:
+    """(Internal) Runs the block in an explicit transaction, rolled back if it raises."""
+    cursor = conn.cursor()
+    cursor.execute(begin)
+    try:
+        yield
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+    cursor.execute("COMMIT")
+
+
+def split_and_compress(
+    csv_file: Path, out_dir: Path, rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK
+) -> tuple[list[Path], int]:
+    """
+    Splits a CSV into gzip chunks of at most `rows_per_chunk` data rows.
+
+    Rows are parsed with the csv module, so quoted fields containing newlines
+    (e.g. BGG descriptions) are never cut in half. Every chunk repeats the
+    header row, matching `SKIP_HEADER = 1` of the stage's file format.
+
+    Returns:
+        tuple[list[Path], int]: The chunk files and the total number of data rows.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    chunks: list[Path] = []
+    total_rows = 0
+    with open(csv_file, newline="", encoding="utf-8") as src:
+        reader = csv.reader(src)
+        header = next(reader, None)
+        if header is None:
+            return chunks, 0
+        while (first_row := next(reader, None)) is not None:
+            chunk_path = out_dir / f"{csv_file.stem}_{len(chunks):05d}.csv.gz"
+            with gzip.open(chunk_path, "wt", newline="", encoding="utf-8", compresslevel=6) as out:
+                writer = csv.writer(out)
+                writer.writerow(header)
+                writer.writerow(first_row)
+                total_rows += 1
+                for row in itertools.islice(reader, rows_per_chunk - 1):
+                    writer.writerow(row)
+                    total_rows += 1
+            chunks.append(chunk_path)
+    return chunks, total_rows
+
+
+def _prepare_file(csv_file: Path, checksum: str, work_dir: Path, rows_per_chunk: int) -> "PreparedFile":
+    """(Internal) Worker: splits one CSV whose checksum the caller already computed."""
+    chunks, rows = split_and_compress(csv_file, work_dir / csv_file.stem, rows_per_chunk)
+    return PreparedFile(csv_file, table_name_for(csv_file), checksum, chunks, rows)
+
+
+def _utc_timestamp() -> str:
+    """(Internal) Returns the current UTC time as a sortable `YYYY-MM-DD HH:MM:SS.ffffff` string."""
+    return datetime.now(UTC).replace(tzinfo=None).isoformat(sep=" ", timespec="microseconds")
+
+
+@dataclass
+class PreparedFile:
+    """A source CSV split into compressed chunks, ready to stage."""
+
+    source: Path
+    table: str
+    checksum: str
+    chunks: list[Path]
+    rows: int
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a `BulkLoader.load` run."""
+
+    loaded: dict[str, int] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+class LoaderBackend(Protocol):
+    """The warehouse operations the bulk loader needs."""
+
+    placeholder: str
+
+    def connect(self) -> Any: ...
+
+    def clear_stage(self, conn: Any, table: str) -> None: ...
+
+    def stage(self, conn: Any, chunk: Path, table: str) -> None: ...
+
+    def transaction(self, conn: Any) -> AbstractContextManager: ...
+
+    def truncate(self, conn: Any, table: str) -> None: ...
+
+    def copy_into(self, conn: Any, table: str, columns: list[str], files: list[str]) -> int: ...
+
+
+class SnowflakeBackend:
+    """
+    Loads through a Snowflake internal stage with PUT and COPY INTO.
+
+    Credentials and context come from the SNOWFLAKE_* environment variables.
+    """
+
+    placeholder = "%s"
+
+    def __init__(self, stage: str = "my_internal_stage", file_format: str = "my_csv_format", put_parallel: int = 4):
+        self.stage_name = stage
+        self.file_format = file_format
+        self.put_parallel = put_parallel
+
+    def connect(self) -> Any:
+        import snowflake.connector
+
+        return snowflake.connector.connect(
+            user=os.getenv("SNOWFLAKE_USER"),
+            password=os.getenv("SNOWFLAKE_PASSWORD"),
+            account=os.getenv("SNOWFLAKE_ACCOUNT"),
+            warehouse=os.getenv("SNOWFLAKE_WAREHOUSE", "COMPUTE_WH"),
+            database=os.getenv("SNOWFLAKE_DATABASE", "BOARDGAME_DB"),
+            schema=os.getenv("SNOWFLAKE_SCHEMA", "RAW_DATA"),
+        )
+
+    def clear_stage(self, conn: Any, table: str) -> None:
+        conn.cursor().execute(f"REMOVE @{self.stage_name}/{table}/")
+
+    def stage(self, conn: Any, chunk: Path, table: str) -> None:
+        conn.cursor().execute(
+            f"PUT 'file://{chunk.resolve().as_posix()}' @{self.stage_name}/{table}/ "
+            f"AUTO_COMPRESS = FALSE SOURCE_COMPRESSION = GZIP PARALLEL = {self.put_parallel} OVERWRITE = TRUE"
+        )
+
+    def transaction(self, conn: Any) -> AbstractContextManager:
+        # TRUNCATE TABLE and COPY INTO are DML in Snowflake, so both roll back together.
+        return _sql_transaction(conn)
+
+    def truncate(self, conn: Any, table: str) -> None:
+        conn.cursor().execute(f"TRUNCATE TABLE IF EXISTS {quote_identifier(table)}")
+
+    def copy_into(self, conn: Any, table: str, columns: list[str], files: list[str]) -> int:
+        cursor = conn.cursor()
+        file_list = ", ".join(f"'{name}'" for name in files)
+        cursor.execute(
+            f"COPY INTO {quote_identifier(table)} FROM @{self.stage_name}/{table}/ FILES = ({file_list}) "
+            f"FILE_FORMAT = (FORMAT_NAME = '{self.file_format}') ON_ERROR = 'ABORT_STATEMENT' PURGE = TRUE"
+        )
+        # One result row per staged file; column 3 is rows_loaded.
+        return sum(int(row[3]) for row in cursor.fetchall() if len(row) > 3 and row[3] is not None)
+
+
+class SQLiteBackend:
+    """
+    Local stand-in for Snowflake: a directory acts as the stage, SQLite as the warehouse.
+
+    Tables missing from the database are created with TEXT columns from the
+    CSV header, mirroring a RAW_DATA layer that stores values as loaded.
+    """
+
+    placeholder = "?"
+
+    def __init__(self, db_path: Path, stage_dir: Path):
+        self.db_path = db_path
+        self.stage_dir = stage_dir
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def clear_stage(self, conn: sqlite3.Connection, table: str) -> None:
+        shutil.rmtree(self.stage_dir / table, ignore_errors=True)
+
+    def stage(self, conn: sqlite3.Connection, chunk: Path, table: str) -> None:
+        target = self.stage_dir / table
+        target.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(chunk, target / chunk.name)
+
+    def transaction(self, conn: sqlite3.Connection) -> AbstractContextManager:
+        # Takes the write lock up front, so concurrent table loads queue instead of failing to upgrade.
+        return _sql_transaction(conn, "BEGIN IMMEDIATE")
+
+    def truncate(self, conn: sqlite3.Connection, table: str) -> None:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        if exists:
+            conn.execute(f"DELETE FROM {quote_identifier(table)}")  # noqa: S608 - quoted identifier
+
+    def copy_into(self, conn: sqlite3.Connection, table: str, columns: list[str], files: list[str]) -> int:
+        quoted = ", ".join(map(quote_identifier, columns))
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {quote_identifier(table)} ({quoted})")
+        insert = f"INSERT INTO {quote_identifier(table)} VALUES ({', '.join('?' * len(columns))})"  # noqa: S608 - quoted identifier
+        loaded = 0
+        staged = [self.stage_dir / table / name for name in files]
+        for chunk in staged:
+            with gzip.open(chunk, "rt", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader)
+                rows = [[None if v in ("", "NULL", "null", "\\N") else v for v in row] for row in reader]
+            conn.executemany(insert, rows)
+            loaded += len(rows)
+        for chunk in staged:  # PURGE = TRUE
+            chunk.unlink()
+        return loaded
+
+
+class ConnectionPool:
+    """A fixed-size pool of backend connections shared by loader threads."""
+
+    def __init__(self, backend: LoaderBackend, size: int):
+        self.backend = backend
+        self._idle: queue.Queue = queue.Queue()
+        self._all = [backend.connect() for _ in range(size)]
+        for conn in self._all:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        for conn in self._all:
+            conn.close()
+
+
+class BulkLoader:
+    """
+    Loads CSV files into the warehouse in parallel, skipping already-loaded content.
+    """
+
+    def __init__(
+        self,
+        backend: LoaderBackend,
+        pool_size: int = 4,
+        max_workers: int | None = None,
+        rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK,
+    ):
+        """
+        Args:
+            backend (LoaderBackend): Warehouse backend (Snowflake or the SQLite stand-in).
+            pool_size (int): Connections shared by the PUT and COPY threads.
+            max_workers (int | None): Processes used to split and compress files. Defaults to the CPU count.
+            rows_per_chunk (int): Data rows per compressed chunk.
+        """
+        self.backend = backend
+        self.pool_size = pool_size
+        self.max_workers = max_workers
+        self.rows_per_chunk = rows_per_chunk
+
+    def _ensure_ledger(self, conn: Any) -> None:
+        conn.cursor().execute(
+            f"CREATE TABLE IF NOT EXISTS {LEDGER_TABLE} "
+            "(FILE_NAME VARCHAR, CHECKSUM VARCHAR, TABLE_NAME VARCHAR, ROWS_LOADED NUMBER, LOADED_AT TIMESTAMP)"
+        )
+
+    def _latest_checksums(self, conn: Any) -> dict[str, str]:
+        """(Internal) Returns the checksum of each file's most recent load."""
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT FILE_NAME, CHECKSUM FROM {LEDGER_TABLE} ORDER BY LOADED_AT")  # noqa: S608 - constant table name
+        # Later rows overwrite earlier ones, so a file reverted to an older version is loaded again.
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def _record_load(self, conn: Any, prepared: PreparedFile, rows: int) -> None:
+        p = self.backend.placeholder
+        conn.cursor().execute(
+            # Constant table name; the values are bound parameters.
+            f"INSERT INTO {LEDGER_TABLE} (FILE_NAME, CHECKSUM, TABLE_NAME, ROWS_LOADED, LOADED_AT) "  # noqa: S608
+            f"VALUES ({p}, {p}, {p}, {p}, {p})",
+            # Bound with microseconds, so two loads within the same second still order correctly.
+            (prepared.source.name, prepared.checksum, prepared.table, rows, _utc_timestamp()),
+        )
+
+    def load(self, csv_files: list[Path]) -> LoadReport:
+        """
+        Loads `csv_files`, each into the table named after it.
+
+        Returns:
+            LoadReport: Rows loaded per table, skipped files and failures.
+        """
+        report = LoadReport()
+        pool = ConnectionPool(self.backend, self.pool_size)
+        try:
+            with pool.connection() as conn:
+                self._ensure_ledger(conn)
+                latest = self._latest_checksums(conn)
+
+            pending = {}
+            for csv_file in csv_files:
+                checksum = file_digest(csv_file)
+                if latest.get(csv_file.name) == checksum:
+                    report.skipped.append(csv_file.name)
+                else:
+                    pending[csv_file] = checksum
+            if not pending:
+                return report
+
+            with tempfile.TemporaryDirectory(prefix="recsys-load-") as work_dir:
+                prepared = self._prepare(pending, Path(work_dir), report)
+                self._stage_all(pool, prepared, report)
+                self._copy_all(pool, [p for p in prepared if p.source.name not in report.failed], report)
+        finally:
+            pool.close()
+        return report
+
+    def _prepare(self, checksums: dict[Path, str], work_dir: Path, report: LoadReport) -> list[PreparedFile]:
+        """(Internal) Splits and compresses files in parallel across processes."""
+        n_workers = min(self.max_workers or os.cpu_count() or 1, len(checksums))
+        prepared = []
+        if n_workers > 1:
+            with ProcessPoolExecutor(n_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = {
+                    f: executor.submit(_prepare_file, f, checksum, work_dir, self.rows_per_chunk)
+                    for f, checksum in checksums.items()
+                }
+                for csv_file, future in futures.items():
+                    try:
+                        prepared.append(future.result())
+                    except Exception as e:
+                        report.failed[csv_file.name] = f"split failed: {e}"
+        else:
+            for csv_file, checksum in checksums.items():
+                try:
+                    prepared.append(_prepare_file(csv_file, checksum, work_dir, self.rows_per_chunk))
+                except Exception as e:
+                    report.failed[csv_file.name] = f"split failed: {e}"
+        return prepared
+
+    def _stage_all(self, pool: ConnectionPool, prepared: list[PreparedFile], report: LoadReport) -> None:
+        """(Internal) Clears each table's stage prefix, then PUTs every chunk over the pooled connections."""
+
+        def put(item: tuple[PreparedFile, Path]) -> None:
+            prepared_file, chunk = item
+            with pool.connection() as conn:
+                self.backend.stage(conn, chunk, prepared_file.table)
+
+        cleared = []
+        with pool.connection() as conn:
+            for prepared_file in prepared:
+                try:
+                    # Chunks left behind by a failed run must not be copied along with this one.
+                    self.backend.clear_stage(conn, prepared_file.table)
+                    cleared.append(prepared_file)
+                except Exception as e:
+                    report.failed[prepared_file.source.name] = f"stage cleanup failed: {e}"
+
+        jobs = [(p, chunk) for p in cleared for chunk in p.chunks]
+        with ThreadPoolExecutor(self.pool_size) as executor:
+            futures = [(job[0], executor.submit(put, job)) for job in jobs]
+            for prepared_file, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    report.failed.setdefault(prepared_file.source.name, f"PUT failed: {e}")
+
+    def _copy_all(self, pool: ConnectionPool, prepared: list[PreparedFile], report: LoadReport) -> None:
+        """(Internal) Runs one COPY INTO per table, tables in parallel, and records the loads."""
+
+        def copy(prepared_file: PreparedFile) -> int:
+            with open(prepared_file.source, newline="", encoding="utf-8") as f:
+                columns = next(csv.reader(f), [])
+            with pool.connection() as conn, self.backend.transaction(conn):
+                # A changed source replaces the table's previous contents, atomically with the copy.
+                self.backend.truncate(conn, prepared_file.table)
+                files = [chunk.name for chunk in prepared_file.chunks]
+                rows = self.backend.copy_into(conn, prepared_file.table, columns, files) if files else 0
+                self._record_load(conn, prepared_file, rows)
+            return rows
+
+        with ThreadPoolExecutor(self.pool_size) as executor:
+            futures = [(p, executor.submit(copy, p)) for p in prepared]
+            for prepared_file, future in futures:
+                try:
+                    report.loaded[prepared_file.table] = future.result()
+                except Exception as e:
+                    report.failed[prepared_file.source.name] = f"COPY INTO failed: {e}"
+
+
+def main() -> None:
+    """Loads every interim CSV into Snowflake's RAW_DATA schema."""
+    print("--- Starting Raw Data Load ---")
+    project_root = get_project_root()
+    config = get_settings().as_dict()
+    data_dir = project_root / config["paths"]["extract_data_dir"]
+    csv_files = sorted(data_dir.glob("*.csv"))
+    if not csv_files:
+        print(f"Warning: No CSV files found in '{data_dir}'.")
+        return
+
+    report = BulkLoader(SnowflakeBackend()).load(csv_files)
+    for table, rows in report.loaded.items():
+        print(f"  - ✅ {table}: {rows} rows loaded")
+    for name in report.skipped:
+        print(f"  - ⏭️  {name}: unchanged since last load, skipped")
+    for name, error in report.failed.items():
+        print(f"  - ❌ {name}: {error}")
+
+
+if __name__ == "__main__":
+    main()
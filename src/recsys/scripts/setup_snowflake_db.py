@@ -10,10 +10,8 @@ from pathlib import Path
 import snowflake.connector
 from snowflake.connector import ProgrammingError
 
-from src.scripts.generate_db_schema import generate_schema_sql_from_csvs
-
-# --- Import from our custom modules ---
-from src.scripts.load_config import load_config
+from recsys.config_management.settings import get_settings
+from recsys.scripts.generate_db_schema import generate_schema_sql_from_csvs
 
 
 def execute_snowflake_script(sql_script):
@@ -46,7 +44,7 @@ def main():
     """Orchestrates the entire database setup process."""
     print("--- Starting Snowflake Database Setup ---")
     # 1. Load Configuration
-    config = load_config("config.yml")
+    config = get_settings().as_dict()
     paths = config.get("paths", {})
     settings = config.get("settings", {})
 
@@ -69,9 +67,4 @@ def main():
 
 
 if __name__ == "__main__":
-    # This setup allows the script to be run directly from the command line
-    # while correctly handling package imports.
-    import sys
-
-    sys.path.append(str(Path(__file__).resolve().parents[1]))
     main()
@@ -0,0 +1,209 @@
+# src/recsys/scripts/train_model.py
+"""
+Training script for the recommendation models.
+
+Trains the collaborative filter by streaming the ratings CSV from the interim
+data directory, builds the RAG index from the embedding shards written by
+`generate_embeddings`, precomputes the item-to-item neighbor table and the
+per-filter clusterings from the processed game records, and writes the
+artifacts into the versioned models directory, marking it ready for the API
+once complete.
+The process's peak resident memory is reported after each stage so the full
+BGG ratings dump can be sized against the training machine.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+if sys.platform != "win32":  # Windows has no `resource`: peak memory is not reported there.
+    import resource
+
+from recsys.config_management.settings import get_settings
+from recsys.models.collaborative_filter import BGG_CSV_COLUMNS, CollaborativeFilter
+from recsys.models.neighbor_table import NeighborTable, build_neighbor_table
+from recsys.models.rag_recommender import DEFAULT_EMBEDDING_MODEL, RAGRecommender
+from recsys.scripts.generate_embeddings import load_embeddings
+from recsys.utils.clustering import ClusterIndex, precompute_clusterings
+from recsys.utils.distance_metrics import NeighborEngine
+from recsys.utils.paths import MODEL_READY_MARKER, get_project_root
+
+
+def peak_memory_mb() -> float:
+    """Returns the peak resident set size of this process in MiB, or NaN where `resource` is unavailable."""
+    if sys.platform == "win32":
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def train_cf_model(project_root: Path, config: dict, model_version: str) -> CollaborativeFilter:
+    """
+    Trains the collaborative filter from `user_ratings.csv` and saves it.
+
+    Args:
+        project_root (Path): The project root directory.
+        config (dict): The loaded project configuration.
+        model_version (str): Name of the output directory under `models_dir`, e.g. 'v1'.
+    """
+    cf_config = config.get("training", {}).get("collaborative_filter", {})
+    ratings_path = (
+        project_root / config["paths"]["extract_data_dir"] / cf_config.get("ratings_file", "user_ratings.csv")
+    )
+    output_dir = project_root / config["paths"]["models_dir"] / model_version
+
+    model = CollaborativeFilter(
+        factors=cf_config.get("factors", 64),
+        regularization=cf_config.get("regularization", 0.05),
+        iterations=cf_config.get("iterations", 15),
+        alpha=cf_config.get("alpha", 1.0),
+    )
+    start = time.perf_counter()
+    model.fit_from_path(ratings_path, columns=BGG_CSV_COLUMNS, chunksize=cf_config.get("chunksize", 1_000_000))
+    ratings = model.user_items.nnz if model.user_items is not None else 0
+    print(
+        f"Trained collaborative filter on {ratings} ratings "
+        f"({len(model.users)} users x {len(model.items)} games) in {time.perf_counter() - start:.1f}s. "
+        f"Peak memory: {peak_memory_mb():.0f} MiB"
+    )
+    model.save(output_dir)
+    return model
+
+
+def build_rag_index(project_root: Path, config: dict, model_version: str) -> RAGRecommender:
+    """
+    Builds the RAG index from the newest embedding of every game and saves it.
+
+    Args:
+        project_root (Path): The project root directory.
+        config (dict): The loaded project configuration.
+        model_version (str): Name of the output directory under `models_dir`, e.g. 'v1'.
+    """
+    training = config.get("training", {})
+    emb_config, rag_config = training.get("embeddings", {}), training.get("rag", {})
+    embeddings_dir = project_root / config["paths"]["processed_data_dir"] / emb_config.get("output_dir", "embeddings")
+    output_dir = project_root / config["paths"]["models_dir"] / model_version
+    if not embeddings_dir.is_dir():
+        raise FileNotFoundError(f"No embeddings at '{embeddings_dir}'. Run `generate_embeddings` first.")
+
+    start = time.perf_counter()
+    game_ids, embeddings = load_embeddings(embeddings_dir)
+    rag = RAGRecommender(
+        index_type=rag_config.get("index_type", "flat"),
+        embedding_model_name=emb_config.get("model", DEFAULT_EMBEDDING_MODEL),
+        nprobe=rag_config.get("nprobe", 8),
+        ef_search=rag_config.get("ef_search", 64),
+    ).fit_embeddings(game_ids, embeddings)
+    rag.save(output_dir)
+    print(
+        f"Built {rag.index_type} RAG index over {len(game_ids)} games in {time.perf_counter() - start:.1f}s. "
+        f"Peak memory: {peak_memory_mb():.0f} MiB"
+    )
+    return rag
+
+
+def load_game_records(project_root: Path, config: dict) -> list[dict]:
+    """Reads the POC-style game records (BGGId, emb, Categories, ...) from `processed_data_dir`."""
+    records_file = config.get("training", {}).get("records_file", "filtered_data.json")
+    with open(project_root / config["paths"]["processed_data_dir"] / records_file, encoding="utf-8") as f:
+        records: list[dict] = json.load(f)
+    return records
+
+
+def build_neighbors(project_root: Path, config: dict, model_version: str) -> NeighborTable:
+    """
+    Precomputes the top-K neighbor table from the processed game records and saves it with the engine.
+
+    Args:
+        project_root (Path): The project root directory.
+        config (dict): The loaded project configuration.
+        model_version (str): Name of the output directory under `models_dir`, e.g. 'v1'.
+    """
+    nt_config = config.get("training", {}).get("neighbor_table", {})
+    output_dir = project_root / config["paths"]["models_dir"] / model_version
+
+    engine = NeighborEngine.from_records(load_game_records(project_root, config))
+    # The API re-ranks with the same catalogue features.
+    engine.save(output_dir)
+    start = time.perf_counter()
+    table = build_neighbor_table(
+        engine,
+        output_dir,
+        k=nt_config.get("k", 50),
+        block_size=nt_config.get("block_size", 1024),
+        max_workers=nt_config.get("max_workers"),
+    )
+    print(
+        f"Built neighbor table for {len(table)} games (k={table.k}) in {time.perf_counter() - start:.1f}s. "
+        f"Peak memory: {peak_memory_mb():.0f} MiB"
+    )
+    return table
+
+
+def build_clusters(project_root: Path, config: dict, model_version: str) -> ClusterIndex:
+    """
+    Precomputes the clustering of every category filter combination and saves it.
+
+    Args:
+        project_root (Path): The project root directory.
+        config (dict): The loaded project configuration.
+        model_version (str): Name of the output directory under `models_dir`, e.g. 'v1'.
+    """
+    cl_config = config.get("training", {}).get("clustering", {})
+    output_dir = project_root / config["paths"]["models_dir"] / model_version
+
+    records = load_game_records(project_root, config)
+    start = time.perf_counter()
+    index = precompute_clusterings(
+        game_ids=np.array([r["BGGId"] for r in records]),
+        features=np.array([r["emb"] for r in records], dtype=np.float32),
+        category_matrix=np.array([r["Categories"] for r in records]),
+        minibatch_threshold=cl_config.get("minibatch_threshold", 10_000),
+        silhouette_sample=cl_config.get("silhouette_sample", 2_000),
+    )
+    index.save(output_dir)
+    print(
+        f"Precomputed {len(index.signatures)} filter clusterings in {time.perf_counter() - start:.1f}s. "
+        f"Peak memory: {peak_memory_mb():.0f} MiB"
+    )
+    return index
+
+
+def main() -> None:
+    """
+    Main orchestration function for model training.
+    """
+    parser = argparse.ArgumentParser(description="Train the recommendation models.")
+    parser.add_argument("--model-version", default="v1", help="Output directory under models_dir.")
+    parser.add_argument("--skip-rag", action="store_true", help="Do not rebuild the RAG index.")
+    parser.add_argument("--skip-neighbors", action="store_true", help="Do not rebuild the neighbor table.")
+    parser.add_argument("--skip-clusters", action="store_true", help="Do not rebuild the filter clusterings.")
+    args = parser.parse_args()
+
+    try:
+        project_root = get_project_root()
+        config = get_settings().as_dict()
+
+        train_cf_model(project_root, config, args.model_version)
+        if not args.skip_rag:
+            build_rag_index(project_root, config, args.model_version)
+        if not args.skip_neighbors:
+            build_neighbors(project_root, config, args.model_version)
+        if not args.skip_clusters:
+            build_clusters(project_root, config, args.model_version)
+        # The API's model registry only picks up versions carrying the marker.
+        (project_root / config["paths"]["models_dir"] / args.model_version / MODEL_READY_MARKER).touch()
+        print(f"Training complete. Peak memory: {peak_memory_mb():.0f} MiB")
+
+    except (FileNotFoundError, OSError, ValueError, TypeError) as e:
+        print(f"\nAn error occurred during training: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+# src/recsys/tracking/event_store.py
+"""
+Time-partitioned, compacted storage for interaction events.
+
+Layout under the store's root directory:
+
+    segments/2026-10-17T14.jsonl     hourly JSON Lines segments written by the tracker
+    segments/2026-10-17T14.<worker>.jsonl  per-worker segments in multi-worker mode
+    compacted/2026-10-17T13.parquet  closed segments compacted into Parquet
+    catalog.json                     per-file row count, min/max timestamp, event types
+                                     and the staged segments it was built from
+
+Once an hour is over (plus a grace period for buffered events), `compact`
+converts its segment into a timestamp-sorted Parquet file and records its
+statistics in the catalog. `read` uses the catalog to skip every compacted
+file outside the requested time range or without the requested event types,
+so an incremental retraining job only touches the last few hours of data.
+
+In multi-worker mode every process appends only to its own segment files, so
+lines from different processes never interleave. Compaction merges all worker
+segments of an hour into one file sorted by `(timestamp_utc, worker_id, seq)`.
+Compaction may run in a separate process: it relies on the grace period being
+longer than the writers' flush interval, after which no worker writes to a
+closed hour any more.
+
+Before compaction reads a closed segment, it renames it to a uniquely named
+`.compacting` file. Each catalog entry lists the staged files it was built
+from, so a run that crashed after saving the catalog but before deleting those
+files deletes them on the next run instead of ingesting them twice.
+"""
+
+import json
+import os
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from recsys.logging.app_logger import logger
+from recsys.tracking.event_writer import BufferedEventWriter
+from recsys.utils.files import atomic_write
+
+SEGMENTS_DIRNAME = "segments"
+COMPACTED_DIRNAME = "compacted"
+CATALOG_FILENAME = "catalog.json"
+SEGMENT_SUFFIX = ".jsonl"
+COMPACTING_SUFFIX = ".compacting"
+SEGMENT_KEY_FORMAT = "%Y-%m-%dT%H"
+
+EVENT_SCHEMA = pa.schema([
+    ("event_id", pa.string()),
+    ("event_type", pa.string()),
+    ("timestamp_utc", pa.timestamp("us", tz="UTC")),
+    ("user_id", pa.string()),
+    ("session_id", pa.string()),
+    ("details", pa.string()),
+    ("worker_id", pa.string()),
+    ("seq", pa.int64()),
+])
+SORT_KEYS = [("timestamp_utc", "ascending"), ("worker_id", "ascending"), ("seq", "ascending")]
+
+
+@dataclass
+class SegmentStats:
+    """Catalog entry for one compacted Parquet file."""
+
+    file: str
+    segment: str
+    rows: int
+    min_timestamp: str
+    max_timestamp: str
+    event_types: list[str]
+    # Names of the staged `.compacting` files the entry was built from.
+    sources: list[str] = field(default_factory=list)
+
+
+def segment_key(timestamp_utc: str) -> str:
+    """Returns the hourly segment key ('YYYY-MM-DDTHH') of an ISO-8601 UTC timestamp."""
+    return timestamp_utc[:13]
+
+
+def _segment_start(key: str) -> datetime:
+    return datetime.strptime(key, SEGMENT_KEY_FORMAT).replace(tzinfo=UTC)
+
+
+def _to_table(events: list[dict]) -> pa.Table:
+    """(Internal) Converts decoded events into an Arrow table in merge order."""
+    columns = {
+        "event_id": [e.get("event_id") for e in events],
+        "event_type": [e.get("event_type") for e in events],
+        "timestamp_utc": [datetime.fromisoformat(e["timestamp_utc"]) for e in events],
+        "user_id": [None if e.get("user_id") is None else str(e["user_id"]) for e in events],
+        "session_id": [None if e.get("session_id") is None else str(e["session_id"]) for e in events],
+        "details": [json.dumps(e.get("details", {}), separators=(",", ":")) for e in events],
+        "worker_id": [e.get("worker_id") for e in events],
+        "seq": [e.get("seq") for e in events],
+    }
+    table = pa.Table.from_pydict(columns, schema=EVENT_SCHEMA)
+    return table.sort_by(SORT_KEYS)
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    """(Internal) Decodes a JSON Lines segment, skipping torn or corrupt lines."""
+    events, corrupt = [], 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+                if "timestamp_utc" in event:
+                    events.append(event)
+                    continue
+            except json.JSONDecodeError:
+                pass
+            corrupt += 1
+    if corrupt:
+        logger.warning(f"Skipped {corrupt} corrupt lines in event segment '{path.name}'.")
+    return events
+
+
+def _row_filters(start: datetime | None, end: datetime | None, wanted_types: set[str] | None) -> list[tuple] | None:
+    """(Internal) The query as pyarrow DNF filters, or None if it selects everything."""
+    filters: list[tuple] = []
+    if start is not None:
+        filters.append(("timestamp_utc", ">=", start))
+    if end is not None:
+        filters.append(("timestamp_utc", "<", end))
+    if wanted_types is not None:
+        filters.append(("event_type", "in", sorted(wanted_types)))
+    return filters or None
+
+
+def _overlaps(first: datetime, last: datetime, start: datetime | None, end: datetime | None) -> bool:
+    """(Internal) True if timestamps in `[first, last]` can fall in `[start, end)`."""
+    return (start is None or last >= start) and (end is None or first < end)
+
+
+class EventStore:
+    """
+    Hourly-partitioned event storage with Parquet compaction and pruned reads.
+    """
+
+    def __init__(self, root: Path, grace: timedelta = timedelta(minutes=5)):
+        """
+        Args:
+            root (Path): Directory holding the segments, compacted files and catalog.
+            grace (timedelta): How long after an hour ends its segment is still considered open.
+        """
+        self.root = root
+        self.grace = grace
+        self.segments_dir = root / SEGMENTS_DIRNAME
+        self.compacted_dir = root / COMPACTED_DIRNAME
+        self.catalog_path = root / CATALOG_FILENAME
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+
+    # --- Writing ---
+
+    def segment_path(self, event: dict) -> Path:
+        """
+        Returns the hourly segment file an event belongs in (the tracker's partitioner).
+
+        Events carrying a `worker_id` go to that worker's own segment for the hour.
+        """
+        key = segment_key(event["timestamp_utc"])
+        worker_id = event.get("worker_id")
+        name = f"{key}.{worker_id}{SEGMENT_SUFFIX}" if worker_id else key + SEGMENT_SUFFIX
+        return self.segments_dir / name
+
+    def load_catalog(self) -> list[SegmentStats]:
+        """Returns the catalog of compacted files."""
+        try:
+            with open(self.catalog_path, encoding="utf-8") as f:
+                return [SegmentStats(**entry) for entry in json.load(f)]
+        except FileNotFoundError:
+            return []
+
+    def _save_catalog(self, catalog: list[SegmentStats]) -> None:
+        with atomic_write(self.catalog_path, "w", encoding="utf-8") as f:
+            json.dump([asdict(entry) for entry in catalog], f, indent=2)
+
+    def _staged_segments(self) -> list[Path]:
+        """(Internal) Segments renamed for compaction, by this run or an interrupted one."""
+        return sorted(self.segments_dir.glob("*" + SEGMENT_SUFFIX + "*" + COMPACTING_SUFFIX))
+
+    def closed_segments(self, now: datetime | None = None) -> list[Path]:
+        """Returns the JSON Lines segments whose hour (plus grace) has ended."""
+        now = now or datetime.now(UTC)
+        closed = []
+        for path in sorted(self.segments_dir.glob("*" + SEGMENT_SUFFIX)):
+            if _segment_start(path.name.split(".", 1)[0]) + timedelta(hours=1) + self.grace <= now:
+                closed.append(path)
+        return closed
+
+    def compact(self, writer: BufferedEventWriter | None = None, now: datetime | None = None) -> list[SegmentStats]:
+        """
+        Compacts every closed segment into a Parquet file and records its stats.
+
+        Args:
+            writer (BufferedEventWriter | None): The live writer, if any, so its handle on
+                a segment is closed before the segment is taken over.
+            now (datetime | None): Reference time for deciding which segments are closed.
+
+        Returns:
+            list[SegmentStats]: Catalog entries added by this run.
+        """
+        self.compacted_dir.mkdir(parents=True, exist_ok=True)
+        for path in self.closed_segments(now):
+            # Unique, so a late segment of an already compacted hour never reuses a name in the catalog.
+            target = path.with_name(f"{path.name}.{uuid.uuid4().hex[:12]}{COMPACTING_SUFFIX}")
+            if writer is not None:
+                writer.detach(path, target)
+            else:
+                os.replace(path, target)
+
+        catalog = self.load_catalog()
+        compacted = {source for entry in catalog for source in entry.sources}
+        by_hour: dict[str, list[Path]] = {}
+        # Also picks up segments left staged by an interrupted run.
+        for path in self._staged_segments():
+            if path.name in compacted:
+                # Already in the catalog: the previous run stopped before deleting it.
+                path.unlink()
+                continue
+            by_hour.setdefault(path.name.split(".", 1)[0], []).append(path)
+
+        added = []
+        for key, paths in sorted(by_hour.items()):
+            events = [event for path in paths for event in _read_jsonl(path)]
+            if events:
+                entry = self._write_compacted(key, events, catalog)
+                entry.sources = [path.name for path in paths]
+                catalog.append(entry)
+                self._save_catalog(catalog)
+                added.append(entry)
+            for path in paths:
+                path.unlink()
+        if added:
+            logger.info(f"Compacted {len(added)} event segments ({sum(e.rows for e in added)} events).")
+        return added
+
+    def _write_compacted(self, key: str, events: list[dict], catalog: list[SegmentStats]) -> SegmentStats:
+        """(Internal) Writes one Parquet file for `key`, numbering it if late events already produced one."""
+        existing = {entry.file for entry in catalog}
+        name, part = f"{key}.parquet", 1
+        while name in existing or (self.compacted_dir / name).exists():
+            name, part = f"{key}.{part}.parquet", part + 1
+
+        table = _to_table(events)
+        with atomic_write(self.compacted_dir / name) as f:
+            pq.write_table(table, f)
+
+        timestamps = table.column("timestamp_utc")
+        return SegmentStats(
+            file=name,
+            segment=key,
+            rows=table.num_rows,
+            min_timestamp=timestamps[0].as_py().isoformat(),
+            max_timestamp=timestamps[-1].as_py().isoformat(),
+            event_types=sorted({t for t in table.column("event_type").to_pylist() if t is not None}),
+        )
+
+    # --- Reading ---
+
+    def read(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        event_types: list[str] | None = None,
+        parse_details: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Reads events with `start <= timestamp_utc < end`, pruning files that cannot match.
+
+        Args:
+            start (datetime | None): Inclusive lower bound (timezone-aware).
+            end (datetime | None): Exclusive upper bound (timezone-aware).
+            event_types (list[str] | None): Only return these event types.
+            parse_details (bool): Decode the `details` column from JSON into dicts.
+
+        Returns:
+            pd.DataFrame: Matching events sorted by timestamp.
+        """
+        wanted_types = set(event_types) if event_types is not None else None
+        filters = _row_filters(start, end, wanted_types)
+        tables = [
+            pq.read_table(self.compacted_dir / entry.file, schema=EVENT_SCHEMA, filters=filters)
+            for entry in self._compacted_files(start, end, wanted_types)
+        ]
+        for path in self._open_segments(start, end):
+            events = _read_jsonl(path)
+            if events:
+                table = _to_table(events)
+                if filters:
+                    table = table.filter(pq.filters_to_expression(filters))
+                tables.append(table)
+
+        table = pa.concat_tables(tables) if tables else EVENT_SCHEMA.empty_table()
+        df = table.sort_by(SORT_KEYS).to_pandas()
+        if parse_details:
+            df["details"] = df["details"].map(json.loads)
+        return df.reset_index(drop=True)
+
+    def _compacted_files(
+        self, start: datetime | None, end: datetime | None, wanted_types: set[str] | None
+    ) -> list[SegmentStats]:
+        """(Internal) Catalog entries whose time range and event types can match the query."""
+        return [
+            entry
+            for entry in self.load_catalog()
+            if _overlaps(
+                datetime.fromisoformat(entry.min_timestamp), datetime.fromisoformat(entry.max_timestamp), start, end
+            )
+            and (wanted_types is None or not wanted_types.isdisjoint(entry.event_types))
+        ]
+
+    def _open_segments(self, start: datetime | None, end: datetime | None) -> list[Path]:
+        """(Internal) Open (not yet compacted) segments, pruned by the hour in the file name."""
+        raw_segments = list(self.segments_dir.glob("*" + SEGMENT_SUFFIX)) + self._staged_segments()
+        selected = []
+        for path in sorted(raw_segments):
+            hour_start = _segment_start(path.name.split(".", 1)[0])
+            # The hour's last instant is just before the next hour starts.
+            if _overlaps(hour_start, hour_start + timedelta(hours=1) - timedelta.resolution, start, end):
+                selected.append(path)
+        return selected
+
+    def read_recent(self, hours: float, event_types: list[str] | None = None) -> pd.DataFrame:
+        """Reads the events of the last `hours` hours."""
+        return self.read(start=datetime.now(UTC) - timedelta(hours=hours), event_types=event_types)
@@ -0,0 +1,291 @@
+# src/recsys/tracking/event_writer.py
+"""
+Background, batched JSON Lines writer for interaction events.
+
+Events are encoded on the request path, so the buffer holds bytes rather than
+references to the callers' dicts, and an event that cannot be serialized is
+rejected on its own. A single writer thread drains the bounded buffer, writes
+each batch with one `write` call per file on handles it keeps open, and
+optionally fsyncs.
+The buffer is flushed when it reaches `flush_size` events or every
+`flush_interval` seconds, whichever comes first.
+
+When the buffer is full, producers wait up to `block_timeout` seconds for room
+(back-pressure) and then drop the event, counting it in `stats.dropped`.
+
+An optional `partitioner` maps each event to its target file (e.g. an hourly
+segment); the writer keeps a handful of segment handles open and closes the
+least recently used ones as time moves on.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from recsys.logging.app_logger import logger
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+# Open writers, re-initialized in forked children by a single fork hook. Weak, so
+# a writer that is closed or no longer referenced is not kept alive.
+_open_writers: weakref.WeakSet = weakref.WeakSet()
+
+
+def _encode_line(event: dict) -> bytes:
+    """(Internal) Encodes one event as a UTF-8 JSON line."""
+    return (_json_encoder.encode(event) + "\n").encode("utf-8")
+
+
+def _reinit_after_fork() -> None:
+    for writer in list(_open_writers):
+        writer._init_state()
+
+
+def _close_at_exit(ref: weakref.ref) -> None:
+    writer = ref()
+    if writer is not None:
+        writer.close()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+@dataclass
+class WriterStats:
+    """Counters exposed by `BufferedEventWriter`."""
+
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    encode_errors: int = 0
+    flushes: int = 0
+    write_errors: int = 0
+
+
+class BufferedEventWriter:
+    """
+    Appends events to a JSON Lines file from a background thread.
+    """
+
+    def __init__(
+        self,
+        storage_path: Path,
+        max_buffer: int = 100_000,
+        flush_size: int = 1_000,
+        flush_interval: float = 0.5,
+        fsync: bool = False,
+        block_timeout: float = 0.0,
+        partitioner: Callable[[dict], Path] | None = None,
+        max_open_files: int = 4,
+    ):
+        """
+        Args:
+            storage_path (Path): The JSON Lines file to append to when no partitioner is given.
+            max_buffer (int): Maximum number of events held in memory.
+            flush_size (int): Wake the writer once this many events are buffered.
+            flush_interval (float): Maximum seconds an event waits before being written.
+            fsync (bool): fsync the file after every batch (durable but slower).
+            block_timeout (float): Seconds a producer waits for room in a full buffer before dropping.
+            partitioner (Callable[[dict], Path] | None): Maps an event to the file it belongs in.
+            max_open_files (int): Segment handles kept open by the writer thread.
+        """
+        self.storage_path = storage_path
+        self.max_buffer = max_buffer
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.block_timeout = block_timeout
+        self.partitioner = partitioner
+        self.max_open_files = max_open_files
+        # Registered when the writer thread starts and unregistered by `close`.
+        self._exit_hook = functools.partial(_close_at_exit, weakref.ref(self))
+        self._init_state()
+        _open_writers.add(self)
+
+    def _init_state(self) -> None:
+        """
+        (Internal) Creates the buffer, locks and counters.
+
+        Also runs in forked children: the parent's writer thread does not survive
+        the fork and its buffered events remain the parent's to write, so the child
+        starts empty and spawns its own writer thread on first use.
+        """
+        self.stats = WriterStats()
+        self._files: OrderedDict[Path, BinaryIO] = OrderedDict()
+        self._files_lock = threading.Lock()
+
+        # (target file, encoded line) pairs.
+        self._buffer: deque[tuple[Path, bytes]] = deque()
+        self._lock = threading.Lock()
+        self._has_events = threading.Condition(self._lock)
+        self._has_room = threading.Condition(self._lock)
+        self._flushed = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def _ensure_started(self) -> None:
+        """(Internal) Starts the writer thread on first use. Must be called with the lock held."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self._exit_hook)
+
+    def write(self, event: dict) -> bool:
+        """
+        Encodes one event and buffers it for writing.
+
+        Returns:
+            bool: False if the event could not be encoded or was dropped because the buffer
+                stayed full or the writer is closed.
+        """
+        try:
+            path = self.storage_path if self.partitioner is None else self.partitioner(event)
+            line = _encode_line(event)
+        except Exception as e:
+            # A single unserializable event is rejected here instead of failing a whole batch later.
+            with self._lock:
+                self.stats.encode_errors += 1
+            logger.error(f"Failed to encode interaction event: {e}")
+            return False
+        with self._lock:
+            if self._closed:
+                self.stats.dropped += 1
+                return False
+            self._ensure_started()
+            if len(self._buffer) >= self.max_buffer:
+                if self.block_timeout <= 0 or not self._has_room.wait_for(
+                    lambda: len(self._buffer) < self.max_buffer or self._closed, timeout=self.block_timeout
+                ):
+                    self.stats.dropped += 1
+                    return False
+                if self._closed:
+                    self.stats.dropped += 1
+                    return False
+            self._buffer.append((path, line))
+            self.stats.enqueued += 1
+            if len(self._buffer) >= self.flush_size:
+                self._has_events.notify()
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until every event buffered so far has been written.
+
+        Returns:
+            bool: False if `timeout` expired first.
+        """
+        with self._lock:
+            if self._thread is None:
+                return True
+            self._flush_requested = True
+            self._has_events.notify()
+            return self._flushed.wait_for(lambda: not self._buffer and self._in_flight == 0, timeout=timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Flushes the remaining events and stops the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._has_events.notify()
+            self._has_room.notify_all()
+            thread = self._thread
+        _open_writers.discard(self)
+        atexit.unregister(self._exit_hook)
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        """(Internal) Writer loop: drain, encode, write, repeat."""
+        try:
+            while True:
+                with self._lock:
+                    if not (self._closed or self._flush_requested) and len(self._buffer) < self.flush_size:
+                        self._has_events.wait(timeout=self.flush_interval)
+                    batch, self._buffer = self._buffer, deque()
+                    self._in_flight = len(batch)
+                    closed = self._closed
+                    self._has_room.notify_all()
+
+                if batch:
+                    self._write_batch(batch)
+
+                with self._lock:
+                    self._in_flight = 0
+                    if not self._buffer:
+                        self._flush_requested = False
+                        self._flushed.notify_all()
+                    if closed and not self._buffer:
+                        return
+        finally:
+            with self._files_lock:
+                for f in self._files.values():
+                    f.close()
+                self._files.clear()
+
+    def _file_for(self, path: Path) -> BinaryIO:
+        """(Internal) Returns an append handle for `path`, closing the least recently used one if needed."""
+        f = self._files.get(path)
+        if f is not None:
+            self._files.move_to_end(path)
+            return f
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(path, "ab")  # noqa: SIM115 - the handle is cached and closed by the writer loop.
+        self._files[path] = f
+        while len(self._files) > self.max_open_files:
+            _, oldest = self._files.popitem(last=False)
+            oldest.close()
+        return f
+
+    def _write_batch(self, batch: deque[tuple[Path, bytes]]) -> None:
+        """(Internal) Writes one batch of encoded lines with a single write call per target file."""
+        groups: dict[Path, list[bytes]] = {}
+        for path, line in batch:
+            groups.setdefault(path, []).append(line)
+        with self._files_lock:
+            for path, lines in groups.items():
+                try:
+                    f = self._file_for(path)
+                    f.write(b"".join(lines))
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                except Exception as e:
+                    # If tracking fails, log it to the *observability* logger
+                    self.stats.write_errors += 1
+                    logger.error(f"Failed to write {len(lines)} interaction events to {path}: {e}")
+                    continue
+                self.stats.written += len(lines)
+        self.stats.flushes += 1
+
+    def detach(self, path: Path, target: Path) -> bool:
+        """
+        Closes the writer's handle on `path` and renames the file to `target`.
+
+        Both steps happen under the writer's file lock, so no batch can land in
+        the renamed file afterwards; later events for `path` start a new file.
+        Used by compaction to take ownership of a closed segment.
+
+        Returns:
+            bool: False if `path` does not exist.
+        """
+        with self._files_lock:
+            f = self._files.pop(path, None)
+            if f is not None:
+                f.close()
+            try:
+                os.replace(path, target)
+            except FileNotFoundError:
+                return False
+            return True
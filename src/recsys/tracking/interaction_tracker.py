@@ -8,10 +8,15 @@ as structured data, not as application logs. They are saved in a format
 """
 
 import json
+from collections.abc import Callable
 from datetime import UTC, datetime
+from functools import cache
 from pathlib import Path
 
-from src.logging.app_logger import logger
+from recsys.logging.app_logger import logger
+from recsys.tracking.event_store import EventStore, SegmentStats
+from recsys.tracking.event_writer import BufferedEventWriter
+from recsys.tracking.sequence import WorkerSequence
 
 
 class InteractionTracker:
@@ -19,25 +24,73 @@ class InteractionTracker:
     A tracker for capturing user interaction events.
     Events are stored in a JSON Lines file, with each line representing
     a single event.
+
+    By default events are handed to a `BufferedEventWriter`, which writes them
+    in batches from a background thread so `track_event` never touches the
+    file system. Pass `buffered=False` to write each event synchronously.
+
+    With `partitioned=True`, `storage_path` is a directory managed by an
+    `EventStore`: events are rolled into hourly segments that `compact` turns
+    into Parquet files, and `event_store.read` prunes them by time and type.
+
+    With `multi_worker=True` (implies `partitioned`), each process writes its
+    own segment files and stamps events with a `worker_id` and gap-free `seq`,
+    giving collision-free `event_id`s that compaction merges in order. This is
+    the mode for serving with several uvicorn/gunicorn workers.
+
+    Listeners registered with `subscribe` see every tracked event in-process,
+    e.g. to fold a `rate_game` event into the user's vector right away.
     """
 
-    def __init__(self, storage_path: Path):
+    def __init__(
+        self,
+        storage_path: Path,
+        buffered: bool = True,
+        max_buffer: int = 100_000,
+        flush_size: int = 1_000,
+        flush_interval: float = 0.5,
+        fsync: bool = False,
+        block_timeout: float = 0.0,
+        partitioned: bool = False,
+        multi_worker: bool = False,
+    ):
         self.storage_path = storage_path
-        # Ensure the directory exists
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sequence = WorkerSequence() if multi_worker else None
+        self.event_store: EventStore | None = None
+        if partitioned or multi_worker:
+            self.event_store = EventStore(storage_path)
+        else:
+            # Ensure the directory exists
+            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.listeners: list[Callable[[dict], object]] = []
+        self.writer: BufferedEventWriter | None = None
+        if buffered:
+            self.writer = BufferedEventWriter(
+                storage_path,
+                max_buffer=max_buffer,
+                flush_size=flush_size,
+                flush_interval=flush_interval,
+                fsync=fsync,
+                block_timeout=block_timeout,
+                partitioner=self.event_store.segment_path if self.event_store else None,
+            )
 
-    def _write_event(self, event_data: dict):
+    def _write_event(self, event_data: dict) -> None:
         """Appends a single event as a new line in the JSON Lines file."""
+        if self.writer is not None:
+            self.writer.write(event_data)
+            return
+        path = self.event_store.segment_path(event_data) if self.event_store else self.storage_path
         try:
             # Use 'a' for append mode
-            with open(self.storage_path, "a", encoding="utf-8") as f:
+            with open(path, "a", encoding="utf-8") as f:
                 f.write(json.dumps(event_data) + "\n")
         except Exception as e:
             # If tracking fails, log it to the *observability* logger
 
             logger.error(f"Failed to write interaction event: {e}", extra={"event_data": event_data})
 
-    def track_event(self, user_id: str, event_type: str, session_id: str, event_details: dict):
+    def track_event(self, user_id: str, event_type: str, session_id: str, event_details: dict) -> None:
         """
         Tracks a single user interaction event.
 
@@ -47,18 +100,67 @@ class InteractionTracker:
             session_id (str): A unique identifier for the user's session.
             event_details (dict): A dictionary containing event-specific data.
         """
-        event = {
-            "event_id": f"{session_id}-{int(datetime.now(UTC).timestamp() * 1000)}",
+        if self.sequence is not None:
+            seq, now = self.sequence.next()
+            event_id = self.sequence.event_id(seq)
+        else:
+            now = datetime.now(UTC)
+            event_id = f"{session_id}-{int(now.timestamp() * 1000)}"
+        event: dict[str, object] = {
+            "event_id": event_id,
             "event_type": event_type,
-            "timestamp_utc": datetime.now(UTC).isoformat(),
+            "timestamp_utc": now.isoformat(),
             "user_id": user_id,
             "session_id": session_id,
             "details": event_details,
         }
+        if self.sequence is not None:
+            event["worker_id"] = self.sequence.worker_id
+            event["seq"] = seq
         self._write_event(event)
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Interaction event listener failed: {e}")
+
+    def subscribe(self, listener: Callable[[dict], object]) -> None:
+        """Calls `listener(event)` for every event tracked from now on, after it is written."""
+        self.listeners.append(listener)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Blocks until all buffered events are on disk. A no-op for unbuffered trackers."""
+        return self.writer.flush(timeout) if self.writer is not None else True
+
+    def compact(self) -> list[SegmentStats]:
+        """Compacts closed hourly segments into Parquet. Requires `partitioned=True`."""
+        if self.event_store is None:
+            raise RuntimeError("Compaction requires a partitioned tracker.")
+        return self.event_store.compact(writer=self.writer)
+
+    def close(self) -> None:
+        """Flushes buffered events and stops the background writer."""
+        if self.writer is not None:
+            self.writer.close()
+
+
+# --- The application's singleton instance ---
+# Saves events into hourly, per-worker segments under a dedicated data directory. It is created on
+# first use, so importing this module (e.g. for the class) does not create directories or threads.
+event_storage_dir = Path("data/events")
+# How long a request waits for room in a full event buffer before the event is dropped. Short, so a
+# burst rides out a flush instead of losing events, without stalling the request path.
+tracker_block_timeout = 0.05
+
+
+@cache
+def get_tracker() -> InteractionTracker:
+    """The application-wide tracker, created on first call."""
+    return InteractionTracker(storage_path=event_storage_dir, block_timeout=tracker_block_timeout, multi_worker=True)
 
 
-# --- Create a singleton instance for the application to use ---
-# This is configured to save events to a dedicated data file.
-event_storage_file = Path("data/events/user_interactions.jsonl")
-tracker = InteractionTracker(storage_path=event_storage_file)
+def __getattr__(name: str) -> InteractionTracker:
+    # Keeps `from recsys.tracking.interaction_tracker import tracker` working, lazily.
+    if name == "tracker":
+        return get_tracker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,72 @@
+# src/recsys/tracking/sequence.py
+"""
+Collision-free, per-worker event sequencing.
+
+Every process that tracks events gets a worker id that is unique across
+hosts, processes and restarts, plus a gap-free sequence counter. An event id
+is `"<worker_id>-<seq>"`, so two events can never collide, even when they are
+created in the same millisecond by different workers.
+
+Timestamps handed out with a sequence number never go backwards within a
+worker (a wall-clock step back is clamped to the previous value), so sorting
+by `(timestamp_utc, worker_id, seq)` keeps every worker's events in sequence
+order. The sequence is reset in forked children, which makes a tracker
+created before uvicorn/gunicorn fork its workers safe to use.
+"""
+
+import os
+import secrets
+import socket
+import threading
+import weakref
+from datetime import UTC, datetime
+
+# Live sequences, reset in forked children by a single fork hook. Weak, so a
+# sequence that is no longer referenced is not kept alive.
+_sequences: weakref.WeakSet = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for sequence in list(_sequences):
+        sequence._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def new_worker_id() -> str:
+    """Returns a short id unique to this host, process and process start."""
+    host = socket.gethostname().split(".", 1)[0][:16]
+    return f"{host}-{os.getpid()}-{secrets.token_hex(3)}"
+
+
+class WorkerSequence:
+    """
+    Thread-safe source of `(seq, timestamp)` pairs for one worker process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+        _sequences.add(self)
+
+    def _reset(self) -> None:
+        """(Internal) Starts a fresh worker id and sequence (also called in forked children)."""
+        self._lock = threading.Lock()
+        self.worker_id = new_worker_id()
+        self._next_seq = 0
+        self._last_timestamp = datetime.min.replace(tzinfo=UTC)
+
+    def next(self) -> tuple[int, datetime]:
+        """Returns the next sequence number and a per-worker monotonic UTC timestamp."""
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            now = max(datetime.now(UTC), self._last_timestamp)
+            self._last_timestamp = now
+        return seq, now
+
+    def event_id(self, seq: int) -> str:
+        """Formats the globally unique event id for `seq`."""
+        return f"{self.worker_id}-{seq}"
@@ -1 +1,354 @@
-# Caching utilities
+# src/recsys/utils/cache.py
+"""
+Tiered cache for recommendation responses.
+
+The POC caches with `st.connection(..., ttl=600)`, which only helps one
+Streamlit process. `TieredCache` puts a small in-process LRU/TTL tier in front
+of an optional, shared Redis tier:
+
+- keys are built from the normalized request (sorted game ids, sorted and
+  lower-cased filters, canonical JSON) and the current model version, so
+  equivalent requests share one entry and `v1` results never answer `v2`;
+- concurrent misses on one key are collapsed into a single load
+  (single-flight), so a burst of identical requests computes once;
+- empty results (the loader returned None) are cached for a shorter
+  `negative_ttl`, so unknown games do not hit the models on every request;
+- `set_model_version` drops every entry of the previous version from both
+  tiers when a new `models/vN` is deployed;
+- `stats` counts hits per tier, misses, loads and errors, with load latency.
+
+Redis errors never fail a request: the cache logs them and falls back to the
+local tier. Values are pickled for Redis, which must therefore be trusted.
+"""
+
+import fnmatch
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from recsys.logging.app_logger import logger
+
+# Stored in place of a value when the loader found nothing (negative caching).
+_NEGATIVE = "__recsys_cache_negative__"
+_MISSING = object()
+
+
+def _is_negative(value: Any) -> bool:
+    return isinstance(value, str) and value == _NEGATIVE
+
+
+def normalize_request(
+    game_ids: Iterable[int] = (), filters: dict[str, Iterable[str] | str | int | None] | None = None, **params: Any
+) -> dict:
+    """
+    Returns the canonical form of a recommendation request.
+
+    Game ids are de-duplicated and sorted; filter values are lower-cased and sorted; None filters are dropped.
+    """
+    normalized_filters = {}
+    for name, value in sorted((filters or {}).items()):
+        if value is None:
+            continue
+        values: Iterable[Any] = [value] if isinstance(value, str | int | float) else value
+        normalized_filters[name] = sorted({str(v).strip().lower() for v in values})
+    return {
+        "game_ids": sorted({int(i) for i in game_ids}),
+        "filters": normalized_filters,
+        **{name: value for name, value in sorted(params.items()) if value is not None},
+    }
+
+
+def cache_key(prefix: str, namespace: str, model_version: str, request: dict) -> str:
+    """Builds `<prefix>:<namespace>:<model_version>:<digest of the canonical request>`."""
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{prefix}:{namespace}:{model_version}:{digest}"
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU map whose entries expire after a TTL.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the live value for `key`, refreshing its recency, or `default`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Stores `value`, evicting the least recently used entries beyond `maxsize`."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete_matching(self, pattern: str) -> int:
+        """Removes every key matching a glob `pattern` (as Redis `SCAN MATCH`); returns how many."""
+        with self._lock:
+            stale = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+@dataclass
+class CacheStats:
+    """Cache counters; latencies are cumulative seconds spent in loaders."""
+
+    local_hits: int = 0
+    remote_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    coalesced: int = 0
+    load_errors: int = 0
+    remote_errors: int = 0
+    invalidated: int = 0
+    load_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.local_hits + self.remote_hits
+        return hits / (hits + self.misses) if hits + self.misses else 0.0
+
+    def as_dict(self) -> dict:
+        stats = asdict(self)
+        stats["hit_rate"] = self.hit_rate
+        stats["mean_load_ms"] = 1000 * self.load_seconds / self.loads if self.loads else 0.0
+        return stats
+
+
+class TieredCache:
+    """
+    In-process LRU/TTL tier in front of an optional Redis tier, with single-flight loads.
+    """
+
+    def __init__(
+        self,
+        model_version: str,
+        redis_client: Any = None,
+        local_maxsize: int = 1024,
+        ttl: float = 600.0,
+        local_ttl: float | None = None,
+        negative_ttl: float = 60.0,
+        prefix: str = "recsys",
+    ):
+        """
+        Args:
+            model_version (str): Version the cached results belong to, e.g. 'v1'.
+            redis_client: A `redis.Redis` (or compatible) client, or None for a local-only cache.
+            local_maxsize (int): Entries kept in the in-process tier.
+            ttl (float): Seconds a result lives in Redis.
+            local_ttl (float | None): Seconds a result lives in-process. Defaults to `ttl`.
+            negative_ttl (float): Seconds an empty result lives in either tier.
+            prefix (str): Key prefix shared by every entry of this cache.
+        """
+        self.model_version = model_version
+        self.redis = redis_client
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.prefix = prefix
+        self.local = LRUCache(maxsize=local_maxsize, ttl=ttl if local_ttl is None else local_ttl)
+        self.stats = CacheStats()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict, model_version: str) -> "TieredCache":
+        """
+        Builds a cache from the `cache` section of `config/local.yml`.
+
+        Redis is used only when `cache.redis_url` is set.
+        """
+        settings = config.get("cache", {})
+        redis_client = None
+        if settings.get("redis_url"):
+            import redis
+
+            redis_client = redis.Redis.from_url(
+                settings["redis_url"], socket_timeout=settings.get("redis_timeout_seconds", 0.05)
+            )
+        return cls(
+            model_version,
+            redis_client=redis_client,
+            local_maxsize=settings.get("local_maxsize", 1024),
+            ttl=settings.get("ttl_seconds", 600),
+            local_ttl=settings.get("local_ttl_seconds"),
+            negative_ttl=settings.get("negative_ttl_seconds", 60),
+            prefix=settings.get("prefix", "recsys"),
+        )
+
+    # --- Keys ---
+
+    def key(
+        self,
+        namespace: str,
+        game_ids: Iterable[int] = (),
+        filters: dict | None = None,
+        *,
+        model_version: str | None = None,
+        **params: Any,
+    ) -> str:
+        """
+        Builds the key of a request (see `normalize_request`).
+
+        Pass the `model_version` that computes the result, e.g. the version a request leased;
+        during a swap it can differ from the cache's current version. Defaults to the latter.
+        """
+        version = self.model_version if model_version is None else model_version
+        return cache_key(self.prefix, namespace, version, normalize_request(game_ids, filters, **params))
+
+    # --- Tiers ---
+
+    def _remote_get(self, key: str) -> Any:
+        if self.redis is None:
+            return _MISSING
+        # A Redis outage or an unreadable entry (e.g. written by an incompatible release) must not fail the request.
+        try:
+            payload = self.redis.get(key)
+            # Only this cache writes under its prefix, and the Redis instance is trusted (see the module docstring).
+            return _MISSING if payload is None else pickle.loads(payload)  # noqa: S301
+        except Exception as e:
+            self.stats.remote_errors += 1
+            logger.warning(f"Redis read failed for '{key}': {e}")
+            return _MISSING
+
+    def _remote_set(self, key: str, value: Any, ttl: float) -> None:
+        if self.redis is None:
+            return
+        try:
+            self.redis.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            self.stats.remote_errors += 1
+            logger.warning(f"Redis write failed for '{key}': {e}")
+
+    def _lookup(self, key: str) -> Any:
+        """(Internal) Returns the stored value (possibly `_NEGATIVE`) from the nearest tier, or `_MISSING`."""
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self.stats.local_hits += 1
+            return value
+        value = self._remote_get(key)
+        if value is not _MISSING:
+            self.stats.remote_hits += 1
+            self.local.set(key, value, ttl=self.negative_ttl if _is_negative(value) else None)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the cached value for `key`, or `default` on a miss or a cached empty result."""
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.stats.misses += 1
+            return default
+        if _is_negative(value):
+            self.stats.negative_hits += 1
+            return default
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores `value` in both tiers; None is stored as a (shorter-lived) negative entry."""
+        if value is None:
+            self.local.set(key, _NEGATIVE, ttl=self.negative_ttl)
+            self._remote_set(key, _NEGATIVE, self.negative_ttl)
+        else:
+            self.local.set(key, value)
+            self._remote_set(key, value, self.ttl)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for `key`, calling `loader` once on a miss.
+
+        Concurrent callers missing the same key wait for the first caller's load instead of
+        loading again. Loader errors propagate to every waiter and are not cached.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            if _is_negative(value):
+                self.stats.negative_hits += 1
+                return None
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._inflight[key] = Future()
+        if not leader:
+            self.stats.coalesced += 1
+            return future.result()
+
+        self.stats.misses += 1
+        start = time.perf_counter()
+        try:
+            value = loader()
+        except BaseException as e:
+            self.stats.load_errors += 1
+            future.set_exception(e)
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self.stats.loads += 1
+            self.stats.load_seconds += time.perf_counter() - start
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    # --- Invalidation ---
+
+    def invalidate_version(self, model_version: str) -> int:
+        """Drops every entry cached for `model_version` from both tiers; returns the number removed."""
+        pattern = f"{self.prefix}:*:{model_version}:*"
+        removed = self.local.delete_matching(pattern)
+        if self.redis is not None:
+            try:
+                batch = []
+                for key in self.redis.scan_iter(match=pattern, count=1000):
+                    batch.append(key)
+                    if len(batch) >= 1000:
+                        removed += self.redis.delete(*batch)
+                        batch = []
+                if batch:
+                    removed += self.redis.delete(*batch)
+            except Exception as e:
+                self.stats.remote_errors += 1
+                logger.warning(f"Redis invalidation of model version '{model_version}' failed: {e}")
+        self.stats.invalidated += removed
+        return removed
+
+    def set_model_version(self, model_version: str) -> None:
+        """Switches new keys to `model_version` and drops the previous version's entries."""
+        previous, self.model_version = self.model_version, model_version
+        if previous != model_version:
+            removed = self.invalidate_version(previous)
+            logger.info(f"Cache moved from model {previous} to {model_version}; dropped {removed} entries.")
@@ -1 +1,233 @@
-# KMeans clustering logic
+# src/recsys/utils/clustering.py
+"""
+Offline KMeans clustering of the game catalogue per category filter.
+
+The Streamlit POC's `get_cluster` filters the catalogue by the selected
+categories, fits eight `KMeans` models (k = 2..9), scores each with an O(n²)
+`silhouette_score`, then fits a ninth model for the winning k, all on the
+request path. The filter is one of only 2^8 - 1 category combinations, so this
+module clusters every combination once, offline:
+
+- small inputs use `KMeans`; inputs above `minibatch_threshold` rows switch to
+  `MiniBatchKMeans`, which fits in roughly linear time,
+- the silhouette of each candidate k is estimated on a fixed random sample of
+  `silhouette_sample` rows instead of all n² pairs,
+- the model fitted for the winning k is reused instead of refitting,
+- combinations that select the same set of games share one clustering.
+
+Results are cached by filter signature (the bitmask of the selected
+categories) in a `ClusterIndex`, which is saved as flat arrays, so serving
+only looks up a game's label.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from recsys.logging.app_logger import logger
+
+# Category one-hot order of the POC's `Categories` field.
+CATEGORY_NAMES = ("thematic", "strategy", "war", "family", "cgs", "abstract", "party", "childrens")
+INDEX_FILENAME = "clusters.npz"
+
+
+def filter_signature(categories: Iterable[str]) -> int:
+    """
+    Returns the cache key of a category filter: a bitmask over `CATEGORY_NAMES`.
+
+    Order, case and duplicates do not matter, so equivalent filters share one key.
+    """
+    mask = 0
+    for category in categories:
+        try:
+            mask |= 1 << CATEGORY_NAMES.index(category.strip().lower())
+        except ValueError as e:
+            raise ValueError(f"Unknown category '{category}'. Expected one of {list(CATEGORY_NAMES)}.") from e
+    return mask
+
+
+def rows_for_signature(category_matrix: np.ndarray, signature: int) -> np.ndarray:
+    """Returns the rows having any of the signature's categories (the POC's `index_of_data`)."""
+    bits = np.array([(signature >> i) & 1 for i in range(category_matrix.shape[1])], dtype=bool)
+    return np.flatnonzero(np.asarray(category_matrix)[:, bits].any(axis=1))
+
+
+@dataclass
+class Clustering:
+    """The selected clustering of one set of games."""
+
+    k: int
+    labels: np.ndarray
+    silhouette: float
+
+
+def cluster_features(
+    features: np.ndarray,
+    k_range: range = range(2, 10),
+    minibatch_threshold: int = 10_000,
+    silhouette_sample: int = 2_000,
+    random_state: int = 42,
+) -> Clustering:
+    """
+    Clusters `features`, picking k by (sampled) silhouette score.
+
+    Args:
+        features (np.ndarray): Feature rows, shape (n, d).
+        k_range (range): Candidate cluster counts.
+        minibatch_threshold (int): Use `MiniBatchKMeans` above this many rows.
+        silhouette_sample (int): Rows sampled to estimate each silhouette score.
+        random_state (int): Seed for KMeans and the silhouette sample.
+
+    Returns:
+        Clustering: The best k, its labels and silhouette score.
+    """
+    # scikit-learn takes ~1 s to import; only training needs it, not the API serving `ClusterIndex`.
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+    from sklearn.metrics import silhouette_score
+
+    features = np.asarray(features, dtype=np.float32)
+    n = len(features)
+    candidates = [k for k in k_range if k < n]
+    if not candidates:
+        return Clustering(k=1, labels=np.zeros(n, dtype=np.int32), silhouette=0.0)
+
+    sample_size = silhouette_sample if n > silhouette_sample else None
+    best: Clustering | None = None
+    for k in candidates:
+        if n > minibatch_threshold:
+            model = MiniBatchKMeans(n_clusters=k, random_state=random_state, batch_size=4096, n_init=3)
+        else:
+            model = KMeans(n_clusters=k, random_state=random_state, n_init="auto")
+        labels = model.fit_predict(features)
+        if len(np.unique(labels)) < 2:
+            continue
+        score = float(silhouette_score(features, labels, sample_size=sample_size, random_state=random_state))
+        if best is None or score > best.silhouette:
+            best = Clustering(k=k, labels=labels.astype(np.int32), silhouette=score)
+    return best or Clustering(k=1, labels=np.zeros(n, dtype=np.int32), silhouette=0.0)
+
+
+class ClusterIndex:
+    """
+    Precomputed clusterings keyed by filter signature, stored as flat arrays.
+
+    For signature `s` at position `p`, the filtered games are
+    `game_ids[offsets[p]:offsets[p + 1]]` and their labels the same slice of `labels`.
+    Each slice is sorted by game id, so `label` is a binary search.
+    """
+
+    def __init__(
+        self,
+        signatures: np.ndarray,
+        offsets: np.ndarray,
+        game_ids: np.ndarray,
+        labels: np.ndarray,
+        ks: np.ndarray,
+        silhouettes: np.ndarray,
+    ):
+        self.signatures = signatures
+        self.offsets = offsets
+        self.game_ids = game_ids
+        self.labels = labels
+        self.ks = ks
+        self.silhouettes = silhouettes
+        self._position = {int(s): p for p, s in enumerate(signatures)}
+
+    def __contains__(self, signature: int) -> bool:
+        return int(signature) in self._position
+
+    def lookup(self, signature: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the filtered games and their cluster labels for a signature.
+
+        Raises:
+            KeyError: If the signature was not precomputed.
+        """
+        try:
+            position = self._position[int(signature)]
+        except KeyError as e:
+            raise KeyError(f"No clustering precomputed for filter signature {signature}.") from e
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return self.game_ids[start:end], self.labels[start:end]
+
+    def label(self, signature: int, game_id: int) -> int | None:
+        """Returns one game's cluster label under a filter, or None if the filter excludes it."""
+        game_ids, labels = self.lookup(signature)
+        position = int(np.searchsorted(game_ids, game_id))
+        if position == len(game_ids) or game_ids[position] != game_id:
+            return None
+        return int(labels[position])
+
+    def save(self, path: Path) -> None:
+        """Writes the index as `clusters.npz` into the `path` directory."""
+        path.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path / INDEX_FILENAME,
+            signatures=self.signatures,
+            offsets=self.offsets,
+            game_ids=self.game_ids,
+            labels=self.labels,
+            ks=self.ks,
+            silhouettes=self.silhouettes,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ClusterIndex":
+        """Loads an index written by `save`."""
+        with np.load(path / INDEX_FILENAME) as arrays:
+            return cls(**{name: arrays[name] for name in arrays.files})
+
+
+def precompute_clusterings(
+    game_ids: np.ndarray,
+    features: np.ndarray,
+    category_matrix: np.ndarray,
+    signatures: Iterable[int] | None = None,
+    **cluster_kwargs: Any,
+) -> ClusterIndex:
+    """
+    Clusters the games selected by every category filter.
+
+    Args:
+        game_ids (np.ndarray): Game id of each row.
+        features (np.ndarray): Clustering features of each row (the POC's 2-d `emb`).
+        category_matrix (np.ndarray): Category one-hot rows, columns in `CATEGORY_NAMES` order.
+        signatures (Iterable[int] | None): Filters to precompute. Defaults to every non-empty combination.
+        **cluster_kwargs: Passed to `cluster_features`.
+
+    Returns:
+        ClusterIndex: Labels for every requested signature.
+    """
+    game_ids = np.asarray(game_ids, dtype=np.int64)
+    features = np.asarray(features, dtype=np.float32)
+    category_matrix = np.asarray(category_matrix)
+    if signatures is None:
+        signatures = range(1, 1 << category_matrix.shape[1])
+
+    by_rows: dict[bytes, Clustering] = {}
+    kept, row_sets, label_sets, results = [], [], [], []
+    for signature in signatures:
+        rows = rows_for_signature(category_matrix, signature)
+        key = rows.tobytes()
+        if key not in by_rows:
+            by_rows[key] = cluster_features(features[rows], **cluster_kwargs)
+        # Slices are stored in game id order for `ClusterIndex.label`.
+        order = np.argsort(game_ids[rows], kind="stable")
+        kept.append(signature)
+        row_sets.append(rows[order])
+        label_sets.append(by_rows[key].labels[order])
+        results.append(by_rows[key])
+
+    sizes = [len(rows) for rows in row_sets]
+    logger.info(f"Precomputed {len(kept)} filter clusterings ({len(by_rows)} distinct game sets).")
+    return ClusterIndex(
+        signatures=np.asarray(kept, dtype=np.int64),
+        offsets=np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64),
+        game_ids=np.concatenate([game_ids[rows] for rows in row_sets]) if row_sets else game_ids[:0],
+        labels=np.concatenate(label_sets) if label_sets else np.empty(0, dtype=np.int32),
+        ks=np.asarray([r.k for r in results], dtype=np.int32),
+        silhouettes=np.asarray([r.silhouette for r in results], dtype=np.float32),
+    )
@@ -1 +1,252 @@
-# Your Computedistance_themes logic
+# src/recsys/utils/distance_metrics.py
+"""
+Vectorized game-to-game distance engine.
+
+This module replaces the per-game Python loop of the Streamlit POC
+(`Computedistnace_themes` + `getNeighbors_themes`) with a batch engine.
+
+The POC distance between two games `a` and `b` is:
+
+    cos(a.emb, b.emb) + |a.rating - b.rating| + 0.9 * |a.popularity - b.popularity|
+    + 0.03 * cos(a.l_cluster, b.l_cluster) + 0.04 * cos(a.themes, b.themes)
+
+where `cos` is the cosine *distance*. The categories distance is computed by the
+POC but never added to the total, so its default weight here is 0.
+
+Because every cosine term is `1 - <a_hat, b_hat>` on L2-normalized vectors, the
+weighted sum of all cosine terms collapses into a single matrix product against
+one contiguous float32 matrix holding every block side by side, each block
+pre-scaled by its weight. The two scalar terms are added by broadcasting.
+
+Training saves the engine next to the other artifacts of a model version
+(`save`), so the API's re-ranker scores with the same catalogue features.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+ENGINE_FILENAME = "neighbor_engine.npz"
+BLOCK_NAMES = ("embeddings", "clusters", "themes", "categories")
+
+
+@dataclass(frozen=True)
+class DistanceWeights:
+    """Weights of each term in the game-to-game distance (POC defaults)."""
+
+    description: float = 1.0
+    rating: float = 1.0
+    popularity: float = 0.9
+    cluster: float = 0.03
+    themes: float = 0.04
+    categories: float = 0.0
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    (Internal) Returns a C-contiguous float32 copy of `matrix` with unit-length rows.
+
+    All-zero rows are left as zeros, which gives them a cosine distance of 1 to
+    every other game instead of the NaN produced by `scipy.spatial.distance.cosine`.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(-1, 1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+class NeighborEngine:
+    """
+    Batch nearest-neighbor search over the game catalogue using the POC distance.
+
+    The catalogue is held as one pre-normalized, weight-scaled float32 matrix
+    (description embedding, cluster, themes and categories blocks side by side)
+    plus two float64 vectors for the rating and popularity terms. Distances for
+    a batch of query games are computed with one matmul and top-k is selected
+    with `np.argpartition`, so no per-game Python work happens at query time.
+    """
+
+    def __init__(
+        self,
+        game_ids: Sequence[int],
+        embeddings: np.ndarray,
+        clusters: np.ndarray,
+        themes: np.ndarray,
+        categories: np.ndarray,
+        ratings: Sequence[float],
+        popularity: Sequence[float],
+        weights: DistanceWeights | None = None,
+    ):
+        """
+        Args:
+            game_ids (Sequence[int]): The BGGId of each catalogue row.
+            embeddings (np.ndarray): Description embeddings, shape (n_games, d_emb).
+            clusters (np.ndarray): Cluster vectors (`l_cluster`), shape (n_games, d_cluster).
+            themes (np.ndarray): Theme one-hot vectors, shape (n_games, d_themes).
+            categories (np.ndarray): Category one-hot vectors, shape (n_games, d_categories).
+            ratings (Sequence[float]): `BayesAvgRating` of each game.
+            popularity (Sequence[float]): `NumUserRatings` of each game.
+            weights (DistanceWeights | None): Term weights. Defaults to the POC weights.
+        """
+        self.weights = weights or DistanceWeights()
+        self.game_ids = np.asarray(game_ids, dtype=np.int64)
+        n_games = len(self.game_ids)
+
+        blocks = [
+            (embeddings, self.weights.description),
+            (clusters, self.weights.cluster),
+            (themes, self.weights.themes),
+            (categories, self.weights.categories),
+        ]
+        normalized = [_normalize_rows(block) for block, _ in blocks]
+        for block in normalized:
+            if block.shape[0] != n_games:
+                raise ValueError(f"Every feature block must have {n_games} rows, got {block.shape[0]}.")
+
+        # Unscaled blocks are used for the query side, weight-scaled blocks for the catalogue side,
+        # so that <query, catalogue> == sum_i w_i * cos_sim_i in a single product.
+        self._unit = np.ascontiguousarray(np.hstack(normalized), dtype=np.float32)
+        self._scaled = np.ascontiguousarray(
+            np.hstack([block * np.float32(weight) for block, (_, weight) in zip(normalized, blocks, strict=True)]),
+            dtype=np.float32,
+        )
+        self._cosine_weight_total = float(sum(weight for _, weight in blocks))
+        self._block_widths = [block.shape[1] for block in normalized]
+
+        self.ratings = np.asarray(ratings, dtype=np.float64)
+        self.popularity = np.asarray(popularity, dtype=np.float64)
+        self._row_of = {int(game_id): row for row, game_id in enumerate(self.game_ids)}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping], weights: DistanceWeights | None = None) -> "NeighborEngine":
+        """
+        Builds an engine from POC-style game dicts (`dict_dataset` / `filtered_data.json`).
+
+        Each record must provide `BGGId`, `emb`, `l_cluster`, `themes`, `Categories`,
+        `BayesAvgRating` and `NumUserRatings`.
+        """
+        records = list(records)
+        return cls(
+            game_ids=[r["BGGId"] for r in records],
+            embeddings=np.array([r["emb"] for r in records], dtype=np.float32),
+            clusters=np.array([r["l_cluster"] for r in records], dtype=np.float32),
+            themes=np.array([r["themes"] for r in records], dtype=np.float32),
+            categories=np.array([r["Categories"] for r in records], dtype=np.float32),
+            ratings=[r["BayesAvgRating"] for r in records],
+            popularity=[r["NumUserRatings"] for r in records],
+            weights=weights,
+        )
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def rows_for(self, game_ids: Iterable[int]) -> np.ndarray:
+        """Maps BGGIds to catalogue row indices."""
+        try:
+            return np.fromiter((self._row_of[int(g)] for g in game_ids), dtype=np.int64)
+        except KeyError as e:
+            raise KeyError(f"Game {e.args[0]} is not in the catalogue.") from e
+
+    def distances(self, query_rows: np.ndarray, candidate_rows: np.ndarray | None = None) -> np.ndarray:
+        """
+        Computes the weighted distance from each query game to every (or every candidate) catalogue game.
+
+        Args:
+            query_rows (np.ndarray): Catalogue row indices of the query games.
+            candidate_rows (np.ndarray | None): Restrict the columns to these catalogue rows
+                (e.g. a re-ranker's candidate set). Defaults to the whole catalogue.
+
+        Returns:
+            np.ndarray: A (n_queries, n_candidates) float64 matrix of distances.
+        """
+        query_rows = np.asarray(query_rows, dtype=np.int64)
+        if candidate_rows is None:
+            scaled, ratings, popularity = self._scaled, self.ratings, self.popularity
+        else:
+            candidate_rows = np.asarray(candidate_rows, dtype=np.int64)
+            scaled = self._scaled[candidate_rows]
+            ratings, popularity = self.ratings[candidate_rows], self.popularity[candidate_rows]
+        similarity = self._unit[query_rows] @ scaled.T
+        dist = self._cosine_weight_total - similarity.astype(np.float64)
+        dist += self.weights.rating * np.abs(self.ratings[query_rows, None] - ratings[None, :])
+        dist += self.weights.popularity * np.abs(self.popularity[query_rows, None] - popularity[None, :])
+        return np.asarray(dist)
+
+    def kneighbors_rows(
+        self, query_rows: np.ndarray, k: int, exclude_self: bool = True, batch_size: int = 1024
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the `k` closest catalogue rows for each query row.
+
+        Args:
+            query_rows (np.ndarray): Catalogue row indices of the query games.
+            k (int): Number of neighbors to return per query.
+            exclude_self (bool): Skip each query game in its own neighbor list.
+            batch_size (int): Queries scored per matmul, bounding the (batch, n_games) buffer.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Neighbor row indices and their distances,
+            both shaped (n_queries, k) and sorted by ascending distance.
+        """
+        query_rows = np.asarray(query_rows, dtype=np.int64)
+        n_candidates = len(self) - 1 if exclude_self else len(self)
+        k = max(0, min(k, n_candidates))
+        out_rows = np.empty((len(query_rows), k), dtype=np.int64)
+        out_dist = np.empty((len(query_rows), k), dtype=np.float64)
+        if k == 0:
+            return out_rows, out_dist
+
+        for start in range(0, len(query_rows), batch_size):
+            batch = query_rows[start : start + batch_size]
+            dist = self.distances(batch)
+            if exclude_self:
+                dist[np.arange(len(batch)), batch] = np.inf
+            # argpartition is O(n) per row; only the k survivors are fully sorted.
+            part = np.argpartition(dist, k - 1, axis=1)[:, :k]
+            part_dist = np.take_along_axis(dist, part, axis=1)
+            order = np.argsort(part_dist, axis=1, kind="stable")
+            out_rows[start : start + len(batch)] = np.take_along_axis(part, order, axis=1)
+            out_dist[start : start + len(batch)] = np.take_along_axis(part_dist, order, axis=1)
+        return out_rows, out_dist
+
+    def kneighbors(self, game_ids: Iterable[int], k: int, exclude_self: bool = True) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the `k` closest games for each query game, by BGGId.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Neighbor BGGIds and their distances, shaped (n_queries, k).
+        """
+        rows, dist = self.kneighbors_rows(self.rows_for(game_ids), k, exclude_self=exclude_self)
+        return self.game_ids[rows], dist
+
+    def save(self, path: Path) -> None:
+        """Writes the catalogue features as `neighbor_engine.npz` into the `path` directory."""
+        path.mkdir(parents=True, exist_ok=True)
+        blocks = np.split(self._unit, np.cumsum(self._block_widths)[:-1], axis=1)
+        # Typed loosely: numpy's stub checks `**` arrays against the `allow_pickle` flag too.
+        block_arrays: dict[str, Any] = dict(zip(BLOCK_NAMES, blocks, strict=True))
+        np.savez(
+            path / ENGINE_FILENAME,
+            game_ids=self.game_ids,
+            ratings=self.ratings,
+            popularity=self.popularity,
+            weights=np.array(astuple(self.weights)),
+            **block_arrays,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "NeighborEngine":
+        """Loads an engine written by `save`."""
+        with np.load(path / ENGINE_FILENAME) as arrays:
+            return cls(
+                game_ids=arrays["game_ids"],
+                ratings=arrays["ratings"],
+                popularity=arrays["popularity"],
+                weights=DistanceWeights(*arrays["weights"].tolist()),
+                **{name: arrays[name] for name in BLOCK_NAMES},
+            )
@@ -0,0 +1,52 @@
+# src/recsys/utils/files.py
+"""
+File helpers shared by the data, tracking and model pipelines.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+
+def buffer_digest(data: bytes | memoryview) -> str:
+    """Returns the BLAKE2b content hash of an in-memory (or memory-mapped) buffer, as `file_digest` would."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Returns the BLAKE2b content hash of a file, read in `chunk_size` blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "wb", encoding: str | None = None) -> Iterator[IO[Any]]:
+    """
+    Opens a uniquely named temporary file next to `path` and moves it into place on success.
+
+    Readers see either the previous file or the complete new one, and concurrent
+    writers (threads or processes) never share a temporary file. If the block
+    raises, the temporary file is removed and `path` is left untouched.
+
+    Args:
+        path (Path): The file to (re)write; its directory must exist.
+        mode (str): 'wb' or 'w'.
+        encoding (str | None): Text encoding, for mode 'w'.
+    """
+    f = tempfile.NamedTemporaryFile(  # noqa: SIM115 - closed below, before the rename.
+        mode, encoding=encoding, dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    )
+    try:
+        with f:
+            yield f
+        os.replace(f.name, path)
+    except BaseException:
+        Path(f.name).unlink(missing_ok=True)
+        raise
@@ -1,23 +1,54 @@
-""" Path utilities for the recsys project. 
-Provides functions to get the project root and check for configuration file existence.# src/recsys/utils/paths.py
+# src/recsys/utils/paths.py
+"""
+Path utilities for the recsys project.
+Provides functions to get the project root and check for configuration file existence.
 """
 
+from functools import cache
 from pathlib import Path
 
-def check_config_file_exists(config_path):
+
+def check_config_file_exists(config_path: Path) -> None:
     if not config_path.is_file():
         raise FileNotFoundError(f"Configuration file not found at: {config_path}")
 
+
+@cache
 def get_project_root() -> Path:
     """
     Finds the project root directory by walking up until 'pyproject.toml' is found.
+
+    The result is memoized: the walk runs once per process.
     """
     current_path = Path(__file__).resolve().parent
 
-    while not (current_path / 'pyproject.toml').is_file():
+    while not (current_path / "pyproject.toml").is_file():
         if current_path == current_path.parent:
-            raise FileNotFoundError("Could not find project root."
-                                    " Make sure 'pyproject.toml' exists.")
+            raise FileNotFoundError("Could not find project root. Make sure 'pyproject.toml' exists.")
         current_path = current_path.parent
     return current_path
 
+
+# Written into `models/vN` once every artifact of the version is in place.
+MODEL_READY_MARKER = "READY"
+
+
+def model_versions(models_dir: Path, ready_only: bool = True) -> list[str]:
+    """
+    Lists the `vN` version directories under `models_dir`, oldest first.
+
+    Args:
+        models_dir (Path): The models directory, e.g. `models`.
+        ready_only (bool): Skip versions whose training has not written `MODEL_READY_MARKER` yet.
+    """
+    if not models_dir.is_dir():
+        return []
+    versions = [
+        path
+        for path in models_dir.iterdir()
+        if path.is_dir()
+        and path.name[:1] == "v"
+        and path.name[1:].isdigit()
+        and (not ready_only or (path / MODEL_READY_MARKER).is_file())
+    ]
+    return [path.name for path in sorted(versions, key=lambda path: int(path.name[1:]))]
@@ -0,0 +1,183 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from recsys.api.dependencies import ModelBundle, ModelRegistry, load_bundle
+from recsys.utils.distance_metrics import NeighborEngine
+from recsys.utils.paths import MODEL_READY_MARKER, model_versions
+
+
+class FakeRecommender:
+    def __init__(self, version: str):
+        self.version = version
+        self.closed = False
+
+    def recommend(self, liked, n=10):
+        if self.closed:
+            raise RuntimeError(f"model {self.version} used after release")
+        time.sleep(0.001)
+        return self.version
+
+    def close(self):
+        self.closed = True
+
+
+def fake_loader(path):
+    if (path / "broken").exists():
+        raise OSError("corrupt artifact")
+    time.sleep(0.05)  # loading takes a while; traffic must keep flowing meanwhile
+    return ModelBundle(version=path.name, path=path, recommender=FakeRecommender(path.name))
+
+
+def publish(models_dir, version, ready=True, broken=False):
+    path = models_dir / version
+    path.mkdir(parents=True)
+    if broken:
+        (path / "broken").touch()
+    if ready:
+        (path / MODEL_READY_MARKER).touch()
+
+
+def test_model_versions_skip_unready_and_sort_numerically(tmp_path):
+    for version in ("v2", "v10", "v1"):
+        publish(tmp_path, version)
+    publish(tmp_path, "v11", ready=False)
+    (tmp_path / "scratch").mkdir()
+
+    assert model_versions(tmp_path) == ["v1", "v2", "v10"]
+
+
+def test_no_version_raises(tmp_path):
+    registry = ModelRegistry(tmp_path, loader=fake_loader)
+
+    assert registry.poll() is False
+    with pytest.raises(RuntimeError), registry.acquire():
+        pass
+
+
+def test_swap_under_concurrent_requests(tmp_path):
+    publish(tmp_path, "v1")
+    registry = ModelRegistry(tmp_path, loader=fake_loader)
+    swaps = []
+    registry.on_swap(swaps.append)
+    registry.start()
+    v1 = registry.current
+
+    stop = threading.Event()
+    errors, served = [], []
+
+    def client():
+        while not stop.is_set():
+            try:
+                with registry.acquire() as bundle:
+                    served.append(bundle.recommender.recommend([1]))
+            except Exception as e:
+                errors.append(e)
+
+    clients = [threading.Thread(target=client) for _ in range(8)]
+    for t in clients:
+        t.start()
+    time.sleep(0.05)
+    publish(tmp_path, "v2")
+    assert registry.poll() is True
+    time.sleep(0.05)
+    stop.set()
+    for t in clients:
+        t.join()
+    registry.stop()
+
+    assert errors == []
+    assert {"v1", "v2"} <= set(served)
+    # Once a request saw v2, none saw v1 again.
+    assert "v1" not in served[served.index("v2") + len(clients) :]
+    assert v1.closed and v1.leases == 0
+    assert swaps == ["v1", "v2"]
+
+
+def test_old_version_released_after_last_lease(tmp_path):
+    publish(tmp_path, "v1")
+    registry = ModelRegistry(tmp_path, loader=fake_loader, warm=False).start()
+
+    with registry.acquire() as v1:
+        publish(tmp_path, "v2")
+        registry.poll()
+        assert registry.version == "v2"
+        assert not v1.closed
+        assert v1.recommender.recommend([1]) == "v1"
+    assert v1.closed
+    registry.stop()
+
+
+def test_broken_version_keeps_serving_current(tmp_path):
+    publish(tmp_path, "v1")
+    registry = ModelRegistry(tmp_path, loader=fake_loader, warm=False).start()
+    publish(tmp_path, "v2", broken=True)
+
+    assert registry.poll() is False
+    assert registry.version == "v1"
+    assert registry.poll() is False
+
+    publish(tmp_path, "v3")
+    assert registry.poll() is True
+    assert registry.version == "v3"
+    registry.stop()
+
+
+class RecordingStore:
+    """Stand-in for `UserVectorStore` that records fold-ins; the first `replay` pass is slow."""
+
+    def __init__(self, replay_seconds=0.0):
+        self.events = []
+        self.replay_seconds = replay_seconds
+
+    def apply_event(self, event):
+        self.events.append(event)
+        return True
+
+    def replay(self, other, skip=None):
+        skip = skip or {}
+        snapshot = list(enumerate(other.events))
+        if not skip:
+            time.sleep(self.replay_seconds)
+        self.events.extend(event for i, event in snapshot if i not in skip)
+        return {i: i for i, _ in snapshot}
+
+
+def test_fold_in_during_swap_reaches_the_new_version_without_waiting(tmp_path):
+    registry = ModelRegistry(tmp_path, loader=fake_loader, warm=False)
+    registry.swap(ModelBundle(version="v1", path=tmp_path, user_vectors=RecordingStore()))
+    registry.apply_event({"user_id": 1})
+    v2 = ModelBundle(version="v2", path=tmp_path, user_vectors=RecordingStore(replay_seconds=0.3))
+
+    swapping = threading.Thread(target=registry.swap, args=(v2,))
+    swapping.start()
+    time.sleep(0.02)  # v2 is replaying v1's users.
+    start = time.perf_counter()
+    assert registry.apply_event({"user_id": 2}) is True
+    waited = time.perf_counter() - start
+    swapping.join()
+
+    assert waited < 0.1
+    assert v2.user_vectors.events == [{"user_id": 1}, {"user_id": 2}]
+
+
+def test_load_bundle_reranks_with_the_saved_engine(tmp_path):
+    rng = np.random.default_rng(0)
+    n_games = 30
+    NeighborEngine(
+        np.arange(1, n_games + 1),
+        rng.normal(size=(n_games, 8)),
+        clusters=rng.normal(size=(n_games, 2)),
+        themes=rng.integers(0, 2, size=(n_games, 4)),
+        categories=rng.integers(0, 2, size=(n_games, 3)),
+        ratings=rng.uniform(0, 1, n_games),
+        popularity=rng.uniform(0, 1, n_games),
+    ).save(tmp_path / "v1")
+
+    bundle = load_bundle(tmp_path / "v1")
+
+    assert bundle.recommender.engine is bundle.engine
+    assert bundle.recommender.recommend([1], n=5).degraded == ["popularity_fallback"]
+    bundle.close()
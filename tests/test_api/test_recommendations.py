@@ -0,0 +1,215 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+import pytest_asyncio
+
+from recsys.api.batching import MicroBatcher
+from recsys.api.main import create_app
+from recsys.data.catalogue_store import CatalogueStore
+from recsys.models.collaborative_filter import CollaborativeFilter
+from recsys.models.neighbor_table import NeighborTable, build_neighbor_table
+from recsys.models.rag_recommender import RAGRecommender
+from recsys.tracking.interaction_tracker import InteractionTracker
+from recsys.utils.distance_metrics import NeighborEngine
+from recsys.utils.paths import MODEL_READY_MARKER
+
+N_GAMES = 100
+
+
+@pytest.fixture(scope="module")
+def project(tmp_path_factory):
+    root = tmp_path_factory.mktemp("project")
+    rng = np.random.default_rng(3)
+    game_ids = np.arange(1, N_GAMES + 1, dtype=np.int64)
+    version = root / "models" / "v1"
+    embeddings = rng.normal(size=(N_GAMES, 16)).astype(np.float32)
+    RAGRecommender().fit_embeddings(game_ids, embeddings).save(version)
+    engine = NeighborEngine(
+        game_ids,
+        embeddings,
+        clusters=rng.normal(size=(N_GAMES, 4)),
+        themes=rng.integers(0, 2, size=(N_GAMES, 6)),
+        categories=rng.integers(0, 2, size=(N_GAMES, 5)),
+        ratings=rng.uniform(0, 1, N_GAMES),
+        popularity=rng.uniform(0, 1, N_GAMES),
+    )
+    engine.save(version)
+    build_neighbor_table(engine, version, k=20)
+    ratings = pd.DataFrame({
+        "USER_ID": [f"user{u}" for u in rng.integers(0, 50, size=1500)],
+        "GAME_ID": rng.choice(game_ids, size=1500),
+        "RATING": rng.uniform(1, 10, size=1500),
+    }).drop_duplicates(subset=["USER_ID", "GAME_ID"])
+    CollaborativeFilter(factors=8, iterations=2).fit(ratings).save(version)
+    (version / MODEL_READY_MARKER).touch()
+
+    catalogue = CatalogueStore(root / "bgg_db.sqlite")
+    catalogue.upsert_games(pd.DataFrame({"BGGId": [1, 2], "Name": ["Catan", "Gloomhaven"]}))
+    return root
+
+
+def make_config(batching: bool = True, cache: bool = False) -> dict:
+    return {
+        "paths": {"models_dir": "models", "bgg_api": {"sqlite_db_file": "bgg_db.sqlite"}},
+        "cache": {"enabled": cache},
+        "api": {"batching": {"enabled": batching, "max_batch_size": 16, "max_wait_ms": 20}},
+    }
+
+
+@pytest_asyncio.fixture
+async def client_for(project):
+    contexts = []
+
+    async def start(config, tracker=None):
+        app = create_app(config, project_root=project, tracker=tracker)
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        contexts.append((lifespan, client))
+        return app, client
+
+    yield start
+    for lifespan, client in contexts:
+        await client.aclose()
+        await lifespan.__aexit__(None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_batched(client_for):
+    app, client = await client_for(make_config())
+    bodies = [{"game_ids": [i, i + 1], "n": 5} for i in range(1, 17)]
+
+    responses = await asyncio.gather(*(client.post("/recommend", json=body) for body in bodies))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert app.state.registry.current.recommender.engine is not None
+    assert app.state.batcher.stats.items == len(bodies)
+    assert app.state.batcher.stats.max_batch > 1
+    with app.state.registry.acquire() as models:
+        for body, response in zip(bodies, responses, strict=True):
+            expected = models.recommender.recommend(body["game_ids"], n=5)
+            got = [item["game_id"] for item in response.json()["recommendations"]]
+            assert got == expected.game_ids.tolist()
+            assert response.json()["model_version"] == "v1"
+
+
+@pytest.mark.asyncio
+async def test_unbatched_mode_runs_one_request_per_batch(client_for):
+    app, client = await client_for(make_config(batching=False))
+
+    responses = await asyncio.gather(*(client.post("/recommend", json={"game_ids": [i]}) for i in range(1, 9)))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert app.state.batcher.stats.max_batch == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_requests_are_served_from_cache(client_for):
+    app, client = await client_for(make_config(cache=True))
+
+    first = await client.post("/recommend", json={"game_ids": [3, 2], "user_id": "user1"})
+    second = await client.post("/recommend", json={"game_ids": [2, 3], "user_id": "user1"})
+
+    assert first.json()["cached"] is False
+    assert second.json()["cached"] is True
+    assert second.json()["recommendations"] == first.json()["recommendations"]
+    assert app.state.batcher.stats.items == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_results_are_keyed_by_the_leased_version(client_for):
+    app, client = await client_for(make_config(cache=True))
+    # As if a swap had already moved the cache on while this request still holds v1.
+    app.state.cache.model_version = "v2"
+
+    response = (await client.post("/recommend", json={"game_ids": [2, 3]})).json()
+
+    assert response["model_version"] == "v1"
+    assert [key.split(":")[2] for key in app.state.cache.local._entries] == ["v1"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cache", [False, True])
+async def test_tracked_ratings_are_folded_in(client_for, tmp_path, cache):
+    tracker = InteractionTracker(tmp_path / "events.jsonl", buffered=False)
+    # The cached variant passes a factory, as the served app does with `get_tracker`.
+    app, client = await client_for(make_config(cache=cache), tracker=(lambda: tracker) if cache else tracker)
+    body = {"game_ids": [5], "user_id": "user1", "n": 20}
+    before = [item["game_id"] for item in (await client.post("/recommend", json=body)).json()["recommendations"]]
+    if cache:
+        assert (await client.post("/recommend", json=body)).json()["cached"] is True
+
+    tracker.track_event("user1", "rate_game", "s1", {"game_id": before[0], "rating": 10})
+    response = (await client.post("/recommend", json=body)).json()
+    after = [item["game_id"] for item in response["recommendations"]]
+
+    store = app.state.registry.current.user_vectors
+    assert "user1" in store
+    assert before[0] not in [game for game, _ in store.recommend("user1", n=20)]
+    assert response["cached"] is False
+    assert after != before
+
+
+@pytest.mark.asyncio
+async def test_validation_health_and_catalogue(client_for):
+    _, client = await client_for(make_config())
+
+    assert (await client.post("/recommend", json={"game_ids": []})).status_code == 422
+    health = (await client.get("/health")).json()
+    assert (health["status"], health["model_version"]) == ("ok", "v1")
+    assert (await client.get("/games/search", params={"q": "glom"})).json() == [{"bggid": 2, "name": "Gloomhaven"}]
+    assert (await client.get("/games/1")).json()["name"] == "Catan"
+    assert (await client.get("/games/999")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_similar_games_are_served_from_the_neighbor_table(client_for, project, monkeypatch):
+    _, client = await client_for(make_config())
+    monkeypatch.setattr(NeighborEngine, "distances", lambda *args, **kwargs: pytest.fail("scored on request"))
+
+    response = await client.get("/games/5/similar", params={"n": 5})
+
+    assert response.status_code == 200
+    body = response.json()
+    expected = NeighborTable.load(project / "models" / "v1").similar_games(5, 5)
+    assert (body["model_version"], body["game_id"]) == ("v1", 5)
+    assert [(g["game_id"], pytest.approx(g["score"])) for g in body["similar"]] == expected
+    assert (await client.get("/games/999/similar")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_batcher_propagates_errors_and_respects_batch_size():
+    sizes = []
+
+    def handler(items):
+        sizes.append(len(items))
+        if "boom" in items:
+            raise ValueError("bad item")
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=4, max_wait_ms=20)
+    await batcher.start()
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+    with pytest.raises(ValueError):
+        await batcher.submit("boom")
+    await batcher.stop()
+
+    assert results == [i * 2 for i in range(10)]
+    assert max(sizes) == 4
+    assert batcher.stats.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_items_of_a_batch_still_being_collected():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=8, max_wait_ms=10_000)
+    await batcher.start()
+    pending = asyncio.ensure_future(batcher.submit(1))
+    await asyncio.sleep(0.05)  # The collector has taken the item and waits for more.
+
+    await batcher.stop()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        await asyncio.wait_for(pending, timeout=1)
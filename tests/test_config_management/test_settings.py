@@ -0,0 +1,81 @@
+import pytest
+
+from recsys.config_management.settings import get_settings, load_settings
+from recsys.data import catalogue_store, extract
+from recsys.utils.paths import get_project_root
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config.yml").write_text(
+        "paths:\n  models_dir: base_models\n  raw_data_dir: data/raw\nsettings:\n  dtype_inference_rows: 1000\n"
+    )
+    (tmp_path / "config" / "local.yml").write_text(
+        "paths:\n  models_dir: models\ncache:\n  ttl_seconds: 30\ntraining:\n  collaborative_filter:\n    factors: 8\n"
+    )
+    (tmp_path / "config" / "prod.yml").write_text("")
+    return tmp_path
+
+
+def test_environment_file_overrides_base_file(project):
+    settings = load_settings(project)
+
+    # Nested sections are merged key by key, not replaced wholesale.
+    assert settings.paths.models_dir == "models"
+    assert settings.paths.raw_data_dir == "data/raw"
+    assert settings.settings == {"dtype_inference_rows": 1000}
+    assert settings.cache.ttl_seconds == 30
+    assert settings.as_dict()["training"]["collaborative_filter"]["factors"] == 8
+    # An empty environment file leaves the base and the defaults.
+    prod = load_settings(project, env="prod")
+    assert prod.paths.models_dir == "base_models"
+    assert prod.api.batching.max_batch_size == 32
+
+
+def test_environment_variables_override_files(project, monkeypatch):
+    monkeypatch.setenv("RECSYS_CACHE__REDIS_URL", "redis://cache:6379/0")
+    monkeypatch.setenv("RECSYS_API__BATCHING__MAX_BATCH_SIZE", "8")
+
+    settings = load_settings(project)
+
+    assert settings.cache.redis_url == "redis://cache:6379/0"
+    assert settings.cache.ttl_seconds == 30
+    assert settings.api.batching.max_batch_size == 8
+
+
+def test_invalid_configuration_raises_instead_of_exiting(project):
+    (project / "config" / "local.yml").write_text("cache:\n  ttl_seconds: soon\n")
+    with pytest.raises(ValueError):
+        load_settings(project)
+
+    (project / "config" / "local.yml").write_text("paths: [unclosed\n")
+    with pytest.raises(ValueError, match="Could not parse"):
+        load_settings(project)
+
+    (project / "config" / "local.yml").write_text("- a list\n")
+    with pytest.raises(TypeError, match="must contain a mapping"):
+        load_settings(project)
+
+    with pytest.raises(FileNotFoundError):
+        load_settings(project, env="staging")
+
+
+def test_project_settings_are_parsed_once():
+    settings = get_settings()
+
+    assert get_settings() is settings
+    assert get_project_root() is get_project_root()
+    config = settings.as_dict()
+    config["paths"]["models_dir"] = "elsewhere"
+    assert settings.as_dict()["paths"]["models_dir"] != "elsewhere"
+
+
+@pytest.mark.parametrize("script", [extract, catalogue_store])
+def test_scripts_report_a_non_mapping_configuration(script, project, monkeypatch, capsys):
+    (project / "config" / "local.yml").write_text("- a list\n")
+    monkeypatch.setattr(script, "get_settings", lambda: load_settings(project))
+
+    script.main()
+
+    assert "must contain a mapping" in capsys.readouterr().out
@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from recsys.data.catalogue_store import CatalogueStore
+
+
+@pytest.fixture
+def games_df():
+    return pd.DataFrame({
+        "BGGId": [13, 174430, 167791, 325, 1234],
+        "Name": ["Catan", "Gloomhaven", "Terraforming Mars", "Catan: Seafarers", "Pandemic"],
+        "YearPublished": [1995, 2017, 2016, 1997, 2008],
+        "BayesAvgRating": [6.9, 8.4, 8.2, 6.8, 7.4],
+        "NumUserRatings": [100_000, 60_000, 80_000, 20_000, None],
+        "ImagePath": ["c.jpg", "g.jpg", "t.jpg", "s.jpg", None],
+        "Cat:Strategy": [1, 1, 1, 1, 0],
+    })
+
+
+@pytest.fixture
+def store(tmp_path, games_df):
+    store = CatalogueStore(tmp_path / "bgg_db.sqlite", pool_size=2)
+    store.upsert_games(games_df)
+    yield store
+    store.close()
+
+
+def test_lookups_by_id_and_name(store):
+    assert store.get(174430)["name"] == "Gloomhaven"
+    assert store.get(174430)["attributes"] == {"Cat:Strategy": 1}
+    assert store.get(99) is None
+    assert [g["bggid"] for g in store.get_many([325, 99, 13])] == [325, 13]
+    assert store.find_by_name("terraforming MARS")[0]["year_published"] == 2016
+
+
+def test_name_lookup_uses_index(store):
+    with store.reader() as conn:
+        plan = " ".join(
+            row[3]
+            for row in conn.execute("EXPLAIN QUERY PLAN SELECT * FROM games WHERE name = ? COLLATE NOCASE", ("Catan",))
+        )
+
+    assert "USING INDEX games_name" in plan
+
+
+def test_autocomplete_prefix_and_typos(store):
+    assert [name for _, name in store.autocomplete("cat")] == ["Catan", "Catan: Seafarers"]
+    assert store.autocomplete("terra ma", limit=1) == [(167791, "Terraforming Mars")]
+    assert (174430, "Gloomhaven") in store.autocomplete("glomhaven")
+    assert store.autocomplete("  ") == []
+
+
+def test_upsert_updates_rows_and_search_index(store, games_df):
+    renamed = games_df.iloc[[1]].assign(Name="Gloomhaven: Second Edition")
+
+    store.upsert_games(renamed)
+
+    assert store.get(174430)["name"] == "Gloomhaven: Second Edition"
+    assert store.autocomplete("second") == [(174430, "Gloomhaven: Second Edition")]
+    with store.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 5
+
+
+def test_failed_bulk_load_rolls_back(store, games_df):
+    bad = games_df.assign(Name=None)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        store.upsert_games([games_df.assign(Name="x"), bad])
+
+    assert store.get(13)["name"] == "Catan"
+
+
+def test_readers_are_read_only_and_concurrent(store, tmp_path, games_df):
+    with store.reader() as conn, pytest.raises(sqlite3.OperationalError, match="readonly"):
+        conn.execute("DELETE FROM games")
+
+    errors = []
+
+    def read():
+        try:
+            for _ in range(50):
+                assert store.get(13)["name"] == "Catan"
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for t in threads:
+        t.start()
+    store.upsert_from_csv(_write(tmp_path, games_df))
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_concurrent_first_readers_share_one_pool(store, monkeypatch):
+    open_reader, opened = store._open_reader, []
+
+    def slow_open_reader():
+        time.sleep(0.01)
+        opened.append(open_reader())
+        return opened[-1]
+
+    monkeypatch.setattr(store, "_open_reader", slow_open_reader)
+    start = threading.Barrier(4)
+
+    def read():
+        start.wait()
+        store.get(13)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(opened) == store.pool_size
+
+
+def _write(tmp_path, df):
+    path = tmp_path / "games.csv"
+    df.to_csv(path, index=False)
+    return path
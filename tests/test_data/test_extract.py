@@ -0,0 +1,67 @@
+import zipfile
+
+import pytest
+
+from recsys.data.extract import extract_data, load_member
+
+CONFIG = {"paths": {"raw_data_dir": "raw", "raw_data_file": "data.zip", "extract_data_dir": "interim"}}
+
+
+def _write_archive(root, members):
+    (root / "raw").mkdir(exist_ok=True)
+    with zipfile.ZipFile(root / "raw" / "data.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    _write_archive(tmp_path, {"games.csv": "BGGId,Name\n1,Catan\n2,Azul\n", "themes.csv": "BGGId,Fantasy\n1,0\n"})
+    return tmp_path
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_extracts_all_members(project_root, max_workers):
+    extract_dir, files = extract_data(project_root, CONFIG, max_workers=max_workers)
+
+    assert sorted(files) == ["games.csv", "themes.csv"]
+    assert (extract_dir / "games.csv").read_text() == "BGGId,Name\n1,Catan\n2,Azul\n"
+    assert (extract_dir / "themes.csv").is_file()
+
+
+def test_rerun_only_extracts_changed_members(project_root):
+    extract_dir, _ = extract_data(project_root, CONFIG, max_workers=1)
+    themes_mtime = (extract_dir / "themes.csv").stat().st_mtime_ns
+
+    _write_archive(project_root, {"games.csv": "BGGId,Name\n1,Catan\n", "themes.csv": "BGGId,Fantasy\n1,0\n"})
+    extract_data(project_root, CONFIG, max_workers=1)
+
+    assert (extract_dir / "games.csv").read_text() == "BGGId,Name\n1,Catan\n"
+    assert (extract_dir / "themes.csv").stat().st_mtime_ns == themes_mtime
+
+
+def test_missing_extracted_file_is_restored(project_root):
+    extract_dir, _ = extract_data(project_root, CONFIG, max_workers=1)
+    (extract_dir / "games.csv").unlink()
+
+    extract_data(project_root, CONFIG, max_workers=1)
+
+    assert (extract_dir / "games.csv").is_file()
+
+
+def test_load_member_streams_without_extracting(project_root):
+    df = load_member(project_root, CONFIG, "games.csv", columns=["Name"])
+
+    assert df["Name"].tolist() == ["Catan", "Azul"]
+    assert not (project_root / "interim").exists()
+
+
+def test_load_member_reads_multiline_quoted_fields(tmp_path):
+    # About 2.5 MB, so quoted newlines straddle Arrow's 1 MB blocks.
+    rows = "".join(f'{i},"Line one of {i},\nline two with ""quotes""\n"\n' for i in range(40_000))
+    _write_archive(tmp_path, {"games.csv": "BGGId,Description\n" + rows})
+
+    df = load_member(tmp_path, CONFIG, "games.csv")
+
+    assert len(df) == 40_000
+    assert df["Description"].iloc[-1] == 'Line one of 39999,\nline two with "quotes"\n'
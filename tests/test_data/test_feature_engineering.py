@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recsys.data.feature_engineering import CatalogueIndex, FeatureIndex
+
+
+@pytest.fixture
+def frames():
+    rng = np.random.default_rng(8)
+    n = 1000
+    ids = rng.permutation(np.arange(1, n + 1)) * 7
+    games = pd.DataFrame({"BGGId": ids, "Name": [f"g{i}" for i in ids]})
+    for cat in ("Thematic", "Strategy", "War", "Family"):
+        games[f"Cat:{cat}"] = (rng.random(n) < 0.3).astype(int)
+    mechanics = pd.DataFrame({"BGGId": ids[::-1]})
+    for mech in ("Dice Rolling", "Hand Management", "Worker Placement"):
+        mechanics[mech] = (rng.random(n) < 0.2).astype(int)
+    return games, mechanics
+
+
+def test_any_of_matches_poc_filter(frames):
+    games, _ = frames
+    index = FeatureIndex.from_frame(games, strip_prefix="Cat:")
+
+    rows = index.rows(index.any_of(["thematic", "War"]))
+
+    expected = np.flatnonzero((games["Cat:Thematic"] == 1) | (games["Cat:War"] == 1))
+    assert rows.tolist() == expected.tolist()
+    assert index.count(index.any_of(["thematic", "War"])) == len(expected)
+
+
+def test_all_none_and_empty_clauses(frames):
+    games, _ = frames
+    index = FeatureIndex.from_frame(games, strip_prefix="Cat:")
+
+    both = index.rows(index.mask(all_of=["Thematic", "Strategy"], none_of=["Family"]))
+
+    expected = (games["Cat:Thematic"] == 1) & (games["Cat:Strategy"] == 1) & (games["Cat:Family"] == 0)
+    assert both.tolist() == np.flatnonzero(expected).tolist()
+    assert len(index.rows(index.mask())) == len(games)
+    assert len(index.rows(index.any_of([]))) == 0
+    assert len(index.rows(index.none_of(["Thematic"]))) == (games["Cat:Thematic"] == 0).sum()
+    with pytest.raises(KeyError):
+        index.any_of(["Euro"])
+
+
+def test_catalogue_filter_combines_families_aligned_by_id(frames):
+    games, mechanics = frames
+    catalogue = CatalogueIndex.from_frames(games, mechanics_df=mechanics)
+
+    rows = catalogue.filter(categories_any=["Thematic"], mechanics_all=["Dice Rolling", "Hand Management"])
+
+    merged = games.merge(mechanics, on="BGGId", how="left")
+    expected = (merged["Cat:Thematic"] == 1) & (merged["Dice Rolling"] == 1) & (merged["Hand Management"] == 1)
+    assert rows.tolist() == np.flatnonzero(expected).tolist()
+    assert {"Dice Rolling", "Hand Management"} <= set(catalogue.families["mechanics"].features_of(int(rows[0])))
+    with pytest.raises(ValueError):
+        catalogue.filter(designers_any=["Knizia"])
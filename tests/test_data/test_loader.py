@@ -0,0 +1,116 @@
+import os
+
+import pandas as pd
+import pytest
+
+from recsys.data import loader
+from recsys.data.loader import load_extracted_data
+
+CONFIG = {"paths": {"extract_data_dir": "interim"}}
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    (tmp_path / "interim").mkdir()
+    pd.DataFrame({
+        "BGGId": [1, 2, 3, 4],
+        "Name": ["Catan", "Carcassonne", "Gloomhaven", "Azul"],
+        "YearPublished": [1995, 2000, 2017, 2017],
+    }).to_csv(tmp_path / "interim" / "games.csv", index=False)
+    return tmp_path
+
+
+@pytest.mark.parametrize("cache_format", ["arrow", "parquet"])
+def test_cache_is_built_then_reused(project_root, cache_format):
+    cold = load_extracted_data("games.csv", project_root, CONFIG, cache_format=cache_format)
+    cache_file = project_root / "interim" / ".cache" / f"games.{cache_format}"
+    built_at = cache_file.stat().st_mtime_ns
+
+    warm = load_extracted_data("games.csv", project_root, CONFIG, cache_format=cache_format)
+
+    pd.testing.assert_frame_equal(cold, warm)
+    assert cache_file.stat().st_mtime_ns == built_at
+    assert isinstance(warm["Name"].dtype, pd.ArrowDtype)
+
+
+@pytest.mark.parametrize("cache_format", ["arrow", "parquet"])
+def test_projection_and_filters(project_root, cache_format):
+    load_extracted_data("games.csv", project_root, CONFIG, cache_format=cache_format)
+
+    df = load_extracted_data(
+        "games.csv",
+        project_root,
+        CONFIG,
+        columns=["Name"],
+        filters=[("YearPublished", "=", 2017)],
+        cache_format=cache_format,
+    )
+
+    assert list(df.columns) == ["Name"]
+    assert df["Name"].tolist() == ["Gloomhaven", "Azul"]
+
+
+def test_changed_source_rebuilds_cache(project_root):
+    csv_path = project_root / "interim" / "games.csv"
+    load_extracted_data("games.csv", project_root, CONFIG)
+
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("5,Wingspan,2019\n")
+    df = load_extracted_data("games.csv", project_root, CONFIG)
+
+    assert df["Name"].tolist()[-1] == "Wingspan"
+
+
+def test_touched_but_identical_source_keeps_cache(project_root):
+    csv_path = project_root / "interim" / "games.csv"
+    load_extracted_data("games.csv", project_root, CONFIG)
+    cache_file = project_root / "interim" / ".cache" / "games.arrow"
+    built_at = cache_file.stat().st_mtime_ns
+
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load_extracted_data("games.csv", project_root, CONFIG)
+
+    assert cache_file.stat().st_mtime_ns == built_at
+
+
+def test_source_replaced_during_build_is_not_cached_under_its_hash(project_root, monkeypatch):
+    csv_path = project_root / "interim" / "games.csv"
+    replacement = csv_path.read_text().replace("Azul", "Lutz")
+    read_csv = loader.pa_csv.read_csv
+
+    def read_then_replace(*args, **kwargs):
+        table = read_csv(*args, **kwargs)
+        # A same-sized, newer file lands while the old one is being cached.
+        tmp_path = csv_path.with_name("games.csv.new")
+        tmp_path.write_text(replacement)
+        stat = csv_path.stat()
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        os.replace(tmp_path, csv_path)
+        return table
+
+    monkeypatch.setattr(loader.pa_csv, "read_csv", read_then_replace)
+    assert load_extracted_data("games.csv", project_root, CONFIG)["Name"].tolist()[-1] == "Azul"
+    monkeypatch.undo()
+
+    assert load_extracted_data("games.csv", project_root, CONFIG)["Name"].tolist()[-1] == "Lutz"
+
+
+def test_unknown_column_raises_value_error(project_root):
+    with pytest.raises(ValueError, match="Unknown columns"):
+        load_extracted_data("games.csv", project_root, CONFIG, columns=["Nope"])
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_multiline_quoted_fields_across_blocks(tmp_path, use_cache):
+    (tmp_path / "interim").mkdir()
+    n_rows = 20_000  # About 2.5 MB, so quoted newlines straddle Arrow's 1 MB blocks.
+    descriptions = [f'Line one of {i},\nline two with "quotes"\n' * 3 for i in range(n_rows)]
+    pd.DataFrame({"BGGId": range(n_rows), "Description": descriptions}).to_csv(
+        tmp_path / "interim" / "games.csv", index=False
+    )
+
+    df = load_extracted_data("games.csv", tmp_path, CONFIG, use_cache=use_cache)
+
+    assert len(df) == n_rows
+    assert df["Description"].iloc[-1] == descriptions[-1]
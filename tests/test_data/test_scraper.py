@@ -0,0 +1,181 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from recsys.data.scraper import BGGScraper, TokenBucket, parse_things
+
+
+def thing_xml(ids):
+    items = "".join(
+        f'<item type="boardgame" id="{i}"><thumbnail>https://img/{i}_t.jpg</thumbnail>'
+        f'<name type="primary" sortindex="1" value="Game {i}"/><yearpublished value="20{i % 100:02d}"/>'
+        f"<description>About {i}</description></item>"
+        for i in ids
+    )
+    return f'<?xml version="1.0" encoding="utf-8"?><items termsofuse="x">{items}</items>'.encode()
+
+
+class MockBGG:
+    """A local stand-in for the BGG `thing` endpoint with scripted failures and ETags."""
+
+    def __init__(self, fail_first=0, status=503):
+        self.requests = []
+        self.fail_first = fail_first
+        self.status = status
+
+    async def thing(self, request):
+        self.requests.append(request)
+        if len(self.requests) <= self.fail_first:
+            return web.Response(status=self.status, headers={"Retry-After": "0"})
+        ids = [int(i) for i in request.query["id"].split(",")]
+        etag = f'"{request.query["id"]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.Response(body=thing_xml(ids), content_type="text/xml", headers={"ETag": etag})
+
+
+@pytest_asyncio.fixture
+async def mock_bgg():
+    async def serve(**kwargs):
+        bgg = MockBGG(**kwargs)
+        app = web.Application()
+        app.router.add_get("/xmlapi2/thing", bgg.thing)
+        server = TestServer(app)
+        await server.start_server()
+        servers.append(server)
+        return bgg, str(server.make_url("/xmlapi2/thing"))
+
+    servers = []
+    yield serve
+    for server in servers:
+        await server.close()
+
+
+def make_scraper(tmp_path, url, **kwargs):
+    defaults = {"rate": 1000.0, "burst": 1000.0, "backoff_base": 0.01}
+    return BGGScraper(tmp_path / "cache", tmp_path / "rate_limit.json", base_url=url, **{**defaults, **kwargs})
+
+
+def test_parse_things():
+    [item] = parse_things(thing_xml([174430]))
+
+    assert item == {
+        "id": 174430,
+        "type": "boardgame",
+        "name": "Game 174430",
+        "year_published": 2030,
+        "thumbnail": "https://img/174430_t.jpg",
+        "image": None,
+        "description": "About 174430",
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_things_batches_ids(tmp_path, mock_bgg):
+    bgg, url = await mock_bgg()
+
+    async with make_scraper(tmp_path, url, batch_size=20) as scraper:
+        games = await scraper.fetch_things([*range(1, 46), 3, 3])
+
+    assert sorted(games) == list(range(1, 46))
+    assert games[7]["name"] == "Game 7"
+    assert sorted(len(r.query["id"].split(",")) for r in bgg.requests) == [5, 20, 20]
+
+
+@pytest.mark.asyncio
+async def test_fresh_cache_skips_network_and_stale_cache_revalidates(tmp_path, mock_bgg):
+    bgg, url = await mock_bgg()
+    async with make_scraper(tmp_path, url) as scraper:
+        await scraper.fetch_things([1, 2])
+    async with make_scraper(tmp_path, url) as scraper:
+        await scraper.fetch_things([1, 2])
+        assert scraper.stats["cache_hits"] == 1
+
+    async with make_scraper(tmp_path, url, cache_ttl=0) as scraper:
+        games = await scraper.fetch_things([1, 2])
+        assert scraper.stats["revalidated"] == 1
+
+    assert games[2]["name"] == "Game 2"
+    assert len(bgg.requests) == 2
+    assert bgg.requests[1].headers["If-None-Match"] == '"1,2"'
+    assert len(list((tmp_path / "cache" / "objects").iterdir())) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [202, 429, 503])
+async def test_transient_errors_are_retried(tmp_path, mock_bgg, status):
+    bgg, url = await mock_bgg(fail_first=2, status=status)
+
+    async with make_scraper(tmp_path, url) as scraper:
+        games = await scraper.fetch_things([5])
+
+    assert games[5]["id"] == 5
+    assert scraper.stats["retries"] == 2
+    assert len(bgg.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(tmp_path, mock_bgg):
+    _, url = await mock_bgg(fail_first=10)
+
+    async with make_scraper(tmp_path, url, max_retries=1) as scraper:
+        with pytest.raises(Exception, match="503"):
+            await scraper.fetch_things([5])
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate_and_persists_state(tmp_path):
+    state_file = tmp_path / "rate_limit.json"
+    bucket = TokenBucket(rate=20.0, capacity=2.0, state_file=state_file)
+
+    start = time.perf_counter()
+    for _ in range(6):
+        await bucket.acquire()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= 4 / 20 * 0.9
+    assert json.loads(state_file.read_text())["tokens"] < 1
+    assert TokenBucket(rate=20.0, capacity=2.0, state_file=state_file).tokens < 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_state_is_shared_between_instances(tmp_path):
+    state_file = tmp_path / "rate_limit.json"
+    # Two buckets over one file, as in two processes started together.
+    first = TokenBucket(rate=20.0, capacity=2.0, state_file=state_file)
+    second = TokenBucket(rate=20.0, capacity=2.0, state_file=state_file)
+
+    await first.acquire()
+    await first.acquire()
+    start = time.perf_counter()
+    await second.acquire()
+
+    assert time.perf_counter() - start >= 1 / 20 * 0.9
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform == "win32", reason="the state file is only locked on POSIX")
+async def test_token_bucket_waits_for_the_state_lock_off_the_event_loop(tmp_path):
+    import fcntl
+
+    state_file = tmp_path / "rate_limit.json"
+    bucket = TokenBucket(rate=20.0, capacity=2.0, state_file=state_file)
+    # Another process holding the state lock for a while.
+    with open(tmp_path / "rate_limit.json.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        threading.Timer(0.3, fcntl.flock, (lock_file, fcntl.LOCK_UN)).start()
+
+        acquire = asyncio.create_task(bucket.acquire())
+        ticks = 0
+        while not acquire.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    assert ticks > 5
@@ -0,0 +1,114 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from loguru import logger
+
+from recsys.logging.logging_backends.loki_logger import PUSH_PATH, LokiSink
+from recsys.logging.logging_backends.pipeline import LogPipeline
+
+
+class LokiStandIn:
+    """Local HTTP server recording pushes; answers with the queued status codes, then 204."""
+
+    def __init__(self):
+        self.pushes: list[dict] = []
+        self.statuses: list[int] = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stand_in.pushes.append({
+                    "path": self.path,
+                    "encoding": self.headers.get("Content-Encoding"),
+                    "payload": json.loads(gzip.decompress(body)),
+                })
+                status = stand_in.statuses.pop(0) if stand_in.statuses else 204
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def lines(self) -> list[tuple[dict, dict]]:
+        return [
+            (stream["stream"], json.loads(line)["record"])
+            for push in self.pushes
+            for stream in push["payload"]["streams"]
+            for _, line in stream["values"]
+        ]
+
+
+@pytest.fixture
+def loki():
+    stand_in = LokiStandIn()
+    yield stand_in
+    stand_in.server.shutdown()
+
+
+def capture(*calls: tuple[str, str]) -> list:
+    """Real loguru messages for `(level, text)` calls."""
+    captured = []
+    handler_id = logger.add(captured.append, level=0, format="{message}", filter=lambda r: "loki_test" in r["extra"])
+    for level, text in calls:
+        logger.bind(loki_test=True).log(level, text)
+    logger.remove(handler_id)
+    return captured
+
+
+def test_lines_are_grouped_by_labels_and_gzipped(loki):
+    sink = LokiSink(loki.url, labels={"service": "recsys-test"}, level="DEBUG", batch_size=100, flush_interval=0.05)
+    pipeline = LogPipeline([sink])
+    for message in capture(("INFO", "a"), ("WARNING", "b"), ("INFO", "c"), ("DEBUG", "d")):
+        pipeline.put(message)
+    pipeline.close()
+
+    assert all(push["path"] == PUSH_PATH and push["encoding"] == "gzip" for push in loki.pushes)
+    by_level = {}
+    for stream, record in loki.lines():
+        assert stream["service"] == "recsys-test"
+        by_level.setdefault(stream["level"], []).append(record["message"])
+    assert by_level == {"info": ["a", "c"], "warning": ["b"], "debug": ["d"]}
+    assert sink.stats.sent == 4
+
+
+def test_transient_failures_are_retried(loki):
+    loki.statuses = [503, 429]
+    sink = LokiSink(loki.url, batch_size=2, flush_interval=10, backoff_base=0.01)
+    sink.write_batch(capture(("INFO", "first"), ("ERROR", "second")))
+    assert sink.flush(timeout=5)
+    sink.close()
+
+    assert len(loki.pushes) == 3
+    assert sink.stats.retries == 2
+    assert (sink.stats.sent, sink.stats.dropped) == (2, 0)
+
+
+def test_rejected_batches_are_dropped_without_retrying(loki):
+    loki.statuses = [400]
+    sink = LokiSink(loki.url, flush_interval=0.01)
+    sink.write_batch(capture(("INFO", "too old")))
+    sink.close()
+
+    assert len(loki.pushes) == 1
+    assert (sink.stats.retries, sink.stats.failed_batches, sink.stats.dropped) == (0, 1, 1)
+
+
+def test_buffer_stays_bounded_while_loki_is_down():
+    sink = LokiSink("http://127.0.0.1:9", max_buffer=10, batch_size=100, flush_interval=10, max_retries=0)
+    sink.write_batch(capture(*[("INFO", f"line {i}") for i in range(50)]))
+
+    assert len(sink._buffer) == 10
+    assert '"message": "line 40"' in sink._buffer[0][2]  # The newest lines are kept.
+    sink.close()
+    assert (sink.stats.failed_batches, sink.stats.dropped, sink.stats.sent) == (1, 50, 0)
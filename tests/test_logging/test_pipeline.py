@@ -0,0 +1,157 @@
+import gc
+import json
+import threading
+import time
+import weakref
+from types import SimpleNamespace
+
+import pytest
+from loguru import logger
+
+from recsys.logging.logging_backends import pipeline as pipeline_module
+from recsys.logging.logging_backends.default_logger import JsonFileSink
+from recsys.logging.logging_backends.pipeline import LogPipeline, LogSampler
+
+
+class ListSink:
+    level_no = 0
+
+    def __init__(self, gate: threading.Event | None = None):
+        self.messages = []
+        self.threads = set()
+        self.gate = gate
+
+    def write_batch(self, messages):
+        if self.gate is not None:
+            self.gate.wait()
+        self.threads.add(threading.current_thread().name)
+        self.messages.extend(messages)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def installed():
+    handlers = []
+
+    def install(pipeline, **kwargs):
+        handlers.append((pipeline.install(logger, **kwargs), pipeline))
+        return logger.bind(case="pipeline")
+
+    yield install
+    for handler_id, pipeline in handlers:
+        logger.remove(handler_id)
+        pipeline.close()
+
+
+def _ingest_row():
+    raise ValueError("bad row")
+
+
+def test_sinks_run_on_the_pipeline_thread(installed, tmp_path):
+    collected = ListSink()
+    pipeline = LogPipeline([collected, JsonFileSink(tmp_path / "app_events.log")])
+    log = installed(pipeline)
+
+    log.info("loaded {} games", 3)
+    try:
+        _ingest_row()
+    except ValueError:
+        log.exception("ingestion failed")
+    assert pipeline.flush()
+
+    assert collected.threads == {"log-pipeline"}
+    records = [json.loads(line)["record"] for line in (tmp_path / "app_events.log").read_text().splitlines()]
+    records = [r for r in records if r["extra"].get("case") == "pipeline"]
+    assert [(r["level"]["name"], r["message"]) for r in records] == [
+        ("INFO", "loaded 3 games"),
+        ("ERROR", "ingestion failed"),
+    ]
+    assert records[1]["exception"]["type"] == "ValueError"
+    assert records[0]["function"] == "test_sinks_run_on_the_pipeline_thread"
+
+
+def test_full_queue_drops_instead_of_blocking(installed):
+    gate = threading.Event()
+    pipeline = LogPipeline([ListSink(gate)], max_queue=2)
+    log = installed(pipeline)
+
+    start = time.perf_counter()
+    for i in range(20):
+        log.info("event {}", i)
+    elapsed = time.perf_counter() - start
+    gate.set()
+    pipeline.flush()
+
+    assert elapsed < 0.5
+    # At most two messages sit in the batch the blocked thread took, and two in the queue.
+    assert pipeline.stats.dropped >= 16
+    assert pipeline.stats.enqueued + pipeline.stats.dropped == 20
+
+
+def test_sampler_limits_each_call_site_but_keeps_warnings(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(pipeline_module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    sampler = LogSampler(rate=2, burst=3, max_level="INFO")
+
+    def record(level: str, no: int, line: int = 10) -> dict:
+        return {"level": SimpleNamespace(name=level, no=no), "name": "recsys.hot", "line": line, "extra": {}}
+
+    kept = [sampler(record("DEBUG", 10)) for _ in range(10)]
+    assert kept == [True] * 3 + [False] * 7
+    assert all(sampler(record("WARNING", 30)) for _ in range(10))
+    assert sampler(record("DEBUG", 10, line=11))  # Another call site has its own bucket.
+
+    clock.now = 1.0  # Two tokens refilled.
+    first = record("DEBUG", 10)
+    assert sampler(first) and sampler(record("DEBUG", 10)) and not sampler(record("DEBUG", 10))
+    assert first["extra"]["sampled_out"] == 7
+    assert sampler.dropped == 8
+
+
+def test_json_file_sink_rotates_by_size(tmp_path):
+    sink = JsonFileSink(tmp_path / "app_events.log", rotation_bytes=2_000)
+    captured = []
+    handler_id = logger.add(captured.append, format="{message}", filter=lambda r: r["extra"].get("case") == "rotate")
+    for i in range(10):
+        logger.bind(case="rotate").info("line {}", i)
+    logger.remove(handler_id)
+
+    for message in captured:
+        sink.write_batch([message])
+    sink.close()
+
+    files = sorted(tmp_path.glob("app_events*.log"))
+    assert len(files) > 1
+    lines = [json.loads(line) for path in files for line in path.read_text().splitlines()]
+    assert sorted(line["record"]["message"] for line in lines) == sorted(f"line {i}" for i in range(10))
+
+
+def test_closed_pipeline_is_not_kept_alive():
+    pipeline = LogPipeline([ListSink()])
+    handler_id = pipeline.install(logger)
+    logger.bind(case="lifetime").info("started")
+    logger.remove(handler_id)
+    pipeline.close()
+    ref = weakref.ref(pipeline)
+
+    del pipeline
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_json_file_sink_rotates_by_encoded_size(tmp_path):
+    sink = JsonFileSink(tmp_path / "app_events.log", rotation_bytes=4_000)
+    captured = []
+    handler_id = logger.add(captured.append, format="{message}", filter=lambda r: r["extra"].get("case") == "bytes")
+    for i in range(10):
+        logger.bind(case="bytes").info("{} {}", "spiel" * 20 + "ä" * 400, i)
+    logger.remove(handler_id)
+
+    for message in captured:
+        sink.write_batch([message])
+    sink.close()
+
+    assert all(path.stat().st_size <= 4_000 for path in tmp_path.glob("app_events*.log"))
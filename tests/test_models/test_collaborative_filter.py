@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recsys.models.collaborative_filter import CollaborativeFilter, GrowableArray, IdInterner, UserVectorStore
+
+
+@pytest.fixture
+def ratings_df():
+    rng = np.random.default_rng(3)
+    n = 4000
+    return pd.DataFrame({
+        "BGGId": rng.integers(1, 120, size=n),
+        "Rating": rng.uniform(1, 10, size=n).round(1),
+        "Username": [f"user{u}" for u in rng.integers(0, 300, size=n)],
+    }).drop_duplicates(subset=["BGGId", "Username"])
+
+
+def test_interner_assigns_dense_codes_in_first_seen_order():
+    interner = IdInterner()
+
+    first = interner.intern(np.array(["b", "a", "b"], dtype=object))
+    second = interner.intern(np.array(["c", "a"], dtype=object))
+
+    assert first.dtype == np.int32
+    assert first.tolist() == [0, 1, 0]
+    assert second.tolist() == [2, 1]
+    assert interner.ids == ["b", "a", "c"]
+
+
+def test_growable_array_grows_past_capacity():
+    buffer = GrowableArray(np.int32, capacity=2)
+
+    buffer.extend(np.arange(3))
+    buffer.extend(np.arange(5))
+
+    assert buffer.view().tolist() == [0, 1, 2, 0, 1, 2, 3, 4]
+
+
+def test_fit_from_path_matches_in_memory_matrix(tmp_path, ratings_df):
+    path = tmp_path / "user_ratings.csv"
+    ratings_df.to_csv(path, index=False)
+
+    streamed = CollaborativeFilter(factors=8, iterations=2).fit_from_path(path, chunksize=333)
+    in_memory = CollaborativeFilter(factors=8, iterations=2).fit(ratings_df, columns=("Username", "BGGId", "Rating"))
+
+    assert streamed.users.ids == in_memory.users.ids
+    assert streamed.items.ids == in_memory.items.ids
+    assert (streamed.user_items != in_memory.user_items).nnz == 0
+    assert streamed.user_items.nnz == len(ratings_df)
+
+
+def test_fit_from_path_interns_ids_with_one_dtype_across_chunks(tmp_path):
+    path = tmp_path / "user_ratings.csv"
+    path.write_text("Username,BGGId,Rating\n123,1,7\n456,2,8\nalice,1,6\n123,2,9\n")
+
+    model = CollaborativeFilter(factors=2, iterations=1).fit_from_path(path, chunksize=2)
+
+    assert model.users.ids == ["123", "456", "alice"]
+    assert model.items.ids == [1, 2]
+
+
+def test_rerated_game_keeps_the_last_rating():
+    ratings = pd.DataFrame({
+        "USER_ID": ["a", "a", "b", "a"],
+        "GAME_ID": [1, 2, 1, 1],
+        "RATING": [7.0, 5.0, 6.0, 8.0],
+    })
+
+    model = CollaborativeFilter(factors=2, iterations=1).fit(ratings)
+
+    assert model.user_ratings("a") == {1: 8.0, 2: 5.0}
+    assert model.user_items.nnz == 3
+
+
+def test_save_load_round_trip(tmp_path, ratings_df):
+    model = CollaborativeFilter(factors=8, iterations=2).fit(ratings_df, columns=("Username", "BGGId", "Rating"))
+    model.save(tmp_path)
+
+    loaded = CollaborativeFilter.load(tmp_path)
+
+    assert loaded.recommend("user1", n=5) == model.recommend("user1", n=5)
+    assert loaded.recommend("nobody") == []
+    assert all(game != 5 for game, _ in loaded.similar_games(5, n=3))
+
+
+@pytest.fixture(scope="module")
+def trained():
+    # Two taste groups: users rate games from their own half of the catalogue.
+    rng = np.random.default_rng(5)
+    rows = []
+    for user in range(400):
+        group = user % 2
+        for game in rng.choice(np.arange(group * 60, group * 60 + 60), size=15, replace=False):
+            rows.append((f"user{user}", int(game), float(rng.integers(6, 11))))
+    ratings = pd.DataFrame(rows, columns=["USER_ID", "GAME_ID", "RATING"])
+    return CollaborativeFilter(factors=16, iterations=10).fit(ratings)
+
+
+def test_fold_in_matches_the_als_user_step(trained):
+    ratings = trained.user_ratings("user7")
+    user_items = trained.user_items[trained.users.get("user7")]
+
+    folded = trained.fold_in(ratings)
+    expected = trained.als_model.recalculate_user(0, user_items)
+
+    np.testing.assert_allclose(folded, expected, rtol=1e-3, atol=1e-4)
+    assert trained.fold_in({"unknown": 5.0}).tolist() == [0.0] * 16
+
+
+def test_store_reflects_new_ratings_immediately(trained):
+    store = UserVectorStore(trained, maxsize=2)
+
+    # A brand-new user who rates group-1 games gets group-1 recommendations.
+    store.rate("newcomer", dict.fromkeys(range(60, 70), 9.0))
+    recommended = [game for game, _ in store.recommend("newcomer", n=10)]
+    assert trained.recommend("newcomer") == []
+    assert not set(recommended) & set(range(60, 70))
+    assert sum(game >= 60 for game in recommended) >= 8
+
+    # A trained user's new rating is excluded from their recommendations from now on.
+    target = next(game for game, _ in trained.recommend("user3", n=1))
+    event = {"event_type": "rate_game", "user_id": "user3", "details": {"game_id": target, "rating": 10}}
+    assert store.apply_event(event)
+    assert target not in [game for game, _ in store.recommend("user3", n=10)]
+    assert store.factors("user3") is not None
+    assert store.revision("user3") > store.revision("newcomer") > store.revision("user9") == 0
+
+    store.rate("user5", {1: 8.0})
+    assert "newcomer" not in store and len(store) == 2
+    assert not store.apply_event({"event_type": "view_recommendation", "user_id": "u", "details": {}})
+
+
+def test_replay_with_skip_refolds_only_changed_users(trained):
+    previous = UserVectorStore(trained)
+    previous.rate("user1", {1: 9.0})
+    previous.rate("user2", {2: 9.0})
+    store = UserVectorStore(trained)
+
+    replayed = store.replay(previous)
+    previous.rate("user2", {3: 9.0})
+    delta = store.replay(previous, skip=replayed)
+
+    assert sorted(replayed) == ["user1", "user2"]
+    assert list(delta) == ["user2"]
+    assert store.fold_ins == 3
+    assert store.revision("user2") > store.revision("user1")
+
+
+def test_fold_in_quality_close_to_full_retrain(trained):
+    # Held-out users folded into a model trained without them recommend as well as a full retrain.
+    rng = np.random.default_rng(6)
+    rows = []
+    for user in range(400):
+        group = user % 2
+        for game in rng.choice(np.arange(group * 60, group * 60 + 60), size=15, replace=False):
+            rows.append((f"user{user}", int(game), 8.0))
+    ratings = pd.DataFrame(rows, columns=["USER_ID", "GAME_ID", "RATING"])
+    held_out = [f"user{u}" for u in range(0, 400, 20)]
+    base = CollaborativeFilter(factors=16, iterations=10).fit(ratings[~ratings.USER_ID.isin(held_out)])
+    full = CollaborativeFilter(factors=16, iterations=10).fit(ratings)
+
+    def in_group(user, games):
+        group = int(user[4:]) % 2
+        return np.mean([group * 60 <= game < group * 60 + 60 for game in games])
+
+    store = UserVectorStore(base)
+    folded, retrained = [], []
+    for user in held_out:
+        user_ratings = dict(zip(*ratings[ratings["USER_ID"] == user][["GAME_ID", "RATING"]].to_numpy().T, strict=True))
+        store.rate(user, {int(g): r for g, r in user_ratings.items()})
+        folded.append(in_group(user, [g for g, _ in store.recommend(user, n=10)]))
+        retrained.append(in_group(user, [g for g, _ in full.recommend(user, n=10)]))
+
+    assert np.mean(folded) >= np.mean(retrained) - 0.05
+    assert np.mean(folded) > 0.9
@@ -0,0 +1,159 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recsys.models.collaborative_filter import CollaborativeFilter
+from recsys.models.hybrid import HybridRecommender, StageBudgets, merge_candidates
+from recsys.models.rag_recommender import RAGRecommender
+from recsys.utils.distance_metrics import NeighborEngine
+
+N_GAMES = 200
+
+
+@pytest.fixture(scope="module")
+def components():
+    rng = np.random.default_rng(11)
+    game_ids = np.arange(1, N_GAMES + 1, dtype=np.int64)
+    embeddings = rng.normal(size=(N_GAMES, 16)).astype(np.float32)
+    rag = RAGRecommender().fit_embeddings(game_ids, embeddings)
+    engine = NeighborEngine(
+        game_ids,
+        embeddings,
+        clusters=rng.normal(size=(N_GAMES, 4)),
+        themes=rng.integers(0, 2, size=(N_GAMES, 6)),
+        categories=rng.integers(0, 2, size=(N_GAMES, 5)),
+        ratings=rng.uniform(0, 1, N_GAMES),
+        popularity=rng.uniform(0, 1, N_GAMES),
+    )
+    ratings = pd.DataFrame({
+        "USER_ID": [f"user{u}" for u in rng.integers(0, 100, size=3000)],
+        "GAME_ID": rng.choice(game_ids, size=3000),
+        "RATING": rng.uniform(1, 10, size=3000),
+    }).drop_duplicates(subset=["USER_ID", "GAME_ID"])
+    cf = CollaborativeFilter(factors=8, iterations=2).fit(ratings)
+    return rag, cf, engine
+
+
+class SlowSource:
+    """Wraps a component and delays every call, to exercise the stage budgets."""
+
+    def __init__(self, inner, delay):
+        self.inner, self.delay = inner, delay
+
+    def __getattr__(self, name):
+        attr = getattr(self.inner, name)
+        if not callable(attr):
+            return attr
+
+        def slow(*args, **kwargs):
+            time.sleep(self.delay)
+            return attr(*args, **kwargs)
+
+        return slow
+
+
+def test_merge_candidates_unions_sources_and_keeps_best_score():
+    ids, scores = merge_candidates({
+        "content": (np.array([3, 1, 3, -1]), np.array([0.9, 0.5, 0.7, -np.inf])),
+        "collaborative": (np.array([2, 3]), np.array([4.0, 2.0])),
+    })
+
+    assert ids.tolist() == [1, 2, 3]
+    np.testing.assert_allclose(scores, [[0.0, 0.0], [0.0, 1.0], [1.0, 0.0]])
+
+
+def test_recommend_blends_sources_and_records_timings(components):
+    rag, cf, engine = components
+    hybrid = HybridRecommender(rag, cf, engine, n_candidates=30)
+
+    result = hybrid.recommend([1, 2, 3], user_id="user5", n=10)
+
+    assert len(result.game_ids) == 10
+    assert not set(result.game_ids.tolist()) & {1, 2, 3}
+    assert (np.diff(result.scores) <= 0).all()
+    assert result.degraded == []
+    assert set(result.timings_ms) == {"candidates", "merge", "rerank", "total"}
+    assert hybrid.timing_history[-1] is result.timings_ms
+    hybrid.close()
+
+
+def test_slow_source_is_dropped_within_budget(components):
+    rag, cf, engine = components
+    hybrid = HybridRecommender(rag, SlowSource(cf, 0.5), engine, budgets=StageBudgets(candidates_ms=50))
+
+    result = hybrid.recommend([1, 2], user_id="user5", n=5)
+
+    assert result.degraded == ["collaborative:timeout"]
+    assert len(result.game_ids) == 5
+    assert result.timings_ms["candidates"] < 400
+    hybrid.close()
+
+
+def test_timed_out_source_does_not_starve_rerank(components):
+    rag, cf, engine = components
+    # One thread per stage: the timed-out source still holds the only candidate thread.
+    hybrid = HybridRecommender(rag, SlowSource(cf, 0.5), engine, budgets=StageBudgets(candidates_ms=50), max_workers=1)
+
+    result = hybrid.recommend([1, 2], user_id="user5", n=5)
+
+    assert result.degraded == ["collaborative:timeout"]
+    hybrid.close()
+
+
+def test_slow_rerank_falls_back_to_blended_scores(components):
+    rag, _, engine = components
+    hybrid = HybridRecommender(rag, None, SlowSource(engine, 0.5), budgets=StageBudgets(rerank_ms=50))
+
+    result = hybrid.recommend([1, 2], n=5)
+    expected, _ = rag.similar_games([1, 2], k=100)
+
+    assert result.degraded == ["rerank:timeout"]
+    assert set(result.game_ids.tolist()) <= set(expected.ravel().tolist())
+    hybrid.close()
+
+
+def test_failing_rerank_falls_back_to_blended_scores(components, monkeypatch):
+    rag, _, engine = components
+    hybrid = HybridRecommender(rag, None, engine)
+
+    def broken_distances(*args, **kwargs):
+        raise ValueError("feature matrix mismatch")
+
+    monkeypatch.setattr(engine, "distances", broken_distances)
+    result = hybrid.recommend([1, 2], n=5)
+    expected, _ = rag.similar_games([1, 2], k=100)
+
+    assert result.degraded == ["rerank:error"]
+    assert len(result.game_ids) == 5
+    assert set(result.game_ids.tolist()) <= set(expected.ravel().tolist())
+    hybrid.close()
+
+
+def test_no_sources_falls_back_to_popular_games(components):
+    _, _, engine = components
+    hybrid = HybridRecommender(engine=engine)
+    most_popular = engine.game_ids[np.argsort(-engine.popularity)]
+
+    result = hybrid.recommend([int(most_popular[0])], n=3)
+
+    assert result.degraded == ["popularity_fallback"]
+    assert result.game_ids.tolist() == most_popular[1:4].tolist()
+    hybrid.close()
+
+
+def test_recommend_many_matches_single_requests(components):
+    rag, cf, engine = components
+    hybrid = HybridRecommender(rag, cf, engine, n_candidates=30, budgets=StageBudgets(5_000, 5_000))
+    requests = [([1, 2, 3], "user5", 10), ([4], None, 5), ([99_999], None, 3), ([7, 8], "user9", 10)]
+
+    batched = hybrid.recommend_many(requests)
+    single = [hybrid.recommend(*request) for request in requests]
+
+    assert len(batched) == len(requests)
+    for got, want in zip(batched, single, strict=True):
+        assert got.game_ids.tolist() == want.game_ids.tolist()
+        np.testing.assert_allclose(got.scores, want.scores)
+        assert got.degraded == want.degraded
+    hybrid.close()
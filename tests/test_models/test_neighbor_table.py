@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from recsys.models.neighbor_table import NeighborTable, build_neighbor_table
+from recsys.utils.distance_metrics import NeighborEngine
+
+
+@pytest.fixture
+def engine():
+    rng = np.random.default_rng(5)
+    n = 300
+    return NeighborEngine(
+        game_ids=rng.choice(np.arange(1, 5000), size=n, replace=False),
+        embeddings=rng.normal(size=(n, 12)),
+        clusters=rng.normal(size=(n, 3)),
+        themes=rng.integers(0, 2, size=(n, 5)),
+        categories=rng.integers(0, 2, size=(n, 4)),
+        ratings=rng.uniform(0, 1, n),
+        popularity=rng.uniform(0, 1, n),
+    )
+
+
+def test_table_matches_engine_neighbors(tmp_path, engine):
+    table = build_neighbor_table(engine, tmp_path, k=10, block_size=64, max_workers=3)
+
+    expected_ids, expected_dist = engine.kneighbors(engine.game_ids, k=10)
+    for game_id, ids, dist in zip(engine.game_ids[::37], expected_ids[::37], expected_dist[::37], strict=True):
+        got_ids, got_dist = table.neighbors(int(game_id))
+        assert got_ids.tolist() == ids.tolist()
+        np.testing.assert_allclose(got_dist, dist, rtol=1e-2)
+
+
+def test_load_memory_maps_compact_arrays(tmp_path, engine):
+    build_neighbor_table(engine, tmp_path, k=5, block_size=100)
+
+    table = NeighborTable.load(tmp_path)
+
+    assert len(table) == len(engine)
+    assert isinstance(table.ids, np.memmap)
+    assert table.ids.dtype == np.int32
+    assert table.scores.dtype == np.float16
+    assert len(table.similar_games(int(engine.game_ids[0]), n=3)) == 3
+
+
+def test_unknown_games_have_no_neighbors(tmp_path, engine):
+    table = build_neighbor_table(engine, tmp_path, k=5)
+    unknown = int(np.setdiff1d(np.arange(1, 5000), engine.game_ids)[0])
+
+    assert len(table.neighbors(unknown)[0]) == 0
+    assert len(table.neighbors(10**7)[0]) == 0
+    assert len(table.neighbors(-3)[0]) == 0
+
+
+@pytest.mark.parametrize("n_games", [0, 1])
+def test_tables_without_neighbors_round_trip(tmp_path, n_games):
+    rng = np.random.default_rng(0)
+    engine = NeighborEngine(
+        game_ids=np.arange(1, n_games + 1),
+        embeddings=rng.normal(size=(n_games, 4)),
+        clusters=rng.normal(size=(n_games, 2)),
+        themes=np.zeros((n_games, 3)),
+        categories=np.zeros((n_games, 3)),
+        ratings=np.ones(n_games),
+        popularity=np.ones(n_games),
+    )
+
+    table = build_neighbor_table(engine, tmp_path, k=5)
+
+    assert (len(table), table.k) == (n_games, 0)
+    assert len(table.neighbors(1)[0]) == 0
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recsys.models.rag_recommender import RAGRecommender, build_embedding_text
+
+
+@pytest.fixture
+def catalogue():
+    rng = np.random.default_rng(7)
+    game_ids = np.arange(500, dtype=np.int64) + 10_000
+    embeddings = rng.normal(size=(500, 24)).astype(np.float32)
+    return game_ids, embeddings
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_search_finds_the_query_game_first(catalogue, index_type):
+    game_ids, embeddings = catalogue
+    model = RAGRecommender(index_type=index_type, nprobe=64).fit_embeddings(game_ids, embeddings)
+
+    ids, scores = model.search_many(embeddings[:20], k=5)
+
+    assert ids.shape == (20, 5)
+    assert (ids[:, 0] == game_ids[:20]).all()
+    np.testing.assert_allclose(scores[:, 0], 1.0, atol=1e-5)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_save_and_mmap_load_round_trip(tmp_path, catalogue, index_type):
+    game_ids, embeddings = catalogue
+    model = RAGRecommender(index_type=index_type, nprobe=64).fit_embeddings(game_ids, embeddings)
+    model.save(tmp_path)
+
+    loaded = RAGRecommender.load(tmp_path, mmap=True)
+
+    assert loaded.index_type == index_type
+    np.testing.assert_array_equal(
+        loaded.search_many(embeddings[:10], k=3)[0], model.search_many(embeddings[:10], k=3)[0]
+    )
+    np.testing.assert_allclose(loaded.vectors_for([10_003]), model.vectors_for([10_003]))
+
+
+def test_similar_games_excludes_query(catalogue):
+    game_ids, embeddings = catalogue
+    model = RAGRecommender().fit_embeddings(game_ids, embeddings)
+
+    ids, _ = model.similar_games([10_000, 10_001], k=4)
+
+    assert ids.shape == (2, 4)
+    assert 10_000 not in ids[0]
+    assert 10_001 not in ids[1]
+
+
+def test_load_rejects_placeholder_artifacts(tmp_path):
+    (tmp_path / "rag_index.faiss").touch()
+    (tmp_path / "metadata.json").touch()
+
+    with pytest.raises(FileNotFoundError):
+        RAGRecommender.load(tmp_path)
+
+
+def test_build_embedding_text():
+    df = pd.DataFrame({"NAME": ["Catan"], "DESCRIPTION": ["Trade"], "CATEGORIES": ["Strategy"], "MECHANICS": [None]})
+
+    assert build_embedding_text(df).iloc[0] == "Name: Catan; Description: Trade; Categories: Strategy; Mechanics: "
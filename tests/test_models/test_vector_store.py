@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from recsys.models.vector_store import QuantizedVectorStore
+
+
+@pytest.fixture(scope="module")
+def vectors():
+    rng = np.random.default_rng(4)
+    centers = rng.normal(size=(20, 32)).astype(np.float32)
+    data = centers[rng.integers(0, 20, size=3000)] + 0.4 * rng.normal(size=(3000, 32)).astype(np.float32)
+    return np.arange(3000, dtype=np.int64) + 1, data
+
+
+def _recall(found, truth):
+    return np.mean([len(np.intersect1d(f, t)) / len(t) for f, t in zip(found, truth, strict=True)])
+
+
+@pytest.mark.parametrize(
+    ("fmt", "bytes_per_vector", "min_recall"), [("float16", 64, 0.99), ("int8", 32, 0.95), ("pq", 8, 0.9)]
+)
+def test_formats_compress_and_rescoring_restores_recall(vectors, fmt, bytes_per_vector, min_recall):
+    game_ids, data = vectors
+    exact = QuantizedVectorStore("float32").fit(game_ids, data)
+    store = QuantizedVectorStore(fmt, pq_m=8, block_size=700).fit(game_ids, data)
+    queries = data[:50]
+
+    truth, _ = exact.search_many(queries, k=10)
+    rescored, scores = store.search_many(queries, k=10, rescore=True, rescore_factor=8)
+
+    assert store.codes.nbytes == len(data) * bytes_per_vector
+    assert _recall(rescored, truth) >= min_recall
+    assert (np.diff(scores, axis=1) <= 1e-6).all()
+    assert _recall(rescored, truth) >= _recall(store.search_many(queries, k=10, rescore=False)[0], truth)
+
+
+def test_decode_approximates_original(vectors):
+    game_ids, data = vectors
+    store = QuantizedVectorStore("int8").fit(game_ids, data)
+    unit = data[:5] / np.linalg.norm(data[:5], axis=1, keepdims=True)
+
+    np.testing.assert_allclose(store.decode(np.arange(5)), unit, atol=0.02)
+
+
+def test_save_load_round_trip(tmp_path, vectors):
+    game_ids, data = vectors
+    store = QuantizedVectorStore("pq", pq_m=8).fit(game_ids, data)
+    store.save(tmp_path)
+
+    loaded = QuantizedVectorStore.load(tmp_path)
+
+    assert isinstance(loaded.full, np.memmap)
+    np.testing.assert_array_equal(loaded.search_many(data[:5], k=5)[0], store.search_many(data[:5], k=5)[0])
+
+
+def test_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        QuantizedVectorStore("int4")
+
+
+def test_search_with_no_candidates_returns_empty_rows(vectors):
+    game_ids, data = vectors
+    store = QuantizedVectorStore("int8").fit(game_ids[:100], data[:100])
+    empty = QuantizedVectorStore("int8")
+    empty.codes, empty.dim = np.empty((0, 32), dtype=np.int8), 32
+
+    for searched in (store.search_many(data[:3], k=0), empty.search_many(data[:3], k=5)):
+        ids, scores = searched
+        assert ids.shape == scores.shape == (3, 0)
+
+    for fmt in ("float32", "int8"):
+        with pytest.raises(ValueError, match="zero vectors"):
+            QuantizedVectorStore(fmt).fit(game_ids[:0], data[:0])
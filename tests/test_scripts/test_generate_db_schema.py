@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from recsys.scripts.generate_db_schema import ColumnProfile, generate_schema_sql_from_csvs, infer_csv_schema
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "games.csv"
+    pd.DataFrame({
+        "BGGId": [1, 22, 333, 98765432109876],
+        "Rating": ["7.5", "8.25", "-1", "10.125"],
+        "Weight": ["1e3", "2.5", "NaN", "3"],
+        "IsExpansion": ["true", "False", "t", "no"],
+        "Name": ["Catan", "Azul", "Gloomhaven", "Twilight Imperium"],
+        "Published": ["1995-01-01", "2017-06-01", "2017-01-01", "NULL"],
+        "Scraped": ["2024-01-01 10:00:00", "2024-01-02T11:00", "", "2024-01-03 12:00:00.5"],
+        "ZipCode": ["02134", "10001", "94105", "60601"],
+        "Empty": ["", "", "", ""],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_full_scan_emits_tight_types(csv_file):
+    schema = infer_csv_schema(csv_file, sample_rows=0, chunksize=2)
+
+    assert schema == {
+        "BGGId": "NUMBER(14,0)",
+        "Rating": "NUMBER(5,3)",
+        "Weight": "FLOAT",
+        "IsExpansion": "BOOLEAN",
+        "Name": "VARCHAR(17)",
+        "Published": "DATE",
+        "Scraped": "TIMESTAMP_NTZ",
+        "ZipCode": "VARCHAR(5)",
+        "Empty": "VARCHAR",
+    }
+
+
+def test_sampled_scan_adds_headroom(csv_file):
+    schema = infer_csv_schema(csv_file, sample_rows=2)
+
+    assert schema["BGGId"] == "NUMBER(38,0)"
+    assert schema["Name"] == "VARCHAR(16)"
+
+
+def test_merge_is_chunking_invariant():
+    values = pd.Series(["1", "22", "3.5", "-0.125", "4000"])
+
+    whole = ColumnProfile.from_values(values)
+    folded = ColumnProfile.from_values(values[:2]).merge(ColumnProfile.from_values(values[2:]))
+
+    assert whole == folded
+    assert whole.to_snowflake_type(complete=True) == "NUMBER(7,3)"
+
+
+def test_timezone_aware_timestamps():
+    profile = ColumnProfile.from_values(pd.Series(["2024-01-01T10:00:00Z", "2024-01-01 10:00:00+02:00"]))
+
+    assert profile.to_snowflake_type(complete=True) == "TIMESTAMP_TZ"
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_generate_schema_sql(tmp_path, csv_file, max_workers):
+    (tmp_path / "themes.csv").write_text("BGGId,Fantasy\n1,0\n2,1\n")
+    (tmp_path / "broken.csv").write_bytes(b"\xff\xfe\x00bad")
+
+    sql = generate_schema_sql_from_csvs(tmp_path, sample_rows=0, max_workers=max_workers)
+
+    assert "CREATE OR REPLACE TABLE GAMES (" in sql
+    assert "    BGGId NUMBER(14,0)," in sql
+    assert "CREATE OR REPLACE TABLE THEMES (\n    BGGId NUMBER(1,0),\n    Fantasy NUMBER(1,0)\n);" in sql
+    assert "-- ERROR generating schema for broken.csv" in sql
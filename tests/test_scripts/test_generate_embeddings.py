@@ -0,0 +1,189 @@
+import hashlib
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recsys.models.rag_recommender import RAGRecommender, build_embedding_text
+from recsys.scripts import train_model
+from recsys.scripts.generate_embeddings import (
+    generate_embeddings,
+    kaggle_embedding_frame,
+    length_batches,
+    load_embeddings,
+)
+from recsys.scripts.train_model import build_rag_index
+
+DIM = 8
+
+
+def fake_encoder(model_name):
+    """Deterministic stand-in for a sentence-transformers model: embeds a text by its hash."""
+
+    def encode(texts, batch_size):
+        assert len(texts) <= batch_size
+        seeds = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=4).digest()) for t in texts]
+        return np.stack([np.random.default_rng(s).normal(size=DIM) for s in seeds])
+
+    return encode
+
+
+class CrashingEncoder:
+    """Encodes `fail_after` shards, then raises, to simulate an interrupted run."""
+
+    def __init__(self, fail_after):
+        self.fail_after = fail_after
+
+    def __call__(self, model_name):
+        encode = fake_encoder(model_name)
+        calls = {"n": 0}
+
+        def crashing(texts, batch_size):
+            calls["n"] += 1
+            if calls["n"] > self.fail_after:
+                raise RuntimeError("worker killed")
+            return encode(texts, batch_size)
+
+        return crashing
+
+
+@pytest.fixture
+def catalogue():
+    rng = np.random.default_rng(2)
+    game_ids = np.arange(100, 150)
+    texts = [f"Name: Game {g}; Description: " + "word " * int(rng.integers(1, 60)) for g in game_ids]
+    return game_ids, texts
+
+
+def test_length_batches_respect_char_budget():
+    lengths = np.array([100, 90, 50, 10, 10, 10, 5])
+
+    batches = length_batches(lengths, max_batch_size=4, max_batch_chars=200)
+
+    assert [(b.start, b.stop) for b in batches] == [(0, 2), (2, 6), (6, 7)]
+
+
+def test_kaggle_frame_names_categories_and_mechanics():
+    games = pd.DataFrame({
+        "BGGId": [1, 2, 3],
+        "Name": ["Alpha", "Beta", "Gamma"],
+        "Description": ["a", "b", "c"],
+        "Cat:Thematic": [1, 0, 0],
+        "Cat:War": [1, 1, 0],
+    })
+    mechanics = pd.DataFrame({"BGGId": [2, 1], "Dice Rolling": [1, 1], "Hand Management": [1, 0]})
+
+    texts = build_embedding_text(kaggle_embedding_frame(games, mechanics)).tolist()
+
+    assert texts == [
+        "Name: Alpha; Description: a; Categories: Thematic, War; Mechanics: Dice Rolling",
+        "Name: Beta; Description: b; Categories: War; Mechanics: Dice Rolling, Hand Management",
+        "Name: Gamma; Description: c; Categories: ; Mechanics: ",
+    ]
+
+
+def test_embeddings_are_sharded_and_aligned(tmp_path, catalogue):
+    game_ids, texts = catalogue
+
+    summary = generate_embeddings(
+        game_ids, texts, tmp_path, shard_size=16, max_batch_size=5, max_workers=1, encoder_factory=fake_encoder
+    )
+    ids, vectors = load_embeddings(tmp_path)
+
+    assert summary == {"embedded": 50, "skipped": 0, "shards": 4, "compacted": False}
+    assert vectors.dtype == np.float32
+    assert ids.tolist() == game_ids.tolist()
+    expected = fake_encoder(None)([texts[7]], 1)[0]
+    np.testing.assert_allclose(vectors[7], expected, rtol=1e-6)
+
+
+def test_unchanged_texts_are_skipped_and_edits_replace_old_rows(tmp_path, catalogue):
+    game_ids, texts = catalogue
+    generate_embeddings(game_ids, texts, tmp_path, shard_size=16, max_workers=1, encoder_factory=fake_encoder)
+    texts[3] = "Name: Game 103; Description: rewritten"
+
+    summary = generate_embeddings(game_ids, texts, tmp_path, shard_size=16, max_workers=1, encoder_factory=fake_encoder)
+    ids, vectors = load_embeddings(tmp_path, game_ids=game_ids[:-1])
+
+    assert summary == {"embedded": 1, "skipped": 49, "shards": 1, "compacted": False}
+    assert len(ids) == 49
+    np.testing.assert_allclose(vectors[3], fake_encoder(None)([texts[3]], 1)[0], rtol=1e-6)
+
+
+def test_interrupted_run_resumes_after_last_shard(tmp_path, catalogue):
+    game_ids, texts = catalogue
+    with pytest.raises(RuntimeError):
+        generate_embeddings(
+            game_ids,
+            texts,
+            tmp_path,
+            shard_size=10,
+            max_batch_size=10,
+            max_workers=1,
+            encoder_factory=CrashingEncoder(fail_after=2),
+        )
+    with open(tmp_path / "manifest.json") as f:
+        assert len(json.load(f)["shards"]) == 2
+
+    summary = generate_embeddings(game_ids, texts, tmp_path, shard_size=10, max_workers=1, encoder_factory=fake_encoder)
+
+    assert summary["embedded"] == 30
+    assert len(load_embeddings(tmp_path)[0]) == 50
+
+
+def test_worker_processes_produce_same_embeddings(tmp_path, catalogue):
+    game_ids, texts = catalogue
+    generate_embeddings(game_ids, texts, tmp_path / "serial", shard_size=8, max_workers=1, encoder_factory=fake_encoder)
+    generate_embeddings(game_ids, texts, tmp_path / "pool", shard_size=8, max_workers=2, encoder_factory=fake_encoder)
+
+    serial, pooled = load_embeddings(tmp_path / "serial"), load_embeddings(tmp_path / "pool")
+
+    np.testing.assert_array_equal(serial[0], pooled[0])
+    np.testing.assert_allclose(serial[1], pooled[1], rtol=1e-6)
+
+
+def test_dead_rows_are_compacted_into_new_shards(tmp_path, catalogue):
+    game_ids, texts = catalogue
+    generate_embeddings(game_ids, texts, tmp_path, shard_size=16, max_workers=1, encoder_factory=fake_encoder)
+    for i in range(20):
+        texts[i] += " edited"
+
+    # 20 superseded rows plus the 5 of games that left the catalogue: 25 of 70 rows are dead.
+    summary = generate_embeddings(
+        game_ids[:-5], texts[:-5], tmp_path, shard_size=16, max_workers=1, encoder_factory=fake_encoder
+    )
+    ids, vectors = load_embeddings(tmp_path)
+
+    assert summary["compacted"]
+    with open(tmp_path / "manifest.json") as f:
+        manifest = json.load(f)
+    assert [shard["rows"] for shard in manifest["shards"]] == [16, 16, 13]
+    assert len(manifest["hashes"]) == 45
+    assert sorted(p.name for p in tmp_path.glob("*.ids.npy")) == [f"shard_{n:05d}.ids.npy" for n in (6, 7, 8)]
+    assert ids.tolist() == game_ids[:-5].tolist()
+    np.testing.assert_allclose(vectors[0], fake_encoder(None)([texts[0]], 1)[0], rtol=1e-6)
+
+
+def test_training_builds_the_rag_index_from_the_shards(tmp_path, catalogue):
+    game_ids, texts = catalogue
+    config = {"paths": {"processed_data_dir": "processed", "models_dir": "models"}, "training": {}}
+    generate_embeddings(
+        game_ids, texts, tmp_path / "processed" / "embeddings", max_workers=1, encoder_factory=fake_encoder
+    )
+
+    build_rag_index(tmp_path, config, "v1")
+    rag = RAGRecommender.load(tmp_path / "models" / "v1")
+
+    assert rag.game_ids.tolist() == game_ids.tolist()
+    expected = fake_encoder(None)([texts[3]], 1)[0]
+    np.testing.assert_allclose(rag.vectors_for([int(game_ids[3])])[0], expected / np.linalg.norm(expected), rtol=1e-5)
+
+
+def test_peak_memory_is_reported_without_resource(monkeypatch):
+    assert train_model.peak_memory_mb() > 0
+
+    monkeypatch.setattr(train_model.sys, "platform", "win32")
+
+    assert math.isnan(train_model.peak_memory_mb())
@@ -0,0 +1,128 @@
+import csv
+import sqlite3
+
+import pytest
+
+from recsys.scripts import load_raw_data
+from recsys.scripts.load_raw_data import BulkLoader, SQLiteBackend, quote_identifier, split_and_compress
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["BGGId", "Name", "Description"])
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def csv_files(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    games = [[i, f"Game {i}", f"Line one\nline two, with comma {i}"] for i in range(25)]
+    _write_csv(source / "games.csv", games)
+    _write_csv(source / "user-ratings.csv", [[i, f"user{i}", ""] for i in range(7)])
+    return [source / "games.csv", source / "user-ratings.csv"]
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteBackend(tmp_path / "warehouse.db", tmp_path / "stage")
+
+
+def _count(backend, table):
+    with sqlite3.connect(backend.db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {quote_identifier(table)}").fetchone()[0]  # noqa: S608
+
+
+def test_split_keeps_multiline_fields_intact(csv_files, tmp_path):
+    chunks, rows = split_and_compress(csv_files[0], tmp_path / "chunks", rows_per_chunk=10)
+
+    assert rows == 25
+    assert len(chunks) == 3
+
+
+def test_load_copies_every_row(csv_files, backend):
+    report = BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+
+    assert report.failed == {}
+    assert report.loaded == {"GAMES": 25, "USER_RATINGS": 7}
+    assert _count(backend, "GAMES") == 25
+    with sqlite3.connect(backend.db_path) as conn:
+        (description,) = conn.execute('SELECT "Description" FROM GAMES WHERE "BGGId" = \'3\'').fetchone()
+        (blank,) = conn.execute('SELECT "Description" FROM USER_RATINGS LIMIT 1').fetchone()
+    assert description == "Line one\nline two, with comma 3"
+    assert blank is None
+
+
+def test_unchanged_files_are_skipped(csv_files, backend):
+    BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+    report = BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+
+    assert report.loaded == {}
+    assert sorted(report.skipped) == ["games.csv", "user-ratings.csv"]
+    assert _count(backend, "GAMES") == 25
+
+
+def test_changed_file_replaces_table_contents(csv_files, backend):
+    BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+    _write_csv(csv_files[0], [[i, f"Game {i}", ""] for i in range(12)])
+
+    report = BulkLoader(backend, pool_size=2, max_workers=2, rows_per_chunk=10).load(csv_files)
+
+    assert report.loaded == {"GAMES": 12}
+    assert report.skipped == ["user-ratings.csv"]
+    assert _count(backend, "GAMES") == 12
+    assert _count(backend, "LOAD_HISTORY") == 3
+
+
+def test_failed_copy_keeps_previous_contents(csv_files, backend):
+    BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+    # One column more than the GAMES table has, so the INSERT fails after the DELETE.
+    with open(csv_files[0], "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([["BGGId", "Name", "Description", "Extra"], [1, "Game 1", "", "x"]])
+
+    report = BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+
+    assert "games.csv" in report.failed
+    assert _count(backend, "GAMES") == 25
+    assert _count(backend, "LOAD_HISTORY") == 2
+
+
+def test_reverted_file_is_loaded_again(csv_files, backend):
+    original = csv_files[0].read_bytes()
+    BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+    _write_csv(csv_files[0], [[i, f"Game {i}", ""] for i in range(12)])
+    BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+    csv_files[0].write_bytes(original)
+
+    report = BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+
+    assert report.loaded == {"GAMES": 25}
+    assert _count(backend, "GAMES") == 25
+
+
+def test_chunks_left_by_a_failed_run_are_not_copied(csv_files, backend):
+    BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+    # Three chunks with an extra column fail to copy and stay staged.
+    with open(csv_files[0], "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["BGGId", "Name", "Description", "Extra"])
+        writer.writerows([i, f"Game {i}", "", "x"] for i in range(25))
+    BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+    _write_csv(csv_files[0], [[1, "Game 1", ""]])
+
+    report = BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+
+    assert report.failed == {}
+    assert report.loaded == {"GAMES": 1}
+    assert _count(backend, "GAMES") == 1
+
+
+def test_each_file_is_checksummed_once(csv_files, backend, monkeypatch):
+    hashed = []
+    real_digest = load_raw_data.file_digest
+    monkeypatch.setattr(load_raw_data, "file_digest", lambda path: hashed.append(path) or real_digest(path))
+
+    BulkLoader(backend, pool_size=2, max_workers=1, rows_per_chunk=10).load(csv_files)
+
+    assert hashed == csv_files
@@ -0,0 +1,41 @@
+import pytest
+
+from recsys.scripts.benchmarks.profile_imports import (
+    STARTUP_BUDGETS_MS,
+    ImportProfile,
+    check_startup,
+    parse_importtime,
+    profile_import,
+)
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:       300 |        300 |     numpy.core
+import time:        50 |        350 |   numpy
+import time:      2000 |       2000 |   sklearn
+import time:        20 |       2370 | recsys.thing
+"""
+
+
+def test_parse_importtime_keeps_only_the_module_subtree():
+    profile = ImportProfile("recsys.thing", parse_importtime(SAMPLE))
+
+    assert [(i.name, i.depth) for i in profile.imports][:3] == [("site", 0), ("numpy.core", 2), ("numpy", 1)]
+    assert profile.total_ms == pytest.approx(2.37)
+    assert [i.name for i in profile.packages()] == ["sklearn", "numpy"]
+    assert check_startup(profile, budget_ms=1) == [
+        "imports in 2 ms (budget 1 ms)",
+        "eagerly imports sklearn",
+    ]
+
+
+@pytest.mark.parametrize("module", list(STARTUP_BUDGETS_MS))
+def test_entry_point_startup_budget(module):
+    # Timing is retried so a noisy neighbour does not fail the run; eager imports and
+    # import side effects fail on the first attempt.
+    for _ in range(3):
+        problems = check_startup(profile_import(module))
+        if not problems or not problems[0].startswith("imports in"):
+            break
+    assert problems == []
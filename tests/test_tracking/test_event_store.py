@@ -0,0 +1,120 @@
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from recsys.tracking import event_store
+from recsys.tracking.event_store import EventStore
+from recsys.tracking.interaction_tracker import InteractionTracker
+
+BASE = datetime(2026, 10, 17, 10, tzinfo=UTC)
+
+
+def _event(minutes, event_type="rate_game", n=0):
+    ts = BASE + timedelta(minutes=minutes)
+    return {
+        "event_id": f"s-{n}",
+        "event_type": event_type,
+        "timestamp_utc": ts.isoformat(),
+        "user_id": "u1",
+        "session_id": "s",
+        "details": {"n": n},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStore(tmp_path)
+    events = [_event(m, "rate_game" if (m // 10) % 2 else "view_recommendation", n=m) for m in range(0, 180, 10)]
+    for event in events:
+        with open(store.segment_path(event), "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+    return store
+
+
+def test_segments_are_hourly(store):
+    assert sorted(p.name for p in store.segments_dir.iterdir()) == [
+        "2026-10-17T10.jsonl",
+        "2026-10-17T11.jsonl",
+        "2026-10-17T12.jsonl",
+    ]
+
+
+def test_compact_only_closed_segments(store):
+    added = store.compact(now=BASE + timedelta(hours=2, minutes=30))
+
+    assert [e.segment for e in added] == ["2026-10-17T10", "2026-10-17T11"]
+    assert added[0].rows == 6
+    assert added[0].event_types == ["rate_game", "view_recommendation"]
+    assert [p.name for p in store.segments_dir.iterdir()] == ["2026-10-17T12.jsonl"]
+    assert len(store.load_catalog()) == 2
+
+
+def test_read_is_identical_before_and_after_compaction(store):
+    before = store.read()
+    store.compact(now=BASE + timedelta(hours=5))
+    after = store.read()
+
+    assert len(after) == 18
+    assert after["event_id"].tolist() == before["event_id"].tolist()
+    assert after["details"].tolist()[0] == {"n": 0}
+
+
+def test_read_prunes_by_time_and_type(store, monkeypatch):
+    store.compact(now=BASE + timedelta(hours=5))
+    opened = []
+    real_read_table = event_store.pq.read_table
+    monkeypatch.setattr(
+        event_store.pq, "read_table", lambda path, **kw: opened.append(path.name) or real_read_table(path, **kw)
+    )
+
+    df = store.read(
+        start=BASE + timedelta(hours=1, minutes=15), end=BASE + timedelta(hours=2), event_types=["rate_game"]
+    )
+
+    assert opened == ["2026-10-17T11.parquet"]
+    assert df["details"].map(lambda d: d["n"]).tolist() == [90, 110]
+    assert set(df["event_type"]) == {"rate_game"}
+
+
+def test_late_events_get_a_second_part(store):
+    store.compact(now=BASE + timedelta(hours=5))
+    late = _event(5, n=999)
+    with open(store.segment_path(late), "a", encoding="utf-8") as f:
+        f.write(json.dumps(late) + "\n")
+
+    (entry,) = store.compact(now=BASE + timedelta(hours=5))
+
+    assert entry.file == "2026-10-17T10.1.parquet"
+    assert 999 in store.read(end=BASE + timedelta(hours=1))["details"].map(lambda d: d["n"]).tolist()
+
+
+def test_partitioned_tracker_round_trip(tmp_path):
+    tracker = InteractionTracker(tmp_path, partitioned=True, flush_interval=0.01)
+    tracker.track_event("u1", "rate_game", "s1", {"game_id": 1})
+    tracker.flush(timeout=5)
+
+    df = tracker.event_store.read_recent(hours=1)
+    tracker.close()
+
+    assert df["details"].tolist() == [{"game_id": 1}]
+
+
+def test_segments_compacted_before_a_crash_are_not_ingested_again(store, monkeypatch):
+    save_catalog = store._save_catalog
+
+    def save_then_crash(catalog):
+        save_catalog(catalog)
+        raise KeyboardInterrupt("killed before the staged segment was deleted")
+
+    monkeypatch.setattr(store, "_save_catalog", save_then_crash)
+    with pytest.raises(KeyboardInterrupt):
+        store.compact(now=BASE + timedelta(hours=5))
+    monkeypatch.undo()
+    assert [entry.segment for entry in store.load_catalog()] == ["2026-10-17T10"]
+
+    store.compact(now=BASE + timedelta(hours=5))
+
+    assert [entry.segment for entry in store.load_catalog()] == ["2026-10-17T10", "2026-10-17T11", "2026-10-17T12"]
+    assert store.read()["event_id"].is_unique
+    assert list(store.segments_dir.iterdir()) == []
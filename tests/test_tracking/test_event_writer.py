@@ -0,0 +1,103 @@
+import gc
+import json
+import threading
+import weakref
+
+from recsys.tracking.event_writer import BufferedEventWriter
+from recsys.tracking.interaction_tracker import InteractionTracker
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_flush_writes_all_events_in_order(tmp_path):
+    writer = BufferedEventWriter(tmp_path / "events.jsonl", flush_size=10, flush_interval=60)
+
+    for i in range(25):
+        assert writer.write({"n": i})
+    assert writer.flush(timeout=5)
+
+    assert [e["n"] for e in _read_lines(tmp_path / "events.jsonl")] == list(range(25))
+    assert writer.stats.written == 25
+    writer.close()
+
+
+def test_time_based_flush(tmp_path):
+    writer = BufferedEventWriter(tmp_path / "events.jsonl", flush_size=1000, flush_interval=0.05)
+
+    writer.write({"n": 1})
+    writer.close()
+
+    assert _read_lines(tmp_path / "events.jsonl") == [{"n": 1}]
+
+
+def test_unserializable_event_is_rejected_alone(tmp_path):
+    writer = BufferedEventWriter(tmp_path / "events.jsonl", flush_size=10, flush_interval=60)
+
+    assert writer.write({"n": 1})
+    assert not writer.write({"n": 2, "bad": object()})
+    assert writer.write({"n": 3})
+    assert writer.flush(timeout=5)
+
+    assert [e["n"] for e in _read_lines(tmp_path / "events.jsonl")] == [1, 3]
+    assert writer.stats.encode_errors == 1
+    assert writer.stats.write_errors == 0
+    writer.close()
+
+
+def test_full_buffer_drops_and_counts(tmp_path):
+    writer = BufferedEventWriter(tmp_path / "events.jsonl", max_buffer=5, flush_size=1000, flush_interval=60)
+    # The writer only drains on flush_size or flush_interval, neither of which is reached here.
+    for i in range(5):
+        assert writer.write({"n": i})
+    accepted = writer.write({"n": 5})
+
+    assert not accepted
+    assert writer.stats.dropped == 1
+    writer.close()
+
+
+def test_closed_writer_is_not_kept_alive(tmp_path):
+    writer = BufferedEventWriter(tmp_path / "events.jsonl", flush_interval=0.01)
+    writer.write({"n": 1})
+    writer.close()
+    ref = weakref.ref(writer)
+
+    del writer
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_concurrent_producers_lose_nothing(tmp_path):
+    writer = BufferedEventWriter(tmp_path / "events.jsonl", flush_size=50, flush_interval=0.01)
+
+    def produce(worker):
+        for i in range(500):
+            writer.write({"worker": worker, "n": i})
+
+    threads = [threading.Thread(target=produce, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+
+    events = _read_lines(tmp_path / "events.jsonl")
+    assert len(events) == 4000
+    for w in range(8):
+        assert [e["n"] for e in events if e["worker"] == w] == list(range(500))
+
+
+def test_tracker_buffered_and_unbuffered_write_same_events(tmp_path):
+    for buffered in (True, False):
+        path = tmp_path / f"{buffered}.jsonl"
+        tracker = InteractionTracker(path, buffered=buffered)
+        tracker.track_event("u1", "rate_game", "s1", {"game_id": 13, "rating": 8})
+        tracker.close()
+
+        (event,) = _read_lines(path)
+        assert event["event_type"] == "rate_game"
+        assert event["details"] == {"game_id": 13, "rating": 8}
+        assert event["event_id"].startswith("s1-")
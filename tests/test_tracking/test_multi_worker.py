@@ -0,0 +1,92 @@
+import gc
+import itertools
+import multiprocessing
+import threading
+import weakref
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from recsys.tracking import interaction_tracker
+from recsys.tracking.interaction_tracker import InteractionTracker
+from recsys.tracking.sequence import WorkerSequence
+
+N_PROCESSES = 6
+N_THREADS = 2
+EVENTS_PER_THREAD = 1500
+# Larger than PIPE_BUF, so concurrent appends to one shared file could interleave.
+PADDING = "x" * 5000
+
+
+def _produce(tracker):
+    def run(thread):
+        for i in range(EVENTS_PER_THREAD):
+            tracker.track_event("u", "rate_game", "s", {"thread": thread, "i": i, "pad": PADDING})
+
+    threads = [threading.Thread(target=run, args=(t,)) for t in range(N_THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Forked children exit without running atexit hooks.
+    tracker.close()
+
+
+def test_worker_sequence_is_unique_and_monotonic():
+    sequence = WorkerSequence()
+    pairs = [sequence.next() for _ in range(1000)]
+
+    assert [seq for seq, _ in pairs] == list(range(1000))
+    assert all(a[1] <= b[1] for a, b in itertools.pairwise(pairs))
+    assert sequence.event_id(5) == f"{sequence.worker_id}-5"
+
+
+def test_dropped_sequence_is_not_kept_alive_by_the_fork_hook():
+    sequence = WorkerSequence()
+    ref = weakref.ref(sequence)
+
+    del sequence
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_application_tracker_waits_briefly_for_room(tmp_path, monkeypatch):
+    monkeypatch.setattr(interaction_tracker, "event_storage_dir", tmp_path)
+    interaction_tracker.get_tracker.cache_clear()
+    try:
+        tracker = interaction_tracker.get_tracker()
+        assert tracker.writer.block_timeout == interaction_tracker.tracker_block_timeout > 0
+        tracker.close()
+    finally:
+        interaction_tracker.get_tracker.cache_clear()
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_many_processes_lose_duplicate_and_corrupt_nothing(tmp_path):
+    # Created before forking, like a tracker imported by a preloaded gunicorn app.
+    tracker = InteractionTracker(tmp_path, multi_worker=True, flush_size=200, flush_interval=0.01)
+    ctx = multiprocessing.get_context("fork")
+
+    processes = [ctx.Process(target=_produce, args=(tracker,)) for _ in range(N_PROCESSES)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join(timeout=120)
+    assert all(p.exitcode == 0 for p in processes)
+
+    tracker.event_store.compact(now=datetime.now(UTC) + timedelta(hours=2))
+    df = tracker.event_store.read()
+
+    assert len(df) == N_PROCESSES * N_THREADS * EVENTS_PER_THREAD
+    assert df["event_id"].is_unique
+    assert df["worker_id"].nunique() == N_PROCESSES
+    assert tracker.sequence.worker_id not in set(df["worker_id"])
+    assert (df["details"].map(lambda d: d["pad"]) == PADDING).all()
+    for _, events in df.groupby("worker_id"):
+        # Gap-free sequence per worker, already in merge order.
+        assert events["seq"].tolist() == list(range(N_THREADS * EVENTS_PER_THREAD))
+        for thread in range(N_THREADS):
+            per_thread = [d["i"] for d in events["details"] if d["thread"] == thread]
+            assert per_thread == list(range(EVENTS_PER_THREAD))
+    tracker.close()
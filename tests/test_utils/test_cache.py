@@ -0,0 +1,169 @@
+import fnmatch
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from recsys.utils.cache import LRUCache, TieredCache
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of `redis.Redis` the cache uses."""
+
+    def __init__(self):
+        self.data: dict[str, tuple[float, bytes]] = {}
+        self.fail = False
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis is down")
+
+    def get(self, key):
+        self._check()
+        entry = self.data.get(key)
+        return entry[1] if entry and entry[0] > time.monotonic() else None
+
+    def set(self, key, value, px):
+        self._check()
+        self.data[key] = (time.monotonic() + px / 1000, value)
+
+    def scan_iter(self, match, count=None):
+        self._check()
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+def test_lru_evicts_least_recent_and_expires():
+    lru = LRUCache(maxsize=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    assert (lru.get("a"), lru.get("b"), lru.get("c")) == (1, None, 3)
+
+    lru.set("d", 4, ttl=0)
+    assert lru.get("d") is None
+
+
+def test_equivalent_requests_share_a_key():
+    cache = TieredCache("v1")
+
+    a = cache.key("hybrid", [3, 1, 2, 1], {"categories": ["War", "thematic"], "mechanics": None}, n=10)
+    b = cache.key("hybrid", [1, 2, 3], {"categories": ["Thematic", " war"]}, n=10)
+
+    assert a == b
+    assert a != cache.key("hybrid", [1, 2, 3], {"categories": ["war"]}, n=10)
+    assert a.startswith("recsys:hybrid:v1:")
+
+
+def test_tiers_fill_each_other(redis_client):
+    writer = TieredCache("v1", redis_client=redis_client)
+    reader = TieredCache("v1", redis_client=redis_client)
+    key = writer.key("hybrid", [1, 2])
+
+    writer.set(key, {"game_ids": np.array([5, 6])})
+
+    assert reader.get(key)["game_ids"].tolist() == [5, 6]
+    assert reader.get(key)["game_ids"].tolist() == [5, 6]
+    assert (reader.stats.remote_hits, reader.stats.local_hits) == (1, 1)
+
+
+def test_negative_results_are_cached(redis_client):
+    cache = TieredCache("v1", redis_client=redis_client, negative_ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+
+    key = cache.key("hybrid", [999])
+    assert cache.get_or_load(key, loader) is None
+    assert cache.get_or_load(key, loader) is None
+    assert len(calls) == 1
+    assert cache.stats.negative_hits == 1
+
+
+def test_single_flight_collapses_concurrent_misses():
+    cache = TieredCache("v1")
+    key = cache.key("hybrid", [1])
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return [1, 2, 3]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load(key, loader))) for _ in range(8)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [[1, 2, 3]] * 8
+    assert cache.stats.loads == 1
+
+
+def test_loader_errors_are_not_cached():
+    cache = TieredCache("v1")
+    key = cache.key("hybrid", [1])
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load(key, lambda: (_ for _ in ()).throw(RuntimeError("model unavailable")))
+
+    assert cache.get_or_load(key, lambda: "ok") == "ok"
+    assert cache.stats.load_errors == 1
+
+
+def test_model_version_change_drops_old_entries(redis_client):
+    cache = TieredCache("v1", redis_client=redis_client)
+    old_key = cache.key("hybrid", [1])
+    cache.set(old_key, "v1 result")
+    cache.set(cache.key("similar", [2]), "v1 result")
+
+    cache.set_model_version("v2")
+
+    assert cache.get(old_key) is None
+    assert redis_client.data == {}
+    assert cache.stats.invalidated == 4
+    assert cache.key("hybrid", [1]) != old_key
+
+
+def test_redis_outage_falls_back_to_local(redis_client):
+    cache = TieredCache("v1", redis_client=redis_client)
+    redis_client.fail = True
+    key = cache.key("hybrid", [1])
+
+    assert cache.get_or_load(key, lambda: "fresh") == "fresh"
+    assert cache.get(key) == "fresh"
+    assert cache.stats.remote_errors == 2
+
+
+def test_key_uses_the_version_that_computed_the_result():
+    cache = TieredCache("v2")
+
+    assert cache.key("hybrid", [1], model_version="v1").startswith("recsys:hybrid:v1:")
+    assert cache.key("hybrid", [1], model_version="v1") == TieredCache("v1").key("hybrid", [1])
+
+
+def test_unreadable_redis_entry_is_a_miss(redis_client):
+    cache = TieredCache("v1", redis_client=redis_client)
+    key = cache.key("hybrid", [1])
+    redis_client.set(key, b"not a pickle", px=60_000)
+
+    assert cache.get_or_load(key, lambda: "fresh") == "fresh"
+    assert cache.stats.remote_errors == 1
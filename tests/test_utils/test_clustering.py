@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+import recsys.utils.clustering as clustering
+from recsys.utils.clustering import (
+    ClusterIndex,
+    cluster_features,
+    filter_signature,
+    precompute_clusterings,
+    rows_for_signature,
+)
+
+
+@pytest.fixture
+def catalogue():
+    rng = np.random.default_rng(9)
+    centers = np.array([[0, 0], [10, 10], [0, 10]], dtype=np.float32)
+    features = centers[rng.integers(0, 3, size=300)] + rng.normal(scale=0.5, size=(300, 2)).astype(np.float32)
+    categories = np.zeros((300, 8), dtype=np.int8)
+    categories[:150, 0] = 1  # thematic
+    categories[100:, 1] = 1  # strategy
+    return np.arange(300) + 1000, features, categories
+
+
+def test_filter_signature_ignores_order_case_and_duplicates():
+    assert filter_signature(["Strategy", "thematic"]) == filter_signature(["thematic", "strategy", "STRATEGY"]) == 0b11
+
+    with pytest.raises(ValueError):
+        filter_signature(["euro"])
+
+
+def test_rows_for_signature_matches_any_category(catalogue):
+    _, _, categories = catalogue
+
+    assert len(rows_for_signature(categories, filter_signature(["thematic"]))) == 150
+    assert len(rows_for_signature(categories, filter_signature(["thematic", "strategy"]))) == 300
+    assert len(rows_for_signature(categories, filter_signature(["war"]))) == 0
+
+
+@pytest.mark.parametrize("minibatch_threshold", [10_000, 50])
+def test_cluster_features_finds_true_k(catalogue, minibatch_threshold):
+    _, features, _ = catalogue
+
+    result = cluster_features(features, minibatch_threshold=minibatch_threshold, silhouette_sample=100)
+
+    assert result.k == 3
+    assert result.silhouette > 0.8
+
+
+def test_tiny_inputs_get_a_single_cluster():
+    assert cluster_features(np.zeros((2, 2))).k == 1
+
+
+def test_precomputed_index_round_trip(tmp_path, catalogue):
+    game_ids, features, categories = catalogue
+    signatures = [filter_signature(["thematic"]), filter_signature(["strategy"]), filter_signature(["war"])]
+    index = precompute_clusterings(game_ids, features, categories, signatures=signatures)
+    index.save(tmp_path)
+
+    loaded = ClusterIndex.load(tmp_path)
+    ids, labels = loaded.lookup(filter_signature(["thematic"]))
+
+    assert ids.tolist() == game_ids[:150].tolist()
+    assert len(np.unique(labels)) == 3
+    assert loaded.label(filter_signature(["thematic"]), 1000) == labels[0]
+    assert loaded.label(filter_signature(["thematic"]), 1299) is None
+    assert len(loaded.lookup(filter_signature(["war"]))[0]) == 0
+    with pytest.raises(KeyError):
+        loaded.lookup(filter_signature(["party"]))
+
+
+def test_identical_game_sets_share_one_clustering(catalogue, monkeypatch):
+    game_ids, features, categories = catalogue
+    calls = []
+    original = clustering.cluster_features
+    monkeypatch.setattr(clustering, "cluster_features", lambda f, **kw: calls.append(len(f)) or original(f, **kw))
+
+    index = precompute_clusterings(game_ids, features, categories)
+
+    assert len(index.signatures) == 255
+    # Only three distinct game sets exist: thematic-only, strategy-only, and both (plus the empty set).
+    assert len(calls) == 4
+
+
+def test_label_finds_games_whose_ids_are_not_in_catalogue_order(catalogue):
+    game_ids, features, categories = catalogue
+    shuffled = np.random.default_rng(3).permutation(game_ids)
+    signature = filter_signature(["thematic"])
+
+    index = precompute_clusterings(shuffled, features, categories, signatures=[signature])
+    ids, labels = index.lookup(signature)
+
+    assert sorted(ids.tolist()) == ids.tolist() == sorted(shuffled[:150].tolist())
+    assert [index.label(signature, game_id) for game_id in shuffled[:150]] == [
+        labels[ids.tolist().index(game_id)] for game_id in shuffled[:150]
+    ]
+    assert index.label(signature, shuffled[200]) is None
@@ -0,0 +1,95 @@
+import operator
+
+import numpy as np
+import pytest
+from scipy import spatial
+
+from recsys.utils.distance_metrics import DistanceWeights, NeighborEngine
+
+
+# --- Legacy reference implementation (notebooks/streamlit_poc.py) ---
+def Computedistnace_themes(a, b):
+    themesDistance = spatial.distance.cosine(a["themes"], b["themes"])
+    popularityDistance = abs(a["NumUserRatings"] - b["NumUserRatings"])
+    clusterDistance = spatial.distance.cosine(a["l_cluster"], b["l_cluster"])
+    descDistance = spatial.distance.cosine(a["emb"], b["emb"])
+    ratingDistance = abs(a["BayesAvgRating"] - b["BayesAvgRating"])
+    return descDistance + ratingDistance + popularityDistance * 0.9 + clusterDistance * 0.03 + themesDistance * 0.04
+
+
+def getNeighbors_themes(baseGame, dict_dataset, k):
+    distances = []
+    for game in dict_dataset:
+        if game["BGGId"] != baseGame["BGGId"]:
+            dist = Computedistnace_themes(baseGame, game)
+            distances.append((game, dist))
+
+    distances.sort(key=operator.itemgetter(1))
+    return distances[:k]
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(42)
+    records = []
+    for i in range(300):
+        records.append({
+            "BGGId": 1000 + i,
+            "emb": rng.normal(size=16).tolist(),
+            "l_cluster": rng.random(4).tolist(),
+            "themes": [*(rng.random(10) < 0.3).astype(float).tolist(), 1.0],
+            "Categories": [*(rng.random(8) < 0.3).astype(float).tolist(), 1.0],
+            "BayesAvgRating": float(rng.uniform(5.5, 8.5)),
+            "NumUserRatings": float(rng.uniform(0, 1)),
+        })
+    return records
+
+
+def test_rankings_match_legacy(dataset):
+    engine = NeighborEngine.from_records(dataset)
+    queries = dataset[:25]
+
+    ids, dist = engine.kneighbors([q["BGGId"] for q in queries], k=20)
+
+    for query, row_ids, row_dist in zip(queries, ids, dist, strict=True):
+        legacy = getNeighbors_themes(query, dataset, 20)
+        assert row_ids.tolist() == [game["BGGId"] for game, _ in legacy]
+        np.testing.assert_allclose(row_dist, [d for _, d in legacy], rtol=1e-5, atol=1e-5)
+
+
+def test_kneighbors_excludes_self_and_clamps_k(dataset):
+    engine = NeighborEngine.from_records(dataset[:5])
+
+    ids, dist = engine.kneighbors([1000], k=50)
+
+    assert ids.shape == (1, 4)
+    assert 1000 not in ids[0]
+    assert np.all(np.diff(dist[0]) >= 0)
+
+
+def test_batch_size_does_not_change_results(dataset):
+    engine = NeighborEngine.from_records(dataset)
+    rows = np.arange(40)
+
+    full = engine.kneighbors_rows(rows, k=10)
+    chunked = engine.kneighbors_rows(rows, k=10, batch_size=7)
+
+    np.testing.assert_array_equal(full[0], chunked[0])
+
+
+def test_unknown_game_raises(dataset):
+    engine = NeighborEngine.from_records(dataset[:5])
+
+    with pytest.raises(KeyError):
+        engine.kneighbors([1], k=2)
+
+
+def test_save_load_round_trip(dataset, tmp_path):
+    engine = NeighborEngine.from_records(dataset, weights=DistanceWeights(categories=0.5))
+    engine.save(tmp_path)
+
+    loaded = NeighborEngine.load(tmp_path)
+
+    assert loaded.weights == engine.weights
+    np.testing.assert_array_equal(loaded.game_ids, engine.game_ids)
+    np.testing.assert_allclose(loaded.distances(np.arange(10)), engine.distances(np.arange(10)), atol=1e-6)
@@ -0,0 +1,37 @@
+import pytest
+
+from recsys.utils.files import atomic_write
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("old")
+
+    with atomic_write(path, "w", encoding="utf-8") as f:
+        f.write("new")
+        assert path.read_text() == "old"
+
+    assert path.read_text() == "new"
+    assert [p.name for p in tmp_path.iterdir()] == ["manifest.json"]
+
+
+def test_failed_atomic_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError), atomic_write(path) as f:
+        f.write(b"partial")
+        raise RuntimeError("crashed mid-write")
+
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.bin"]
+
+
+def test_interleaved_atomic_writes_do_not_share_a_temporary_file(tmp_path):
+    path = tmp_path / "state.json"
+
+    with atomic_write(path, "w") as first, atomic_write(path, "w") as second:
+        first.write("first")
+        second.write("second")
+
+    assert path.read_text() == "first"